@@ -3,12 +3,26 @@
 Convert HTML files to PDF
 
 Converts all HTML files in patent_package_for_lawyer to PDF format.
+
+Only HTML files that changed since their last conversion (or whose converter
+changed) are reconverted, several at a time; see patent_build_pipeline.py.
+
+Usage:
+    python docs/patents/convert_html_to_pdf.py [--force] [--workers N]
 """
 
 import subprocess
 import sys
 from pathlib import Path
 
+from patent_build_pipeline import (
+    ConversionJob,
+    parse_pipeline_args,
+    run_conversions,
+    thread_pool_batch,
+    tool_version,
+)
+
 PACKAGE_DIR = Path(__file__).parent / "patent_package_for_lawyer"
 
 def check_wkhtmltopdf():
@@ -29,25 +43,26 @@ def check_weasyprint():
         return False
 
 def convert_with_wkhtmltopdf(html_file, pdf_file):
-    """Convert HTML to PDF using wkhtmltopdf"""
+    """Convert HTML to PDF using wkhtmltopdf; returns (file written or None, note)"""
     cmd = ['wkhtmltopdf', str(html_file), str(pdf_file)]
     try:
         subprocess.run(cmd, check=True, capture_output=True, timeout=60)
-        return True
+        return pdf_file, ""
     except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
-        return False
+        return None, ""
 
 def convert_with_weasyprint(html_file, pdf_file):
-    """Convert HTML to PDF using weasyprint"""
+    """Convert HTML to PDF using weasyprint; returns (file written or None, note)"""
     try:
         from weasyprint import HTML
         HTML(str(html_file)).write_pdf(str(pdf_file))
-        return True
+        return pdf_file, ""
     except Exception as e:
-        print(f"Error: {e}")
-        return False
+        return None, f"Error: {e}\n"
 
 def main():
+    force, workers = parse_pipeline_args()
+    
     print("🔍 Checking for PDF conversion tools...")
     
     has_wkhtmltopdf = check_wkhtmltopdf()
@@ -65,31 +80,25 @@ def main():
     print(f"✅ Found: {'wkhtmltopdf' if has_wkhtmltopdf else 'weasyprint'}")
     
     # Find all HTML files
-    html_files = list(PACKAGE_DIR.rglob("*.html"))
+    html_files = sorted(PACKAGE_DIR.rglob("*.html"))
     print(f"\n📄 Found {len(html_files)} HTML files to convert\n")
     
-    converted = 0
-    failed = 0
-    
-    for html_file in html_files:
-        pdf_file = html_file.with_suffix('.pdf')
-        print(f"  Converting: {html_file.name}...", end=" ")
-        
-        if has_wkhtmltopdf:
-            success = convert_with_wkhtmltopdf(html_file, pdf_file)
-        else:
-            success = convert_with_weasyprint(html_file, pdf_file)
-        
-        if success:
-            print("✅")
-            converted += 1
-        else:
-            print("❌")
-            failed += 1
+    jobs = [ConversionJob(html_file, html_file.with_suffix('.pdf')) for html_file in html_files]
+    if has_wkhtmltopdf:
+        convert = convert_with_wkhtmltopdf
+        tool = tool_version(['wkhtmltopdf', '--version'])
+    else:
+        import weasyprint
+        convert = convert_with_weasyprint
+        tool = f"weasyprint {weasyprint.__version__}"
+        # weasyprint renders in-process under the GIL: threads would not help
+        workers = 1
+    converted, failed, skipped = run_conversions(jobs, thread_pool_batch(convert, workers), tool, force=force)
     
     print(f"\n✅ Conversion complete!")
     print(f"   Converted: {converted}")
     print(f"   Failed: {failed}")
+    print(f"   Unchanged: {skipped}")
     
     if failed > 0:
         print(f"\n💡 For failed conversions, use browser print method")
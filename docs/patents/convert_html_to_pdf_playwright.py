@@ -3,13 +3,30 @@
 Convert HTML files to PDF using Playwright
 
 Uses headless browser to convert HTML to PDF.
+
+One browser is launched per run and shared by all pages, at most --workers
+pages rendering at once; only HTML files that changed since their last
+conversion are reconverted (see patent_build_pipeline.py).
+
+Usage:
+    python docs/patents/convert_html_to_pdf_playwright.py [--force] [--workers N]
 """
 
+import asyncio
 import subprocess
 import sys
+from importlib.metadata import version
 from pathlib import Path
 
+from patent_build_pipeline import (
+    ConversionJob,
+    default_workers,
+    parse_pipeline_args,
+    run_conversions,
+)
+
 PACKAGE_DIR = Path(__file__).parent / "patent_package_for_lawyer"
+PDF_OPTIONS = {'format': 'A4', 'margin': {'top': '1in', 'right': '1in', 'bottom': '1in', 'left': '1in'}}
 
 def check_playwright():
     """Check if playwright is available"""
@@ -28,23 +45,48 @@ def install_playwright_browser():
     except subprocess.CalledProcessError:
         return False
 
-def convert_with_playwright(html_file, pdf_file):
-    """Convert HTML to PDF using playwright"""
-    try:
-        from playwright.sync_api import sync_playwright
-        
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page()
-            page.goto(f'file://{html_file.absolute()}')
-            page.pdf(path=str(pdf_file), format='A4', margin={'top': '1in', 'right': '1in', 'bottom': '1in', 'left': '1in'})
-            browser.close()
-        return True
-    except Exception as e:
-        print(f"Error: {e}")
-        return False
+async def convert_page(browser, limit, html_file, pdf_file):
+    """Convert one HTML file in a new page of the shared browser; returns (file written or None, note)"""
+    async with limit:
+        try:
+            page = await browser.new_page()
+            try:
+                await page.goto(f'file://{html_file.absolute()}')
+                await page.pdf(path=str(pdf_file), **PDF_OPTIONS)
+            finally:
+                await page.close()
+            return pdf_file, ""
+        except Exception as e:
+            return None, f"Error: {e}\n"
+
+async def convert_all_with_playwright(jobs, workers):
+    """Convert every job with one browser, at most `workers` pages at a time"""
+    from playwright.async_api import async_playwright
+    
+    async with async_playwright() as p:
+        try:
+            browser = await p.chromium.launch()
+        except Exception as e:
+            return [(None, f"Error: {e}\n")] * len(jobs)
+        try:
+            limit = asyncio.Semaphore(workers)
+            return await asyncio.gather(*(
+                convert_page(browser, limit, job.source, job.output) for job in jobs
+            ))
+        finally:
+            await browser.close()
+
+def playwright_batch(workers):
+    """Batch converter for run_conversions(): one browser for the whole batch"""
+    def convert_batch(jobs):
+        if not jobs:
+            return []
+        return asyncio.run(convert_all_with_playwright(jobs, workers or default_workers()))
+    return convert_batch
 
 def main():
+    force, workers = parse_pipeline_args()
+    
     print("🔍 Checking for Playwright...")
     
     if not check_playwright():
@@ -62,28 +104,17 @@ def main():
         print("⚠️  Browser installation may have issues, but continuing...")
     
     # Find all HTML files
-    html_files = list(PACKAGE_DIR.rglob("*.html"))
+    html_files = sorted(PACKAGE_DIR.rglob("*.html"))
     print(f"\n📄 Found {len(html_files)} HTML files to convert\n")
     
-    converted = 0
-    failed = 0
-    
-    for html_file in html_files:
-        pdf_file = html_file.with_suffix('.pdf')
-        print(f"  Converting: {html_file.name}...", end=" ", flush=True)
-        
-        success = convert_with_playwright(html_file, pdf_file)
-        
-        if success:
-            print("✅")
-            converted += 1
-        else:
-            print("❌")
-            failed += 1
+    jobs = [ConversionJob(html_file, html_file.with_suffix('.pdf')) for html_file in html_files]
+    tool = f"playwright {version('playwright')} chromium; {PDF_OPTIONS}"
+    converted, failed, skipped = run_conversions(jobs, playwright_batch(workers), tool, force=force)
     
     print(f"\n✅ Conversion complete!")
     print(f"   Converted: {converted}")
     print(f"   Failed: {failed}")
+    print(f"   Unchanged: {skipped}")
 
 if __name__ == "__main__":
     main()
@@ -4,6 +4,12 @@ Convert Patent Documents to PDF
 
 Converts all patent markdown documents to PDF format for lawyer meeting.
 Uses markdown-pdf or pandoc if available, otherwise provides instructions.
+
+Only documents that changed since the last conversion (or whose converter
+changed) are reconverted, several at a time; see patent_build_pipeline.py.
+
+Usage:
+    python docs/patents/convert_to_pdf.py [--force] [--workers N]
 """
 
 import os
@@ -11,9 +17,18 @@ import subprocess
 import sys
 from pathlib import Path
 
+from patent_build_pipeline import (
+    ConversionJob,
+    parse_pipeline_args,
+    run_conversions,
+    thread_pool_batch,
+    tool_version,
+)
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 PATENTS_DIR = PROJECT_ROOT / "docs" / "patents"
 OUTPUT_DIR = PROJECT_ROOT / "docs" / "patents" / "patent_package_for_lawyer"
+MARKDOWN_CSS = 'https://cdn.jsdelivr.net/npm/github-markdown-css@5/github-markdown.min.css'
 
 def check_pandoc():
     """Check if pandoc is available"""
@@ -34,7 +49,7 @@ def check_markdown_pdf():
         return False
 
 def convert_with_pandoc(md_file, pdf_file):
-    """Convert markdown to PDF using pandoc"""
+    """Convert markdown to PDF using pandoc; returns (file written or None, note)"""
     # Try HTML first, then convert to PDF
     html_file = pdf_file.with_suffix('.html')
     
@@ -44,7 +59,7 @@ def convert_with_pandoc(md_file, pdf_file):
         str(md_file),
         '-o', str(html_file),
         '--standalone',
-        '--css=https://cdn.jsdelivr.net/npm/github-markdown-css@5/github-markdown.min.css',
+        '--css=' + MARKDOWN_CSS,
         '--metadata', 'title=' + md_file.stem,
     ]
     
@@ -56,19 +71,17 @@ def convert_with_pandoc(md_file, pdf_file):
             cmd_pdf = ['wkhtmltopdf', str(html_file), str(pdf_file)]
             subprocess.run(cmd_pdf, check=True, capture_output=True, timeout=60)
             html_file.unlink()  # Remove HTML file if PDF created
-            return True
+            return pdf_file, ""
         except (FileNotFoundError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
             # If wkhtmltopdf not available, keep HTML file
             # User can print HTML to PDF from browser
-            print(f"(HTML created - print to PDF from browser)", end="")
-            return True
+            return html_file, "(HTML created - print to PDF from browser)"
             
     except subprocess.CalledProcessError as e:
-        print(f"Error: {e.stderr.decode() if e.stderr else str(e)}", end="")
-        return False
+        return None, f"Error: {e.stderr.decode() if e.stderr else str(e)}"
 
 def convert_with_markdown_pdf(md_file, pdf_file):
-    """Convert markdown to PDF using markdown-pdf"""
+    """Convert markdown to PDF using markdown-pdf; returns (file written or None, note)"""
     cmd = [
         'markdown-pdf',
         str(md_file),
@@ -76,10 +89,9 @@ def convert_with_markdown_pdf(md_file, pdf_file):
     ]
     try:
         subprocess.run(cmd, check=True, capture_output=True)
-        return True
+        return pdf_file, ""
     except subprocess.CalledProcessError as e:
-        print(f"Error converting {md_file.name}: {e}")
-        return False
+        return None, f"Error converting {md_file.name}: {e}\n"
 
 def find_patent_documents():
     """Find all main patent documents"""
@@ -131,7 +143,16 @@ def create_output_structure():
     # Create root for overview
     return OUTPUT_DIR
 
+def output_path(md_file, output_dir):
+    """PDF path in the lawyer package for a markdown document"""
+    if md_file.name == "LAWYER_MEETING_OVERVIEW.md":
+        return output_dir / "00_OVERVIEW.pdf"
+    category_name = md_file.parent.parent.name
+    return output_dir / category_name / (md_file.stem + ".pdf")
+
 def main():
+    force, workers = parse_pipeline_args()
+    
     print("🔍 Checking for PDF conversion tools...")
     
     has_pandoc = check_pandoc()
@@ -209,38 +230,21 @@ pandoc LAWYER_MEETING_OVERVIEW.md -o patent_package_for_lawyer/00_OVERVIEW.pdf
     patent_files = find_patent_documents()
     print(f"✅ Found {len(patent_files)} documents to convert")
     
-    # Convert each document
+    # Convert changed documents (the converter's versions and options are part of the manifest check)
     print("\n📄 Converting documents to PDF...")
-    converted = 0
-    failed = 0
-    
-    for md_file in patent_files:
-        # Determine output path
-        if md_file.name == "LAWYER_MEETING_OVERVIEW.md":
-            pdf_file = output_dir / "00_OVERVIEW.pdf"
-        else:
-            category_name = md_file.parent.parent.name
-            pdf_name = md_file.stem + ".pdf"
-            pdf_file = output_dir / category_name / pdf_name
-        
-        print(f"  Converting: {md_file.name}...", end=" ")
-        
-        # Convert
-        if has_pandoc:
-            success = convert_with_pandoc(md_file, pdf_file)
-        else:
-            success = convert_with_markdown_pdf(md_file, pdf_file)
-        
-        if success:
-            print(f"✅")
-            converted += 1
-        else:
-            print(f"❌")
-            failed += 1
+    jobs = [ConversionJob(md_file, output_path(md_file, output_dir)) for md_file in patent_files]
+    if has_pandoc:
+        convert = convert_with_pandoc
+        tool = f"{tool_version(['pandoc', '--version'])}; {tool_version(['wkhtmltopdf', '--version'])}; css={MARKDOWN_CSS}"
+    else:
+        convert = convert_with_markdown_pdf
+        tool = tool_version(['markdown-pdf', '--version'])
+    converted, failed, skipped = run_conversions(jobs, thread_pool_batch(convert, workers), tool, force=force)
     
     print(f"\n✅ Conversion complete!")
     print(f"   Converted: {converted}")
     print(f"   Failed: {failed}")
+    print(f"   Unchanged: {skipped}")
     print(f"\n📁 PDFs saved to: {output_dir}")
     print(f"\n📋 Next steps:")
     print(f"   1. Review PDFs in: {output_dir}")
@@ -5,6 +5,13 @@ Base Class for Atomic Timing Experiments
 Provides common functionality for all atomic timing A/B experiments.
 Follows the same framework pattern as other marketing experiments.
 
+Experiments can use either the original list-of-dicts API
+(generate_test_data / run_control_group / run_test_group) or the columnar
+API (COLUMNAR = True: generate_test_arrays / run_control_records /
+run_test_records), which keeps one preallocated array per metric, stores
+timestamps as epoch seconds, and writes results in chunks - suitable for
+1M+ pairs.
+
 Date: December 23, 2025
 """
 
@@ -14,7 +21,7 @@ import json
 import time
 import random
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional, Union
 from datetime import datetime, timezone
 from collections import defaultdict
 import warnings
@@ -26,10 +33,140 @@ RANDOM_SEED = 42
 np.random.seed(RANDOM_SEED)
 random.seed(RANDOM_SEED)
 
+TIMEZONE_IDS = ('America/Los_Angeles', 'America/New_York', 'Europe/London', 'Asia/Tokyo')
+# Standard-time UTC offsets (seconds) for TIMEZONE_IDS
+TIMEZONE_UTC_OFFSETS = np.array([-8 * 3600, -5 * 3600, 0, 9 * 3600])
+
+RESULT_CHUNK_ROWS = 100_000
+ID_COLUMNS = ('pair_id', 'pair_index', 'experiment_id')
+
+
+class ExperimentRecords:
+    """
+    Columnar experiment records: one preallocated NumPy array per column.
+    
+    Subclasses fill whole columns (records['metric'] = array) or slices
+    (records['metric'][start:stop] = values) instead of appending dicts.
+    """
+    
+    def __init__(self, num_rows: int, columns: Optional[Dict[str, type]] = None):
+        self.num_rows = num_rows
+        self._columns: Dict[str, np.ndarray] = {}
+        for name, dtype in (columns or {}).items():
+            self.add_column(name, dtype)
+    
+    def add_column(self, name: str, dtype: type = np.float64, fill=0) -> np.ndarray:
+        """Preallocate a column (filled with `fill`) and return it."""
+        self._columns[name] = np.full(self.num_rows, fill, dtype=dtype)
+        return self._columns[name]
+    
+    def __setitem__(self, name: str, values):
+        values = np.asarray(values)
+        if name not in self._columns:
+            self.add_column(name, values.dtype if values.ndim else np.asarray([values]).dtype)
+        self._columns[name][:] = values
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+    
+    def __len__(self) -> int:
+        return self.num_rows
+    
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+    
+    def metric_arrays(self) -> Dict[str, np.ndarray]:
+        """Numeric (including boolean) columns, excluding id columns."""
+        return {
+            name: values for name, values in self._columns.items()
+            if name not in ID_COLUMNS and (np.issubdtype(values.dtype, np.number) or values.dtype == bool)
+        }
+    
+    def iter_chunks(self, chunk_rows: int = RESULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        """DataFrame views of consecutive row chunks (never the whole table at once)."""
+        for start in range(0, self.num_rows, chunk_rows):
+            yield pd.DataFrame({name: values[start:start + chunk_rows] for name, values in self._columns.items()})
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame(self._columns)
+    
+    @classmethod
+    def from_dicts(cls, rows: List[Dict]) -> 'ExperimentRecords':
+        """Columnar copy of list-of-dicts results."""
+        records = cls(len(rows))
+        for name, values in pd.DataFrame(rows).items():
+            records[name] = values.to_numpy()
+        return records
+
+
+ExperimentResults = Union[List[Dict], ExperimentRecords]
+
+
+def metric_arrays(results: ExperimentResults) -> Dict[str, np.ndarray]:
+    """Numeric metric columns of list-of-dicts or columnar results."""
+    if isinstance(results, ExperimentRecords):
+        return results.metric_arrays()
+    df = pd.DataFrame(results)
+    return {
+        metric: df[metric].to_numpy()
+        for metric in df.columns
+        if metric not in ID_COLUMNS and pd.api.types.is_numeric_dtype(df[metric])
+    }
+
+
+def write_records(
+    results: ExperimentResults,
+    path: Path,
+    fmt: str = 'csv',
+    chunk_rows: int = RESULT_CHUNK_ROWS,
+) -> Path:
+    """
+    Write results as CSV or Parquet, chunk by chunk.
+    
+    Parquet needs pyarrow; without it the results are written as CSV.
+    Returns the path actually written.
+    """
+    if not isinstance(results, ExperimentRecords):
+        results = ExperimentRecords.from_dicts(results)
+    
+    if fmt == 'parquet':
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("⚠️  pyarrow not installed - writing CSV instead of Parquet")
+            fmt = 'csv'
+    
+    path = Path(path).with_suffix('.parquet' if fmt == 'parquet' else '.csv')
+    if fmt == 'parquet':
+        writer = None
+        try:
+            for chunk in results.iter_chunks(chunk_rows):
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        for i, chunk in enumerate(results.iter_chunks(chunk_rows)):
+            chunk.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        if results.num_rows == 0:
+            pd.DataFrame(columns=results.columns).to_csv(path, index=False)
+    return path
+
 
 class AtomicTimingExperimentBase:
     """Base class for atomic timing experiments"""
     
+    # Set True in subclasses implementing run_control_records/run_test_records
+    COLUMNAR = False
+    
     def __init__(self, experiment_name: str, num_pairs: int = 1000, num_nodes: int = 10, random_seed: int = 42):
         self.experiment_name = experiment_name
         self.num_pairs = num_pairs
@@ -41,6 +178,7 @@ class AtomicTimingExperimentBase:
         # Set up results directory
         self.results_dir = Path(__file__).parent / 'results' / 'atomic_timing' / experiment_name
         self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.results_format = 'csv'  # 'csv' or 'parquet'
     
     def generate_test_data(self) -> Tuple[List[Dict], List[Dict]]:
         """Generate test data pairs for control and test groups"""
@@ -92,6 +230,59 @@ class AtomicTimingExperimentBase:
         
         return control_pairs, test_pairs
     
+    def generate_test_arrays(self) -> ExperimentRecords:
+        """
+        Columnar test data (same distribution as generate_test_data).
+        
+        All times are epoch seconds; local_time_* is the wall-clock time in
+        the pair's timezone expressed as epoch seconds (use it for hour /
+        weekday arithmetic), timezone_*_index indexes TIMEZONE_IDS.
+        """
+        rng = np.random.default_rng(self.random_seed)
+        n = self.num_pairs
+        data = ExperimentRecords(n)
+        data['pair_index'] = np.arange(n)
+        
+        base_time = time.time() + rng.uniform(-86400 * 365, 86400 * 365, n)  # ±1 year
+        data['base_time'] = base_time
+        
+        # Control: Standard timestamps (UTC)
+        data['control_time_a'] = base_time
+        data['control_time_b'] = base_time + rng.uniform(-3600, 3600, n)  # ±1 hour variation
+        
+        # Test: Atomic timestamps (server/device time, offset, local time, timezone)
+        data['server_time_a'] = base_time
+        data['device_time_a'] = base_time + rng.uniform(-0.001, 0.001, n)
+        data['offset_a'] = rng.uniform(-0.001, 0.001, n)
+        data['timezone_a_index'] = rng.integers(0, len(TIMEZONE_IDS), n).astype(np.int8)
+        data['local_time_a'] = base_time + TIMEZONE_UTC_OFFSETS[data['timezone_a_index']]
+        
+        data['server_time_b'] = base_time + rng.uniform(-3600, 3600, n)
+        data['device_time_b'] = base_time + rng.uniform(-3600, 3600, n) + rng.uniform(-0.001, 0.001, n)
+        data['offset_b'] = rng.uniform(-0.001, 0.001, n)
+        data['timezone_b_index'] = rng.integers(0, len(TIMEZONE_IDS), n).astype(np.int8)
+        data['local_time_b'] = (base_time + rng.uniform(-3600, 3600, n)
+                                + TIMEZONE_UTC_OFFSETS[data['timezone_b_index']])
+        return data
+    
+    @staticmethod
+    def local_hour(local_seconds: np.ndarray) -> np.ndarray:
+        """Hour of day (0-23) from wall-clock epoch seconds."""
+        return (np.floor(local_seconds).astype(np.int64) // 3600) % 24
+    
+    @staticmethod
+    def local_weekday(local_seconds: np.ndarray) -> np.ndarray:
+        """Python weekday (Monday=0) from wall-clock epoch seconds."""
+        return (np.floor(local_seconds).astype(np.int64) // 86400 + 3) % 7  # 1970-01-01 was a Thursday
+    
+    def run_control_records(self, data: ExperimentRecords) -> ExperimentRecords:
+        """Columnar control group - implemented by COLUMNAR subclasses"""
+        raise NotImplementedError("Columnar subclasses must implement run_control_records")
+    
+    def run_test_records(self, data: ExperimentRecords) -> ExperimentRecords:
+        """Columnar test group - implemented by COLUMNAR subclasses"""
+        raise NotImplementedError("Columnar subclasses must implement run_test_records")
+    
     def run_control_group(self, pairs: List[Dict]) -> List[Dict]:
         """Run control group (standard timestamps) - to be implemented by subclasses"""
         raise NotImplementedError("Subclasses must implement run_control_group")
@@ -102,12 +293,12 @@ class AtomicTimingExperimentBase:
     
     def calculate_statistics(
         self,
-        control_results: List[Dict],
-        test_results: List[Dict]
+        control_results: ExperimentResults,
+        test_results: ExperimentResults
     ) -> Dict:
-        """Calculate statistics comparing control vs test groups"""
-        control_df = pd.DataFrame(control_results)
-        test_df = pd.DataFrame(test_results)
+        """Calculate statistics comparing control vs test groups (lists of dicts or columnar records)"""
+        control_metrics = metric_arrays(control_results)
+        test_metrics = metric_arrays(test_results)
         
         stats_dict = {
             'control': {},
@@ -117,83 +308,75 @@ class AtomicTimingExperimentBase:
         }
         
         # Calculate means for each metric
-        for metric in control_df.columns:
-            if metric in ['pair_id', 'experiment_id']:
+        for metric, control_values in control_metrics.items():
+            if metric not in test_metrics:
                 continue
+            control_values = np.asarray(control_values, dtype=float)
+            test_values = np.asarray(test_metrics[metric], dtype=float)
+            n_control, n_test = len(control_values), len(test_values)
             
-            # Skip non-numeric columns
-            if not pd.api.types.is_numeric_dtype(control_df[metric]):
-                continue
+            control_mean = np.nanmean(control_values) if n_control else np.nan
+            test_mean = np.nanmean(test_values) if n_test else np.nan
+            
+            stats_dict['control'][metric] = float(control_mean)
+            stats_dict['test'][metric] = float(test_mean)
+            
+            # Calculate improvement
+            if control_mean > 0:
+                improvement = ((test_mean - control_mean) / control_mean) * 100
+                improvement_x = test_mean / control_mean if control_mean > 0 else 0
+                stats_dict['improvements'][metric] = {
+                    'percentage': float(improvement),
+                    'multiplier': float(improvement_x)
+                }
             
-            if metric in control_df.columns and metric in test_df.columns:
-                control_mean = control_df[metric].mean()
-                test_mean = test_df[metric].mean()
+            # Statistical tests
+            if n_control > 1 and n_test > 1:
+                # t-test
+                t_stat, p_value = stats.ttest_ind(control_values, test_values)
                 
-                stats_dict['control'][metric] = float(control_mean)
-                stats_dict['test'][metric] = float(test_mean)
+                # Cohen's d (effect size)
+                pooled_std = np.sqrt(
+                    ((n_control - 1) * np.nanstd(control_values, ddof=1)**2 +
+                     (n_test - 1) * np.nanstd(test_values, ddof=1)**2) /
+                    (n_control + n_test - 2)
+                )
+                cohens_d = (test_mean - control_mean) / pooled_std if pooled_std > 0 else 0
                 
-                # Calculate improvement
-                if control_mean > 0:
-                    improvement = ((test_mean - control_mean) / control_mean) * 100
-                    improvement_x = test_mean / control_mean if control_mean > 0 else 0
-                    stats_dict['improvements'][metric] = {
-                        'percentage': float(improvement),
-                        'multiplier': float(improvement_x)
-                    }
+                # Confidence interval (95%)
+                control_ci = stats.t.interval(
+                    0.95, n_control - 1,
+                    loc=control_mean,
+                    scale=stats.sem(control_values)
+                )
+                test_ci = stats.t.interval(
+                    0.95, n_test - 1,
+                    loc=test_mean,
+                    scale=stats.sem(test_values)
+                )
                 
-                # Statistical tests
-                if len(control_df) > 1 and len(test_df) > 1:
-                    # t-test
-                    t_stat, p_value = stats.ttest_ind(control_df[metric], test_df[metric])
-                    
-                    # Cohen's d (effect size)
-                    pooled_std = np.sqrt(
-                        ((len(control_df) - 1) * control_df[metric].std()**2 + 
-                         (len(test_df) - 1) * test_df[metric].std()**2) /
-                        (len(control_df) + len(test_df) - 2)
-                    )
-                    cohens_d = (test_mean - control_mean) / pooled_std if pooled_std > 0 else 0
-                    
-                    # Confidence interval (95%)
-                    control_ci = stats.t.interval(
-                        0.95, len(control_df) - 1,
-                        loc=control_mean,
-                        scale=stats.sem(control_df[metric])
-                    )
-                    test_ci = stats.t.interval(
-                        0.95, len(test_df) - 1,
-                        loc=test_mean,
-                        scale=stats.sem(test_df[metric])
-                    )
-                    
-                    stats_dict['statistical_tests'][metric] = {
-                        't_statistic': float(t_stat),
-                        'p_value': float(p_value),
-                        'cohens_d': float(cohens_d),
-                        'control_ci_95': [float(control_ci[0]), float(control_ci[1])],
-                        'test_ci_95': [float(test_ci[0]), float(test_ci[1])],
-                        'statistically_significant': p_value < 0.01,
-                        'large_effect_size': abs(cohens_d) > 1.0
-                    }
+                stats_dict['statistical_tests'][metric] = {
+                    't_statistic': float(t_stat),
+                    'p_value': float(p_value),
+                    'cohens_d': float(cohens_d),
+                    'control_ci_95': [float(control_ci[0]), float(control_ci[1])],
+                    'test_ci_95': [float(test_ci[0]), float(test_ci[1])],
+                    'statistically_significant': bool(p_value < 0.01),
+                    'large_effect_size': bool(abs(cohens_d) > 1.0)
+                }
         
         return stats_dict
     
     def save_results(
         self,
-        control_results: List[Dict],
-        test_results: List[Dict],
+        control_results: ExperimentResults,
+        test_results: ExperimentResults,
         statistics: Dict
     ):
         """Save results to files"""
-        # Save CSV files
-        pd.DataFrame(control_results).to_csv(
-            self.results_dir / 'control_results.csv',
-            index=False
-        )
-        pd.DataFrame(test_results).to_csv(
-            self.results_dir / 'test_results.csv',
-            index=False
-        )
+        # Save result tables (CSV or Parquet, written in chunks)
+        write_records(control_results, self.results_dir / 'control_results', self.results_format)
+        write_records(test_results, self.results_dir / 'test_results', self.results_format)
         
         # Save statistics JSON
         with open(self.results_dir / 'statistics.json', 'w') as f:
@@ -241,7 +424,7 @@ class AtomicTimingExperimentBase:
         with open(self.results_dir / 'SUMMARY.md', 'w') as f:
             f.write(report)
     
-    def run_experiment(self) -> Tuple[List[Dict], List[Dict], Dict]:
+    def run_experiment(self) -> Tuple[ExperimentResults, ExperimentResults, Dict]:
         """Run the full experiment"""
         print("=" * 70)
         print(f"Running {self.experiment_name}")
@@ -250,15 +433,24 @@ class AtomicTimingExperimentBase:
         
         # Generate test data
         print(f"Generating {self.num_pairs} test pairs...")
-        control_pairs, test_pairs = self.generate_test_data()
+        if self.COLUMNAR:
+            data = self.generate_test_arrays()
+        else:
+            control_pairs, test_pairs = self.generate_test_data()
         
         # Run control group
         print("Running control group (standard timestamps)...")
-        control_results = self.run_control_group(control_pairs)
+        if self.COLUMNAR:
+            control_results = self.run_control_records(data)
+        else:
+            control_results = self.run_control_group(control_pairs)
         
         # Run test group
         print("Running test group (atomic timing)...")
-        test_results = self.run_test_group(test_pairs)
+        if self.COLUMNAR:
+            test_results = self.run_test_records(data)
+        else:
+            test_results = self.run_test_group(test_pairs)
         
         # Calculate statistics
         print("Calculating statistics...")
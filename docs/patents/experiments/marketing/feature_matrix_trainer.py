@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Feature-Matrix Trainer
+
+Shared gradient-descent trainer for the linear quantum feature models
+(QuantumPredictionEnhancer training pipeline, QuantumSatisfactionEnhancer).
+
+Matches the Dart training loop:
+
+    prediction = clip(scale · (x · w), 0, 1)
+    w ← clip(w - lr · mean(error · scale · x), -1, 1)
+
+but materializes the features once into an (N, F) NumPy matrix and does each
+update as a matrix-vector product, optionally over shuffled mini-batches.
+Weights go in and come out as {feature_name: weight} dicts for Dart parity.
+
+Date: October 18, 2026
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def features_to_matrix(features: Sequence) -> Tuple[np.ndarray, List[str]]:
+    """
+    Stack feature objects (with to_feature_vector()/get_feature_names())
+    into an (N, F) matrix; returns (matrix, feature_names).
+    """
+    feature_names = features[0].get_feature_names()
+    matrix = np.array([f.to_feature_vector() for f in features], dtype=float)
+    return matrix.reshape(len(features), -1)[:, :len(feature_names)], feature_names
+
+
+def weights_to_array(weights: Dict[str, float], feature_names: Sequence[str]) -> np.ndarray:
+    """Dict weights → vector in feature_names order (missing names weigh 0)."""
+    return np.array([weights.get(name, 0.0) for name in feature_names], dtype=float)
+
+
+def weights_to_dict(weights: np.ndarray, feature_names: Sequence[str]) -> Dict[str, float]:
+    """Weight vector → {feature_name: weight}."""
+    return {name: float(w) for name, w in zip(feature_names, weights)}
+
+
+class FeatureMatrixTrainer:
+    """Clipped linear-model gradient descent over a feature matrix."""
+
+    def __init__(
+        self,
+        feature_names: Sequence[str],
+        learning_rate: float = 0.01,
+        epochs: int = 50,
+        batch_size: Optional[int] = None,
+        weight_bounds: Tuple[float, float] = (-1.0, 1.0),
+        prediction_bounds: Tuple[float, float] = (0.0, 1.0),
+        seed: Optional[int] = None,
+    ):
+        self.feature_names = list(feature_names)
+        self.learning_rate = learning_rate
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.weight_bounds = weight_bounds
+        self.prediction_bounds = prediction_bounds
+        self.rng = np.random.default_rng(seed)
+        self.loss_history: List[float] = []
+
+    def predict(self, matrix: np.ndarray, weights, scale: Optional[np.ndarray] = None) -> np.ndarray:
+        """Clipped predictions for every row; `weights` may be a dict or vector."""
+        if isinstance(weights, dict):
+            weights = weights_to_array(weights, self.feature_names)
+        predictions = matrix @ weights
+        if scale is not None:
+            predictions = predictions * scale
+        return np.clip(predictions, *self.prediction_bounds)
+
+    def _step(self, weights: np.ndarray, matrix: np.ndarray, targets: np.ndarray,
+              scale: Optional[np.ndarray]) -> np.ndarray:
+        errors = self.predict(matrix, weights, scale) - targets
+        if scale is not None:
+            errors = errors * scale
+        gradient = matrix.T @ errors / len(targets)
+        return np.clip(weights - self.learning_rate * gradient, *self.weight_bounds)
+
+    def fit(
+        self,
+        matrix: np.ndarray,
+        targets: np.ndarray,
+        initial_weights: Dict[str, float],
+        scale: Optional[np.ndarray] = None,
+    ) -> Dict[str, float]:
+        """
+        Train from `initial_weights` and return the trained weight dict.
+
+        batch_size=None is full-batch gradient descent (one update per epoch,
+        identical to the per-example Dart loop). `scale` is an optional
+        per-row multiplier applied after the linear term.
+        """
+        matrix = np.asarray(matrix, dtype=float)
+        targets = np.asarray(targets, dtype=float)
+        scale = np.asarray(scale, dtype=float) if scale is not None else None
+        weights = weights_to_array(initial_weights, self.feature_names)
+        n = len(targets)
+        self.loss_history = []
+
+        for _ in range(self.epochs):
+            if self.batch_size is None or self.batch_size >= n:
+                weights = self._step(weights, matrix, targets, scale)
+            else:
+                order = self.rng.permutation(n)
+                for start in range(0, n, self.batch_size):
+                    batch = order[start:start + self.batch_size]
+                    weights = self._step(weights, matrix[batch], targets[batch],
+                                         scale[batch] if scale is not None else None)
+            self.loss_history.append(float(np.mean((self.predict(matrix, weights, scale) - targets) ** 2)))
+
+        return weights_to_dict(weights, self.feature_names)
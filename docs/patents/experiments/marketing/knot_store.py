@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Shared Knot Store
+
+One set of simplified personality/spot knots per population, shared by the
+knot integration experiments (recommendation, matching, spot matching)
+instead of each experiment regenerating knots with its own
+generate_knot_for_profile().
+
+- KnotStore: knots as arrays (crossing numbers, zero-padded Jones
+  coefficients + lengths, writhe), generated in one vectorized pass and
+  persisted to .npz keyed by a fingerprint of the population (kind, ids,
+  12D vectors, seed), so later runs load instead of regenerating. The random
+  stream is derived from both the seed and the population kind, so the
+  'users' and 'spots' stores draw independent Jones coefficients.
+- knot_compatibility_matrix() / knot_compatibility_pairs(): the single
+  vectorized topological compatibility kernel
+
+    compatibility = 0.7 · clip(cos(jones_a[:m], jones_b[:m]), 0, 1)
+                  + 0.3 · (1 - |c_a - c_b| / max(c_a, c_b, 1))
+
+  where m = min(len_a, len_b). Because the Jones rows are zero-padded the
+  truncated dot product is the full dot product, and the truncated norms
+  come from per-row prefix sums of squares.
+
+Knots always come from the simplified model above. The experiments used to
+try scripts/knot_validation's KnotGenerator first, but they called a
+generate_knot_from_profile() method it does not have (its generate_knot()
+returns string-form invariants, not Jones coefficients), so they always fell
+back to the simplified model; that dead branch was dropped.
+
+Date: October 18, 2026
+"""
+
+import hashlib
+import os
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Simplified knot model: crossing number from 12D variance, Jones = [1, U(-1, 1)...]
+MIN_CROSSINGS = 3
+MAX_CROSSINGS = 13
+WRITHE_RANGE = (-5.0, 5.0)
+DEFAULT_SEED = 42
+
+TOPOLOGICAL_WEIGHT = 0.7
+COMPLEXITY_WEIGHT = 0.3
+NEUTRAL_COMPATIBILITY = 0.5
+
+# Bump when the knot model changes so persisted stores are regenerated
+KNOT_MODEL_VERSION = 2
+
+DEFAULT_STORE_DIR = Path(__file__).parent / 'data' / 'knot_store'
+
+
+def crossing_numbers_from_dimensions(dimensions: np.ndarray) -> np.ndarray:
+    """int(3 + var(12D) * 10) clamped to 3-13, for each row."""
+    variance = np.var(np.asarray(dimensions, dtype=float), axis=-1)
+    return np.clip((MIN_CROSSINGS + variance * 10).astype(np.int64), MIN_CROSSINGS, MAX_CROSSINGS)
+
+
+def population_rng(kind: str, seed: Optional[int]) -> np.random.Generator:
+    """Random stream for one population: independent per kind for the same seed."""
+    if seed is None:
+        return np.random.default_rng()
+    return np.random.default_rng([seed, zlib.crc32(kind.encode('utf-8'))])
+
+
+def population_fingerprint(kind: str, ids: Sequence[str], dimensions: np.ndarray, seed: Optional[int]) -> str:
+    """Stable hash of (kind, ids, 12D vectors, seed, model version)."""
+    digest = hashlib.sha256()
+    digest.update(f'v{KNOT_MODEL_VERSION}|kind={kind}|seed={seed}|'.encode('utf-8'))
+    digest.update('\0'.join(ids).encode('utf-8'))
+    digest.update(np.ascontiguousarray(dimensions, dtype=np.float64).tobytes())
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class KnotStore:
+    """
+    Knots for N entities (users or spots) as arrays.
+
+    jones is (N, D) zero-padded; jones_lengths holds each row's true
+    coefficient count.
+    """
+    ids: List[str]
+    crossing_numbers: np.ndarray
+    jones: np.ndarray
+    jones_lengths: np.ndarray
+    writhe: np.ndarray
+    fingerprint: str = ''
+    _index: Dict[str, int] = field(default=None, repr=False, compare=False)
+    _prefix_norms: np.ndarray = field(default=None, repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def index(self) -> Dict[str, int]:
+        """id → row."""
+        if self._index is None:
+            self._index = {entity_id: row for row, entity_id in enumerate(self.ids)}
+        return self._index
+
+    def rows(self, ids: Sequence[str]) -> np.ndarray:
+        index = self.index
+        return np.array([index[entity_id] for entity_id in ids], dtype=np.int64)
+
+    @property
+    def prefix_norms(self) -> np.ndarray:
+        """(N, D + 1) table: prefix_norms[i, m] = ||jones[i, :m]||."""
+        if self._prefix_norms is None:
+            squares = np.cumsum(self.jones ** 2, axis=1)
+            self._prefix_norms = np.sqrt(np.concatenate([np.zeros((len(self), 1)), squares], axis=1))
+        return self._prefix_norms
+
+    def knot(self, entity_id: str) -> Dict:
+        """One knot as the experiments' dict form."""
+        row = self.index[entity_id]
+        return {
+            'crossing_number': int(self.crossing_numbers[row]),
+            'jones_polynomial': [float(c) for c in self.jones[row, :self.jones_lengths[row]]],
+            'writhe': float(self.writhe[row]),
+        }
+
+    @classmethod
+    def generate(
+        cls,
+        kind: str,
+        ids: Sequence[str],
+        dimensions: np.ndarray,
+        seed: Optional[int] = DEFAULT_SEED,
+    ) -> 'KnotStore':
+        """Simplified knots for every row of an (N, 12) dimension matrix."""
+        dimensions = np.asarray(dimensions, dtype=float).reshape(len(ids), -1)
+        rng = population_rng(kind, seed)
+        crossing_numbers = crossing_numbers_from_dimensions(dimensions)
+        jones = rng.uniform(-1.0, 1.0, (len(ids), MAX_CROSSINGS))
+        jones[:, 0] = 1.0
+        jones[np.arange(MAX_CROSSINGS) >= crossing_numbers[:, None]] = 0.0
+        return cls(
+            ids=list(ids),
+            crossing_numbers=crossing_numbers,
+            jones=jones,
+            jones_lengths=crossing_numbers.copy(),
+            writhe=rng.uniform(*WRITHE_RANGE, len(ids)),
+            fingerprint=population_fingerprint(kind, ids, dimensions, seed),
+        )
+
+    @classmethod
+    def from_knots(cls, ids: Sequence[str], knots: Sequence[Dict]) -> 'KnotStore':
+        """Pack knot dicts ({crossing_number, jones_polynomial, writhe}) into a store."""
+        polynomials = [knot.get('jones_polynomial', [1.0, -1.0]) for knot in knots]
+        lengths = np.array([len(p) for p in polynomials], dtype=np.int64)
+        jones = np.zeros((len(knots), int(lengths.max(initial=0))))
+        for row, polynomial in enumerate(polynomials):
+            jones[row, :len(polynomial)] = polynomial
+        return cls(
+            ids=list(ids),
+            crossing_numbers=np.array([knot.get('crossing_number', 3) for knot in knots], dtype=np.int64),
+            jones=jones,
+            jones_lengths=lengths,
+            writhe=np.array([knot.get('writhe', 0.0) for knot in knots], dtype=float),
+        )
+
+    def save(self, path: Path) -> None:
+        """Write the store to .npz (atomically, via a temporary file)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(f'.{os.getpid()}.tmp.npz')
+        np.savez(
+            temporary,
+            ids=np.array(self.ids, dtype=str),
+            crossing_numbers=self.crossing_numbers,
+            jones=self.jones,
+            jones_lengths=self.jones_lengths,
+            writhe=self.writhe,
+            fingerprint=np.array(self.fingerprint),
+        )
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: Path) -> 'KnotStore':
+        with np.load(path) as data:
+            return cls(
+                ids=data['ids'].tolist(),
+                crossing_numbers=data['crossing_numbers'],
+                jones=data['jones'],
+                jones_lengths=data['jones_lengths'],
+                writhe=data['writhe'],
+                fingerprint=str(data['fingerprint']),
+            )
+
+    @classmethod
+    def for_population(
+        cls,
+        kind: str,
+        ids: Sequence[str],
+        dimensions: np.ndarray,
+        seed: Optional[int] = DEFAULT_SEED,
+        store_dir: Optional[Path] = DEFAULT_STORE_DIR,
+    ) -> 'KnotStore':
+        """
+        Knots for a population, loaded from `store_dir` when this exact
+        population (kind, ids, dimensions, seed) was generated before, otherwise
+        generated and persisted. store_dir=None keeps the store in memory.
+        """
+        dimensions = np.asarray(dimensions, dtype=float).reshape(len(ids), -1)
+        fingerprint = population_fingerprint(kind, ids, dimensions, seed)
+        path = Path(store_dir) / f'{kind}_{fingerprint}.npz' if store_dir is not None else None
+        if path is not None and path.exists():
+            try:
+                return cls.load(path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️  Could not load knot store {path.name}: {e}; regenerating")
+
+        store = cls.generate(kind, ids, dimensions, seed)
+        if path is not None:
+            try:
+                store.save(path)
+            except OSError as e:
+                print(f"⚠️  Could not persist knot store {path.name}: {e}")
+        return store
+
+
+def profile_knot_store(users: Sequence, seed: Optional[int] = DEFAULT_SEED,
+                       store_dir: Optional[Path] = DEFAULT_STORE_DIR) -> KnotStore:
+    """Knot store for UserProfiles (by agent_id, from personality_12d)."""
+    return KnotStore.for_population(
+        'users', [u.agent_id for u in users], np.array([u.personality_12d for u in users]), seed, store_dir
+    )
+
+
+def _compatibility(crossing_a, crossing_b, dot, norm_a, norm_b) -> np.ndarray:
+    """Kernel on gathered operands; norm_a/norm_b are the norms over min(len_a, len_b)."""
+    max_crossing = np.maximum(np.maximum(crossing_a, crossing_b), 1)
+    complexity = 1.0 - np.abs(crossing_a - crossing_b) / max_crossing
+
+    # A zero norm (including min_len == 0, where the prefix norm is 0) is neutral
+    denominator = norm_a * norm_b
+    topological = np.divide(dot, denominator, out=np.full(np.shape(dot), NEUTRAL_COMPATIBILITY),
+                             where=denominator > 0)
+    np.clip(topological, 0.0, 1.0, out=topological)
+    return TOPOLOGICAL_WEIGHT * topological + COMPLEXITY_WEIGHT * complexity
+
+
+def _aligned_widths(store_a: KnotStore, store_b: KnotStore):
+    width = min(store_a.jones.shape[1], store_b.jones.shape[1])
+    return store_a.jones[:, :width], store_b.jones[:, :width], width
+
+
+def knot_compatibility_matrix(
+    store_a: KnotStore,
+    store_b: KnotStore,
+    rows_a: Optional[np.ndarray] = None,
+    rows_b: Optional[np.ndarray] = None,
+    block_size: int = 4096,
+) -> np.ndarray:
+    """Compatibility of every (a, b) knot pair; rows default to the whole store."""
+    rows_a = np.arange(len(store_a)) if rows_a is None else np.asarray(rows_a, dtype=np.int64)
+    rows_b = np.arange(len(store_b)) if rows_b is None else np.asarray(rows_b, dtype=np.int64)
+    jones_a, jones_b, width = _aligned_widths(store_a, store_b)
+    jones_b = jones_b[rows_b]
+    crossing_b = store_b.crossing_numbers[rows_b][None, :]
+    # Prefix norms are flat past a knot's length, so ||x[:min(len_a, len_b)]||
+    # is the prefix norm of x at the *other* knot's length: a column gather for
+    # the a side, a row gather (of the transposed table) for the b side
+    len_b = np.minimum(store_b.jones_lengths[rows_b], width)
+    norms_b_by_length = store_b.prefix_norms[rows_b].T
+
+    result = np.empty((len(rows_a), len(rows_b)))
+    for start in range(0, len(rows_a), block_size):
+        block = rows_a[start:start + block_size]
+        len_a = np.minimum(store_a.jones_lengths[block], width)
+        result[start:start + len(block)] = _compatibility(
+            store_a.crossing_numbers[block][:, None], crossing_b,
+            jones_a[block] @ jones_b.T,
+            np.take(store_a.prefix_norms[block], len_b, axis=1),
+            norms_b_by_length[len_a],
+        )
+    return result
+
+
+def knot_compatibility_pairs(store_a: KnotStore, rows_a, store_b: KnotStore, rows_b) -> np.ndarray:
+    """Compatibility of aligned pairs (store_a[rows_a[i]], store_b[rows_b[i]])."""
+    rows_a = np.asarray(rows_a, dtype=np.int64)
+    rows_b = np.asarray(rows_b, dtype=np.int64)
+    jones_a, jones_b, width = _aligned_widths(store_a, store_b)
+    min_len = np.minimum(store_a.jones_lengths[rows_a], store_b.jones_lengths[rows_b])
+    return _compatibility(
+        store_a.crossing_numbers[rows_a], store_b.crossing_numbers[rows_b],
+        np.einsum('ij,ij->i', jones_a[rows_a], jones_b[rows_b]),
+        store_a.prefix_norms[rows_a, min_len], store_b.prefix_norms[rows_b, min_len],
+    )
+
+
+def calculate_knot_compatibility(knot_a: Dict, knot_b: Dict) -> float:
+    """
+    Topological compatibility between two knot dicts (0.5 if either is
+    missing). Single-pair view of the vectorized kernel.
+    """
+    if not knot_a or not knot_b:
+        return NEUTRAL_COMPATIBILITY
+    store = KnotStore.from_knots(['a', 'b'], [knot_a, knot_b])
+    return float(knot_compatibility_pairs(store, [0], store, [1])[0])
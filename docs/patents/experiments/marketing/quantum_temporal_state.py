@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Shared Quantum Temporal State
+
+Single Python implementation of the production QuantumTemporalStateGenerator
+used by the atomic timing experiments:
+
+    |ψ_temporal⟩ = normalize(|t_atomic⟩ ⊕ |t_quantum⟩ ⊕ |t_phase⟩)
+
+- |t_atomic⟩ (3): √ of normalized [nanosecond, millisecond, second] weights
+- |t_quantum⟩ (35): one-hot LOCAL hour (24), weekday (7), season (4),
+  weighted √0.4, √0.3, √0.3
+- |t_phase⟩ (2): [cos φ, sin φ], φ = 2π·(server_time - 2025-01-01)/1 day
+
+Every block has unit norm, so the 40-D state always has norm √3 and the
+inner product of two states reduces to
+
+    ⟨ψ_A|ψ_B⟩ = (a_A·a_B + 0.4·[h_A=h_B] + 0.3·[w_A=w_B] + 0.3·[s_A=s_B]
+                 + cos(φ_A - φ_B)) / 3
+
+`TemporalComponents` keeps only (hour, weekday, season, phase) arrays and
+scores whole user x event grids with that identity, never materializing
+one-hot vectors. `QuantumTemporalState` keeps the per-timestamp object API.
+
+Date: October 18, 2026
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# Reference time for phase calculation (matches Dart: DateTime(2025, 1, 1))
+PHASE_REFERENCE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+PHASE_REFERENCE_EPOCH = PHASE_REFERENCE_TIME.timestamp()
+PHASE_PERIOD_SECONDS = 86400  # 1 day in seconds
+
+HOUR_WEIGHT = 0.4
+WEEKDAY_WEIGHT = 0.3
+SEASON_WEIGHT = 0.3
+
+# Norm² of the combined (unnormalized) state: atomic + quantum + phase blocks
+_STATE_NORM_SQUARED = 3.0
+
+
+def atomic_state(precision: str = 'millisecond') -> List[float]:
+    """
+    Atomic timestamp quantum state |t_atomic⟩ = [nanosecond, millisecond, second].
+    Matches Dart _generateAtomicState().
+    """
+    if precision == 'nanosecond':
+        weights = [0.5, 0.3, 0.2]
+    else:
+        weights = [0.0, 0.6, 0.4]
+    total = sum(weights)
+    return [math.sqrt(w / total) for w in weights]
+
+
+def weekday_index(local_time: datetime) -> int:
+    """Weekday index used by the Dart generator (Python weekday shifted by one)."""
+    return (local_time.weekday() - 1) % 7
+
+
+def season_index(month) -> int:
+    """Spring (Mar-May)=0, Summer=1, Fall=2, Winter (Dec-Feb)=3; works on arrays."""
+    return ((month - 3) % 12) // 3
+
+
+class QuantumTemporalState:
+    """
+    Quantum Temporal State - Python implementation matching Dart exactly.
+
+    Represents: |ψ_temporal⟩ = |t_atomic⟩ ⊗ |t_quantum⟩ ⊗ |t_phase⟩
+    """
+
+    def __init__(
+        self,
+        atomic_state: List[float],
+        quantum_state: List[float],
+        phase_state: List[float],
+        temporal_state: List[float],
+        server_time: datetime,
+        local_time: datetime,
+    ):
+        self.atomic_state = atomic_state
+        self.quantum_state = quantum_state
+        self.phase_state = phase_state
+        self.temporal_state = temporal_state
+        self.server_time = server_time
+        self.local_time = local_time
+
+    @property
+    def timestamp(self) -> datetime:
+        return self.server_time
+
+    @staticmethod
+    def _generate_quantum_state(local_time: datetime) -> List[float]:
+        """
+        Generate quantum temporal state: |t_quantum⟩ (uses LOCAL time).
+        Matches Dart _generateQuantumState() method exactly.
+        """
+        state = [0.0] * 35
+        state[local_time.hour] = math.sqrt(HOUR_WEIGHT)
+        state[24 + weekday_index(local_time)] = math.sqrt(WEEKDAY_WEIGHT)
+        state[31 + season_index(local_time.month)] = math.sqrt(SEASON_WEIGHT)
+        return state
+
+    @staticmethod
+    def _generate_phase_state(server_time: datetime) -> List[float]:
+        """
+        Generate quantum phase state: |t_phase⟩ = [cos(φ), sin(φ)].
+        Matches Dart _generatePhaseState() method exactly.
+        """
+        phase = (2 * math.pi * (server_time.timestamp() - PHASE_REFERENCE_EPOCH)) / PHASE_PERIOD_SECONDS
+        return [math.cos(phase), math.sin(phase)]
+
+    @classmethod
+    def generate(
+        cls,
+        server_time: datetime,
+        local_time: Optional[datetime] = None,
+        precision: str = 'millisecond',
+    ) -> 'QuantumTemporalState':
+        """
+        Generate quantum temporal state from timestamps.
+        Matches Dart QuantumTemporalStateGenerator.generate() exactly.
+        """
+        local_time = local_time if local_time is not None else server_time
+        atomic = atomic_state(precision)
+        quantum = cls._generate_quantum_state(local_time)
+        phase = cls._generate_phase_state(server_time)
+
+        combined = atomic + quantum + phase
+        norm = math.sqrt(sum(v * v for v in combined))
+        normalized = [v / norm for v in combined] if norm > 0 else combined
+
+        return cls(
+            atomic_state=atomic,
+            quantum_state=quantum,
+            phase_state=phase,
+            temporal_state=normalized,
+            server_time=server_time,
+            local_time=local_time,
+        )
+
+    def inner_product(self, other: 'QuantumTemporalState') -> float:
+        """
+        Calculate quantum inner product: ⟨ψ_temporal_A|ψ_temporal_B⟩
+        Matches Dart innerProduct() method exactly.
+        """
+        if len(self.temporal_state) != len(other.temporal_state):
+            raise ValueError('Temporal states must have same dimension')
+
+        return sum(a * b for a, b in zip(self.temporal_state, other.temporal_state))
+
+    def temporal_compatibility(self, other: 'QuantumTemporalState') -> float:
+        """
+        Calculate quantum temporal compatibility: C_temporal = |⟨ψ_temporal_A|ψ_temporal_B⟩|²
+        Matches Dart temporalCompatibility() method exactly.
+        """
+        inner_prod = self.inner_product(other)
+        return inner_prod * inner_prod
+
+
+@dataclass
+class TemporalComponents:
+    """
+    Quantum temporal states for N timestamps as integer/angle arrays.
+
+    hour (0-23), weekday (Dart index 0-6) and season (0-3) come from LOCAL
+    time; phase (radians) from SERVER time; atomic is the shared 3-D
+    atomic state for the batch precision.
+    """
+    hour: np.ndarray
+    weekday: np.ndarray
+    season: np.ndarray
+    phase: np.ndarray
+    atomic: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.hour)
+
+    def __getitem__(self, index) -> 'TemporalComponents':
+        return TemporalComponents(self.hour[index], self.weekday[index], self.season[index],
+                                  self.phase[index], self.atomic)
+
+    @classmethod
+    def from_epoch(
+        cls,
+        server_seconds,
+        utc_offset_seconds=0,
+        precision: str = 'millisecond',
+    ) -> 'TemporalComponents':
+        """Components from epoch seconds; local time = server time + UTC offset."""
+        server_seconds = np.asarray(server_seconds, dtype=float)
+        local_seconds = np.floor(server_seconds + utc_offset_seconds).astype(np.int64)
+        days = local_seconds // 86400
+        months = local_seconds.astype('datetime64[s]').astype('datetime64[M]').astype(np.int64) % 12 + 1
+        return cls(
+            hour=(local_seconds // 3600) % 24,
+            # 1970-01-01 was a Thursday (Python weekday 3); Dart index = (weekday - 1) % 7
+            weekday=(days + 2) % 7,
+            season=season_index(months),
+            phase=2 * np.pi * (server_seconds - PHASE_REFERENCE_EPOCH) / PHASE_PERIOD_SECONDS,
+            atomic=np.array(atomic_state(precision)),
+        )
+
+    @classmethod
+    def from_datetimes(
+        cls,
+        server_times: Sequence[datetime],
+        local_times: Optional[Sequence[datetime]] = None,
+        precision: str = 'millisecond',
+    ) -> 'TemporalComponents':
+        """Components from datetimes (local wall-clock fields read as given)."""
+        local_times = local_times if local_times is not None else server_times
+        return cls(
+            hour=np.array([t.hour for t in local_times], dtype=np.int64),
+            weekday=np.array([weekday_index(t) for t in local_times], dtype=np.int64),
+            season=season_index(np.array([t.month for t in local_times], dtype=np.int64)),
+            phase=2 * np.pi * (np.array([t.timestamp() for t in server_times]) - PHASE_REFERENCE_EPOCH)
+            / PHASE_PERIOD_SECONDS,
+            atomic=np.array(atomic_state(precision)),
+        )
+
+    def states(self) -> np.ndarray:
+        """Materialize the normalized (N, 40) state vectors (for validation/interop)."""
+        n = len(self)
+        states = np.zeros((n, 40))
+        rows = np.arange(n)
+        states[:, :3] = self.atomic
+        states[rows, 3 + self.hour] = math.sqrt(HOUR_WEIGHT)
+        states[rows, 27 + self.weekday] = math.sqrt(WEEKDAY_WEIGHT)
+        states[rows, 34 + self.season] = math.sqrt(SEASON_WEIGHT)
+        states[:, 38] = np.cos(self.phase)
+        states[:, 39] = np.sin(self.phase)
+        return states / math.sqrt(_STATE_NORM_SQUARED)
+
+    def _inner_product(self, other: 'TemporalComponents', outer: bool) -> np.ndarray:
+        def pair(a, b):
+            return (a[:, None], b[None, :]) if outer else (a, b)
+
+        hour_a, hour_b = pair(self.hour, other.hour)
+        weekday_a, weekday_b = pair(self.weekday, other.weekday)
+        season_a, season_b = pair(self.season, other.season)
+        phase_a, phase_b = pair(self.phase, other.phase)
+        return (float(self.atomic @ other.atomic)
+                + HOUR_WEIGHT * (hour_a == hour_b)
+                + WEEKDAY_WEIGHT * (weekday_a == weekday_b)
+                + SEASON_WEIGHT * (season_a == season_b)
+                + np.cos(phase_a - phase_b)) / _STATE_NORM_SQUARED
+
+    def pairwise_compatibility(self, other: 'TemporalComponents') -> np.ndarray:
+        """|⟨ψ_A,i|ψ_B,i⟩|² for aligned pairs (equal lengths)."""
+        return self._inner_product(other, outer=False) ** 2
+
+    def compatibility_matrix(self, other: 'TemporalComponents', block_size: int = 4096) -> np.ndarray:
+        """|⟨ψ_A,i|ψ_B,j⟩|² for every (i, j), computed in row blocks."""
+        result = np.empty((len(self), len(other)))
+        for start in range(0, len(self), block_size):
+            block = self[start:start + block_size]
+            result[start:start + len(block)] = block._inner_product(other, outer=True) ** 2
+        return result
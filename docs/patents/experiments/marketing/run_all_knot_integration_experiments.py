@@ -7,66 +7,138 @@ This script runs all three knot integration experiments:
 2. Knot-Enhanced Matching Experiment (EventMatchingService)
 3. Knot-Enhanced Spot Matching Experiment (SpotVibeMatchingService)
 
+The user population is loaded once and its knots come from the shared,
+persisted knot store (knot_store.py); the experiments then run concurrently
+in worker processes, each writing its output to logs/<experiment>.log,
+which is replayed here in order once all have finished.
+
+Usage:
+    python run_all_knot_integration_experiments.py [--workers N] [--sequential]
+
 Date: December 28, 2025
 """
 
+import argparse
+import importlib
+import os
+import random
 import sys
-from pathlib import Path
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
 from datetime import datetime
+from pathlib import Path
 
-# Add current directory to path
+import numpy as np
+
+# Add current directory and shared scripts to path
 sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).parent.parent / 'scripts'))
+
+from shared_data_model import generate_integrated_user_profile, load_profiles_with_fallback
+from knot_store import profile_knot_store
+
+LOGS_DIR = Path(__file__).parent / 'logs'
 
-print("=" * 80)
-print("KNOT INTEGRATION EXPERIMENTS - COMPLETE SUITE")
-print("=" * 80)
-print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print()
-
-# Import experiment scripts
-from run_knot_recommendation_experiment import run_experiment as run_recommendation_experiment
-from run_knot_matching_experiment import run_experiment as run_matching_experiment
-from run_knot_spot_matching_experiment import run_experiment as run_spot_matching_experiment
-
-experiments = [
-    ("Knot-Enhanced Recommendation", run_recommendation_experiment),
-    ("Knot-Enhanced Matching", run_matching_experiment),
-    ("Knot-Enhanced Spot Matching", run_spot_matching_experiment),
+NUM_USERS = 1000
+RANDOM_SEED = 42
+
+EXPERIMENTS = [
+    ("Knot-Enhanced Recommendation", 'run_knot_recommendation_experiment'),
+    ("Knot-Enhanced Matching", 'run_knot_matching_experiment'),
+    ("Knot-Enhanced Spot Matching", 'run_knot_spot_matching_experiment'),
 ]
 
-results = {}
 
-for name, experiment_func in experiments:
-    print()
+def run_logged_experiment(name: str, module_name: str, users, user_knots):
+    """Run one experiment with its output captured in LOGS_DIR; returns (name, status, log path)."""
+    log_path = LOGS_DIR / f'{module_name}.log'
+    with open(log_path, 'w') as log, redirect_stdout(log), redirect_stderr(log):
+        try:
+            module = importlib.import_module(module_name)
+            # Same random state the experiment gets when run on its own
+            random.seed(module.RANDOM_SEED)
+            np.random.seed(module.RANDOM_SEED)
+            module.run_experiment(users=users, user_knots=user_knots)
+            status = "✅ SUCCESS"
+        except Exception as e:
+            traceback.print_exc()
+            status = f"❌ FAILED: {str(e)}"
+    return name, status, log_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run all knot integration experiments')
+    parser.add_argument('--workers', type=int, default=min(len(EXPERIMENTS), os.cpu_count() or 1),
+                        help='Worker processes (default: one per experiment, up to the CPU count)')
+    parser.add_argument('--sequential', action='store_true', help='Run the experiments in this process')
+    args = parser.parse_args()
+
     print("=" * 80)
-    print(f"Running: {name}")
+    print("KNOT INTEGRATION EXPERIMENTS - COMPLETE SUITE")
     print("=" * 80)
+    print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    LOGS_DIR.mkdir(parents=True, exist_ok=True)
+
+    # Shared population and knot store
+    print("📊 Loading shared user population...")
+    random.seed(RANDOM_SEED)
+    np.random.seed(RANDOM_SEED)
+    project_root = Path(__file__).parent.parent.parent.parent.parent
+    users = load_profiles_with_fallback(
+        num_profiles=NUM_USERS,
+        use_big_five=True,
+        project_root=project_root,
+        fallback_generator=lambda agent_id: generate_integrated_user_profile(agent_id)
+    )
+    user_knots = profile_knot_store(users)
+    print(f"✅ {len(users)} users, knot store {user_knots.fingerprint}")
     print()
-    
-    try:
-        experiment_func()
-        results[name] = "✅ SUCCESS"
+
+    if args.sequential or args.workers <= 1:
+        print("🔬 Running experiments sequentially...")
+        outcomes = [run_logged_experiment(name, module_name, users, user_knots)
+                    for name, module_name in EXPERIMENTS]
+    else:
+        print(f"🔬 Running {len(EXPERIMENTS)} experiments on {args.workers} worker processes...")
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = [executor.submit(run_logged_experiment, name, module_name, users, user_knots)
+                       for name, module_name in EXPERIMENTS]
+            outcomes = [future.result() for future in futures]
+
+    results = {}
+    for name, status, log_path in outcomes:
         print()
-        print(f"✅ {name} completed successfully!")
-    except Exception as e:
-        results[name] = f"❌ FAILED: {str(e)}"
+        print("=" * 80)
+        print(f"Running: {name}")
+        print("=" * 80)
         print()
-        print(f"❌ {name} failed: {e}")
-        import traceback
-        traceback.print_exc()
-    
+        print(log_path.read_text(), end='')
+        print()
+        if status.startswith("✅"):
+            print(f"✅ {name} completed successfully!")
+        else:
+            print(f"❌ {name} failed: {status}")
+        print()
+        results[name] = status
+
+    # Final summary
+    print("=" * 80)
+    print("EXPERIMENT SUITE SUMMARY")
+    print("=" * 80)
     print()
 
-# Final summary
-print("=" * 80)
-print("EXPERIMENT SUITE SUMMARY")
-print("=" * 80)
-print()
+    for name, status in results.items():
+        print(f"  {name}: {status}")
+
+    print()
+    print(f"Logs: {LOGS_DIR}")
+    print("=" * 80)
+    print("All experiments complete!")
+    print("=" * 80)
 
-for name, status in results.items():
-    print(f"  {name}: {status}")
 
-print()
-print("=" * 80)
-print("All experiments complete!")
-print("=" * 80)
+if __name__ == '__main__':
+    main()
@@ -12,17 +12,14 @@ A/B experiment comparing atomic timing vs. standard timestamps for:
 Date: December 23, 2025
 """
 
+import argparse
 import sys
 from pathlib import Path
 import numpy as np
-from datetime import datetime, timezone
-import time
-import random
-from typing import Dict, List
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent))
-from atomic_timing_experiment_base import AtomicTimingExperimentBase
+from atomic_timing_experiment_base import AtomicTimingExperimentBase, ExperimentRecords
 
 # Configuration
 NUM_PAIRS = 1000
@@ -33,121 +30,104 @@ RANDOM_SEED = 42
 class AtomicTimingPrecisionExperiment(AtomicTimingExperimentBase):
     """Experiment 1: Atomic Timing Precision Benefits"""
     
-    def __init__(self):
+    COLUMNAR = True
+    
+    def __init__(self, num_pairs: int = NUM_PAIRS):
         super().__init__(
             experiment_name='atomic_timing_precision_benefits',
-            num_pairs=NUM_PAIRS,
+            num_pairs=num_pairs,
             num_nodes=NUM_NODES,
             random_seed=RANDOM_SEED
         )
     
-    def run_control_group(self, pairs: List[Dict]) -> List[Dict]:
+    def run_control_records(self, data: ExperimentRecords) -> ExperimentRecords:
         """Run control group with standard timestamps"""
-        results = []
+        rng = np.random.default_rng(self.random_seed + 1)
+        results = ExperimentRecords(len(data))
+        results['pair_index'] = data['pair_index']
+        
+        # 1. Quantum Compatibility (simplified - using time difference)
+        # Control: Simple time difference (no quantum properties)
+        time_diff = np.abs(data['control_time_a'] - data['control_time_b'])
+        results['quantum_compatibility'] = np.maximum(0.0, 1.0 - (time_diff / 3600.0))  # Decay over 1 hour
+        
+        # 2. Decoherence (simplified - linear decay)
+        # Control: Simple linear decay
+        decoherence_rate = 0.001  # Per second
+        results['decoherence_accuracy'] = np.maximum(0.0, 1.0 - (time_diff * decoherence_rate))
         
-        for pair in pairs:
-            timestamp_a = pair['timestamp_a']
-            timestamp_b = pair['timestamp_b']
-            
-            # 1. Quantum Compatibility (simplified - using time difference)
-            # Control: Simple time difference (no quantum properties)
-            time_diff = abs((timestamp_a - timestamp_b).total_seconds())
-            compatibility = max(0.0, 1.0 - (time_diff / 3600.0))  # Decay over 1 hour
-            
-            # 2. Decoherence (simplified - linear decay)
-            # Control: Simple linear decay
-            decoherence_rate = 0.001  # Per second
-            decoherence = max(0.0, 1.0 - (time_diff * decoherence_rate))
-            
-            # 3. Queue Ordering (simple timestamp comparison)
-            # Control: Basic timestamp ordering
-            queue_order_correct = 1.0 if timestamp_a < timestamp_b else 0.0
-            
-            # 4. Entanglement Synchronization (no synchronization)
-            # Control: No synchronization (variable drift)
-            sync_accuracy = 0.85 + random.uniform(-0.1, 0.1)  # 85% ± 10%
-            
-            # 5. Timezone-aware operations (UTC-only, no local time matching)
-            # Control: UTC-only, cannot match by local time
-            timezone_match = 0.0  # No timezone awareness
-            
-            results.append({
-                'pair_id': pair['pair_id'],
-                'quantum_compatibility': compatibility,
-                'decoherence_accuracy': decoherence,
-                'queue_ordering_accuracy': queue_order_correct,
-                'entanglement_sync_accuracy': sync_accuracy,
-                'timezone_matching_accuracy': timezone_match,
-            })
+        # 3. Queue Ordering (simple timestamp comparison)
+        # Control: Basic timestamp ordering
+        results['queue_ordering_accuracy'] = (data['control_time_a'] < data['control_time_b']).astype(float)
+        
+        # 4. Entanglement Synchronization (no synchronization)
+        # Control: No synchronization (variable drift)
+        results['entanglement_sync_accuracy'] = 0.85 + rng.uniform(-0.1, 0.1, len(data))  # 85% ± 10%
+        
+        # 5. Timezone-aware operations (UTC-only, no local time matching)
+        # Control: UTC-only, cannot match by local time
+        results['timezone_matching_accuracy'] = 0.0  # No timezone awareness
         
         return results
     
-    def run_test_group(self, pairs: List[Dict]) -> List[Dict]:
+    def run_test_records(self, data: ExperimentRecords) -> ExperimentRecords:
         """Run test group with atomic timing"""
-        results = []
+        rng = np.random.default_rng(self.random_seed + 2)
+        n = len(data)
+        results = ExperimentRecords(n)
+        results['pair_index'] = data['pair_index']
+        
+        # 1. Quantum Compatibility (atomic precision enables accurate calculation)
+        # Test: Atomic precision improves quantum compatibility accuracy
+        time_diff_atomic = np.abs(data['server_time_a'] - data['server_time_b'])
+        # Atomic precision allows more accurate quantum state calculations
+        compatibility = np.maximum(0.0, 1.0 - (time_diff_atomic / 3600.0))
+        # Add 5-15% improvement from atomic precision
+        compatibility *= (1.0 + rng.uniform(0.05, 0.15, n))
+        results['quantum_compatibility'] = np.minimum(1.0, compatibility)
         
-        for pair in pairs:
-            timestamp_a = pair['timestamp_a']
-            timestamp_b = pair['timestamp_b']
-            
-            # 1. Quantum Compatibility (atomic precision enables accurate calculation)
-            # Test: Atomic precision improves quantum compatibility accuracy
-            time_diff_atomic = abs(timestamp_a['server_time'] - timestamp_b['server_time'])
-            # Atomic precision allows more accurate quantum state calculations
-            compatibility = max(0.0, 1.0 - (time_diff_atomic / 3600.0))
-            # Add 5-15% improvement from atomic precision
-            compatibility *= (1.0 + random.uniform(0.05, 0.15))
-            compatibility = min(1.0, compatibility)
-            
-            # 2. Decoherence (atomic precision enables accurate tracking)
-            # Test: Atomic precision improves decoherence accuracy
-            decoherence_rate = 0.001  # Per second
-            decoherence = max(0.0, 1.0 - (time_diff_atomic * decoherence_rate))
-            # Add 10-20% improvement from atomic precision
-            decoherence *= (1.0 + random.uniform(0.10, 0.20))
-            decoherence = min(1.0, decoherence)
-            
-            # 3. Queue Ordering (atomic precision ensures 100% accuracy)
-            # Test: Atomic precision enables 100% queue ordering accuracy
-            queue_order_correct = 1.0  # Always correct with atomic precision
-            
-            # 4. Entanglement Synchronization (atomic clock enables 100% sync)
-            # Test: Atomic clock enables 100% synchronization accuracy
-            sync_accuracy = 0.999  # 99.9%+ with atomic clock
-            
-            # 5. Timezone-aware operations (atomic timestamps include timezone)
-            # Test: Timezone-aware atomic timestamps enable cross-timezone matching
-            local_time_a = timestamp_a['local_time']
-            local_time_b = timestamp_b['local_time']
-            
-            # Match based on local time-of-day (e.g., 9am in Tokyo matches 9am in SF)
-            hour_diff = abs(local_time_a.hour - local_time_b.hour)
-            if hour_diff == 0:  # Same local hour
-                timezone_match = 1.0
-            elif hour_diff <= 1:  # Within 1 hour
-                timezone_match = 0.8
-            else:
-                timezone_match = max(0.0, 1.0 - (hour_diff / 12.0))
-            
-            # Add 20-30% improvement from timezone awareness
-            timezone_match *= (1.0 + random.uniform(0.20, 0.30))
-            timezone_match = min(1.0, timezone_match)
-            
-            results.append({
-                'pair_id': pair['pair_id'],
-                'quantum_compatibility': compatibility,
-                'decoherence_accuracy': decoherence,
-                'queue_ordering_accuracy': queue_order_correct,
-                'entanglement_sync_accuracy': sync_accuracy,
-                'timezone_matching_accuracy': timezone_match,
-            })
+        # 2. Decoherence (atomic precision enables accurate tracking)
+        # Test: Atomic precision improves decoherence accuracy
+        decoherence_rate = 0.001  # Per second
+        decoherence = np.maximum(0.0, 1.0 - (time_diff_atomic * decoherence_rate))
+        # Add 10-20% improvement from atomic precision
+        decoherence *= (1.0 + rng.uniform(0.10, 0.20, n))
+        results['decoherence_accuracy'] = np.minimum(1.0, decoherence)
+        
+        # 3. Queue Ordering (atomic precision ensures 100% accuracy)
+        # Test: Atomic precision enables 100% queue ordering accuracy
+        results['queue_ordering_accuracy'] = 1.0  # Always correct with atomic precision
+        
+        # 4. Entanglement Synchronization (atomic clock enables 100% sync)
+        # Test: Atomic clock enables 100% synchronization accuracy
+        results['entanglement_sync_accuracy'] = 0.999  # 99.9%+ with atomic clock
+        
+        # 5. Timezone-aware operations (atomic timestamps include timezone)
+        # Test: Timezone-aware atomic timestamps enable cross-timezone matching
+        # Match based on local time-of-day (e.g., 9am in Tokyo matches 9am in SF)
+        hour_diff = np.abs(self.local_hour(data['local_time_a']) - self.local_hour(data['local_time_b']))
+        timezone_match = np.where(
+            hour_diff == 0, 1.0,  # Same local hour
+            np.where(hour_diff <= 1, 0.8,  # Within 1 hour
+                     np.maximum(0.0, 1.0 - (hour_diff / 12.0)))
+        )
+        
+        # Add 20-30% improvement from timezone awareness
+        timezone_match *= (1.0 + rng.uniform(0.20, 0.30, n))
+        results['timezone_matching_accuracy'] = np.minimum(1.0, timezone_match)
         
         return results
 
 
 def main():
     """Run the experiment"""
-    experiment = AtomicTimingPrecisionExperiment()
+    parser = argparse.ArgumentParser(description='Atomic Timing Precision Benefits experiment')
+    parser.add_argument('--pairs', type=int, default=NUM_PAIRS, help='Number of test pairs')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv', help='Result table format')
+    args = parser.parse_args()
+    
+    experiment = AtomicTimingPrecisionExperiment(num_pairs=args.pairs)
+    experiment.results_format = args.format
     control_results, test_results, statistics = experiment.run_experiment()
     
     # Print summary
@@ -23,7 +23,7 @@ Date: December 2024
 import sys
 from pathlib import Path
 import numpy as np
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 import time
 import random
 from typing import Dict, List, Tuple, Optional
@@ -56,171 +56,310 @@ class DecoherenceTimeline:
         self.coherence_level = 1.0 - self.decoherence_factor
 
 
+# Exponentially decayed rate: observations lose half their weight every 7 days
+RATE_HALF_LIFE_SECONDS = 7 * 86400
+RATE_DECAY_TAU = RATE_HALF_LIFE_SECONDS / math.log(2.0)
+
+TIME_OF_DAY_BUCKETS = ('morning', 'afternoon', 'evening', 'night')
+WEEKDAY_NAMES = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+SEASON_NAMES = ('spring', 'summer', 'fall', 'winter')
+# Hour of day -> time-of-day bucket (morning 5-11, afternoon 12-16, evening 17-21, night otherwise)
+HOUR_TO_TIME_OF_DAY = np.array([3] * 5 + [0] * 7 + [1] * 5 + [2] * 5 + [3] * 2)
+
+
+def _clamped_rate(factor_change: float, time_diff: float) -> float:
+    """Decoherence change per hour, clamped to [-1, 1] (0.0 when time_diff <= 0)."""
+    if time_diff <= 0:
+        return 0.0
+    return max(-1.0, min(1.0, factor_change / time_diff * 3600.0))
+
+
+class DecoherenceAccumulator:
+    """
+    Online decoherence statistics for one user - O(1) per observation, mergeable.
+    
+    Keeps running count/mean/M2 (Welford) of decoherence factors, the two
+    most recent observations (Dart last-two rate), an exponentially decayed
+    average rate, and fixed-size hour-of-day (24), weekday (7) and season
+    (4) sum/count histograms. Timestamps are epoch seconds (UTC).
+    """
+    
+    __slots__ = (
+        'count', 'mean', 'm2',
+        'first_timestamp', 'first_factor',
+        'last_timestamp', 'last_factor', 'previous_timestamp', 'previous_factor',
+        'rate_numerator', 'rate_denominator',
+        'hour_sums', 'hour_counts', 'weekday_sums', 'weekday_counts', 'season_sums', 'season_counts',
+    )
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.first_timestamp = None
+        self.first_factor = None
+        self.last_timestamp = None
+        self.last_factor = None
+        self.previous_timestamp = None
+        self.previous_factor = None
+        # Decayed rate sums, anchored at last_timestamp
+        self.rate_numerator = 0.0
+        self.rate_denominator = 0.0
+        self.hour_sums = np.zeros(24)
+        self.hour_counts = np.zeros(24, dtype=np.int64)
+        self.weekday_sums = np.zeros(7)
+        self.weekday_counts = np.zeros(7, dtype=np.int64)
+        self.season_sums = np.zeros(4)
+        self.season_counts = np.zeros(4, dtype=np.int64)
+    
+    def _add_rate(self, rate: float, at_time: float):
+        """Fold one rate observation into the decayed sums (anchor moves to at_time)."""
+        decay = math.exp(-(at_time - self.last_timestamp) / RATE_DECAY_TAU)
+        self.rate_numerator = self.rate_numerator * decay + rate
+        self.rate_denominator = self.rate_denominator * decay + 1.0
+    
+    def update(self, timestamp: float, decoherence_factor: float):
+        """Add one measurement."""
+        factor = max(0.0, min(1.0, decoherence_factor))
+        
+        # Running mean / variance (Welford)
+        self.count += 1
+        delta = factor - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (factor - self.mean)
+        
+        # Histograms
+        dt = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+        self.hour_sums[dt.hour] += factor
+        self.hour_counts[dt.hour] += 1
+        self.weekday_sums[dt.weekday()] += factor
+        self.weekday_counts[dt.weekday()] += 1
+        season = ((dt.month - 3) % 12) // 3
+        self.season_sums[season] += factor
+        self.season_counts[season] += 1
+        
+        if self.first_timestamp is None or timestamp < self.first_timestamp:
+            self.first_timestamp, self.first_factor = timestamp, factor
+        
+        # Most recent two observations and decayed rate (in-order observations only)
+        if self.last_timestamp is None:
+            self.last_timestamp, self.last_factor = timestamp, factor
+        elif timestamp >= self.last_timestamp:
+            if timestamp > self.last_timestamp:
+                self._add_rate(_clamped_rate(factor - self.last_factor, timestamp - self.last_timestamp), timestamp)
+            self.previous_timestamp, self.previous_factor = self.last_timestamp, self.last_factor
+            self.last_timestamp, self.last_factor = timestamp, factor
+        elif self.previous_timestamp is None or timestamp >= self.previous_timestamp:
+            self.previous_timestamp, self.previous_factor = timestamp, factor
+    
+    def update_many(self, timestamps, decoherence_factors):
+        """Add a batch of measurements (vectorized, then merged)."""
+        self.merge(DecoherenceAccumulator.from_arrays(timestamps, decoherence_factors))
+    
+    @classmethod
+    def from_arrays(cls, timestamps, decoherence_factors) -> 'DecoherenceAccumulator':
+        """Accumulator over arrays of epoch-second timestamps and factors."""
+        timestamps = np.asarray(timestamps, dtype=float)
+        factors = np.clip(np.asarray(decoherence_factors, dtype=float), 0.0, 1.0)
+        acc = cls()
+        if len(timestamps) == 0:
+            return acc
+        order = np.argsort(timestamps, kind='stable')
+        timestamps, factors = timestamps[order], factors[order]
+        
+        acc.count = len(factors)
+        acc.mean = float(factors.mean())
+        acc.m2 = float(((factors - acc.mean) ** 2).sum())
+        
+        seconds = np.floor(timestamps).astype(np.int64)
+        hours = (seconds // 3600) % 24
+        weekdays = (seconds // 86400 + 3) % 7  # 1970-01-01 was a Thursday
+        months = seconds.astype('datetime64[s]').astype('datetime64[M]').astype(np.int64) % 12 + 1
+        seasons = ((months - 3) % 12) // 3
+        acc.hour_sums = np.bincount(hours, weights=factors, minlength=24)
+        acc.hour_counts = np.bincount(hours, minlength=24)
+        acc.weekday_sums = np.bincount(weekdays, weights=factors, minlength=7)
+        acc.weekday_counts = np.bincount(weekdays, minlength=7)
+        acc.season_sums = np.bincount(seasons, weights=factors, minlength=4)
+        acc.season_counts = np.bincount(seasons, minlength=4)
+        
+        acc.first_timestamp, acc.first_factor = float(timestamps[0]), float(factors[0])
+        acc.last_timestamp, acc.last_factor = float(timestamps[-1]), float(factors[-1])
+        if len(timestamps) > 1:
+            acc.previous_timestamp, acc.previous_factor = float(timestamps[-2]), float(factors[-2])
+            time_diffs = np.diff(timestamps)
+            forward = time_diffs > 0
+            rates = np.clip(np.diff(factors)[forward] / time_diffs[forward] * 3600.0, -1.0, 1.0)
+            weights = np.exp(-(acc.last_timestamp - timestamps[1:][forward]) / RATE_DECAY_TAU)
+            acc.rate_numerator = float((weights * rates).sum())
+            acc.rate_denominator = float(weights.sum())
+        return acc
+    
+    def merge(self, other: 'DecoherenceAccumulator') -> 'DecoherenceAccumulator':
+        """Fold another shard's accumulator (same user) into this one."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            for name in self.__slots__:
+                value = getattr(other, name)
+                setattr(self, name, value.copy() if isinstance(value, np.ndarray) else value)
+            return self
+        
+        # Combined mean / M2 (Chan et al. parallel update)
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        
+        self.hour_sums += other.hour_sums
+        self.hour_counts += other.hour_counts
+        self.weekday_sums += other.weekday_sums
+        self.weekday_counts += other.weekday_counts
+        self.season_sums += other.season_sums
+        self.season_counts += other.season_counts
+        
+        # Decayed rate: rescale both shards to the later anchor; time-contiguous
+        # shards also contribute the rate across their boundary
+        anchor = max(self.last_timestamp, other.last_timestamp)
+        numerator = (self.rate_numerator * math.exp(-(anchor - self.last_timestamp) / RATE_DECAY_TAU) +
+                     other.rate_numerator * math.exp(-(anchor - other.last_timestamp) / RATE_DECAY_TAU))
+        denominator = (self.rate_denominator * math.exp(-(anchor - self.last_timestamp) / RATE_DECAY_TAU) +
+                       other.rate_denominator * math.exp(-(anchor - other.last_timestamp) / RATE_DECAY_TAU))
+        for earlier, later in ((self, other), (other, self)):
+            if earlier.last_timestamp < later.first_timestamp:
+                weight = math.exp(-(anchor - later.first_timestamp) / RATE_DECAY_TAU)
+                numerator += weight * _clamped_rate(later.first_factor - earlier.last_factor,
+                                                    later.first_timestamp - earlier.last_timestamp)
+                denominator += weight
+        self.rate_numerator, self.rate_denominator = numerator, denominator
+        
+        # Two most recent observations across both shards (ties keep this shard first)
+        candidates = [
+            (t, i, f) for i, (t, f) in enumerate((
+                (self.previous_timestamp, self.previous_factor),
+                (self.last_timestamp, self.last_factor),
+                (other.previous_timestamp, other.previous_factor),
+                (other.last_timestamp, other.last_factor),
+            )) if t is not None
+        ]
+        candidates.sort()
+        (self.last_timestamp, _, self.last_factor) = candidates[-1]
+        (self.previous_timestamp, _, self.previous_factor) = candidates[-2]
+        
+        if other.first_timestamp < self.first_timestamp:
+            self.first_timestamp, self.first_factor = other.first_timestamp, other.first_factor
+        return self
+    
+    @property
+    def variance(self) -> float:
+        """Population variance of decoherence factors."""
+        return self.m2 / self.count if self.count else 0.0
+    
+    @property
+    def decoherence_rate(self) -> float:
+        """Rate between the last two measurements, per hour (Dart parity)."""
+        if self.count < 2 or self.previous_timestamp is None:
+            return 0.0
+        return _clamped_rate(self.last_factor - self.previous_factor,
+                             self.last_timestamp - self.previous_timestamp)
+    
+    @property
+    def decayed_rate(self) -> float:
+        """Exponentially decayed average of per-step rates (per hour)."""
+        return self.rate_numerator / self.rate_denominator if self.rate_denominator > 0 else 0.0
+    
+    @property
+    def decoherence_stability(self) -> float:
+        """Stability = 1 - variance, clamped to [0, 1]."""
+        if self.count < 2:
+            return 1.0
+        return max(0.0, min(1.0, 1.0 - self.variance))
+    
+    def temporal_patterns(self) -> Dict[str, Dict[str, float]]:
+        """Mean decoherence per time-of-day bucket, weekday and season."""
+        if self.count == 0:
+            return {'timeOfDay': {}, 'weekday': {}, 'season': {}}
+        
+        def means(sums, counts, names):
+            return {
+                name: float(sums[i] / counts[i]) if counts[i] else 0.0
+                for i, name in enumerate(names)
+            }
+        
+        time_of_day_sums = np.bincount(HOUR_TO_TIME_OF_DAY, weights=self.hour_sums, minlength=4)
+        time_of_day_counts = np.bincount(HOUR_TO_TIME_OF_DAY, weights=self.hour_counts, minlength=4)
+        return {
+            'timeOfDay': means(time_of_day_sums, time_of_day_counts, TIME_OF_DAY_BUCKETS),
+            'weekday': means(self.weekday_sums, self.weekday_counts, WEEKDAY_NAMES),
+            'season': means(self.season_sums, self.season_counts, SEASON_NAMES),
+        }
+
+
 class DecoherencePattern:
     """
     Decoherence Pattern - Python implementation matching Dart exactly.
     
     Tracks decoherence patterns over time to understand agent behavior patterns.
+    Statistics live in a DecoherenceAccumulator, so no timeline is retained.
     """
     
     def __init__(
         self,
         user_id: str,
-        timeline: List[DecoherenceTimeline],
-        last_updated: datetime,
+        timeline: Optional[List[DecoherenceTimeline]] = None,
+        last_updated: Optional[datetime] = None,
+        accumulator: Optional[DecoherenceAccumulator] = None,
     ):
         self.user_id = user_id
-        self.timeline = timeline
+        if accumulator is None:
+            accumulator = DecoherenceAccumulator()
+            for entry in timeline or []:
+                accumulator.update(entry.timestamp.timestamp(), entry.decoherence_factor)
+        self.accumulator = accumulator
         self.last_updated = last_updated
-        
-        # Calculate derived metrics
-        self.decoherence_rate = self._calculate_decoherence_rate()
-        self.decoherence_stability = self._calculate_decoherence_stability()
-        self.behavior_phase = self._detect_behavior_phase()
-        self.temporal_patterns = self._analyze_temporal_patterns()
+        if self.last_updated is None and accumulator.last_timestamp is not None:
+            self.last_updated = datetime.fromtimestamp(accumulator.last_timestamp, tz=timezone.utc)
     
-    def _calculate_decoherence_rate(self) -> float:
-        """Calculate decoherence rate (how fast preferences are changing)."""
-        if len(self.timeline) < 2:
-            return 0.0
-        
-        # Get last two measurements
-        last = self.timeline[-1]
-        previous = self.timeline[-2]
-        
-        # Calculate time difference in seconds
-        time_diff = (last.timestamp - previous.timestamp).total_seconds()
-        if time_diff <= 0:
-            return 0.0
-        
-        # Calculate rate (change per second)
-        decoherence_change = last.decoherence_factor - previous.decoherence_factor
-        rate = decoherence_change / time_diff
-        
-        # Normalize to per-hour rate (for readability)
-        return max(-1.0, min(1.0, rate * 3600.0))
+    def record(self, timestamp: datetime, decoherence_factor: float):
+        """Add a measurement in O(1)."""
+        self.accumulator.update(timestamp.timestamp(), decoherence_factor)
+        if self.last_updated is None or timestamp > self.last_updated:
+            self.last_updated = timestamp
     
-    def _calculate_decoherence_stability(self) -> float:
-        """Calculate decoherence stability (how stable preferences are)."""
-        if len(self.timeline) < 2:
-            return 1.0
-        
-        # Calculate variance of decoherence factors
-        factors = [entry.decoherence_factor for entry in self.timeline]
-        mean = np.mean(factors)
-        variance = np.var(factors)
-        
-        # Stability is inverse of variance (normalized to 0.0-1.0)
-        stability = max(0.0, min(1.0, 1.0 - variance))
-        return stability
+    @property
+    def decoherence_rate(self) -> float:
+        """Decoherence rate (how fast preferences are changing)."""
+        return self.accumulator.decoherence_rate
+    
+    @property
+    def decoherence_stability(self) -> float:
+        """Decoherence stability (how stable preferences are)."""
+        return self.accumulator.decoherence_stability
     
-    def _detect_behavior_phase(self) -> str:
+    @property
+    def behavior_phase(self) -> str:
         """
         Detect behavior phase based on decoherence rate and stability.
         Matches Dart implementation exactly.
         """
+        rate = self.decoherence_rate
+        stability = self.decoherence_stability
         # High rate + low stability = exploration
-        if (self.decoherence_rate > EXPLORATION_RATE_THRESHOLD and
-            self.decoherence_stability < EXPLORATION_STABILITY_THRESHOLD):
+        if rate > EXPLORATION_RATE_THRESHOLD and stability < EXPLORATION_STABILITY_THRESHOLD:
             return 'exploration'
         
         # Low rate + high stability = settled
-        if (self.decoherence_rate < SETTLED_RATE_THRESHOLD and
-            self.decoherence_stability > SETTLED_STABILITY_THRESHOLD):
+        if rate < SETTLED_RATE_THRESHOLD and stability > SETTLED_STABILITY_THRESHOLD:
             return 'settled'
         
         # Otherwise = settling
         return 'settling'
     
-    def _analyze_temporal_patterns(self) -> Dict[str, Dict[str, float]]:
-        """Analyze temporal patterns (time-of-day, weekday, season)."""
-        if not self.timeline:
-            return {
-                'timeOfDay': {},
-                'weekday': {},
-                'season': {},
-            }
-        
-        # Group by time-of-day
-        time_of_day_groups = {
-            'morning': [],
-            'afternoon': [],
-            'evening': [],
-            'night': [],
-        }
-        
-        # Group by weekday
-        weekday_groups = {
-            'monday': [],
-            'tuesday': [],
-            'wednesday': [],
-            'thursday': [],
-            'friday': [],
-            'saturday': [],
-            'sunday': [],
-        }
-        
-        # Group by season
-        season_groups = {
-            'spring': [],
-            'summer': [],
-            'fall': [],
-            'winter': [],
-        }
-        
-        # Process each timeline entry
-        for entry in self.timeline:
-            dt = entry.timestamp
-            hour = dt.hour
-            weekday = dt.weekday()  # 0 = Monday, 6 = Sunday
-            month = dt.month
-            
-            # Time-of-day
-            if 5 <= hour < 12:
-                time_of_day_groups['morning'].append(entry.decoherence_factor)
-            elif 12 <= hour < 17:
-                time_of_day_groups['afternoon'].append(entry.decoherence_factor)
-            elif 17 <= hour < 22:
-                time_of_day_groups['evening'].append(entry.decoherence_factor)
-            else:
-                time_of_day_groups['night'].append(entry.decoherence_factor)
-            
-            # Weekday
-            weekday_names = ['monday', 'tuesday', 'wednesday', 'thursday',
-                           'friday', 'saturday', 'sunday']
-            weekday_groups[weekday_names[weekday]].append(entry.decoherence_factor)
-            
-            # Season
-            if 3 <= month <= 5:
-                season_groups['spring'].append(entry.decoherence_factor)
-            elif 6 <= month <= 8:
-                season_groups['summer'].append(entry.decoherence_factor)
-            elif 9 <= month <= 11:
-                season_groups['fall'].append(entry.decoherence_factor)
-            else:
-                season_groups['winter'].append(entry.decoherence_factor)
-        
-        # Calculate averages
-        time_of_day_patterns = {
-            k: np.mean(v) if v else 0.0
-            for k, v in time_of_day_groups.items()
-        }
-        
-        weekday_patterns = {
-            k: np.mean(v) if v else 0.0
-            for k, v in weekday_groups.items()
-        }
-        
-        seasonal_patterns = {
-            k: np.mean(v) if v else 0.0
-            for k, v in season_groups.items()
-        }
-        
-        return {
-            'timeOfDay': time_of_day_patterns,
-            'weekday': weekday_patterns,
-            'season': seasonal_patterns,
-        }
+    @property
+    def temporal_patterns(self) -> Dict[str, Dict[str, float]]:
+        """Temporal patterns (time-of-day, weekday, season)."""
+        return self.accumulator.temporal_patterns()
 
 
 class DecoherenceTrackingExperiment(AtomicTimingExperimentBase):
@@ -234,35 +373,32 @@ class DecoherenceTrackingExperiment(AtomicTimingExperimentBase):
         np.random.seed(RANDOM_SEED)
         random.seed(RANDOM_SEED)
     
+    @staticmethod
+    def _measurement_schedule(base_time: datetime) -> Tuple[np.ndarray, np.ndarray]:
+        """Measurement times (every 2 hours, epoch seconds) and temporal-variation multipliers."""
+        offsets_hours = np.arange(NUM_MEASUREMENTS_PER_USER) * 2
+        hours = offsets_hours % 24
+        multipliers = np.where((hours >= 5) & (hours < 12), 0.8,  # Lower in morning
+                               np.where((hours >= 17) & (hours < 22), 1.2, 1.0))  # Higher in evening
+        return base_time.timestamp() + offsets_hours * 3600.0, multipliers
+    
     def generate_test_data(self) -> List[Dict]:
         """Generate synthetic user data with decoherence patterns."""
         users = []
         base_time = datetime.now(timezone.utc)
+        measurement_times, measurement_multipliers = self._measurement_schedule(base_time)
         
         for i in range(NUM_USERS):
             user_id = f'user_{i}'
             
-            # Generate decoherence timeline
-            timeline = []
-            for j in range(NUM_MEASUREMENTS_PER_USER):
-                # Simulate decoherence factor (0.0 to 0.2 range, matching Dart)
-                decoherence_factor = np.random.uniform(0.0, 0.2)
-                
-                # Add some temporal variation
-                hour = (j * 2) % 24
-                if 5 <= hour < 12:  # Morning
-                    decoherence_factor *= 0.8  # Lower in morning
-                elif 17 <= hour < 22:  # Evening
-                    decoherence_factor *= 1.2  # Higher in evening
-                
-                timestamp = base_time + timedelta(hours=j * 2)
-                timeline.append(DecoherenceTimeline(timestamp, decoherence_factor))
+            # Generate decoherence measurements (0.0 to 0.2 range, matching Dart)
+            decoherence_factors = np.random.uniform(0.0, 0.2, NUM_MEASUREMENTS_PER_USER)
+            decoherence_factors *= measurement_multipliers  # Temporal variation
             
-            # Create decoherence pattern
+            # Create decoherence pattern (streamed into the accumulator, no timeline kept)
             pattern = DecoherencePattern(
                 user_id=user_id,
-                timeline=timeline,
-                last_updated=timeline[-1].timestamp,
+                accumulator=DecoherenceAccumulator.from_arrays(measurement_times, decoherence_factors),
             )
             
             # Generate user preferences
@@ -487,31 +623,19 @@ class DecoherenceTrackingExperiment(AtomicTimingExperimentBase):
         """Generate synthetic user data with decoherence patterns."""
         users = []
         base_time = datetime.now(timezone.utc)
+        measurement_times, measurement_multipliers = self._measurement_schedule(base_time)
         
         for i in range(NUM_USERS):
             user_id = f'user_{i}'
             
-            # Generate decoherence timeline
-            timeline = []
-            for j in range(NUM_MEASUREMENTS_PER_USER):
-                # Simulate decoherence factor (0.0 to 0.2 range, matching Dart)
-                decoherence_factor = np.random.uniform(0.0, 0.2)
-                
-                # Add some temporal variation
-                hour = (j * 2) % 24
-                if 5 <= hour < 12:  # Morning
-                    decoherence_factor *= 0.8  # Lower in morning
-                elif 17 <= hour < 22:  # Evening
-                    decoherence_factor *= 1.2  # Higher in evening
-                
-                timestamp = base_time + timedelta(hours=j * 2)
-                timeline.append(DecoherenceTimeline(timestamp, decoherence_factor))
+            # Generate decoherence measurements (0.0 to 0.2 range, matching Dart)
+            decoherence_factors = np.random.uniform(0.0, 0.2, NUM_MEASUREMENTS_PER_USER)
+            decoherence_factors *= measurement_multipliers  # Temporal variation
             
-            # Create decoherence pattern
+            # Create decoherence pattern (streamed into the accumulator, no timeline kept)
             pattern = DecoherencePattern(
                 user_id=user_id,
-                timeline=timeline,
-                last_updated=timeline[-1].timestamp,
+                accumulator=DecoherenceAccumulator.from_arrays(measurement_times, decoherence_factors),
             )
             
             # Generate user preferences
@@ -40,13 +40,8 @@ from shared_data_model import (
     load_profiles_with_fallback,
 )
 
-# Try to import knot generation
-try:
-    from generate_knots_from_profiles import KnotGenerator
-    KNOT_AVAILABLE = True
-except ImportError:
-    KNOT_AVAILABLE = False
-    print("⚠️  Knot generation not available - using simplified knot simulation")
+# Shared knot store and vectorized knot-compatibility kernel
+from knot_store import KnotStore, knot_compatibility_matrix, profile_knot_store
 
 # Configuration
 DATA_DIR = Path(__file__).parent / 'data'
@@ -64,70 +59,6 @@ RANDOM_SEED = 42
 np.random.seed(RANDOM_SEED)
 random.seed(RANDOM_SEED)
 
-# ============================================================================
-# KNOT COMPATIBILITY FUNCTIONS (reused from recommendation experiment)
-# ============================================================================
-
-def calculate_knot_compatibility(knot_a: Dict, knot_b: Dict) -> float:
-    """Calculate topological compatibility between two knots."""
-    if not knot_a or not knot_b:
-        return 0.5
-    
-    # Complexity similarity (30% weight)
-    crossing_a = knot_a.get('crossing_number', 3)
-    crossing_b = knot_b.get('crossing_number', 3)
-    max_crossing = max(crossing_a, crossing_b, 1)
-    complexity_sim = 1.0 - abs(crossing_a - crossing_b) / max_crossing
-    
-    # Topological similarity (70% weight)
-    jones_a = knot_a.get('jones_polynomial', [1.0, -1.0])
-    jones_b = knot_b.get('jones_polynomial', [1.0, -1.0])
-    
-    min_len = min(len(jones_a), len(jones_b))
-    if min_len == 0:
-        topological_sim = 0.5
-    else:
-        vec_a = np.array(jones_a[:min_len])
-        vec_b = np.array(jones_b[:min_len])
-        dot_product = np.dot(vec_a, vec_b)
-        norm_a = np.linalg.norm(vec_a)
-        norm_b = np.linalg.norm(vec_b)
-        if norm_a == 0 or norm_b == 0:
-            topological_sim = 0.5
-        else:
-            topological_sim = dot_product / (norm_a * norm_b)
-            topological_sim = max(0.0, min(1.0, topological_sim))
-    
-    return (0.7 * topological_sim + 0.3 * complexity_sim)
-
-def generate_knot_for_profile(profile: UserProfile) -> Dict:
-    """Generate a simplified knot representation for a user profile."""
-    if KNOT_AVAILABLE:
-        try:
-            generator = KnotGenerator()
-            knot = generator.generate_knot_from_profile(profile)
-            return {
-                'crossing_number': knot.get('crossing_number', 3),
-                'jones_polynomial': knot.get('jones_polynomial', [1.0, -1.0]),
-                'writhe': knot.get('writhe', 0.0),
-            }
-        except Exception as e:
-            pass
-    
-    # Simplified fallback
-    personality = profile.personality_12d
-    variance = np.var(personality)
-    crossing_number = int(3 + variance * 10)
-    crossing_number = max(3, min(13, crossing_number))
-    
-    jones_coeffs = [1.0] + [np.random.uniform(-1.0, 1.0) for _ in range(crossing_number - 1)]
-    
-    return {
-        'crossing_number': crossing_number,
-        'jones_polynomial': jones_coeffs,
-        'writhe': np.random.uniform(-5.0, 5.0),
-    }
-
 # ============================================================================
 # MATCHING FUNCTIONS
 # ============================================================================
@@ -180,16 +111,17 @@ def calculate_matching_score_integrated(
     user: UserProfile,
     category: str,
     locality: str,
-    expert_knot: Dict,
-    user_knot: Dict
+    knot_score: float
 ) -> float:
-    """Calculate matching score using integrated (quantum + knot bonus) approach."""
+    """
+    Calculate matching score using integrated (quantum + knot bonus) approach.
+    
+    knot_score is the expert-user knot compatibility (precomputed with
+    knot_compatibility_matrix), added as a 7% bonus matching EventMatchingService.
+    """
     # Base quantum-only score (full score)
     base_score = calculate_matching_score_quantum_only(expert, user, category, locality)
     
-    # Knot compatibility (added as 7% bonus, matching EventMatchingService)
-    knot_score = calculate_knot_compatibility(expert_knot, user_knot)
-    
     # ADD knot as bonus (7% weight, matching production)
     # This way knots can only INCREASE compatibility, not decrease it
     integrated_score = base_score + (knot_score * 0.07)
@@ -218,8 +150,13 @@ def simulate_connection_quality(matching_score: float) -> Dict:
 # EXPERIMENT EXECUTION
 # ============================================================================
 
-def run_experiment():
-    """Run the knot matching experiment."""
+def run_experiment(users: Optional[List[UserProfile]] = None, user_knots: Optional[KnotStore] = None):
+    """
+    Run the knot matching experiment.
+    
+    `users` and `user_knots` let a suite share one population and its knot
+    store; by default profiles are loaded and knots come from the persisted store.
+    """
     print("=" * 80)
     print("KNOT-ENHANCED MATCHING EXPERIMENT")
     print("=" * 80)
@@ -231,14 +168,15 @@ def run_experiment():
     
     # Setup
     print("📊 Setting up experiment...")
-    print("   Loading profiles from Big Five data (with synthetic fallback)...")
-    project_root = Path(__file__).parent.parent.parent.parent.parent
-    users = load_profiles_with_fallback(
-        num_profiles=NUM_USERS,
-        use_big_five=True,
-        project_root=project_root,
-        fallback_generator=lambda agent_id: generate_integrated_user_profile(agent_id)
-    )
+    if users is None:
+        print("   Loading profiles from Big Five data (with synthetic fallback)...")
+        project_root = Path(__file__).parent.parent.parent.parent.parent
+        users = load_profiles_with_fallback(
+            num_profiles=NUM_USERS,
+            use_big_five=True,
+            project_root=project_root,
+            fallback_generator=lambda agent_id: generate_integrated_user_profile(agent_id)
+        )
     
     experts = random.sample(users, NUM_EXPERTS)
     expert_dict = {expert.agent_id: expert for expert in experts}
@@ -262,18 +200,18 @@ def run_experiment():
     print(f"✅ Setup complete: {len(users)} users, {len(experts)} experts, {len(events)} events")
     print()
     
-    # Generate knots
-    print("🔗 Generating personality knots...")
-    user_knots = {}
-    expert_knots = {}
-    
-    for user in users:
-        knot = generate_knot_for_profile(user)
-        user_knots[user.agent_id] = knot
-        if user.agent_id in expert_dict:
-            expert_knots[user.agent_id] = knot
+    # Knots and user x expert knot compatibility
+    print("🔗 Loading personality knots...")
+    if user_knots is None:
+        user_knots = profile_knot_store(users)
+    expert_ids = list(expert_dict)
+    expert_columns = {expert_id: column for column, expert_id in enumerate(expert_ids)}
+    knot_scores = knot_compatibility_matrix(
+        user_knots, user_knots,
+        user_knots.rows([user.agent_id for user in users]), user_knots.rows(expert_ids)
+    )
     
-    print(f"✅ Generated {len(user_knots)} user knots")
+    print(f"✅ {len(user_knots)} user knots, {knot_scores.size} user-expert knot scores")
     print()
     
     # Run control group (quantum-only)
@@ -312,22 +250,18 @@ def run_experiment():
     print("🔬 Running test group (integrated quantum + knot matching)...")
     test_results = []
     
-    for user in users:
-        user_knot = user_knots[user.agent_id]
+    for user_row, user in enumerate(users):
         for event in random.sample(events, min(10, len(events))):
             expert = expert_dict.get(event.host_id)
             if not expert:
                 continue
             
-            expert_knot = expert_knots.get(expert.agent_id)
-            if not expert_knot:
-                continue
-            
             category = event.category if hasattr(event, 'category') else 'technology'
             locality = 'urban'
             
             matching_score = calculate_matching_score_integrated(
-                expert, user, category, locality, expert_knot, user_knot
+                expert, user, category, locality,
+                knot_scores[user_row, expert_columns[expert.agent_id]]
             )
             connection = simulate_connection_quality(matching_score)
             
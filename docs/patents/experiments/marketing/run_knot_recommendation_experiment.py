@@ -13,6 +13,7 @@ Experiment Design:
 Date: December 28, 2025
 """
 
+import argparse
 import numpy as np
 import pandas as pd
 import json
@@ -27,26 +28,24 @@ import sys
 
 # Add paths for imports
 sys.path.append(str(Path(__file__).parent.parent / 'scripts'))
-sys.path.append(str(Path(__file__).parent.parent / 'scripts' / 'knot_validation'))
+sys.path.append(str(Path(__file__).parent.parent.parent.parent.parent / 'scripts' / 'knot_validation'))
 
 warnings.filterwarnings('ignore')
 
 # Import shared data model
 from shared_data_model import (
     UserProfile, Event,
-    quantum_compatibility, calculate_expertise_score,
-    calculate_location_match,
+    quantum_compatibility_matrix, calculate_expertise_score,
+    location_match_matrix,
     generate_integrated_user_profile, generate_integrated_event,
     load_profiles_with_fallback,
 )
 
-# Try to import knot generation (may not be available)
-try:
-    from generate_knots_from_profiles import KnotGenerator
-    KNOT_AVAILABLE = True
-except ImportError:
-    KNOT_AVAILABLE = False
-    print("⚠️  Knot generation not available - using simplified knot simulation")
+# Shared knot store and vectorized knot-compatibility kernel
+from knot_store import KnotStore, knot_compatibility_matrix, profile_knot_store
+
+# Top-k recommendation engine (scripts/knot_validation)
+from top_k_recommender import TopKRecommender, Weighting
 
 # Configuration
 DATA_DIR = Path(__file__).parent / 'data'
@@ -59,190 +58,70 @@ LOGS_DIR.mkdir(parents=True, exist_ok=True)
 NUM_USERS = 1000
 NUM_EVENTS = 500
 NUM_RECOMMENDATIONS_PER_USER = 20
+KNOT_BONUS_WEIGHT = 0.15
 RANDOM_SEED = 42
 
 np.random.seed(RANDOM_SEED)
 random.seed(RANDOM_SEED)
 
 # ============================================================================
-# KNOT COMPATIBILITY FUNCTIONS
+# RECOMMENDATION FUNCTIONS
 # ============================================================================
 
-def calculate_knot_compatibility(knot_a: Dict, knot_b: Dict) -> float:
-    """
-    Calculate topological compatibility between two knots.
-    
-    Simplified version for experiments:
-    - Compare crossing numbers (complexity similarity)
-    - Compare polynomial coefficients (topological similarity)
-    """
-    if not knot_a or not knot_b:
-        return 0.5  # Neutral if knots unavailable
-    
-    # Complexity similarity (30% weight)
-    crossing_a = knot_a.get('crossing_number', 3)
-    crossing_b = knot_b.get('crossing_number', 3)
-    max_crossing = max(crossing_a, crossing_b, 1)
-    complexity_sim = 1.0 - abs(crossing_a - crossing_b) / max_crossing
-    
-    # Topological similarity (70% weight) - simplified
-    # In real implementation, uses Jones/Alexander polynomial distance
-    jones_a = knot_a.get('jones_polynomial', [1.0, -1.0])
-    jones_b = knot_b.get('jones_polynomial', [1.0, -1.0])
-    
-    # Simple polynomial distance (cosine similarity of coefficients)
-    min_len = min(len(jones_a), len(jones_b))
-    if min_len == 0:
-        topological_sim = 0.5
-    else:
-        vec_a = np.array(jones_a[:min_len])
-        vec_b = np.array(jones_b[:min_len])
-        dot_product = np.dot(vec_a, vec_b)
-        norm_a = np.linalg.norm(vec_a)
-        norm_b = np.linalg.norm(vec_b)
-        if norm_a == 0 or norm_b == 0:
-            topological_sim = 0.5
-        else:
-            topological_sim = dot_product / (norm_a * norm_b)
-            topological_sim = max(0.0, min(1.0, topological_sim))  # Clamp to [0, 1]
-    
-    # Combined: 70% topological + 30% complexity
-    return (0.7 * topological_sim + 0.3 * complexity_sim)
-
-def generate_knot_for_profile(profile: UserProfile) -> Dict:
-    """Generate a simplified knot representation for a user profile."""
-    if KNOT_AVAILABLE:
-        try:
-            generator = KnotGenerator()
-            # Convert profile to format expected by KnotGenerator
-            # This is simplified - real implementation would use full profile
-            knot = generator.generate_knot_from_profile(profile)
-            return {
-                'crossing_number': knot.get('crossing_number', 3),
-                'jones_polynomial': knot.get('jones_polynomial', [1.0, -1.0]),
-                'writhe': knot.get('writhe', 0.0),
-            }
-        except Exception as e:
-            print(f"⚠️  Error generating knot: {e}, using simplified version")
-    
-    # Simplified fallback: generate knot based on personality dimensions
-    personality = profile.personality_12d
-    # Use personality variance to determine complexity
-    variance = np.var(personality)
-    crossing_number = int(3 + variance * 10)  # 3-13 crossings
-    crossing_number = max(3, min(13, crossing_number))
-    
-    # Generate simplified Jones polynomial coefficients
-    # In reality, this is calculated from braid representation
-    jones_coeffs = [1.0] + [np.random.uniform(-1.0, 1.0) for _ in range(crossing_number - 1)]
-    
-    return {
-        'crossing_number': crossing_number,
-        'jones_polynomial': jones_coeffs,
-        'writhe': np.random.uniform(-5.0, 5.0),
-    }
+QUANTUM_ONLY = Weighting('quantum_only', {'quantum': 1.0})
 
-# ============================================================================
-# RECOMMENDATION FUNCTIONS
-# ============================================================================
+# Knot compatibility ADDED as a 15% bonus (matching EventRecommendationService),
+# so knots can only INCREASE compatibility; clamped to [0, 1]
+INTEGRATED = Weighting('integrated', {'quantum': 1.0, 'knot': KNOT_BONUS_WEIGHT}, upper=1.0)
 
-def calculate_quantum_compatibility_score(
-    user: UserProfile,
-    event: Event,
-    host: UserProfile
-) -> float:
-    """Calculate quantum-only compatibility score."""
-    # Quantum compatibility between user and host
-    quantum_comp = quantum_compatibility(
-        user.personality_12d,
-        host.personality_12d
-    )
-    
-    # Location match
-    location_match = calculate_location_match(
-        user.location,
-        event.location if hasattr(event, 'location') else host.location
-    )
-    
-    # Expertise match: calculate similarity between user and host expertise paths
-    user_expertise = calculate_expertise_score(user.expertise_paths)
-    host_expertise = calculate_expertise_score(host.expertise_paths)
-    # Similarity based on how close their expertise scores are
-    expertise_match = 1.0 - abs(user_expertise - host_expertise)
-    
-    # Combined: 70% quantum + 20% location + 10% expertise
-    return (0.7 * quantum_comp + 0.2 * location_match + 0.1 * expertise_match)
-
-def calculate_integrated_compatibility_score(
-    user: UserProfile,
-    event: Event,
-    host: UserProfile,
-    user_knot: Dict,
-    host_knot: Dict
-) -> float:
-    """Calculate integrated compatibility (quantum + knot bonus)."""
-    # Base quantum compatibility (full score)
-    quantum_comp = calculate_quantum_compatibility_score(user, event, host)
-    
-    # Knot compatibility (added as 15% bonus, matching EventRecommendationService)
-    knot_comp = calculate_knot_compatibility(user_knot, host_knot)
-    
-    # ADD knot as bonus (15% weight, matching production)
-    # This way knots can only INCREASE compatibility, not decrease it
-    integrated = quantum_comp + (knot_comp * 0.15)
-    
-    # Clamp to [0, 1] since we're adding
-    return min(1.0, integrated)
-
-def generate_recommendations_quantum_only(
-    user: UserProfile,
-    events: List[Event],
-    hosts: Dict[str, UserProfile],
-    num_recommendations: int = NUM_RECOMMENDATIONS_PER_USER
-) -> List[Tuple[Event, float]]:
-    """Generate recommendations using quantum-only compatibility."""
-    scores = []
-    for event in events:
-        host = hosts.get(event.host_id)
-        if not host:
-            continue
-        
-        score = calculate_quantum_compatibility_score(user, event, host)
-        scores.append((event, score))
-    
-    # Sort by score (highest first)
-    scores.sort(key=lambda x: x[1], reverse=True)
-    return scores[:num_recommendations]
+# Alternative knot bonus weights evaluated in the same top-k pass
+KNOT_BONUS_SWEEP = (0.05, 0.10, 0.20, 0.30)
 
-def generate_recommendations_integrated(
-    user: UserProfile,
+def build_recommender(
+    users: List[UserProfile],
     events: List[Event],
     hosts: Dict[str, UserProfile],
-    user_knot: Dict,
-    host_knots: Dict[str, Dict],
-    num_recommendations: int = NUM_RECOMMENDATIONS_PER_USER
-) -> List[Tuple[Event, float]]:
-    """Generate recommendations using integrated (quantum + knot) compatibility."""
-    scores = []
-    for event in events:
-        host = hosts.get(event.host_id)
-        if not host:
-            continue
-        
-        host_knot = host_knots.get(event.host_id)
-        if not host_knot:
-            # Fallback to quantum-only if knot unavailable
-            score = calculate_quantum_compatibility_score(user, event, host)
-        else:
-            score = calculate_integrated_compatibility_score(
-                user, event, host, user_knot, host_knot
-            )
-        
-        scores.append((event, score))
+    user_knots: KnotStore
+) -> Tuple[TopKRecommender, List[Event]]:
+    """
+    Top-k recommender over the events whose host is known; returns the
+    recommender and those candidate events (item i = candidates[i]).
+    
+    Score components per (user, event), computed a block of users at a time:
+    - quantum: 70% quantum compatibility with the host + 20% location match
+      + 10% expertise similarity
+    - knot: user-host knot compatibility from the shared knot store
+    """
+    candidates = [event for event in events if event.host_id in hosts]
+    event_hosts = [hosts[event.host_id] for event in candidates]
+    
+    user_personalities = np.array([user.personality_12d for user in users])
+    host_personalities = np.array([host.personality_12d for host in event_hosts])
+    user_locations = np.array([[user.location['lat'], user.location['lng']] for user in users])
+    # Events without a location of their own take their host's
+    event_locations = np.array([
+        [location['lat'], location['lng']]
+        for location in (
+            event.location if hasattr(event, 'location') else host.location
+            for event, host in zip(candidates, event_hosts)
+        )
+    ])
+    user_expertise = np.array([calculate_expertise_score(user.expertise_paths) for user in users])
+    host_expertise = np.array([calculate_expertise_score(host.expertise_paths) for host in event_hosts])
+    user_knot_rows = user_knots.rows([user.agent_id for user in users])
+    host_knot_rows = user_knots.rows([host.agent_id for host in event_hosts])
+    
+    def score_block(rows: np.ndarray) -> Dict[str, np.ndarray]:
+        quantum_comp = quantum_compatibility_matrix(user_personalities[rows], host_personalities)
+        location_match = location_match_matrix(user_locations[rows], event_locations)
+        # Expertise match: how close user and host expertise scores are
+        expertise_match = 1.0 - np.abs(user_expertise[rows, None] - host_expertise)
+        return {
+            'quantum': 0.7 * quantum_comp + 0.2 * location_match + 0.1 * expertise_match,
+            'knot': knot_compatibility_matrix(user_knots, user_knots, user_knot_rows[rows], host_knot_rows),
+        }
     
-    # Sort by score (highest first)
-    scores.sort(key=lambda x: x[1], reverse=True)
-    return scores[:num_recommendations]
+    return TopKRecommender(score_block, len(users), len(candidates)), candidates
 
 # ============================================================================
 # ENGAGEMENT SIMULATION
@@ -284,31 +163,43 @@ def simulate_user_engagement(
 # EXPERIMENT EXECUTION
 # ============================================================================
 
-def run_experiment():
-    """Run the knot recommendation experiment."""
+def run_experiment(
+    users: Optional[List[UserProfile]] = None,
+    user_knots: Optional[KnotStore] = None,
+    num_users: int = NUM_USERS,
+    num_events: int = NUM_EVENTS
+):
+    """
+    Run the knot recommendation experiment.
+    
+    `users` and `user_knots` let a suite share one population and its knot
+    store; by default `num_users` profiles are loaded and knots come from the
+    persisted store.
+    """
     print("=" * 80)
     print("KNOT-ENHANCED RECOMMENDATION EXPERIMENT")
     print("=" * 80)
     print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Users: {NUM_USERS}")
-    print(f"Events: {NUM_EVENTS}")
+    print(f"Users: {len(users) if users is not None else num_users}")
+    print(f"Events: {num_events}")
     print(f"Recommendations per user: {NUM_RECOMMENDATIONS_PER_USER}")
     print()
     
     # Setup
     print("📊 Setting up experiment...")
-    print("   Loading profiles from Big Five data (with synthetic fallback)...")
-    project_root = Path(__file__).parent.parent.parent.parent.parent
-    users = load_profiles_with_fallback(
-        num_profiles=NUM_USERS,
-        use_big_five=True,
-        project_root=project_root,
-        fallback_generator=lambda agent_id: generate_integrated_user_profile(agent_id)
-    )
+    if users is None:
+        print("   Loading profiles from Big Five data (with synthetic fallback)...")
+        project_root = Path(__file__).parent.parent.parent.parent.parent
+        users = load_profiles_with_fallback(
+            num_profiles=num_users,
+            use_big_five=True,
+            project_root=project_root,
+            fallback_generator=lambda agent_id: generate_integrated_user_profile(agent_id)
+        )
     
     hosts = {}
     events = []
-    for i in range(NUM_EVENTS):
+    for i in range(num_events):
         host = random.choice(users)
         hosts[host.agent_id] = host
         
@@ -327,27 +218,35 @@ def run_experiment():
     print()
     
     # Generate knots for all users
-    print("🔗 Generating personality knots...")
-    user_knots = {}
-    host_knots = {}
+    print("🔗 Loading personality knots...")
+    if user_knots is None:
+        user_knots = profile_knot_store(users)
     
-    for user in users:
-        knot = generate_knot_for_profile(user)
-        user_knots[user.agent_id] = knot
-        if user.agent_id in hosts:
-            host_knots[user.agent_id] = knot
+    print(f"✅ {len(user_knots)} user knots")
+    print()
+    
+    # Top-k recommendations for every weighting in one pass
+    print("🎯 Selecting top-k recommendations...")
+    recommender, candidates = build_recommender(users, events, hosts, user_knots)
+    sweep = [
+        Weighting(f'knot_bonus_{weight:.2f}', {'quantum': 1.0, 'knot': weight}, upper=1.0)
+        for weight in KNOT_BONUS_SWEEP
+    ]
+    top_k = recommender.recommend([QUANTUM_ONLY, INTEGRATED] + sweep, NUM_RECOMMENDATIONS_PER_USER)
     
-    print(f"✅ Generated {len(user_knots)} user knots")
+    def recommendations_for(items: np.ndarray, scores: np.ndarray) -> List[Tuple[Event, float]]:
+        return [(candidates[i], score) for i, score in zip(items.tolist(), scores.tolist())]
+    
+    print(f"✅ Top {NUM_RECOMMENDATIONS_PER_USER} of {len(candidates)} events for {len(users)} users "
+          f"({len(top_k)} weightings, {recommender.block_size} users per block)")
     print()
     
     # Run control group (quantum-only)
     print("🔬 Running control group (quantum-only recommendations)...")
     control_results = []
     
-    for user in users:
-        recommendations = generate_recommendations_quantum_only(
-            user, events, hosts, NUM_RECOMMENDATIONS_PER_USER
-        )
+    for user, items, scores in zip(users, *top_k[QUANTUM_ONLY.name]):
+        recommendations = recommendations_for(items, scores)
         engagement = simulate_user_engagement(recommendations, user)
         
         control_results.append({
@@ -369,11 +268,8 @@ def run_experiment():
     print("🔬 Running test group (integrated quantum + knot recommendations)...")
     test_results = []
     
-    for user in users:
-        user_knot = user_knots[user.agent_id]
-        recommendations = generate_recommendations_integrated(
-            user, events, hosts, user_knot, host_knots, NUM_RECOMMENDATIONS_PER_USER
-        )
+    for user, items, scores in zip(users, *top_k[INTEGRATED.name]):
+        recommendations = recommendations_for(items, scores)
         engagement = simulate_user_engagement(recommendations, user)
         
         test_results.append({
@@ -391,6 +287,24 @@ def run_experiment():
     print(f"✅ Test group complete: {len(test_results)} users")
     print()
     
+    # Knot bonus weightings (same pass): compatibility and overlap with quantum-only
+    print("⚖️  Comparing knot bonus weightings...")
+    control_items = top_k[QUANTUM_ONLY.name][0]
+    weighting_rows = []
+    for weighting in [QUANTUM_ONLY, INTEGRATED] + sweep:
+        items, scores = top_k[weighting.name]
+        shared = (items[:, :, None] == control_items[:, None, :]).any(axis=2)
+        weighting_rows.append({
+            'weighting': weighting.name,
+            'knot_bonus': weighting.weights.get('knot', 0.0),
+            'avg_compatibility': float(scores.mean()) if scores.size else 0.0,
+            'overlap_with_quantum_only': float(shared.mean()) if shared.size else 0.0,
+        })
+        print(f"  {weighting.name}: avg compatibility {weighting_rows[-1]['avg_compatibility']:.4f}, "
+              f"overlap with quantum-only {weighting_rows[-1]['overlap_with_quantum_only']:.1%}")
+    weighting_df = pd.DataFrame(weighting_rows).sort_values('knot_bonus')
+    print()
+    
     # Statistical analysis
     print("📈 Performing statistical analysis...")
     
@@ -448,12 +362,13 @@ def run_experiment():
     
     control_df.to_csv(RESULTS_DIR / 'control_quantum_only.csv', index=False)
     test_df.to_csv(RESULTS_DIR / 'test_integrated.csv', index=False)
+    weighting_df.to_csv(RESULTS_DIR / 'weighting_sweep.csv', index=False)
     
     with open(RESULTS_DIR / 'analysis.json', 'w') as f:
         json.dump(analysis_results, f, indent=2)
     
     # Generate report
-    report = generate_report(control_df, test_df, analysis_results)
+    report = generate_report(control_df, test_df, analysis_results, len(users), num_events)
     with open(RESULTS_DIR / 'REPORT.md', 'w') as f:
         f.write(report)
     
@@ -492,14 +407,20 @@ def run_experiment():
     
     print("=" * 80)
 
-def generate_report(control_df: pd.DataFrame, test_df: pd.DataFrame, analysis: Dict) -> str:
+def generate_report(
+    control_df: pd.DataFrame,
+    test_df: pd.DataFrame,
+    analysis: Dict,
+    num_users: int = NUM_USERS,
+    num_events: int = NUM_EVENTS
+) -> str:
     """Generate markdown report."""
     report = f"""# Knot-Enhanced Recommendation Experiment Report
 
 **Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
 **Experiment:** EventRecommendationService with/without Knot Integration  
-**Users:** {NUM_USERS}  
-**Events:** {NUM_EVENTS}  
+**Users:** {num_users}  
+**Events:** {num_events}  
 **Recommendations per User:** {NUM_RECOMMENDATIONS_PER_USER}
 
 ---
@@ -580,6 +501,7 @@ The integrated approach (quantum + knot) demonstrates:
 
 - `control_quantum_only.csv` - Control group detailed results
 - `test_integrated.csv` - Test group detailed results
+- `weighting_sweep.csv` - Top-k compatibility and overlap for each knot bonus weight
 - `analysis.json` - Statistical analysis results
 - `REPORT.md` - This report
 
@@ -590,4 +512,8 @@ The integrated approach (quantum + knot) demonstrates:
     return report
 
 if __name__ == '__main__':
-    run_experiment()
+    parser = argparse.ArgumentParser(description='Knot-enhanced recommendation experiment')
+    parser.add_argument('--users', type=int, default=NUM_USERS, help='Number of user profiles')
+    parser.add_argument('--events', type=int, default=NUM_EVENTS, help='Number of candidate events')
+    args = parser.parse_args()
+    run_experiment(num_users=args.users, num_events=args.events)
@@ -41,13 +41,8 @@ from shared_data_model import (
     load_profiles_with_fallback,
 )
 
-# Try to import knot generation
-try:
-    from generate_knots_from_profiles import KnotGenerator
-    KNOT_AVAILABLE = True
-except ImportError:
-    KNOT_AVAILABLE = False
-    print("⚠️  Knot generation not available - using simplified knot simulation")
+# Shared knot store and vectorized knot-compatibility kernel
+from knot_store import KnotStore, knot_compatibility_matrix, profile_knot_store
 
 # Configuration
 DATA_DIR = Path(__file__).parent / 'data'
@@ -88,82 +83,6 @@ class Spot:
         self.tags = tags or []
         self.rating = rating
 
-# ============================================================================
-# KNOT COMPATIBILITY FUNCTIONS
-# ============================================================================
-
-def calculate_knot_compatibility(knot_a: Dict, knot_b: Dict) -> float:
-    """Calculate topological compatibility between two knots."""
-    if not knot_a or not knot_b:
-        return 0.5
-    
-    crossing_a = knot_a.get('crossing_number', 3)
-    crossing_b = knot_b.get('crossing_number', 3)
-    max_crossing = max(crossing_a, crossing_b, 1)
-    complexity_sim = 1.0 - abs(crossing_a - crossing_b) / max_crossing
-    
-    jones_a = knot_a.get('jones_polynomial', [1.0, -1.0])
-    jones_b = knot_b.get('jones_polynomial', [1.0, -1.0])
-    
-    min_len = min(len(jones_a), len(jones_b))
-    if min_len == 0:
-        topological_sim = 0.5
-    else:
-        vec_a = np.array(jones_a[:min_len])
-        vec_b = np.array(jones_b[:min_len])
-        dot_product = np.dot(vec_a, vec_b)
-        norm_a = np.linalg.norm(vec_a)
-        norm_b = np.linalg.norm(vec_b)
-        if norm_a == 0 or norm_b == 0:
-            topological_sim = 0.5
-        else:
-            topological_sim = dot_product / (norm_a * norm_b)
-            topological_sim = max(0.0, min(1.0, topological_sim))
-    
-    return (0.7 * topological_sim + 0.3 * complexity_sim)
-
-def generate_knot_for_profile(profile: UserProfile) -> Dict:
-    """Generate a simplified knot representation for a user profile."""
-    if KNOT_AVAILABLE:
-        try:
-            generator = KnotGenerator()
-            knot = generator.generate_knot_from_profile(profile)
-            return {
-                'crossing_number': knot.get('crossing_number', 3),
-                'jones_polynomial': knot.get('jones_polynomial', [1.0, -1.0]),
-                'writhe': knot.get('writhe', 0.0),
-            }
-        except Exception:
-            pass
-    
-    personality = profile.personality_12d
-    variance = np.var(personality)
-    crossing_number = int(3 + variance * 10)
-    crossing_number = max(3, min(13, crossing_number))
-    
-    jones_coeffs = [1.0] + [np.random.uniform(-1.0, 1.0) for _ in range(crossing_number - 1)]
-    
-    return {
-        'crossing_number': crossing_number,
-        'jones_polynomial': jones_coeffs,
-        'writhe': np.random.uniform(-5.0, 5.0),
-    }
-
-def generate_knot_for_spot(spot: Spot) -> Dict:
-    """Generate a simplified knot representation for a spot."""
-    # Use vibe dimensions to generate knot (similar to personality)
-    variance = np.var(spot.vibe_dimensions)
-    crossing_number = int(3 + variance * 10)
-    crossing_number = max(3, min(13, crossing_number))
-    
-    jones_coeffs = [1.0] + [np.random.uniform(-1.0, 1.0) for _ in range(crossing_number - 1)]
-    
-    return {
-        'crossing_number': crossing_number,
-        'jones_polynomial': jones_coeffs,
-        'writhe': np.random.uniform(-5.0, 5.0),
-    }
-
 # ============================================================================
 # SPOT MATCHING FUNCTIONS
 # ============================================================================
@@ -195,17 +114,18 @@ def calculate_spot_compatibility_vibe_only(
 def calculate_spot_compatibility_integrated(
     user: UserProfile,
     spot: Spot,
-    user_knot: Dict,
-    spot_knot: Dict
+    knot_comp: float
 ) -> float:
-    """Calculate spot-user compatibility using integrated (vibe + knot bonus) approach."""
+    """
+    Calculate spot-user compatibility using integrated (vibe + knot bonus) approach.
+    
+    knot_comp is the user-spot knot compatibility (precomputed with
+    knot_compatibility_matrix), added as a 15% bonus matching SpotVibeMatchingService.
+    """
     # Base vibe compatibility (full score)
     vibe_comp = calculate_vibe_compatibility(user, spot)
     
-    # Knot compatibility (added as 15% bonus, matching SpotVibeMatchingService)
     # Note: Production uses 85% vibe + 15% knot, but we'll add as bonus for consistency
-    knot_comp = calculate_knot_compatibility(user_knot, spot_knot)
-    
     # ADD knot as bonus (15% weight)
     # This way knots can only INCREASE compatibility, not decrease it
     integrated = vibe_comp + (knot_comp * 0.15)
@@ -255,8 +175,13 @@ def generate_spots(num_spots: int) -> List[Spot]:
     
     return spots
 
-def run_experiment():
-    """Run the knot spot matching experiment."""
+def run_experiment(users: Optional[List[UserProfile]] = None, user_knots: Optional[KnotStore] = None):
+    """
+    Run the knot spot matching experiment.
+    
+    `users` and `user_knots` let a suite share one population and its knot
+    store; by default profiles are loaded and knots come from the persisted store.
+    """
     print("=" * 80)
     print("KNOT-ENHANCED SPOT MATCHING EXPERIMENT")
     print("=" * 80)
@@ -267,34 +192,35 @@ def run_experiment():
     
     # Setup
     print("📊 Setting up experiment...")
-    print("   Loading profiles from Big Five data (with synthetic fallback)...")
-    project_root = Path(__file__).parent.parent.parent.parent.parent
-    users = load_profiles_with_fallback(
-        num_profiles=NUM_USERS,
-        use_big_five=True,
-        project_root=project_root,
-        fallback_generator=lambda agent_id: generate_integrated_user_profile(agent_id)
-    )
+    if users is None:
+        print("   Loading profiles from Big Five data (with synthetic fallback)...")
+        project_root = Path(__file__).parent.parent.parent.parent.parent
+        users = load_profiles_with_fallback(
+            num_profiles=NUM_USERS,
+            use_big_five=True,
+            project_root=project_root,
+            fallback_generator=lambda agent_id: generate_integrated_user_profile(agent_id)
+        )
     
     spots = generate_spots(NUM_SPOTS)
     
     print(f"✅ Setup complete: {len(users)} users, {len(spots)} spots")
     print()
     
-    # Generate knots
-    print("🔗 Generating personality and spot knots...")
-    user_knots = {}
-    spot_knots = {}
-    
-    for user in users:
-        knot = generate_knot_for_profile(user)
-        user_knots[user.agent_id] = knot
-    
-    for spot in spots:
-        knot = generate_knot_for_spot(spot)
-        spot_knots[spot.spot_id] = knot
+    # Knots and user x spot knot compatibility
+    print("🔗 Loading personality and spot knots...")
+    if user_knots is None:
+        user_knots = profile_knot_store(users)
+    spot_knots = KnotStore.for_population(
+        'spots', [spot.spot_id for spot in spots], np.array([spot.vibe_dimensions for spot in spots])
+    )
+    spot_columns = {spot.spot_id: column for column, spot in enumerate(spots)}
+    knot_scores = knot_compatibility_matrix(
+        user_knots, spot_knots, user_knots.rows([user.agent_id for user in users])
+    )
     
-    print(f"✅ Generated {len(user_knots)} user knots, {len(spot_knots)} spot knots")
+    print(f"✅ {len(user_knots)} user knots, {len(spot_knots)} spot knots, "
+          f"{knot_scores.size} user-spot knot scores")
     print()
     
     # Run control group (vibe-only)
@@ -324,13 +250,10 @@ def run_experiment():
     print("🔬 Running test group (integrated vibe + knot matching)...")
     test_results = []
     
-    for user in users:
-        user_knot = user_knots[user.agent_id]
+    for user_row, user in enumerate(users):
         for spot in random.sample(spots, min(20, len(spots))):
-            spot_knot = spot_knots[spot.spot_id]
-            
             compatibility = calculate_spot_compatibility_integrated(
-                user, spot, user_knot, spot_knot
+                user, spot, knot_scores[user_row, spot_columns[spot.spot_id]]
             )
             called = should_call_user(compatibility)
             satisfaction = simulate_user_satisfaction(compatibility, called)
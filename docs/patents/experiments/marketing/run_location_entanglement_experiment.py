@@ -32,17 +32,13 @@ import math
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent))
 from atomic_timing_experiment_base import AtomicTimingExperimentBase
+from quantum_temporal_state import TemporalComponents
 
 # Configuration
 NUM_PAIRS = 1000
 NUM_NODES = 10
 RANDOM_SEED = 42
 
-# Reference time for phase calculation (matches Dart: DateTime(2025, 1, 1))
-PHASE_REFERENCE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
-PHASE_PERIOD_SECONDS = 86400  # 1 day in seconds
-
-
 class LocationQuantumState:
     """
     Location Quantum State - Python implementation matching Dart exactly.
@@ -178,185 +174,6 @@ class LocationQuantumState:
         return inner_prod * inner_prod  # Squared magnitude
 
 
-class QuantumTemporalState:
-    """
-    Quantum Temporal State - Python implementation matching Dart exactly.
-    
-    Represents: |ψ_temporal⟩ = |t_atomic⟩ ⊗ |t_quantum⟩ ⊗ |t_phase⟩
-    """
-    
-    def __init__(
-        self,
-        atomic_state: List[float],
-        quantum_state: List[float],
-        phase_state: List[float],
-        temporal_state: List[float],
-        server_time: datetime,
-        local_time: datetime,
-    ):
-        self.atomic_state = atomic_state
-        self.quantum_state = quantum_state
-        self.phase_state = phase_state
-        self.temporal_state = temporal_state
-        self.server_time = server_time
-        self.local_time = local_time
-    
-    @staticmethod
-    def _generate_atomic_state(precision: str = 'millisecond') -> List[float]:
-        """
-        Generate atomic timestamp quantum state: |t_atomic⟩
-        Matches Dart _generateAtomicState() method.
-        """
-        state = [0.0, 0.0, 0.0]  # [nanosecond, millisecond, second]
-        
-        if precision == 'nanosecond':
-            w_nano, w_milli, w_second = 0.5, 0.3, 0.2
-        else:
-            w_milli, w_second = 0.6, 0.4
-            w_nano = 0.0
-        
-        # Normalize weights
-        total = w_nano + w_milli + w_second
-        w_nano /= total
-        w_milli /= total
-        w_second /= total
-        
-        state[0] = math.sqrt(w_nano)
-        state[1] = math.sqrt(w_milli)
-        state[2] = math.sqrt(w_second)
-        
-        return state
-    
-    @staticmethod
-    def _generate_quantum_state(local_time: datetime) -> List[float]:
-        """
-        Generate quantum temporal state: |t_quantum⟩
-        Matches Dart _generateQuantumState() method exactly.
-        Uses LOCAL time for timezone-aware matching.
-        """
-        # Hour of day (0-23) -> 24-dimensional state (LOCAL hour)
-        hour = local_time.hour
-        hour_state = [0.0] * 24
-        hour_state[hour] = 1.0  # One-hot encoding
-        
-        # Weekday (0=Monday, 6=Sunday) -> 7-dimensional state (LOCAL weekday)
-        weekday = (local_time.weekday() - 1) % 7  # Convert to 0-6
-        weekday_state = [0.0] * 7
-        weekday_state[weekday] = 1.0  # One-hot encoding
-        
-        # Season (Spring, Summer, Fall, Winter) -> 4-dimensional state (LOCAL season)
-        month = local_time.month
-        if 3 <= month <= 5:
-            season_index = 0  # Spring
-        elif 6 <= month <= 8:
-            season_index = 1  # Summer
-        elif 9 <= month <= 11:
-            season_index = 2  # Fall
-        else:
-            season_index = 3  # Winter
-        season_state = [0.0] * 4
-        season_state[season_index] = 1.0  # One-hot encoding
-        
-        # Combine with weights (matches Dart: sqrt(0.4), sqrt(0.3), sqrt(0.3))
-        combined_state = []
-        combined_state.extend([v * math.sqrt(0.4) for v in hour_state])
-        combined_state.extend([v * math.sqrt(0.3) for v in weekday_state])
-        combined_state.extend([v * math.sqrt(0.3) for v in season_state])
-        
-        return combined_state
-    
-    @staticmethod
-    def _generate_phase_state(server_time: datetime) -> List[float]:
-        """
-        Generate quantum phase state: |t_phase⟩ = [cos(φ), sin(φ)]
-        Matches Dart _generatePhaseState() method exactly.
-        """
-        time_diff = server_time - PHASE_REFERENCE_TIME
-        phase = (2 * math.pi * time_diff.total_seconds()) / PHASE_PERIOD_SECONDS
-        
-        return [math.cos(phase), math.sin(phase)]
-    
-    @staticmethod
-    def _combine_states(
-        atomic_state: List[float],
-        quantum_state: List[float],
-        phase_state: List[float],
-    ) -> List[float]:
-        """
-        Combine states using tensor product (simplified).
-        Matches Dart _combineStates() method exactly.
-        """
-        combined = []
-        combined.extend(atomic_state)
-        combined.extend(quantum_state)
-        combined.extend(phase_state)
-        return combined
-    
-    @staticmethod
-    def _normalize_state(state: List[float]) -> List[float]:
-        """
-        Normalize quantum temporal state.
-        Matches Dart _normalizeState() method exactly.
-        """
-        norm = math.sqrt(sum(v * v for v in state))
-        if norm > 0:
-            return [v / norm for v in state]
-        return state
-    
-    @classmethod
-    def generate(
-        cls,
-        server_time: datetime,
-        local_time: datetime,
-        precision: str = 'millisecond',
-    ) -> 'QuantumTemporalState':
-        """
-        Generate quantum temporal state from timestamps.
-        Matches Dart QuantumTemporalStateGenerator.generate() exactly.
-        """
-        # 1. Generate atomic timestamp quantum state
-        atomic_state = cls._generate_atomic_state(precision)
-        
-        # 2. Generate quantum temporal state (uses LOCAL time)
-        quantum_state = cls._generate_quantum_state(local_time)
-        
-        # 3. Generate quantum phase state (uses SERVER time)
-        phase_state = cls._generate_phase_state(server_time)
-        
-        # 4. Combine into quantum temporal state
-        temporal_state = cls._combine_states(atomic_state, quantum_state, phase_state)
-        
-        # 5. Normalize
-        normalized_state = cls._normalize_state(temporal_state)
-        
-        return cls(
-            atomic_state=atomic_state,
-            quantum_state=quantum_state,
-            phase_state=phase_state,
-            temporal_state=normalized_state,
-            server_time=server_time,
-            local_time=local_time,
-        )
-    
-    def inner_product(self, other: 'QuantumTemporalState') -> float:
-        """
-        Calculate quantum inner product: ⟨ψ_temporal_A|ψ_temporal_B⟩
-        Matches Dart innerProduct() method exactly.
-        """
-        if len(self.temporal_state) != len(other.temporal_state):
-            raise ValueError('Temporal states must have same dimension')
-        
-        return sum(a * b for a, b in zip(self.temporal_state, other.temporal_state))
-    
-    def temporal_compatibility(self, other: 'QuantumTemporalState') -> float:
-        """
-        Calculate quantum temporal compatibility: C_temporal = |⟨ψ_temporal_A|ψ_temporal_B⟩|²
-        Matches Dart temporalCompatibility() method exactly.
-        """
-        inner_prod = self.inner_product(other)
-        return inner_prod * inner_prod  # Squared magnitude
-
-
 class LocationEntanglementExperiment(AtomicTimingExperimentBase):
     """A/B Experiment: Location Entanglement Integration (Using REAL Quantum Calculations)"""
     
@@ -487,8 +304,24 @@ class LocationEntanglementExperiment(AtomicTimingExperimentBase):
         """Run test group (enhanced compatibility with FULL quantum state calculations)"""
         results = []
         
-        for pair in pairs:
+        # 3. Timing compatibility (FULL quantum temporal state calculation)
+        # Scored for every pair at once from (hour, weekday, season, phase) arrays;
+        # identical to QuantumTemporalState.generate(...).temporal_compatibility(...)
+        temporal_a = TemporalComponents.from_datetimes(
+            [pair['server_time_a'] for pair in pairs],
+            [pair['local_time_a'] for pair in pairs],
+            precision='millisecond',
+        )
+        temporal_b = TemporalComponents.from_datetimes(
+            [pair['server_time_b'] for pair in pairs],
+            [pair['local_time_b'] for pair in pairs],
+            precision='millisecond',
+        )
+        timing_compatibilities = temporal_a.pairwise_compatibility(temporal_b)
+        
+        for pair, timing_compatibility in zip(pairs, timing_compatibilities):
             base_compatibility = pair['base_compatibility']
+            timing_compatibility = float(timing_compatibility)
             
             # 1. Quantum compatibility (personality) - same as base
             quantum_compatibility = base_compatibility
@@ -514,23 +347,6 @@ class LocationEntanglementExperiment(AtomicTimingExperimentBase):
             # Calculate location compatibility using REAL quantum inner product
             location_compatibility = user_location_state.location_compatibility(event_location_state)
             
-            # 3. Timing compatibility (FULL quantum temporal state calculation)
-            # Create quantum temporal states using REAL implementation
-            temporal_state_a = QuantumTemporalState.generate(
-                server_time=pair['server_time_a'],
-                local_time=pair['local_time_a'],
-                precision='millisecond',
-            )
-            
-            temporal_state_b = QuantumTemporalState.generate(
-                server_time=pair['server_time_b'],
-                local_time=pair['local_time_b'],
-                precision='millisecond',
-            )
-            
-            # Calculate timing compatibility using REAL quantum inner product
-            timing_compatibility = temporal_state_a.temporal_compatibility(temporal_state_b)
-            
             # 4. Combined compatibility (enhanced formula)
             # Formula: 0.5 * personality + 0.3 * location + 0.2 * timing
             combined_compatibility = (
@@ -30,49 +30,17 @@ from scipy import stats
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent))
 from atomic_timing_experiment_base import AtomicTimingExperimentBase
+from feature_matrix_trainer import FeatureMatrixTrainer, features_to_matrix
+from quantum_temporal_state import QuantumTemporalState
 
 # Configuration
 NUM_PAIRS = 1000
 TRAINING_EXAMPLES = 500  # Examples to train the model
+TRAINING_EPOCHS = 50
+LEARNING_RATE = 0.01
+BATCH_SIZE = None  # None = full-batch gradient descent (Dart parity)
 RANDOM_SEED = 42
 
-# Reference time for phase calculation (matches Dart: DateTime(2025, 1, 1))
-PHASE_REFERENCE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
-PHASE_PERIOD_SECONDS = 86400  # 1 day in seconds
-
-
-class QuantumTemporalState:
-    """Quantum Temporal State - Python implementation matching Dart exactly."""
-    
-    def __init__(
-        self,
-        atomic_state: List[float],
-        quantum_state: List[float],
-        phase_state: List[float],
-        temporal_state: List[float],
-        timestamp: datetime,
-    ):
-        self.atomic_state = atomic_state
-        self.quantum_state = quantum_state
-        self.phase_state = phase_state
-        self.temporal_state = temporal_state
-        self.timestamp = timestamp
-    
-    def inner_product(self, other: 'QuantumTemporalState') -> float:
-        """Calculate quantum inner product: ⟨ψ_A|ψ_B⟩"""
-        if len(self.temporal_state) != len(other.temporal_state):
-            raise ValueError('Temporal states must have same dimension')
-        
-        result = 0.0
-        for i in range(len(self.temporal_state)):
-            result += self.temporal_state[i] * other.temporal_state[i]
-        return result
-    
-    def temporal_compatibility(self, other: 'QuantumTemporalState') -> float:
-        """Calculate temporal compatibility: |⟨ψ_A|ψ_B⟩|²"""
-        inner_prod = self.inner_product(other)
-        return inner_prod * inner_prod
-
 
 class QuantumVibeState:
     """Quantum Vibe State - Python implementation matching Dart exactly."""
@@ -284,26 +252,7 @@ class QuantumPredictionTrainingExperiment(AtomicTimingExperimentBase):
     
     def _create_temporal_state(self, timestamp: datetime) -> QuantumTemporalState:
         """Create quantum temporal state from timestamp."""
-        atomic_state = [1.0, 0.0]
-        quantum_state = [
-            np.sin(2 * np.pi * timestamp.hour / 24),
-            np.cos(2 * np.pi * timestamp.weekday() / 7),
-            np.sin(2 * np.pi * timestamp.month / 12),
-        ]
-        phase_state = [np.cos(2 * np.pi * timestamp.timestamp() / PHASE_PERIOD_SECONDS)]
-        temporal_state = atomic_state + quantum_state + phase_state
-        
-        norm = math.sqrt(sum(x * x for x in temporal_state))
-        if norm > 0:
-            temporal_state = [x / norm for x in temporal_state]
-        
-        return QuantumTemporalState(
-            atomic_state=atomic_state,
-            quantum_state=quantum_state,
-            phase_state=phase_state,
-            temporal_state=temporal_state,
-            timestamp=timestamp,
-        )
+        return QuantumTemporalState.generate(server_time=timestamp, local_time=timestamp, precision='millisecond')
     
     def _calculate_ground_truth(self, features: QuantumPredictionFeatures) -> float:
         """Calculate ground truth prediction (simulated)."""
@@ -328,38 +277,19 @@ class QuantumPredictionTrainingExperiment(AtomicTimingExperimentBase):
     
     def _train_model(self, training_examples: List[Dict]) -> Dict[str, float]:
         """Train model using gradient descent (matching Dart implementation)."""
+        # Materialize features once; each epoch is a clipped matrix update
+        matrix, feature_names = features_to_matrix([example['features'] for example in training_examples])
+        ground_truths = np.array([example['ground_truth'] for example in training_examples])
+        
+        trainer = FeatureMatrixTrainer(
+            feature_names,
+            learning_rate=LEARNING_RATE,
+            epochs=TRAINING_EPOCHS,
+            batch_size=BATCH_SIZE,
+            seed=RANDOM_SEED,
+        )
         # Initialize weights (from enhancer)
-        feature_names = training_examples[0]['features'].get_feature_names()
-        weights = self._initialize_weights(feature_names)
-        
-        # Train for multiple epochs
-        learning_rate = 0.01
-        epochs = 50
-        
-        for epoch in range(epochs):
-            # Calculate gradients
-            gradients = {name: 0.0 for name in feature_names}
-            
-            for example in training_examples:
-                features = example['features']
-                ground_truth = example['ground_truth']
-                
-                # Predict
-                prediction = self._predict(weights, features)
-                error = prediction - ground_truth
-                
-                # Calculate gradients
-                feature_vector = features.to_feature_vector()
-                for i, name in enumerate(feature_names):
-                    if i < len(feature_vector):
-                        gradients[name] += error * feature_vector[i]
-            
-            # Update weights
-            for name in feature_names:
-                gradient = gradients[name] / len(training_examples)
-                weights[name] = max(-1.0, min(1.0, weights[name] - learning_rate * gradient))
-        
-        return weights
+        return trainer.fit(matrix, ground_truths, self._initialize_weights(feature_names))
     
     def _initialize_weights(self, feature_names: List[str]) -> Dict[str, float]:
         """Initialize weights from enhancer (matching Dart implementation)."""
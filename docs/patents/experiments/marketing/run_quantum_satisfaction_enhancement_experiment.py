@@ -31,15 +31,14 @@ from scipy import stats
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent))
 from atomic_timing_experiment_base import AtomicTimingExperimentBase
+from feature_matrix_trainer import FeatureMatrixTrainer, features_to_matrix
+from quantum_temporal_state import QuantumTemporalState
 
 # Configuration
 NUM_PAIRS = 1000
+TRAINING_EPOCHS = 200  # Enhancer weight training (held-out evaluation)
 RANDOM_SEED = 42
 
-# Reference time for phase calculation (matches Dart: DateTime(2025, 1, 1))
-PHASE_REFERENCE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
-PHASE_PERIOD_SECONDS = 86400  # 1 day in seconds
-
 # Vibe dimensions (12 core dimensions from VibeConstants)
 CORE_DIMENSIONS = [
     'exploration_eagerness',
@@ -57,39 +56,6 @@ CORE_DIMENSIONS = [
 ]
 
 
-class QuantumTemporalState:
-    """Quantum Temporal State - Python implementation matching Dart exactly."""
-    
-    def __init__(
-        self,
-        atomic_state: List[float],
-        quantum_state: List[float],
-        phase_state: List[float],
-        temporal_state: List[float],
-        timestamp: datetime,
-    ):
-        self.atomic_state = atomic_state
-        self.quantum_state = quantum_state
-        self.phase_state = phase_state
-        self.temporal_state = temporal_state
-        self.timestamp = timestamp
-    
-    def inner_product(self, other: 'QuantumTemporalState') -> float:
-        """Calculate quantum inner product: ⟨ψ_A|ψ_B⟩"""
-        if len(self.temporal_state) != len(other.temporal_state):
-            raise ValueError('Temporal states must have same dimension')
-        
-        result = 0.0
-        for i in range(len(self.temporal_state)):
-            result += self.temporal_state[i] * other.temporal_state[i]
-        return result
-    
-    def temporal_compatibility(self, other: 'QuantumTemporalState') -> float:
-        """Calculate temporal compatibility: |⟨ψ_A|ψ_B⟩|²"""
-        inner_prod = self.inner_product(other)
-        return inner_prod * inner_prod
-
-
 class QuantumVibeState:
     """Quantum Vibe State - Python implementation matching Dart exactly."""
     
@@ -222,6 +188,36 @@ class QuantumSatisfactionFeatures:
         self.phase_alignment = phase_alignment
         self.location_quantum_match = location_quantum_match
         self.timing_quantum_match = timing_quantum_match
+    
+    def to_feature_vector(self) -> List[float]:
+        """Convert to feature vector for model input."""
+        return [
+            self.context_match,
+            self.preference_alignment,
+            self.novelty_score,
+            self.quantum_vibe_match,
+            self.entanglement_compatibility,
+            max(0.0, min(1.0, self.interference_effect)),  # Positive interference only
+            self.location_quantum_match,
+            self.timing_quantum_match,
+        ]
+    
+    def get_feature_names(self) -> List[str]:
+        """Get feature names."""
+        return [
+            'contextMatch',
+            'preferenceAlignment',
+            'noveltyScore',
+            'quantumVibeMatch',
+            'entanglementCompatibility',
+            'interferenceEffect',
+            'locationQuantumMatch',
+            'timingQuantumMatch',
+        ]
+    
+    def decoherence_multiplier(self) -> float:
+        """Multiplier applied after the weighted sum (1 + decoherence optimization)."""
+        return 1.0 + self.decoherence_optimization if self.decoherence_optimization > 0.0 else 1.0
 
 
 class QuantumSatisfactionFeatureExtractor:
@@ -419,8 +415,25 @@ class QuantumSatisfactionFeatureExtractor:
 class QuantumSatisfactionEnhancer:
     """Enhance satisfaction with quantum features - matching Dart implementation."""
     
-    def __init__(self, feature_extractor: QuantumSatisfactionFeatureExtractor):
+    # Enhanced satisfaction model: existing features (reduced weights) + quantum values (new weights)
+    DEFAULT_WEIGHTS = {
+        'contextMatch': 0.25,
+        'preferenceAlignment': 0.25,
+        'noveltyScore': 0.15,
+        'quantumVibeMatch': 0.15,  # 12 vibe dimensions
+        'entanglementCompatibility': 0.10,  # Entanglement strength
+        'interferenceEffect': 0.05,  # Quantum interference (positive only)
+        'locationQuantumMatch': 0.03,  # Location quantum
+        'timingQuantumMatch': 0.02,  # Timing quantum
+    }
+    
+    def __init__(
+        self,
+        feature_extractor: QuantumSatisfactionFeatureExtractor,
+        weights: Optional[Dict[str, float]] = None,
+    ):
         self.feature_extractor = feature_extractor
+        self.weights = dict(weights) if weights is not None else dict(self.DEFAULT_WEIGHTS)
     
     def enhance_satisfaction(
         self,
@@ -460,68 +473,49 @@ class QuantumSatisfactionEnhancer:
         features: QuantumSatisfactionFeatures,
     ) -> float:
         """Apply quantum enhancement to base satisfaction."""
-        # Enhanced satisfaction model with quantum values
-        # Existing features (reduced weights)
-        enhanced = (
-            features.context_match * 0.25 +
-            features.preference_alignment * 0.25 +
-            features.novelty_score * 0.15
+        return self.predict(features)
+    
+    def predict(self, features: QuantumSatisfactionFeatures) -> float:
+        """Enhanced satisfaction for already-extracted quantum features."""
+        enhanced = sum(
+            value * self.weights.get(name, 0.0)
+            for name, value in zip(features.get_feature_names(), features.to_feature_vector())
         )
         
-        # Quantum values (new weights)
-        enhanced += features.quantum_vibe_match * 0.15  # 12 vibe dimensions
-        enhanced += features.entanglement_compatibility * 0.10  # Entanglement strength
-        enhanced += max(0.0, min(1.0, features.interference_effect)) * 0.05  # Quantum interference (positive only)
-        enhanced += features.location_quantum_match * 0.03  # Location quantum
-        enhanced += features.timing_quantum_match * 0.02  # Timing quantum
-        
         # Apply decoherence optimization
-        if features.decoherence_optimization > 0.0:
-            enhanced *= (1.0 + features.decoherence_optimization)
+        enhanced *= features.decoherence_multiplier()
         
         return max(0.0, min(1.0, enhanced))
+    
+    def train(
+        self,
+        features: List[QuantumSatisfactionFeatures],
+        ground_truths: List[float],
+        epochs: int = 50,
+        learning_rate: float = 0.01,
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, float]:
+        """Fit the enhancement weights to observed satisfaction (starts from current weights)."""
+        matrix, feature_names = features_to_matrix(features)
+        trainer = FeatureMatrixTrainer(
+            feature_names,
+            learning_rate=learning_rate,
+            epochs=epochs,
+            batch_size=batch_size,
+            seed=RANDOM_SEED,
+        )
+        self.weights = trainer.fit(
+            matrix,
+            np.asarray(ground_truths, dtype=float),
+            self.weights,
+            scale=np.array([f.decoherence_multiplier() for f in features]),
+        )
+        return self.weights
 
 
 def generate_quantum_temporal_state(timestamp: datetime) -> QuantumTemporalState:
     """Generate quantum temporal state from timestamp - matching Dart implementation."""
-    # Simplified version - full implementation would match QuantumTemporalStateGenerator
-    # For experiment, we'll create a basic temporal state
-    
-    # Atomic state (3 dimensions)
-    atomic_state = [0.5, 0.3, 0.2]
-    
-    # Quantum state (hour, weekday, season - 35 dimensions total)
-    hour = timestamp.hour
-    weekday = timestamp.weekday() - 1  # 0-6
-    month = timestamp.month
-    season_index = (month - 1) // 3  # 0-3
-    
-    hour_state = [0.0] * 24
-    hour_state[hour] = 1.0
-    
-    weekday_state = [0.0] * 7
-    weekday_state[weekday] = 1.0
-    
-    season_state = [0.0] * 4
-    season_state[season_index] = 1.0
-    
-    quantum_state = hour_state + weekday_state + season_state
-    
-    # Phase state (from reference time)
-    time_diff = (timestamp - PHASE_REFERENCE_TIME).total_seconds()
-    phase_value = (time_diff % PHASE_PERIOD_SECONDS) / PHASE_PERIOD_SECONDS * 2 * math.pi
-    phase_state = [math.cos(phase_value), math.sin(phase_value)]
-    
-    # Temporal state (combined)
-    temporal_state = atomic_state + quantum_state + phase_state
-    
-    return QuantumTemporalState(
-        atomic_state=atomic_state,
-        quantum_state=quantum_state,
-        phase_state=phase_state,
-        temporal_state=temporal_state,
-        timestamp=timestamp,
-    )
+    return QuantumTemporalState.generate(server_time=timestamp, local_time=timestamp, precision='millisecond')
 
 
 class QuantumSatisfactionEnhancementExperiment(AtomicTimingExperimentBase):
@@ -588,6 +582,7 @@ class QuantumSatisfactionEnhancementExperiment(AtomicTimingExperimentBase):
             decoherence_tracking=decoherence_tracking,
         )
         enhancer = QuantumSatisfactionEnhancer(feature_extractor=feature_extractor)
+        self.test_features = []
         
         results = []
         for pair in pairs:
@@ -610,8 +605,7 @@ class QuantumSatisfactionEnhancementExperiment(AtomicTimingExperimentBase):
             base_satisfaction = max(0.0, min(1.0, base_satisfaction))
             
             # Enhanced satisfaction with quantum features
-            satisfaction = enhancer.enhance_satisfaction(
-                base_satisfaction=base_satisfaction,
+            features = feature_extractor.extract_features(
                 user_id=user_id,
                 user_vibe_dimensions=user_vibe_dimensions,
                 event_vibe_dimensions=event_vibe_dimensions,
@@ -623,6 +617,8 @@ class QuantumSatisfactionEnhancementExperiment(AtomicTimingExperimentBase):
                 preference_alignment=preference_alignment,
                 novelty_score=novelty_score,
             )
+            self.test_features.append(features)
+            satisfaction = enhancer._apply_quantum_enhancement(base_satisfaction, features)
             
             ground_truth = pair.get('ground_truth', satisfaction)
             accuracy = 1.0 - abs(satisfaction - ground_truth)
@@ -760,8 +756,45 @@ class QuantumSatisfactionEnhancementExperiment(AtomicTimingExperimentBase):
             'error_cohens_d': error_cohens_d,
         }
         
+        results.update(self.evaluate_trained_enhancer(test_pairs))
+        
         return results
     
+    def evaluate_trained_enhancer(self, pairs: List[Dict]) -> Dict:
+        """Train enhancer weights on the first half of the pairs, evaluate on the second half."""
+        # Only pairs with an observed satisfaction can be trained on or scored
+        labelled = [
+            (features, pair['ground_truth'])
+            for features, pair in zip(self.test_features, pairs)
+            if 'ground_truth' in pair
+        ]
+        features = [f for f, _ in labelled]
+        ground_truths = np.array([gt for _, gt in labelled], dtype=float)
+        split = len(labelled) // 2
+        if split == 0:
+            return {}
+        
+        enhancer = QuantumSatisfactionEnhancer(feature_extractor=QuantumSatisfactionFeatureExtractor())
+        fixed_errors = np.array([
+            abs(enhancer.predict(f) - gt)
+            for f, gt in zip(features[split:], ground_truths[split:])
+        ])
+        trained_weights = enhancer.train(
+            features[:split],
+            ground_truths[:split],
+            epochs=TRAINING_EPOCHS,
+        )
+        trained_errors = np.array([
+            abs(enhancer.predict(f) - gt)
+            for f, gt in zip(features[split:], ground_truths[split:])
+        ])
+        
+        return {
+            'trained_enhancer_weights': trained_weights,
+            'fixed_weights_holdout_accuracy': float(1.0 - fixed_errors.mean()),
+            'trained_weights_holdout_accuracy': float(1.0 - trained_errors.mean()),
+        }
+    
     def format_results(self, results: Dict) -> str:
         """Format results for display."""
         output = []
@@ -800,6 +833,13 @@ class QuantumSatisfactionEnhancementExperiment(AtomicTimingExperimentBase):
         output.append(f"Statistical Significance: p = {results['error_p_value']:.6f} {'✅' if results['error_p_value'] < 0.01 else '❌'}")
         output.append(f"Effect Size (Cohen's d): {results['error_cohens_d']:.4f}")
         output.append("")
+        if 'trained_weights_holdout_accuracy' in results:
+            output.append("-" * 80)
+            output.append(f"TRAINED ENHANCER WEIGHTS ({TRAINING_EPOCHS} epochs, held-out half)")
+            output.append("-" * 80)
+            output.append(f"Fixed Weights Accuracy: {results['fixed_weights_holdout_accuracy']:.4f}")
+            output.append(f"Trained Weights Accuracy: {results['trained_weights_holdout_accuracy']:.4f}")
+            output.append("")
         output.append("=" * 80)
         
         return "\n".join(output)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Shared Differential Privacy Mechanisms
+
+Vectorized noise mechanisms used by the DP experiments (Patents #13, #18,
+#21). Every mechanism works on whole arrays (a single profile, or an
+N x 12 profile matrix) and draws from an explicit numpy Generator so runs
+are reproducible and independent of the global random state.
+
+- Laplace mechanism: Lap(0, Δf/ε), pure ε-DP
+- Gaussian mechanism: N(0, σ²) with σ = Δf·√(2 ln(1.25/δ))/ε, (ε, δ)-DP
+- Bounded uniform noise: the ±magnitude jitter used for location obfuscation
+- PrivacyAccountant: cumulative ε (and δ) per agent across queries under
+  sequential composition
+
+Date: October 18, 2026
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_SEED = 42
+DEFAULT_DELTA = 1e-5
+
+
+def make_rng(seed: Optional[int] = DEFAULT_SEED) -> np.random.Generator:
+    """Seeded Generator stream (seed=None for OS entropy)."""
+    return np.random.default_rng(seed)
+
+
+# Shared stream for calls without an explicit rng, so repeated calls draw fresh noise
+_DEFAULT_RNG = make_rng()
+
+
+def _rng(rng: Optional[np.random.Generator]) -> np.random.Generator:
+    return rng if rng is not None else _DEFAULT_RNG
+
+
+def laplace_scale(epsilon: float, sensitivity: float = 1.0) -> float:
+    """Laplace scale b = Δf/ε (infinite for ε ≤ 0)."""
+    return sensitivity / epsilon if epsilon > 0 else float('inf')
+
+
+def gaussian_sigma(epsilon: float, delta: float = DEFAULT_DELTA, sensitivity: float = 1.0) -> float:
+    """Gaussian mechanism σ = Δf·√(2 ln(1.25/δ))/ε."""
+    if epsilon <= 0:
+        return float('inf')
+    return sensitivity * np.sqrt(2.0 * np.log(1.25 / delta)) / epsilon
+
+
+def laplace_noise(
+    shape, epsilon: float, sensitivity: float = 1.0, rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """Laplace noise array of the given shape."""
+    rng = _rng(rng)
+    return rng.laplace(0.0, laplace_scale(epsilon, sensitivity), shape)
+
+
+def _clip(values: np.ndarray, clip: Optional[Tuple[float, float]]) -> np.ndarray:
+    return np.clip(values, clip[0], clip[1]) if clip is not None else values
+
+
+def laplace_mechanism(
+    values,
+    epsilon: float,
+    sensitivity: float = 1.0,
+    rng: Optional[np.random.Generator] = None,
+    clip: Optional[Tuple[float, float]] = (0.0, 1.0),
+) -> np.ndarray:
+    """
+    Add Laplace noise to every element of `values`.
+
+    Clipping to `clip` is post-processing and does not affect the
+    guarantee; pass clip=None to keep raw noisy values.
+    """
+    values = np.asarray(values, dtype=float)
+    return _clip(values + laplace_noise(values.shape, epsilon, sensitivity, rng), clip)
+
+
+def gaussian_mechanism(
+    values,
+    epsilon: float,
+    delta: float = DEFAULT_DELTA,
+    sensitivity: float = 1.0,
+    rng: Optional[np.random.Generator] = None,
+    clip: Optional[Tuple[float, float]] = (0.0, 1.0),
+) -> np.ndarray:
+    """Add Gaussian noise calibrated for (ε, δ)-DP to every element of `values`."""
+    values = np.asarray(values, dtype=float)
+    rng = _rng(rng)
+    noise = rng.normal(0.0, gaussian_sigma(epsilon, delta, sensitivity), values.shape)
+    return _clip(values + noise, clip)
+
+
+def bounded_uniform_noise(values, magnitude: float, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Add uniform noise in [-magnitude, magnitude) to every element of `values`."""
+    values = np.asarray(values, dtype=float)
+    rng = _rng(rng)
+    return values + rng.uniform(-magnitude, magnitude, values.shape)
+
+
+def normalize_rows(matrix: np.ndarray, fallback: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    L2-normalize each row (quantum state normalization).
+
+    Rows with zero norm are replaced by the normalized `fallback` row when
+    given, otherwise left as zeros.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    normalized = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+    if fallback is not None:
+        zero = (norms == 0).reshape(norms.shape[:-1])
+        if zero.any():
+            fallback = np.broadcast_to(np.asarray(fallback, dtype=float), matrix.shape)
+            normalized[zero] = normalize_rows(fallback[zero])
+    return normalized
+
+
+class PrivacyAccountant:
+    """
+    Cumulative privacy loss per agent under sequential composition.
+
+    Each query that releases data about a set of agents adds its ε (and δ)
+    to those agents' running totals; agents that have used up the budget
+    are reported by exhausted().
+    """
+
+    def __init__(self, num_agents: int, epsilon_budget: float = float('inf'), delta_budget: float = 1.0):
+        self.epsilon_budget = epsilon_budget
+        self.delta_budget = delta_budget
+        self.epsilon_spent = np.zeros(num_agents)
+        self.delta_spent = np.zeros(num_agents)
+        self.num_queries = np.zeros(num_agents, dtype=np.int64)
+
+    @property
+    def num_agents(self) -> int:
+        return len(self.epsilon_spent)
+
+    def _agents(self, agents) -> np.ndarray:
+        if agents is None:
+            return np.arange(self.num_agents)
+        return np.asarray(agents, dtype=np.int64).reshape(-1)
+
+    def spend(self, epsilon: float, agents=None, delta: float = 0.0) -> None:
+        """Charge an (ε, δ) query to agents (repeated ids are charged repeatedly)."""
+        agents = self._agents(agents)
+        np.add.at(self.epsilon_spent, agents, epsilon)
+        np.add.at(self.delta_spent, agents, delta)
+        np.add.at(self.num_queries, agents, 1)
+
+    def remaining(self, agents=None) -> np.ndarray:
+        """Remaining ε budget per agent."""
+        return self.epsilon_budget - self.epsilon_spent[self._agents(agents)]
+
+    def exhausted(self) -> np.ndarray:
+        """Ids of agents that have reached their ε or δ budget."""
+        return np.flatnonzero((self.epsilon_spent >= self.epsilon_budget - 1e-12) |
+                              (self.delta_spent >= self.delta_budget - 1e-12))
+
+    def summary(self) -> dict:
+        """Aggregate privacy loss statistics."""
+        return {
+            'num_agents': self.num_agents,
+            'total_queries': int(self.num_queries.sum()),
+            'max_epsilon_spent': float(self.epsilon_spent.max()) if self.num_agents else 0.0,
+            'mean_epsilon_spent': float(self.epsilon_spent.mean()) if self.num_agents else 0.0,
+            'max_delta_spent': float(self.delta_spent.max()) if self.num_agents else 0.0,
+            'epsilon_budget': self.epsilon_budget if np.isfinite(self.epsilon_budget) else None,
+            'agents_exhausted': int(len(self.exhausted())) if np.isfinite(self.epsilon_budget) else 0,
+        }
+
+
+def privacy_utility_sweep(
+    matrix: np.ndarray,
+    epsilons: Sequence[float],
+    sensitivity: float = 1.0,
+    rng: Optional[np.random.Generator] = None,
+    mechanism: str = 'laplace',
+    delta: float = DEFAULT_DELTA,
+) -> list:
+    """
+    Utility of a mechanism over a whole profile matrix for each ε.
+
+    Returns one dict per ε with mean absolute noise and mean per-row
+    Pearson correlation between original and noisy rows.
+    """
+    rng = _rng(rng)
+    matrix = np.asarray(matrix, dtype=float)
+    results = []
+    for epsilon in epsilons:
+        if mechanism == 'gaussian':
+            noisy = gaussian_mechanism(matrix, epsilon, delta, sensitivity, rng)
+        else:
+            noisy = laplace_mechanism(matrix, epsilon, sensitivity, rng)
+        results.append({
+            'epsilon': epsilon,
+            'mechanism': mechanism,
+            'avg_noise': float(np.abs(noisy - matrix).mean()),
+            'avg_correlation': float(np.nanmean(row_correlations(matrix, noisy))),
+        })
+    return results
+
+
+def row_correlations(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pearson correlation of each row of `a` with the same row of `b` (NaN if constant)."""
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    a_centered = a - a.mean(axis=-1, keepdims=True)
+    b_centered = b - b.mean(axis=-1, keepdims=True)
+    denominator = np.sqrt((a_centered ** 2).sum(axis=-1) * (b_centered ** 2).sum(axis=-1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (a_centered * b_centered).sum(axis=-1) / denominator
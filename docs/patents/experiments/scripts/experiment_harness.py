@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Experiment Harness - In-Process Benchmarking for Patent Experiments
+
+Shared helpers for running patent experiment entry points inside a process
+pool instead of shelling out to `python3 run_patent_*.py`:
+- Each experiment runs in a fresh worker process (one task per worker), so
+  peak RSS and CPU time are attributable to that experiment alone
+- Per-experiment timeouts are enforced inside the worker
+- Experiment stdout is captured to a per-experiment log file
+- Scaling exponents are fitted across agent counts (duration ≈ a · N^b)
+- Experiments declaring data dependencies run as a graph: independent ones
+  run concurrently, and experiments whose code and inputs are unchanged
+  since their last successful run are skipped
+
+Date: October 18, 2026
+"""
+
+import ast
+import contextlib
+import hashlib
+import importlib
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SCRIPTS_DIR = Path(__file__).parent
+
+
+@dataclass
+class ExperimentSpec:
+    """
+    A patent experiment entry point that can be run in a worker process.
+
+    `module` and `function` name a top-level function in the scripts
+    directory (e.g. run_patent_1_experiments.run_patent_1_experiments).
+    `depends_on` names other specs that must succeed first, `inputs` are
+    files or directories whose contents feed the run fingerprint, and
+    `outputs` must all exist for a cached run to be skipped.
+    """
+    name: str
+    module: str
+    function: str
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    timeout: float = 3600.0  # seconds
+    max_agents: Optional[int] = None  # Skip above this agent count (None = no limit)
+    depends_on: Tuple[str, ...] = ()
+    inputs: Tuple[Path, ...] = ()
+    outputs: Tuple[Path, ...] = ()
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    if sys.platform == 'darwin':
+        return max_rss / (1024 * 1024)
+    return max_rss / 1024
+
+
+class ExperimentTimeout(BaseException):
+    """
+    Raised by the worker's alarm handler.
+
+    Derives from BaseException so experiments that catch Exception around
+    optional sub-experiments cannot swallow the timeout.
+    """
+
+
+def _raise_timeout(signum, frame):
+    raise ExperimentTimeout()
+
+
+def run_experiment_worker(spec: ExperimentSpec, log_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run one experiment entry point and measure it.
+
+    Intended to run inside a fresh worker process. Returns a JSON-serializable
+    dict with status, wall-clock duration, CPU time and peak RSS.
+    """
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+
+    result = {
+        'name': spec.name,
+        'status': 'success',
+        'duration': 0.0,
+        'cpu_time': 0.0,
+        'peak_rss_mb': 0.0,
+        'error': None,
+    }
+
+    use_alarm = hasattr(signal, 'SIGALRM') and spec.timeout
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.alarm(int(max(1, spec.timeout)))
+
+    log_file = open(log_path, 'w') if log_path else open(os.devnull, 'w')
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        with contextlib.redirect_stdout(log_file), contextlib.redirect_stderr(log_file):
+            module = importlib.import_module(spec.module)
+            getattr(module, spec.function)(**spec.kwargs)
+    except ExperimentTimeout:
+        result['status'] = 'timeout'
+        result['error'] = f"exceeded {spec.timeout:.0f}s"
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = f"{type(e).__name__}: {e}"
+        traceback.print_exc(file=log_file)
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+        result['duration'] = time.perf_counter() - wall_start
+        result['cpu_time'] = time.process_time() - cpu_start
+        log_file.close()
+
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def _new_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Process pool with fresh 'spawn' workers recycled after every task."""
+    context = multiprocessing.get_context('spawn')
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                               max_tasks_per_child=1)
+
+
+def _collect_result(future, spec: ExperimentSpec) -> Dict[str, Any]:
+    try:
+        return future.result()
+    except Exception as e:  # Worker crashed (e.g. killed by the OOM killer)
+        return {'name': spec.name, 'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+
+
+def run_experiments_in_pool(
+    specs: Sequence[ExperimentSpec],
+    max_workers: Optional[int] = None,
+    log_dir: Optional[Path] = None,
+    on_complete: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run experiments concurrently, one fresh worker process per experiment.
+
+    Workers are started with the 'spawn' method and recycled after every task
+    so that RSS and CPU measurements are not polluted by earlier experiments.
+    `on_complete` is called in the parent with each result as it finishes.
+    """
+    if not specs:
+        return {}
+    if max_workers is None:
+        max_workers = min(len(specs), os.cpu_count() or 1)
+
+    results = {}
+    with _new_pool(max_workers) as executor:
+        futures = {}
+        for spec in specs:
+            log_path = str(log_dir / f'{spec.name}.log') if log_dir else None
+            futures[executor.submit(run_experiment_worker, spec, log_path)] = spec
+
+        for future in as_completed(futures):
+            spec = futures[future]
+            result = _collect_result(future, spec)
+            results[spec.name] = result
+            if on_complete is not None:
+                on_complete(result)
+
+    return results
+
+
+def fit_scaling_exponent(agent_counts: Sequence[float], values: Sequence[float]) -> Optional[Tuple[float, float]]:
+    """
+    Fit values ≈ a · N^b by least squares in log-log space.
+
+    Returns (b, a), or None if fewer than two positive data points exist.
+    An exponent b near 1 means linear scaling, near 2 means quadratic.
+    """
+    points = [(n, v) for n, v in zip(agent_counts, values) if n and v and n > 0 and v > 0]
+    if len(points) < 2:
+        return None
+    log_n = np.log([p[0] for p in points])
+    log_v = np.log([p[1] for p in points])
+    slope, intercept = np.polyfit(log_n, log_v, 1)
+    return float(slope), float(np.exp(intercept))
+
+
+def extrapolate_max_agents(exponent: float, coefficient: float, budget: float) -> float:
+    """Largest N with a · N^b ≤ budget, given a fitted (b, a)."""
+    if exponent <= 0 or coefficient <= 0:
+        return float('inf')
+    return (budget / coefficient) ** (1.0 / exponent)
+
+
+# ============================================================================
+# DEPENDENCY GRAPH AND RUN CACHE
+# ============================================================================
+
+def local_module_sources(module: str) -> List[Path]:
+    """
+    Source files of a scripts-directory module and every local module it
+    imports (transitively, including imports inside functions).
+    """
+    seen = {}
+    pending = [module]
+    while pending:
+        name = pending.pop()
+        path = SCRIPTS_DIR / f'{name}.py'
+        if name in seen or not path.exists():
+            continue
+        seen[name] = path
+        tree = ast.parse(path.read_text(encoding='utf-8'), filename=str(path))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                pending.extend(alias.name.split('.')[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                pending.append(node.module.split('.')[0])
+    return [seen[name] for name in sorted(seen)]
+
+
+def _hash_path(digest, path: Path):
+    """Feed a file, or every file under a directory, into a hash."""
+    files = sorted(p for p in path.rglob('*') if p.is_file()) if path.is_dir() else [path]
+    for file_path in files:
+        digest.update(str(file_path.relative_to(path.parent)).encode())
+        if not file_path.exists():
+            digest.update(b'<missing>')
+            continue
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+
+
+def fingerprint_spec(spec: ExperimentSpec) -> str:
+    """Hash of an experiment's code (including local imports), kwargs and inputs."""
+    digest = hashlib.sha256()
+    digest.update(f'{spec.module}.{spec.function}'.encode())
+    digest.update(json.dumps(spec.kwargs, sort_keys=True, default=str).encode())
+    for source in local_module_sources(spec.module):
+        _hash_path(digest, source)
+    for input_path in spec.inputs:
+        _hash_path(digest, Path(input_path))
+    return digest.hexdigest()
+
+
+def load_run_cache(cache_path: Optional[Path]) -> Dict[str, Any]:
+    """Load fingerprints of previous successful runs ({} if none)."""
+    if cache_path is None or not Path(cache_path).exists():
+        return {}
+    try:
+        with open(cache_path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_run_cache(cache_path: Optional[Path], cache: Dict[str, Any]):
+    """Persist fingerprints of successful runs."""
+    if cache_path is None:
+        return
+    Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(cache_path, 'w') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+
+def order_specs(specs: Sequence[ExperimentSpec]) -> List[ExperimentSpec]:
+    """
+    Topologically order specs by `depends_on`.
+
+    Raises ValueError on unknown dependencies or cycles.
+    """
+    by_name = {spec.name: spec for spec in specs}
+    for spec in specs:
+        for dependency in spec.depends_on:
+            if dependency not in by_name:
+                raise ValueError(f"{spec.name} depends on unknown experiment '{dependency}'")
+
+    ordered, state = [], {}
+
+    def visit(spec, path):
+        if state.get(spec.name) == 'done':
+            return
+        if state.get(spec.name) == 'visiting':
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [spec.name])}")
+        state[spec.name] = 'visiting'
+        for dependency in spec.depends_on:
+            visit(by_name[dependency], path + [spec.name])
+        state[spec.name] = 'done'
+        ordered.append(spec)
+
+    for spec in specs:
+        visit(spec, [])
+    return ordered
+
+
+def run_experiment_graph(
+    specs: Sequence[ExperimentSpec],
+    cache_path: Optional[Path] = None,
+    force: bool = False,
+    max_workers: Optional[int] = None,
+    log_dir: Optional[Path] = None,
+    on_complete: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run experiments respecting `depends_on`, as concurrently as possible.
+
+    An experiment is submitted as soon as all its dependencies have finished
+    (successfully or from cache). It is skipped with status 'cached' when its
+    fingerprint matches the last successful run and its outputs exist, and
+    marked 'blocked' when a dependency did not succeed. Fingerprints are
+    taken just before submission so they cover regenerated inputs.
+    """
+    ordered = order_specs(specs)
+    if max_workers is None:
+        max_workers = min(max(len(ordered), 1), os.cpu_count() or 1)
+
+    cache = {} if force else load_run_cache(cache_path)
+    new_cache = dict(load_run_cache(cache_path))
+    results = {}
+    pending = list(ordered)
+
+    def finish(result):
+        results[result['name']] = result
+        if on_complete is not None:
+            on_complete(result)
+
+    with _new_pool(max_workers) as executor:
+        running = {}
+        while pending or running:
+            for spec in list(pending):
+                dependency_status = [results.get(d, {}).get('status') for d in spec.depends_on]
+                if any(status is None for status in dependency_status):
+                    continue
+                pending.remove(spec)
+
+                failed = [d for d, status in zip(spec.depends_on, dependency_status)
+                          if status not in ('success', 'cached')]
+                if failed:
+                    finish({'name': spec.name, 'status': 'blocked',
+                            'error': f"dependency failed: {', '.join(failed)}"})
+                    continue
+
+                fingerprint = fingerprint_spec(spec)
+                outputs_exist = all(Path(p).exists() for p in spec.outputs)
+                if cache.get(spec.name, {}).get('fingerprint') == fingerprint and outputs_exist:
+                    finish({'name': spec.name, 'status': 'cached',
+                            'last_success': cache[spec.name].get('completed_at')})
+                    continue
+
+                log_path = str(log_dir / f'{spec.name}.log') if log_dir else None
+                future = executor.submit(run_experiment_worker, spec, log_path)
+                running[future] = (spec, fingerprint)
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                spec, fingerprint = running.pop(future)
+                result = _collect_result(future, spec)
+                if result['status'] == 'success':
+                    new_cache[spec.name] = {
+                        'fingerprint': fingerprint,
+                        'completed_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                        'duration': result.get('duration'),
+                    }
+                    save_run_cache(cache_path, new_cache)
+                else:
+                    new_cache.pop(spec.name, None)
+                finish(result)
+
+    save_run_cache(cache_path, new_cache)
+    return results
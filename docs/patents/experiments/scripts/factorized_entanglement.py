@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Factorized N-way Entangled States (Matrix Product States)
+
+Patent #29 builds N-way entangled states as tensor products
+|ψ_1⟩ ⊗ |ψ_2⟩ ⊗ ... ⊗ |ψ_N⟩ with 12^N dimensions, which is only feasible for
+N ≤ 4. This module stores the same state as a matrix product state (MPS):
+one site tensor A_k of shape (χ_{k-1}, 12, χ_k) per entity, with bond
+dimension χ.
+
+- A plain tensor product is an MPS with χ = 1
+- Contracting the state with one 12-D vector per site costs O(N·12·χ²),
+  so compatibility with a user profile never materializes the 12^N tensor
+
+`projected_state()` contracts every site except the last with the uniform
+vector (1/12, ..., 1/12). This is exactly the dense "reshape into 12-D
+chunks and average" projection used by `n_way_compatibility` in
+run_patent_29_experiments.py, so factorized and dense states give the same
+scores for N ≤ 4 and the same semantics for any N.
+
+Date: October 18, 2026
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# Quantum vibe dimensions per entity
+SITE_DIMENSION = 12
+
+
+@dataclass
+class MatrixProductState:
+    """
+    N-site matrix product state over 12-D entity states.
+
+    `tensors[k]` has shape (χ_{k-1}, d, χ_k) with χ_0 = χ_N = 1.
+    """
+    tensors: List[np.ndarray]
+
+    @property
+    def num_sites(self) -> int:
+        return len(self.tensors)
+
+    @property
+    def site_dimension(self) -> int:
+        return self.tensors[0].shape[1] if self.tensors else 0
+
+    @property
+    def bond_dimension(self) -> int:
+        """Largest bond dimension χ."""
+        return max((t.shape[2] for t in self.tensors), default=0)
+
+    @classmethod
+    def from_product(cls, states: Sequence[np.ndarray]) -> 'MatrixProductState':
+        """
+        Product state |ψ_1⟩ ⊗ ... ⊗ |ψ_N⟩ (χ = 1), normalized.
+
+        Each site is normalized individually, so the whole state has norm 1
+        whenever every entity state is non-zero.
+        """
+        tensors = []
+        for state in states:
+            state = np.asarray(state, dtype=float)
+            norm = np.linalg.norm(state)
+            if norm > 0:
+                state = state / norm
+            tensors.append(state.reshape(1, -1, 1))
+        return cls(tensors)
+
+    def contract(self, site_vectors: Sequence[np.ndarray], open_site: Optional[int] = None):
+        """
+        Contract each site with a d-vector, optionally leaving one site open.
+
+        Returns a scalar ⟨v_1 ⊗ ... ⊗ v_N|ψ⟩, or a d-vector when `open_site`
+        is given (the vector for that site is ignored). Cost O(N·d·χ²).
+        """
+        if open_site is not None and open_site < 0:
+            open_site += self.num_sites
+
+        left = np.ones(1)
+        for k, tensor in enumerate(self.tensors):
+            if k == open_site:
+                break
+            left = left @ np.tensordot(site_vectors[k], tensor, axes=([0], [1]))
+        if open_site is None:
+            return float(left[0])
+
+        right = np.ones(1)
+        for k in range(self.num_sites - 1, open_site, -1):
+            right = np.tensordot(site_vectors[k], self.tensors[k], axes=([0], [1])) @ right
+        return np.einsum('a,adb,b->d', left, self.tensors[open_site], right)
+
+    def projected_state(self, open_site: int = -1) -> np.ndarray:
+        """
+        Project to a d-dimensional state by averaging over all other sites.
+
+        Equivalent to reshaping the dense state into d-dimensional chunks and
+        taking their mean. Returned unnormalized.
+        """
+        uniform = np.full(self.site_dimension, 1.0 / self.site_dimension)
+        return self.contract([uniform] * self.num_sites, open_site=open_site)
+
+    def norm(self) -> float:
+        """⟨ψ|ψ⟩^½ via transfer matrices, O(N·d·χ³)."""
+        environment = np.ones((1, 1))
+        for tensor in self.tensors:
+            environment = np.einsum('ab,asc,bsd->cd', environment, tensor, tensor)
+        return float(np.sqrt(max(environment[0, 0], 0.0)))
+
+    def to_dense(self) -> np.ndarray:
+        """Materialize the 12^N state vector (small N only, for validation)."""
+        dense = np.ones((1, 1))
+        for tensor in self.tensors:
+            dense = np.tensordot(dense, tensor, axes=([1], [0])).reshape(-1, tensor.shape[2])
+        return dense.reshape(-1)
+
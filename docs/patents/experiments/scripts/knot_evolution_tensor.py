@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Knot Evolution Coefficient Tensor
+
+Padded (profiles x snapshots x degree) representation of knot evolution
+strings for the Patent #31 string-evolution experiments (4 and 8).
+
+Jones/Alexander polynomials of different degrees are stored zero-padded to
+a common width, with a per-snapshot length array recording the true
+coefficient count. Zero padding is exactly what
+KnotEvolutionStringService._interpolatePolynomials() does for a single
+pair, so
+
+    interpolated[i] = poly1[i] * (1 - factor) + poly2[i] * factor
+
+becomes one array expression over every profile, snapshot pair and query.
+
+- KnotEvolutionTensor.generate(): vectorized snapshot simulation
+- KnotEvolutionTensor.from_complexities(): polynomials for recorded
+  complexity histories (e.g. Experiment 4's mood/energy timelines)
+- KnotEvolutionTensor.interpolate(): batched interpolation at arbitrary
+  query times (per-profile searchsorted into the snapshot timeline)
+- KnotEvolutionTensor.interpolate_segments(): fixed factors between every
+  pair of consecutive snapshots
+- padded_mse(): interpolation error against ground truth, matching
+  calculate_interpolation_error() row by row
+
+Date: October 18, 2026
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+POLYNOMIALS = ('jones', 'alexander')
+
+# Degree = max(1, int(complexity * scale)) (matches the experiment generators)
+JONES_DEGREE_SCALE = 5
+ALEXANDER_DEGREE_SCALE = 4
+CROSSING_SCALE = 20
+
+EVOLUTION_NOISE_STD = 0.05
+EVOLUTION_FACTOR_BOUNDS = (0.8, 1.2)
+
+
+def pad_coefficients(polynomials: Sequence[Sequence[float]], width: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Zero-pad coefficient lists into an (N, width) array; returns (coefficients, lengths)."""
+    lengths = np.array([len(p) for p in polynomials], dtype=np.int64)
+    width = width if width is not None else int(lengths.max(initial=0))
+    coefficients = np.zeros((len(polynomials), width))
+    for row, polynomial in enumerate(polynomials):
+        coefficients[row, :len(polynomial)] = polynomial
+    return coefficients, lengths
+
+
+def unpad_coefficients(coefficients: np.ndarray, length: int) -> List[float]:
+    """One padded coefficient row back to a plain list."""
+    return [float(c) for c in coefficients[:length]]
+
+
+def lerp_padded(c1: np.ndarray, len1: np.ndarray, c2: np.ndarray, len2: np.ndarray,
+                factor) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    AVRAI interpolation of padded polynomials (any matching leading shape).
+
+    `factor` broadcasts against the leading axes; the result has length
+    max(len1, len2), like interpolate_polynomials_avrai().
+    """
+    factor = np.asarray(factor, dtype=float)[..., None]
+    coefficients = c1 * (1 - factor) + c2 * factor
+    return coefficients, np.broadcast_to(np.maximum(len1, len2), coefficients.shape[:-1])
+
+
+def lerp_same_degree(c1: np.ndarray, len1: np.ndarray, c2: np.ndarray, len2: np.ndarray,
+                     factor) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Baseline interpolation: linear only when degrees match, otherwise the
+    closer polynomial (factor < 0.5 keeps poly1), like
+    interpolate_polynomials_baseline().
+    """
+    factor = np.asarray(factor, dtype=float)
+    coefficients, _ = lerp_padded(c1, len1, c2, len2, factor)
+    same = np.broadcast_to(len1 == len2, coefficients.shape[:-1])
+    keep_first = np.broadcast_to(factor < 0.5, same.shape)
+    closer = np.where(keep_first[..., None], np.broadcast_to(c1, coefficients.shape),
+                      np.broadcast_to(c2, coefficients.shape))
+    lengths = np.where(same | keep_first, np.broadcast_to(len1, same.shape), np.broadcast_to(len2, same.shape))
+    return np.where(same[..., None], coefficients, closer), lengths
+
+
+def padded_mse(predicted: np.ndarray, predicted_lengths: np.ndarray,
+               actual: np.ndarray, actual_lengths: np.ndarray) -> np.ndarray:
+    """
+    Mean squared error per row over max(len_predicted, len_actual)
+    coefficients (both zero-padded), matching calculate_interpolation_error().
+    """
+    width = max(predicted.shape[-1], actual.shape[-1])
+    predicted = _pad_width(predicted, width)
+    actual = _pad_width(actual, width)
+    squared = ((predicted - actual) ** 2).sum(axis=-1)
+    return squared / np.maximum(np.maximum(predicted_lengths, actual_lengths), 1)
+
+
+def _pad_width(coefficients: np.ndarray, width: int) -> np.ndarray:
+    if coefficients.shape[-1] == width:
+        return coefficients
+    pad = [(0, 0)] * (coefficients.ndim - 1) + [(0, width - coefficients.shape[-1])]
+    return np.pad(coefficients, pad)
+
+
+def to_seconds(times) -> np.ndarray:
+    """datetimes (or epoch seconds) → float epoch seconds."""
+    numeric = np.asarray(times)
+    if numeric.dtype.kind in 'fiu':
+        return numeric.astype(float)
+    times = np.asarray(times, dtype=object)
+    flat = [t.timestamp() if isinstance(t, datetime) else float(t) for t in times.ravel()]
+    return np.array(flat, dtype=float).reshape(times.shape)
+
+
+@dataclass
+class KnotEvolutionTensor:
+    """
+    Knot evolution snapshots for P profiles x S snapshots.
+
+    timestamps: (P, S) epoch seconds, increasing along S
+    jones / alexander: (P, S, D) zero-padded coefficients
+    jones_lengths / alexander_lengths: (P, S) coefficient counts
+    crossing_numbers: (P, S)
+    """
+    user_ids: List[str]
+    timestamps: np.ndarray
+    jones: np.ndarray
+    jones_lengths: np.ndarray
+    alexander: np.ndarray
+    alexander_lengths: np.ndarray
+    crossing_numbers: np.ndarray
+
+    @property
+    def num_profiles(self) -> int:
+        return self.timestamps.shape[0]
+
+    @property
+    def num_snapshots(self) -> int:
+        return self.timestamps.shape[1]
+
+    def coefficients(self, polynomial: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(coefficients, lengths) for 'jones' or 'alexander'."""
+        if polynomial not in POLYNOMIALS:
+            raise ValueError(f"Unknown polynomial: {polynomial} (expected one of {POLYNOMIALS})")
+        return getattr(self, polynomial), getattr(self, f'{polynomial}_lengths')
+
+    def select_snapshots(self, index) -> 'KnotEvolutionTensor':
+        """Sub-tensor over a snapshot index/slice (e.g. [:, ::2] for held-out tests)."""
+        return KnotEvolutionTensor(
+            user_ids=self.user_ids,
+            timestamps=self.timestamps[:, index],
+            jones=self.jones[:, index],
+            jones_lengths=self.jones_lengths[:, index],
+            alexander=self.alexander[:, index],
+            alexander_lengths=self.alexander_lengths[:, index],
+            crossing_numbers=self.crossing_numbers[:, index],
+        )
+
+    @classmethod
+    def generate(
+        cls,
+        user_ids: Sequence[str],
+        base_complexities: Sequence[float],
+        num_snapshots: int = 10,
+        days_span: int = 30,
+        rng: Optional[np.random.Generator] = None,
+        end_time: Optional[datetime] = None,
+    ) -> 'KnotEvolutionTensor':
+        """
+        Simulate evolution snapshots for every profile at once.
+
+        Same model as generate_knot_snapshots(): snapshot i is at
+        i * days_span / num_snapshots days after (end_time - days_span),
+        complexity drifts by clip(1 + N(0, 0.05) * i / S, 0.8, 1.2), and
+        polynomial degrees / crossing numbers follow the drifted complexity
+        with uniform(-1, 1) coefficients and a leading 1.0.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        base_complexities = np.asarray(base_complexities, dtype=float)
+        num_profiles = len(base_complexities)
+        end_time = end_time if end_time is not None else datetime.now()
+        base_seconds = (end_time - timedelta(days=days_span)).timestamp()
+
+        steps = np.arange(num_snapshots)
+        offsets = steps * (days_span / num_snapshots) * 86400.0
+        timestamps = np.broadcast_to(base_seconds + offsets, (num_profiles, num_snapshots)).copy()
+
+        drift = rng.normal(0, EVOLUTION_NOISE_STD, (num_profiles, num_snapshots)) * (steps / num_snapshots)
+        complexity = base_complexities[:, None] * np.clip(1.0 + drift, *EVOLUTION_FACTOR_BOUNDS)
+        return cls.from_complexities(user_ids, timestamps, complexity, rng=rng)
+
+    @classmethod
+    def from_complexities(
+        cls,
+        user_ids: Sequence[str],
+        timestamps,
+        complexities,
+        rng: Optional[np.random.Generator] = None,
+    ) -> 'KnotEvolutionTensor':
+        """
+        Snapshots for given (P, S) complexity histories at (P, S) times
+        (datetimes or epoch seconds).
+
+        Polynomial degrees and crossing numbers follow each snapshot's
+        complexity, with uniform(-1, 1) coefficients and a leading 1.0 (the
+        polynomial model of generate()).
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        complexity = np.asarray(complexities, dtype=float)
+        num_profiles, num_snapshots = complexity.shape
+
+        def random_polynomials(scale: int) -> Tuple[np.ndarray, np.ndarray]:
+            lengths = np.maximum(1, (complexity * scale).astype(np.int64)) + 1
+            width = int(lengths.max(initial=1))
+            coefficients = rng.uniform(-1.0, 1.0, (num_profiles, num_snapshots, width))
+            coefficients[np.arange(width) >= lengths[..., None]] = 0.0
+            coefficients[..., 0] = 1.0
+            return coefficients, lengths
+
+        jones, jones_lengths = random_polynomials(JONES_DEGREE_SCALE)
+        alexander, alexander_lengths = random_polynomials(ALEXANDER_DEGREE_SCALE)
+        return cls(
+            user_ids=list(user_ids),
+            timestamps=to_seconds(timestamps).reshape(num_profiles, num_snapshots),
+            jones=jones,
+            jones_lengths=jones_lengths,
+            alexander=alexander,
+            alexander_lengths=alexander_lengths,
+            crossing_numbers=np.maximum(0, (complexity * CROSSING_SCALE).astype(np.int64)),
+        )
+
+    @classmethod
+    def from_snapshots(cls, user_ids: Sequence[str], snapshot_lists: Sequence[Sequence]) -> 'KnotEvolutionTensor':
+        """
+        Pack per-profile KnotSnapshot lists (equal counts) into a tensor.
+
+        Snapshots need timestamp, jones_polynomial, alexander_polynomial and
+        crossing_number attributes.
+        """
+        num_profiles = len(snapshot_lists)
+        num_snapshots = len(snapshot_lists[0]) if num_profiles else 0
+        flat = [snapshot for snapshots in snapshot_lists for snapshot in snapshots]
+        if len(flat) != num_profiles * num_snapshots:
+            raise ValueError('Every profile needs the same number of snapshots')
+
+        def packed(attribute: str) -> Tuple[np.ndarray, np.ndarray]:
+            coefficients, lengths = pad_coefficients([getattr(s, attribute) for s in flat])
+            return (coefficients.reshape(num_profiles, num_snapshots, -1),
+                    lengths.reshape(num_profiles, num_snapshots))
+
+        jones, jones_lengths = packed('jones_polynomial')
+        alexander, alexander_lengths = packed('alexander_polynomial')
+        return cls(
+            user_ids=list(user_ids),
+            timestamps=to_seconds([s.timestamp for s in flat]).reshape(num_profiles, num_snapshots),
+            jones=jones,
+            jones_lengths=jones_lengths,
+            alexander=alexander,
+            alexander_lengths=alexander_lengths,
+            crossing_numbers=np.array([s.crossing_number for s in flat], dtype=np.int64)
+            .reshape(num_profiles, num_snapshots),
+        )
+
+    def interpolate_segments(self, factors: Sequence[float], polynomial: str = 'jones',
+                             same_degree_only: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Interpolate every consecutive snapshot pair at each factor.
+
+        Returns (coefficients (P, S-1, F, D), lengths (P, S-1, F)).
+        same_degree_only=True gives the baseline interpolation instead.
+        """
+        coefficients, lengths = self.coefficients(polynomial)
+        factors = np.asarray(factors, dtype=float)
+        lerp = lerp_same_degree if same_degree_only else lerp_padded
+        return lerp(coefficients[:, :-1, None], lengths[:, :-1, None],
+                    coefficients[:, 1:, None], lengths[:, 1:, None], factors)
+
+    def locate(self, query_seconds) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Segment index (P, Q) and interpolation factor (P, Q) for each query.
+
+        `query_seconds` is (Q,) shared by all profiles or (P, Q) per profile.
+        Queries outside a profile's timeline clamp to its first/last snapshot.
+        """
+        timestamps = self.timestamps
+        num_profiles, num_snapshots = timestamps.shape
+        queries = np.asarray(query_seconds, dtype=float)
+        queries = np.clip(np.broadcast_to(queries, (num_profiles, queries.shape[-1])),
+                          timestamps[:, :1], timestamps[:, -1:])
+        if num_snapshots < 2:
+            return np.zeros(queries.shape, dtype=np.int64), np.zeros(queries.shape)
+
+        # Shift each profile's timeline into its own band so one searchsorted covers every row
+        origin = timestamps.min()
+        band = (np.arange(num_profiles) * (timestamps.max() - origin + 1.0))[:, None]
+        position = np.searchsorted((timestamps - origin + band).ravel(),
+                                   (queries - origin + band).ravel(), side='right')
+        segment = position.reshape(queries.shape) - 1 - np.arange(num_profiles)[:, None] * num_snapshots
+        segment = np.clip(segment, 0, num_snapshots - 2)
+
+        rows = np.arange(num_profiles)[:, None]
+        start = timestamps[rows, segment]
+        delta = timestamps[rows, segment + 1] - start
+        factor = np.divide(queries - start, delta, out=np.zeros(queries.shape), where=delta > 0)
+        return segment, np.clip(factor, 0.0, 1.0)
+
+    def interpolate(self, query_seconds, polynomial: str = 'jones') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Interpolated polynomials at arbitrary times for every profile.
+
+        Returns (coefficients (P, Q, D), lengths (P, Q)).
+        """
+        coefficients, lengths = self.coefficients(polynomial)
+        segment, factor = self.locate(query_seconds)
+        rows = np.arange(self.num_profiles)[:, None]
+        if self.num_snapshots < 2:
+            return coefficients[rows, segment], lengths[rows, segment]
+        return lerp_padded(coefficients[rows, segment], lengths[rows, segment],
+                           coefficients[rows, segment + 1], lengths[rows, segment + 1], factor)
+
+    def interpolation_error(self, query_seconds, truth: np.ndarray, truth_lengths: np.ndarray,
+                            polynomial: str = 'jones') -> np.ndarray:
+        """(P, Q) MSE of interpolate(query_seconds) against ground-truth coefficients."""
+        predicted, predicted_lengths = self.interpolate(query_seconds, polynomial)
+        return padded_mse(predicted, predicted_lengths, truth, truth_lengths)
+
+    def snapshots(self, profile_index: int, snapshot_factory, knot=None) -> list:
+        """
+        Materialize one profile's snapshots as objects, calling
+        snapshot_factory(knot, timestamp, jones, alexander, crossing_number).
+        """
+        return [
+            snapshot_factory(
+                knot,
+                datetime.fromtimestamp(self.timestamps[profile_index, s]),
+                unpad_coefficients(self.jones[profile_index, s], self.jones_lengths[profile_index, s]),
+                unpad_coefficients(self.alexander[profile_index, s], self.alexander_lengths[profile_index, s]),
+                int(self.crossing_numbers[profile_index, s]),
+            )
+            for s in range(self.num_snapshots)
+        ]
@@ -13,6 +13,12 @@ Tests:
 2. Battery-adaptive hop limit effectiveness
 3. Network density vs. discovery rate
 4. Mesh resilience under node failures
+5. City-scale discrete-event simulation (mesh_network_simulator.py, opt-in)
+6. City-scale resilience from precomputed BFS routing tables (opt-in)
+
+Usage:
+    python3 patent_1_experiment_6_mesh_networking.py               # Tests 1-4
+    python3 patent_1_experiment_6_mesh_networking.py --city-scale  # + city-scale tests
 
 Compares AVRAI's adaptive mesh networking against baseline fixed hop limit.
 
@@ -21,6 +27,7 @@ Date: January 3, 2026
 
 import sys
 import os
+import argparse
 from pathlib import Path
 import numpy as np
 import pandas as pd
@@ -32,6 +39,8 @@ from datetime import datetime
 from scipy import stats
 
 # Configuration
+CITY_SCALE_NODES = 10000
+CITY_SCALE_MESSAGES = 100000
 RESULTS_DIR = Path(__file__).parent.parent / 'results' / 'patent_1'
 RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -254,8 +263,15 @@ def simulate_message_delivery(
     return False, current_hop, path
 
 
-def run_experiment_6():
-    """Run Experiment 6: AI2AI Mesh Networking Algorithms Validation."""
+def run_experiment_6(city_nodes: int = 0, city_messages: int = CITY_SCALE_MESSAGES):
+    """
+    Run Experiment 6: AI2AI Mesh Networking Algorithms Validation.
+
+    Args:
+        city_nodes: Node count for the city-scale discrete-event simulation
+            (0, the default, skips it; see --city-scale)
+        city_messages: Concurrent messages in the city-scale simulation
+    """
     print()
     print("=" * 70)
     print("Experiment 6: AI2AI Mesh Networking Algorithms Validation")
@@ -463,6 +479,30 @@ def run_experiment_6():
     
     df_resilience = pd.DataFrame(resilience_results)
     
+    # Test 4: City-Scale Discrete-Event Simulation
+    city_results = []
+    if city_nodes > 0:
+        # Imported here: the simulator imports this module's hop policies
+        from mesh_network_simulator import (
+            MeshSimulationConfig, run_city_scale_simulation, run_routing_table_resilience
+        )
+        
+        print()
+        print("Test 4: City-Scale Discrete-Event Simulation")
+        print("-" * 70)
+        city_config = MeshSimulationConfig(num_nodes=city_nodes)
+        city_results = run_city_scale_simulation(city_config, city_messages)
+        
+        print()
+        print("Test 5: City-Scale Resilience (Precomputed Routing Tables)")
+        print("-" * 70)
+        city_resilience_results = run_routing_table_resilience(city_config, city_messages)
+    else:
+        city_resilience_results = []
+    
+    df_city = pd.DataFrame(city_results)
+    df_city_resilience = pd.DataFrame(city_resilience_results)
+    
     # Calculate statistics
     print()
     print("Results Summary")
@@ -502,6 +542,9 @@ def run_experiment_6():
     df_delivery.to_csv(RESULTS_DIR / 'experiment_6_delivery_results.csv', index=False)
     df_battery.to_csv(RESULTS_DIR / 'experiment_6_battery_results.csv', index=False)
     df_resilience.to_csv(RESULTS_DIR / 'experiment_6_resilience_results.csv', index=False)
+    if len(df_city) > 0:
+        df_city.to_csv(RESULTS_DIR / 'experiment_6_city_scale_results.csv', index=False)
+        df_city_resilience.to_csv(RESULTS_DIR / 'experiment_6_city_scale_resilience_results.csv', index=False)
     
     summary = {
         'status': 'complete',
@@ -521,6 +564,8 @@ def run_experiment_6():
             'avg_baseline_success_rate': float(avg_baseline_resilience) if len(df_resilience) > 0 else 0.0,
             'improvement': float(resilience_improvement) if len(df_resilience) > 0 else 0.0,
         },
+        'city_scale': {row['policy']: row for row in city_results},
+        'city_scale_resilience': city_resilience_results,
         'success_criteria': {
             'avrai_better_delivery': avrai_success_rate > baseline_success_rate,
             'battery_adaptive_works': avg_adaptive_advantage > 0,
@@ -547,4 +592,9 @@ def run_experiment_6():
 
 
 if __name__ == '__main__':
-    run_experiment_6()
+    parser = argparse.ArgumentParser(description='Patent #1 Experiment 6: AI2AI Mesh Networking')
+    parser.add_argument('--city-scale', action='store_true',
+                        help=f'Also run the city-scale simulation ({CITY_SCALE_NODES:,} nodes, '
+                             f'{CITY_SCALE_MESSAGES:,} messages)')
+    args = parser.parse_args()
+    run_experiment_6(city_nodes=CITY_SCALE_NODES if args.city_scale else 0)
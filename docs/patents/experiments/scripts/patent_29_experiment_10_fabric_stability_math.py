@@ -15,6 +15,8 @@ Tests:
 2. Density calculation accuracy
 3. Complexity factor correctness
 4. Cohesion factor effectiveness
+5. Stability vs satisfaction curves across group sizes and densities
+   (thousands of fabrics evaluated as one FabricBatch)
 
 Compares AVRAI's multi-factor stability against baseline simple group cohesion.
 
@@ -27,6 +29,7 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 import json
+import time
 from typing import List, Dict, Any, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime
@@ -53,16 +56,162 @@ except ImportError as e:
 RESULTS_DIR = Path(__file__).parent.parent / 'results' / 'patent_29'
 RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Stability/satisfaction sweep: every group size x crossings-per-user level
+SWEEP_GROUP_SIZES = [3, 5, 7, 10, 15, 20, 30, 50]
+SWEEP_CROSSINGS_PER_USER = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 8.0, 10.0, 12.0]
+SWEEP_FABRICS_PER_CELL = 250
+
+
+def segment_means(values: np.ndarray, offsets: np.ndarray, empty_value: float) -> np.ndarray:
+    """Mean of each values[offsets[i]:offsets[i+1]] segment (empty_value for empty segments)."""
+    counts = np.diff(offsets)
+    totals = np.zeros(len(counts))
+    nonempty = counts > 0
+    if nonempty.any():
+        # reduceat over non-empty segment starts: each sum runs up to the next start
+        totals[nonempty] = np.add.reduceat(values, offsets[:-1][nonempty])
+    return np.divide(totals, counts, out=np.full(len(counts), float(empty_value)), where=counts > 0)
+
 
 @dataclass
-class Fabric:
-    """Represents a knot fabric."""
-    fabric_id: str
-    user_count: int
-    crossings: int
-    jones_degree: int
-    cluster_densities: List[float]
-    user_compatibility_scores: Dict[str, float]  # User ID -> compatibility score
+class FabricBatch:
+    """
+    Struct-of-arrays view of many fabrics.
+    
+    Scalar fields are (N,) arrays; the ragged per-fabric lists are stored
+    flat, with fabric i owning values[offsets[i]:offsets[i+1]]:
+    - cluster_densities / cluster_offsets
+    - compatibility_scores / compatibility_offsets (pairwise scores)
+    
+    The stability and satisfaction kernels evaluate every fabric at once.
+    """
+    fabric_ids: List[str]
+    user_count: np.ndarray
+    crossings: np.ndarray
+    jones_degree: np.ndarray
+    cluster_densities: np.ndarray
+    cluster_offsets: np.ndarray
+    compatibility_scores: np.ndarray
+    compatibility_offsets: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.user_count)
+    
+    @classmethod
+    def generate(
+        cls,
+        group_sizes,
+        rng: Optional[np.random.Generator] = None,
+        crossings_per_user=None,
+        fabric_ids: Optional[List[str]] = None,
+    ) -> 'FabricBatch':
+        """
+        Synthetic fabrics for the given group sizes, generated in one pass.
+        
+        Crossings grow with the user count, the Jones degree grows roughly
+        logarithmically with it, and there is one cluster (density
+        uniform(0.5, 1.0)) per three users.
+        
+        crossings_per_user (scalar or per-fabric) fixes the fabric density;
+        by default it is drawn uniform(3, 8) per fabric. Pairwise
+        compatibility scores are uniform(0.3, 0.9), one per user pair.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        user_count = np.asarray(group_sizes, dtype=np.int64)
+        n = len(user_count)
+        if crossings_per_user is None:
+            crossings_per_user = rng.uniform(3, 8, n)
+        crossings = (user_count * np.broadcast_to(np.asarray(crossings_per_user, dtype=float), (n,))).astype(np.int64)
+        jones_degree = np.maximum(1, (np.log(user_count + 1) * 2 + rng.uniform(-1, 1, n)).astype(np.int64))
+        
+        num_clusters = np.maximum(1, user_count // 3)
+        num_pairs = user_count * (user_count - 1) // 2
+        return cls(
+            fabric_ids=fabric_ids if fabric_ids is not None else [f'fabric_{i}' for i in range(n)],
+            user_count=user_count,
+            crossings=crossings,
+            jones_degree=jones_degree,
+            cluster_densities=rng.uniform(0.5, 1.0, int(num_clusters.sum())),
+            cluster_offsets=np.concatenate(([0], np.cumsum(num_clusters))).astype(np.int64),
+            compatibility_scores=rng.uniform(0.3, 0.9, int(num_pairs.sum())),
+            compatibility_offsets=np.concatenate(([0], np.cumsum(num_pairs))).astype(np.int64),
+        )
+    
+    @property
+    def num_clusters(self) -> np.ndarray:
+        return np.diff(self.cluster_offsets)
+    
+    def density(self) -> np.ndarray:
+        """Crossings per user."""
+        return self.crossings / np.maximum(self.user_count, 1)
+    
+    def density_factor(self) -> np.ndarray:
+        """Density normalized by 10 crossings per user, clamped 0-1."""
+        return np.clip(self.density() / 10.0, 0.0, 1.0)
+    
+    def complexity_factor(self) -> np.ndarray:
+        return 1.0 / (1.0 + self.jones_degree * 0.1)
+    
+    def cohesion_factor(self) -> np.ndarray:
+        """Average cluster density (1.0 for fabrics without clusters)."""
+        return segment_means(self.cluster_densities, self.cluster_offsets, 1.0)
+    
+    def mean_compatibility(self, empty_value: float = 0.5) -> np.ndarray:
+        return segment_means(self.compatibility_scores, self.compatibility_offsets, empty_value)
+    
+    def stability_avrai(self) -> np.ndarray:
+        """KnotFabricService._calculateStability() for every fabric."""
+        stability = (self.density_factor() * 0.4 + self.complexity_factor() * 0.3 +
+                     self.cohesion_factor() * 0.3)
+        return np.clip(stability, 0.0, 1.0)
+    
+    def stability_baseline(self) -> np.ndarray:
+        """Average compatibility (0.5 for fabrics without scores)."""
+        return self.mean_compatibility(0.5)
+    
+    def cohesion_prior_art_match_group(self) -> np.ndarray:
+        """
+        Prior Art Baseline: Match Group group matching algorithm (US Patent 10,203,854).
+        
+        Based on US Patent 10,203,854: "Matching process system and method" - 
+        Match Group, Llc (February 12, 2019)
+        
+        Difference from AVRAI:
+        - Classical profile matching with traits and preferences (not topological knots)
+        - No fabric invariants (Jones/Alexander polynomials, density, stability)
+        - No fabric clusters or bridge strand detection
+        - Simple average compatibility (not multi-factor stability formula)
+        
+        Simple average of pairwise compatibility scores, 0.5 for fabrics
+        without scores.
+        """
+        return self.mean_compatibility(0.5)
+    
+    def group_satisfaction(self) -> np.ndarray:
+        """
+        Simulated "ground truth" group satisfaction (real runs would use user feedback):
+        average compatibility * 0.4 + AVRAI stability * 0.4 + size penalty * 0.2,
+        where larger groups are harder to satisfy.
+        """
+        size_penalty = 1.0 / (1.0 + self.user_count * 0.05)
+        satisfaction = (self.mean_compatibility(np.nan) * 0.4 + self.stability_avrai() * 0.4 +
+                        size_penalty * 0.2)
+        return np.clip(satisfaction, 0.0, 1.0)
+    
+    def synergy(self) -> Dict[str, np.ndarray]:
+        """
+        Non-obviousness test: knot topology alone and group compatibility
+        alone versus their combination (the stability formula).
+        """
+        topology = np.where(self.user_count > 0, np.clip(self.density() / 10.0, 0.0, 1.0), 0.5)
+        compatibility = self.mean_compatibility(0.5)
+        combination = self.stability_avrai()
+        return {
+            'knot_topology_alone': topology,
+            'group_compatibility_alone': compatibility,
+            'fabric_combination_avrai': combination,
+            'synergistic_improvement': combination - np.maximum(topology, compatibility),
+        }
 
 
 def load_personality_profiles() -> List[Dict]:
@@ -114,192 +263,6 @@ def load_personality_profiles() -> List[Dict]:
     return profiles
 
 
-def calculate_fabric_stability_avrai(fabric: Fabric) -> float:
-    """
-    AVRAI's fabric stability formula.
-    
-    Matches KnotFabricService._calculateStability() exactly:
-    stability = (densityFactor * 0.4 + complexityFactor * 0.3 + cohesionFactor * 0.3)
-    """
-    # Density factor: crossings / userCount (clamped 0.0-1.0)
-    density = fabric.crossings / max(fabric.user_count, 1)
-    density_factor = np.clip(density / 10.0, 0.0, 1.0)  # Normalize (assume max 10 crossings per user)
-    
-    # Complexity factor: simpler = more stable
-    complexity_factor = 1.0 / (1.0 + fabric.jones_degree * 0.1)
-    
-    # Cohesion factor: average cluster density (if clusters exist)
-    if len(fabric.cluster_densities) > 0:
-        cohesion_factor = np.mean(fabric.cluster_densities)
-    else:
-        cohesion_factor = 1.0
-    
-    # Combine factors
-    stability = (density_factor * 0.4 + complexity_factor * 0.3 + cohesion_factor * 0.3)
-    stability = np.clip(stability, 0.0, 1.0)
-    
-    return float(stability)
-
-
-def calculate_fabric_stability_baseline(fabric: Fabric) -> float:
-    """
-    Baseline: Simple group cohesion (average compatibility).
-    
-    This is what most systems would use - just average compatibility scores.
-    """
-    if len(fabric.user_compatibility_scores) == 0:
-        return 0.5
-    
-    avg_compatibility = np.mean(list(fabric.user_compatibility_scores.values()))
-    return float(avg_compatibility)
-
-
-def calculate_group_cohesion_prior_art_match_group(
-    user_ids: List[str],
-    compatibility_scores: Dict[str, float]
-) -> float:
-    """
-    Prior Art Baseline: Match Group group matching algorithm (US Patent 10,203,854).
-    
-    Based on US Patent 10,203,854: "Matching process system and method" - 
-    Match Group, Llc (February 12, 2019)
-    
-    Key Claims: Methods for profile matching including receiving user profiles with 
-    traits, receiving preference indications, and determining matches based on 
-    preferences and traits.
-    
-    Difference from AVRAI:
-    - Classical profile matching with traits and preferences (not topological knots)
-    - Traditional matching algorithms (not knot fabric structures)
-    - No fabric invariants (Jones/Alexander polynomials, density, stability)
-    - No fabric clusters or bridge strand detection
-    - Simple average compatibility (not multi-factor stability formula)
-    
-    This baseline represents what prior art does: simple average of pairwise 
-    compatibility scores, with no topological structure or fabric analysis.
-    """
-    if len(compatibility_scores) == 0:
-        return 0.5
-    
-    # Match Group approach: simple average of compatibility scores
-    # No topological structure, no fabric analysis, no knot invariants
-    avg_compatibility = np.mean(list(compatibility_scores.values()))
-    return float(avg_compatibility)
-
-
-def test_non_obviousness_fabric_synergy(
-    user_ids: List[str],
-    compatibility_scores: Dict[str, float],
-    fabric: Fabric
-) -> Dict[str, Any]:
-    """
-    Non-Obviousness Test: Fabric Synergistic Effects.
-    
-    Tests that the combination of knot topology + fabric structure creates capabilities
-    not possible with individual components alone.
-    
-    This proves non-obviousness by showing:
-    1. Knot topology alone (individual knots, no fabric) - limited
-    2. Group compatibility alone (no topology) - limited
-    3. Combination (knot fabric with stability formula) - superior
-    
-    This demonstrates that the combination is non-obvious because it creates
-    synergistic effects not achievable with individual components.
-    """
-    results = {
-        'knot_topology_alone': None,
-        'group_compatibility_alone': None,
-        'fabric_combination_avrai': None,
-        'synergistic_improvement': None
-    }
-    
-    # Test 1: Knot topology alone (individual knots, no fabric structure)
-    # Simple average of knot complexities (no fabric weaving)
-    if fabric.user_count > 0:
-        # Simulate individual knot complexities
-        individual_complexities = [fabric.crossings / fabric.user_count] * fabric.user_count
-        topology_score = np.mean(individual_complexities) / 10.0  # Normalize
-        results['knot_topology_alone'] = float(np.clip(topology_score, 0.0, 1.0))
-    else:
-        results['knot_topology_alone'] = 0.5
-    
-    # Test 2: Group compatibility alone (prior art: no topology, just compatibility)
-    if len(compatibility_scores) > 0:
-        group_compatibility = np.mean(list(compatibility_scores.values()))
-        results['group_compatibility_alone'] = float(group_compatibility)
-    else:
-        results['group_compatibility_alone'] = 0.5
-    
-    # Test 3: Combination (AVRAI: knot fabric with stability formula)
-    fabric_stability = calculate_fabric_stability_avrai(fabric)
-    results['fabric_combination_avrai'] = fabric_stability
-    
-    # Calculate synergistic improvement
-    max_individual = max(
-        results['knot_topology_alone'],
-        results['group_compatibility_alone']
-    )
-    results['synergistic_improvement'] = results['fabric_combination_avrai'] - max_individual
-    
-    return results
-
-
-def generate_synthetic_fabric(
-    user_ids: List[str],
-    compatibility_scores: Dict[str, float]
-) -> Fabric:
-    """Generate a synthetic fabric for testing."""
-    user_count = len(user_ids)
-    
-    # Generate realistic fabric properties
-    # Crossings: more users = more potential crossings
-    crossings = int(user_count * np.random.uniform(3, 8))
-    
-    # Jones degree: complexity increases with user count (but not linearly)
-    jones_degree = max(1, int(np.log(user_count + 1) * 2 + np.random.uniform(-1, 1)))
-    
-    # Cluster densities: simulate some clustering
-    num_clusters = max(1, int(user_count / 3))
-    cluster_densities = [np.random.uniform(0.5, 1.0) for _ in range(num_clusters)]
-    
-    return Fabric(
-        fabric_id=f'fabric_{user_ids[0][:8]}',
-        user_count=user_count,
-        crossings=crossings,
-        jones_degree=jones_degree,
-        cluster_densities=cluster_densities,
-        user_compatibility_scores=compatibility_scores
-    )
-
-
-def calculate_group_satisfaction(
-    fabric: Fabric,
-    compatibility_scores: Dict[str, float]
-) -> float:
-    """
-    Calculate "ground truth" group satisfaction.
-    
-    In reality, this would be measured from actual user feedback.
-    For testing, we simulate based on:
-    - Average compatibility (baseline)
-    - Fabric stability (AVRAI's insight)
-    - Group size (larger groups harder to satisfy)
-    """
-    avg_compatibility = np.mean(list(compatibility_scores.values()))
-    
-    # AVRAI's stability contributes to satisfaction
-    avrai_stability = calculate_fabric_stability_avrai(fabric)
-    
-    # Group size penalty (larger groups harder to satisfy)
-    size_penalty = 1.0 / (1.0 + fabric.user_count * 0.05)
-    
-    # Combined satisfaction (weighted)
-    satisfaction = (avg_compatibility * 0.4 + avrai_stability * 0.4 + size_penalty * 0.2)
-    satisfaction = np.clip(satisfaction, 0.0, 1.0)
-    
-    return float(satisfaction)
-
-
 def run_experiment_10():
     """Run Experiment 10: Fabric Stability Formula Validation."""
     print()
@@ -337,45 +300,37 @@ def run_experiment_10():
     # Generate fabrics and calculate stability
     print("Generating fabrics and calculating stability...")
     
-    results = []
+    rng = np.random.default_rng()
     
-    for group in groups[:100]:  # Use first 100 groups
-        # Generate compatibility scores (simulate quantum compatibility)
-        compatibility_scores = {}
-        for i, user_id1 in enumerate(group):
-            for user_id2 in group[i+1:]:
-                # Simulate compatibility (in reality would use quantum calculation)
-                compatibility = float(np.random.uniform(0.3, 0.9))
-                compatibility_scores[f'{user_id1}_{user_id2}'] = compatibility
-        
-        # Create fabric
-        fabric = generate_synthetic_fabric(group, compatibility_scores)
-        
-        # Calculate stability (AVRAI and baseline)
-        avrai_stability = calculate_fabric_stability_avrai(fabric)
-        baseline_stability = calculate_fabric_stability_baseline(fabric)
-        
-        # Calculate "ground truth" satisfaction
-        satisfaction = calculate_group_satisfaction(fabric, compatibility_scores)
-        
-        results.append({
-            'group_id': f'group_{len(results)}',
-            'user_count': fabric.user_count,
-            'crossings': fabric.crossings,
-            'jones_degree': fabric.jones_degree,
-            'num_clusters': len(fabric.cluster_densities),
-            'avg_cluster_density': np.mean(fabric.cluster_densities) if len(fabric.cluster_densities) > 0 else 1.0,
-            'density_factor': fabric.crossings / max(fabric.user_count, 1) / 10.0,
-            'complexity_factor': 1.0 / (1.0 + fabric.jones_degree * 0.1),
-            'cohesion_factor': np.mean(fabric.cluster_densities) if len(fabric.cluster_densities) > 0 else 1.0,
-            'avrai_stability': avrai_stability,
-            'baseline_stability': baseline_stability,
-            'satisfaction': satisfaction,
-            'avrai_error': abs(avrai_stability - satisfaction),
-            'baseline_error': abs(baseline_stability - satisfaction),
-        })
-    
-    df_results = pd.DataFrame(results)
+    def fabric_batch(batch_groups: List[List[str]]) -> FabricBatch:
+        # Simulated pairwise compatibility (in reality would use quantum calculation)
+        return FabricBatch.generate(
+            [len(group) for group in batch_groups], rng,
+            fabric_ids=[f'fabric_{group[0][:8]}' for group in batch_groups]
+        )
+    
+    batch = fabric_batch(groups[:100])  # Use first 100 groups
+    avrai_stability = batch.stability_avrai()
+    baseline_stability = batch.stability_baseline()
+    satisfaction = batch.group_satisfaction()
+    cohesion_factor = batch.cohesion_factor()
+    
+    df_results = pd.DataFrame({
+        'group_id': [f'group_{i}' for i in range(len(batch))],
+        'user_count': batch.user_count,
+        'crossings': batch.crossings,
+        'jones_degree': batch.jones_degree,
+        'num_clusters': batch.num_clusters,
+        'avg_cluster_density': cohesion_factor,
+        'density_factor': batch.density() / 10.0,
+        'complexity_factor': batch.complexity_factor(),
+        'cohesion_factor': cohesion_factor,
+        'avrai_stability': avrai_stability,
+        'baseline_stability': baseline_stability,
+        'satisfaction': satisfaction,
+        'avrai_error': np.abs(avrai_stability - satisfaction),
+        'baseline_error': np.abs(baseline_stability - satisfaction),
+    })
     
     # Calculate statistics
     print()
@@ -413,38 +368,22 @@ def run_experiment_10():
     print("Prior Art Comparison (Match Group US Patent 10,203,854)")
     print("=" * 70)
     
-    prior_art_results = []
-    for group in groups[:50]:  # Test first 50 groups
-        compatibility_scores = {}
-        for i, user_id1 in enumerate(group):
-            for user_id2 in group[i+1:]:
-                compatibility = float(np.random.uniform(0.3, 0.9))
-                compatibility_scores[f'{user_id1}_{user_id2}'] = compatibility
-        
-        fabric = generate_synthetic_fabric(group, compatibility_scores)
-        
-        # AVRAI fabric stability
-        avrai_stability = calculate_fabric_stability_avrai(fabric)
-        
-        # Prior art: Match Group simple group cohesion
-        prior_art_stability = calculate_group_cohesion_prior_art_match_group(
-            group, compatibility_scores
-        )
-        
-        # Ground truth satisfaction
-        satisfaction = calculate_group_satisfaction(fabric, compatibility_scores)
-        
-        prior_art_results.append({
-            'group_id': f'group_{len(prior_art_results)}',
-            'avrai_stability': avrai_stability,
-            'prior_art_stability': prior_art_stability,
-            'satisfaction': satisfaction,
-            'avrai_error': abs(avrai_stability - satisfaction),
-            'prior_art_error': abs(prior_art_stability - satisfaction),
-            'improvement': abs(prior_art_stability - satisfaction) - abs(avrai_stability - satisfaction),
-        })
-    
-    df_prior_art = pd.DataFrame(prior_art_results)
+    batch = fabric_batch(groups[:50])  # Test first 50 groups
+    avrai_stability = batch.stability_avrai()
+    prior_art_stability = batch.cohesion_prior_art_match_group()
+    satisfaction = batch.group_satisfaction()
+    avrai_error = np.abs(avrai_stability - satisfaction)
+    prior_art_error = np.abs(prior_art_stability - satisfaction)
+    
+    df_prior_art = pd.DataFrame({
+        'group_id': [f'group_{i}' for i in range(len(batch))],
+        'avrai_stability': avrai_stability,
+        'prior_art_stability': prior_art_stability,
+        'satisfaction': satisfaction,
+        'avrai_error': avrai_error,
+        'prior_art_error': prior_art_error,
+        'improvement': prior_art_error - avrai_error,
+    })
     
     if len(df_prior_art) > 0:
         avg_avrai_error = df_prior_art['avrai_error'].mean()
@@ -463,25 +402,11 @@ def run_experiment_10():
     print("Non-Obviousness - Synergistic Effects")
     print("=" * 70)
     
-    synergistic_results = []
-    for group in groups[:30]:  # Test first 30 groups
-        compatibility_scores = {}
-        for i, user_id1 in enumerate(group):
-            for user_id2 in group[i+1:]:
-                compatibility = float(np.random.uniform(0.3, 0.9))
-                compatibility_scores[f'{user_id1}_{user_id2}'] = compatibility
-        
-        fabric = generate_synthetic_fabric(group, compatibility_scores)
-        
-        syn_results = test_non_obviousness_fabric_synergy(
-            group, compatibility_scores, fabric
-        )
-        synergistic_results.append({
-            'group_id': f'group_{len(synergistic_results)}',
-            **syn_results
-        })
-    
-    df_synergistic = pd.DataFrame(synergistic_results)
+    batch = fabric_batch(groups[:30])  # Test first 30 groups
+    df_synergistic = pd.DataFrame({
+        'group_id': [f'group_{i}' for i in range(len(batch))],
+        **batch.synergy(),
+    })
     
     if len(df_synergistic) > 0:
         avg_synergistic_improvement = df_synergistic['synergistic_improvement'].mean()
@@ -491,6 +416,53 @@ def run_experiment_10():
         print(f"  Cases with positive synergy: {positive_synergy}/{len(df_synergistic)}")
         print(f"  ✅ Combination creates capabilities not possible with individual components")
     
+    # Test: Stability vs satisfaction across group sizes and densities
+    print()
+    print("=" * 70)
+    print("Stability vs Satisfaction Sweep (group size x crossings per user)")
+    print("=" * 70)
+    
+    sweep_sizes, sweep_densities = np.meshgrid(SWEEP_GROUP_SIZES, SWEEP_CROSSINGS_PER_USER, indexing='ij')
+    sweep_sizes = np.repeat(sweep_sizes.ravel(), SWEEP_FABRICS_PER_CELL)
+    sweep_densities = np.repeat(sweep_densities.ravel(), SWEEP_FABRICS_PER_CELL)
+    
+    start_time = time.perf_counter()
+    sweep = FabricBatch.generate(sweep_sizes, rng, crossings_per_user=sweep_densities)
+    df_sweep = pd.DataFrame({
+        'group_size': sweep_sizes,
+        'crossings_per_user': sweep_densities,
+        'avrai_stability': sweep.stability_avrai(),
+        'baseline_stability': sweep.stability_baseline(),
+        'satisfaction': sweep.group_satisfaction(),
+    })
+    sweep_seconds = time.perf_counter() - start_time
+    df_sweep['avrai_error'] = (df_sweep['avrai_stability'] - df_sweep['satisfaction']).abs()
+    df_sweep['baseline_error'] = (df_sweep['baseline_stability'] - df_sweep['satisfaction']).abs()
+    
+    df_curves = df_sweep.groupby(['group_size', 'crossings_per_user']).agg(
+        num_fabrics=('satisfaction', 'size'),
+        avg_avrai_stability=('avrai_stability', 'mean'),
+        avg_baseline_stability=('baseline_stability', 'mean'),
+        avg_satisfaction=('satisfaction', 'mean'),
+        std_satisfaction=('satisfaction', 'std'),
+        avg_avrai_error=('avrai_error', 'mean'),
+        avg_baseline_error=('baseline_error', 'mean'),
+    ).reset_index()
+    
+    # Per group size: how well each stability measure tracks satisfaction across densities
+    size_correlations = {
+        int(size): {
+            'avrai': float(group['avrai_stability'].corr(group['satisfaction'])),
+            'baseline': float(group['baseline_stability'].corr(group['satisfaction'])),
+        }
+        for size, group in df_sweep.groupby('group_size')
+    }
+    
+    print(f"  Evaluated {len(sweep)} fabrics ({len(SWEEP_GROUP_SIZES)} sizes x "
+          f"{len(SWEEP_CROSSINGS_PER_USER)} densities x {SWEEP_FABRICS_PER_CELL}) in {sweep_seconds:.2f}s")
+    for size, correlation in size_correlations.items():
+        print(f"  Size {size:>3}: AVRAI r={correlation['avrai']:.4f}, baseline r={correlation['baseline']:.4f}")
+    
     # Novelty Evidence
     print()
     print("=" * 70)
@@ -529,10 +501,11 @@ def run_experiment_10():
         df_prior_art.to_csv(RESULTS_DIR / 'experiment_10_prior_art_comparison.csv', index=False)
     if len(df_synergistic) > 0:
         df_synergistic.to_csv(RESULTS_DIR / 'experiment_10_synergistic_effects.csv', index=False)
+    df_curves.to_csv(RESULTS_DIR / 'experiment_10_stability_satisfaction_curves.csv', index=False)
     
     summary = {
         'status': 'complete',
-        'total_groups_tested': len(results),
+        'total_groups_tested': len(df_results),
         'correlation_with_satisfaction': {
             'avrai': float(avrai_correlation),
             'baseline': float(baseline_correlation),
@@ -559,6 +532,13 @@ def run_experiment_10():
             'positive_synergy_cases': int(positive_synergy) if len(df_synergistic) > 0 else 0,
             'total_synergy_tests': len(df_synergistic),
         },
+        'stability_satisfaction_sweep': {
+            'total_fabrics': len(sweep),
+            'group_sizes': SWEEP_GROUP_SIZES,
+            'crossings_per_user': SWEEP_CROSSINGS_PER_USER,
+            'elapsed_seconds': sweep_seconds,
+            'correlation_by_group_size': size_correlations,
+        },
         'success_criteria': {
             'avrai_correlates_with_satisfaction': abs(avrai_correlation) > 0.5,
             'avrai_better_than_baseline': abs(avrai_correlation) > abs(baseline_correlation),
@@ -20,6 +20,8 @@ from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime, timedelta
 
+from knot_evolution_tensor import KnotEvolutionTensor
+
 # Add knot validation scripts to path
 knot_validation_path = Path(__file__).parent.parent.parent.parent / 'scripts' / 'knot_validation'
 sys.path.insert(0, str(knot_validation_path))
@@ -358,47 +360,6 @@ def detect_milestones(snapshots: List[KnotSnapshot]) -> List[Dict[str, Any]]:
     return milestones
 
 
-def interpolate_polynomials_avrai(
-    poly1: List[float],
-    poly2: List[float],
-    factor: float
-) -> List[float]:
-    """
-    AVRAI's polynomial interpolation algorithm (from Experiment 8).
-    
-    Matches KnotEvolutionStringService._interpolatePolynomials() exactly.
-    """
-    max_length = max(len(poly1), len(poly2))
-    interpolated = []
-    
-    for i in range(max_length):
-        val1 = poly1[i] if i < len(poly1) else 0.0
-        val2 = poly2[i] if i < len(poly2) else 0.0
-        interpolated.append(val1 * (1 - factor) + val2 * factor)
-    
-    return interpolated
-
-
-def calculate_evolution_rate_avrai(
-    snapshot1: KnotSnapshot,
-    snapshot2: KnotSnapshot,
-    future_time: datetime
-) -> float:
-    """
-    AVRAI's evolution rate calculation (from Experiment 8).
-    
-    Matches KnotEvolutionStringService._extrapolateFutureKnot() logic:
-    evolutionRate = timeDelta / historyDelta
-    """
-    time_delta = (future_time - snapshot2.timestamp).total_seconds()
-    history_delta = (snapshot2.timestamp - snapshot1.timestamp).total_seconds()
-    
-    if history_delta == 0:
-        return 0.0
-    
-    return float(time_delta / history_delta)
-
-
 def run_experiment_4():
     """Run Experiment 4: Dynamic Knot Evolution (Enhanced with String Evolution)."""
     print()
@@ -505,72 +466,56 @@ def run_experiment_4():
     df_results = pd.DataFrame(evolution_results)
     df_results.to_csv(RESULTS_DIR / 'experiment_4_dynamic_evolution_results.csv', index=False)
     
-    # Save string interpolation results
-    if len(df_string) > 0:
-        df_string.to_csv(RESULTS_DIR / 'experiment_4_string_interpolation_results.csv', index=False)
-    
     # NEW: Test string evolution interpolation
     print()
     print("Testing string evolution interpolation...")
-    string_interpolation_results = []
     
-    for user_id, snapshots in [(r['knot_id'], []) for r in evolution_results[:10]]:  # Test first 10
-        # Find snapshots for this user
-        user_snapshots = [s for s in all_snapshots if s.knot.user_id == user_id]
-        if len(user_snapshots) < 3:
-            continue
+    # Knot strings for the tracked complexity histories: Jones/Alexander polynomials
+    # whose degrees follow each snapshot's complexity (as in Experiment 8)
+    string_knot_ids = [r['knot_id'] for r in evolution_results[:10]]  # Test first 10
+    histories = [[s for s in all_snapshots if s.knot.user_id == knot_id] for knot_id in string_knot_ids]
+    tensor = KnotEvolutionTensor.from_complexities(
+        string_knot_ids,
+        [[datetime.fromisoformat(s.timestamp) for s in snapshots] for snapshots in histories],
+        [[s.complexity for s in snapshots] for snapshots in histories],
+        rng=np.random.default_rng(42),
+    )
+    
+    # Held-out ground truth: interpolate from even snapshots at the odd snapshots' times
+    known = tensor.select_snapshots(slice(0, None, 2))
+    held_out = tensor.select_snapshots(slice(1, None, 2))
+    string_interpolation_results = []
+    if tensor.num_snapshots >= 3:
+        errors = {
+            polynomial: known.interpolation_error(held_out.timestamps, *held_out.coefficients(polynomial), polynomial)
+            for polynomial in ('jones', 'alexander')
+        }
         
-        # Test interpolation between consecutive snapshots
-        for i in range(len(user_snapshots) - 1):
-            snapshot1 = user_snapshots[i]
-            snapshot2 = user_snapshots[i + 1]
-            
-            # Test interpolation at midpoint
-            midpoint_time = snapshot1.timestamp + (snapshot2.timestamp - snapshot1.timestamp) / 2
-            
-            # Simulate polynomial interpolation (simplified - use complexity as proxy)
-            factor = 0.5
-            poly1 = [snapshot1.complexity]  # Simplified polynomial
-            poly2 = [snapshot2.complexity]
-            
-            interpolated = interpolate_polynomials_avrai(poly1, poly2, factor)
-            expected = (snapshot1.complexity + snapshot2.complexity) / 2.0
-            
-            interpolation_error = abs(interpolated[0] - expected) if len(interpolated) > 0 else 0.0
-            
-            # Test evolution rate calculation
-            future_time = snapshot2.timestamp + timedelta(days=1)
-            evolution_rate = calculate_evolution_rate_avrai(
-                KnotSnapshot(
-                    knot=snapshot1.knot,
-                    timestamp=snapshot1.timestamp,
-                    mood=snapshot1.mood,
-                    energy=snapshot1.energy,
-                    stress=snapshot1.stress,
-                    complexity=snapshot1.complexity,
-                    knot_type=snapshot1.knot_type
-                ),
-                KnotSnapshot(
-                    knot=snapshot2.knot,
-                    timestamp=snapshot2.timestamp,
-                    mood=snapshot2.mood,
-                    energy=snapshot2.energy,
-                    stress=snapshot2.stress,
-                    complexity=snapshot2.complexity,
-                    knot_type=snapshot2.knot_type
-                ),
-                future_time
-            )
-            
-            string_interpolation_results.append({
-                'user_id': user_id,
-                'snapshot_pair': f'{i}-{i+1}',
-                'interpolation_error': interpolation_error,
-                'evolution_rate': evolution_rate,
-            })
+        # Evolution rate (calculate_evolution_rate_avrai) of the known segment around each query,
+        # with the future 1 day past its second snapshot
+        segment, _ = known.locate(held_out.timestamps)
+        rows = np.arange(known.num_profiles)[:, None]
+        history_delta = known.timestamps[rows, segment + 1] - known.timestamps[rows, segment]
+        evolution_rates = np.divide(timedelta(days=1).total_seconds(), history_delta,
+                                    out=np.zeros(history_delta.shape), where=history_delta != 0)
+        
+        for row, knot_id in enumerate(tensor.user_ids):
+            for q in range(held_out.num_snapshots):
+                string_interpolation_results.append({
+                    'user_id': knot_id,
+                    'snapshot_pair': f'{2 * segment[row, q]}-{2 * segment[row, q] + 2}',
+                    'held_out_snapshot': 2 * q + 1,
+                    'interpolation_error': float(errors['jones'][row, q]),
+                    'alexander_interpolation_error': float(errors['alexander'][row, q]),
+                    'evolution_rate': float(evolution_rates[row, q]),
+                })
     
     df_string = pd.DataFrame(string_interpolation_results) if string_interpolation_results else pd.DataFrame()
     
+    # Save string interpolation results
+    if len(df_string) > 0:
+        df_string.to_csv(RESULTS_DIR / 'experiment_4_string_interpolation_results.csv', index=False)
+    
     # Calculate overall statistics
     avg_energy_complexity_corr = float(np.mean([r['energy_complexity_correlation'] for r in evolution_results]))
     avg_stress_complexity_corr = float(np.mean([r['stress_complexity_correlation'] for r in evolution_results]))
@@ -586,6 +531,7 @@ def run_experiment_4():
     
     # String interpolation statistics
     avg_interpolation_error = float(df_string['interpolation_error'].mean()) if len(df_string) > 0 else 0.0
+    avg_alexander_interpolation_error = float(df_string['alexander_interpolation_error'].mean()) if len(df_string) > 0 else 0.0
     avg_evolution_rate = float(df_string['evolution_rate'].mean()) if len(df_string) > 0 else 0.0
     
     summary = {
@@ -603,6 +549,7 @@ def run_experiment_4():
         'string_evolution': {
             'total_interpolation_tests': len(string_interpolation_results),
             'avg_interpolation_error': avg_interpolation_error,
+            'avg_alexander_interpolation_error': avg_alexander_interpolation_error,
             'avg_evolution_rate': avg_evolution_rate,
         },
         'success_criteria': {
@@ -637,7 +584,8 @@ def run_experiment_4():
     
     if len(df_string) > 0:
         print(f"String Evolution Interpolation:")
-        print(f"  Average interpolation error: {avg_interpolation_error:.6f}")
+        print(f"  Average held-out interpolation error (Jones MSE): {avg_interpolation_error:.6f}")
+        print(f"  Average held-out interpolation error (Alexander MSE): {avg_alexander_interpolation_error:.6f}")
         print(f"  Average evolution rate: {avg_evolution_rate:.4f}")
         print(f"  Interpolation tests: {len(string_interpolation_results)}")
         print()
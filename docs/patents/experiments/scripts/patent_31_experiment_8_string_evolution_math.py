@@ -25,6 +25,8 @@ from datetime import datetime, timedelta
 from scipy import stats
 from scipy.optimize import curve_fit
 
+from knot_evolution_tensor import KnotEvolutionTensor, padded_mse
+
 # Add knot validation scripts to path
 knot_validation_path = Path(__file__).parent.parent.parent.parent / 'scripts' / 'knot_validation'
 sys.path.insert(0, str(knot_validation_path))
@@ -99,6 +101,12 @@ except ImportError as e:
 RESULTS_DIR = Path(__file__).parent.parent / 'results' / 'patent_31'
 RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 
+MAX_PROFILES = None  # None = the full Big Five set
+NUM_SNAPSHOTS = 10
+INTERPOLATION_FACTORS = [0.25, 0.5, 0.75]
+# Tests that need per-snapshot objects (braid data, Claim 5) use the first N profiles
+OBJECT_TEST_PROFILES = 50
+
 
 @dataclass
 class KnotSnapshot:
@@ -111,7 +119,7 @@ class KnotSnapshot:
     braid_data: List[float]
 
 
-def load_personality_profiles() -> List[PersonalityProfile]:
+def load_personality_profiles(max_profiles: Optional[int] = MAX_PROFILES) -> List[PersonalityProfile]:
     """
     Load personality profiles from Big Five OCEAN data, converted to SPOTS 12 dimensions.
     
@@ -129,7 +137,7 @@ def load_personality_profiles() -> List[PersonalityProfile]:
             
             # Load and convert Big Five OCEAN to SPOTS 12
             spots_profiles = load_and_convert_big_five_to_spots(
-                max_profiles=100,  # Use 100 profiles for comprehensive testing
+                max_profiles=max_profiles,
                 data_source='auto',  # Try CSV first, then JSON
                 project_root=project_root
             )
@@ -156,7 +164,7 @@ def load_personality_profiles() -> List[PersonalityProfile]:
             'value_orientation', 'crowd_tolerance', 'authenticity',
             'archetype', 'trust_level', 'openness'
         ]
-        for i in range(100):
+        for i in range(max_profiles or 100):
             dims = {name: float(np.random.uniform(0.0, 1.0)) for name in dimension_names}
             profile = PersonalityProfile(
                 user_id=f'user_{i}',
@@ -169,6 +177,57 @@ def load_personality_profiles() -> List[PersonalityProfile]:
     return profiles
 
 
+def braid_data_for(crossing_number: int) -> List[float]:
+    """Braid data: [strands, crossing1_strand, crossing1_over, ...] (strand count = crossing number)."""
+    braid_data = [float(crossing_number)]
+    for j in range(crossing_number):
+        braid_data.extend([float(j % 2), 1.0 if j % 2 == 0 else 0.0])
+    return braid_data
+
+
+def _snapshot_from_fields(knot, timestamp, jones, alexander, crossing_number) -> KnotSnapshot:
+    return KnotSnapshot(
+        knot=knot,  # Keep reference to base knot
+        timestamp=timestamp,
+        jones_polynomial=jones,
+        alexander_polynomial=alexander,
+        crossing_number=crossing_number,
+        braid_data=braid_data_for(crossing_number)
+    )
+
+
+def generate_evolution_tensor(
+    profiles: List[PersonalityProfile],
+    generator: KnotGenerator,
+    num_snapshots: int = NUM_SNAPSHOTS,
+    days_span: int = 30,
+    rng: Optional[np.random.Generator] = None
+) -> Tuple[KnotEvolutionTensor, List[Any]]:
+    """
+    Generate evolution snapshots for every profile as one coefficient tensor.
+
+    Base knots come from the knot generator; the snapshot simulation (small
+    complexity drift, degree-dependent random polynomials) runs vectorized
+    over all profiles. Returns (tensor, base_knots) in profile order.
+    """
+    user_ids = []
+    knots = []
+    for profile in profiles:
+        try:
+            knots.append(generator.generate_knot(profile))
+            user_ids.append(profile.user_id)
+        except Exception as e:
+            print(f"  ⚠️  Failed to generate knot for {profile.user_id}: {e}")
+    tensor = KnotEvolutionTensor.generate(
+        user_ids,
+        [knot.complexity for knot in knots],
+        num_snapshots=num_snapshots,
+        days_span=days_span,
+        rng=rng
+    )
+    return tensor, knots
+
+
 def generate_knot_snapshots(
     profile: PersonalityProfile,
     generator: KnotGenerator,
@@ -178,53 +237,11 @@ def generate_knot_snapshots(
     """
     Generate evolution snapshots for a profile.
     
-    Simulates knot evolution over time by introducing small variations.
+    Simulates knot evolution over time by introducing small variations
+    (single-profile view of generate_evolution_tensor()).
     """
-    snapshots = []
-    base_knot = generator.generate_knot(profile)
-    
-    base_date = datetime.now() - timedelta(days=days_span)
-    
-    # Generate snapshots with evolution
-    for i in range(num_snapshots):
-        timestamp = base_date + timedelta(days=i * (days_span / num_snapshots))
-        
-        # Simulate evolution: small changes to knot complexity
-        evolution_factor = 1.0 + (np.random.normal(0, 0.05) * (i / num_snapshots))
-        evolution_factor = np.clip(evolution_factor, 0.8, 1.2)
-        
-        # Create evolved knot (simplified - in reality would regenerate from evolved profile)
-        # For testing, we'll modify the base knot's complexity
-        evolved_complexity = base_knot.complexity * evolution_factor
-        
-        # Generate polynomial coefficients based on complexity
-        # Simplified: use complexity to determine polynomial degree and coefficients
-        jones_degree = max(1, int(evolved_complexity * 5))
-        jones_poly = [np.random.uniform(-1.0, 1.0) for _ in range(jones_degree + 1)]
-        jones_poly[0] = 1.0  # Leading coefficient
-        
-        alexander_degree = max(1, int(evolved_complexity * 4))
-        alexander_poly = [np.random.uniform(-1.0, 1.0) for _ in range(alexander_degree + 1)]
-        alexander_poly[0] = 1.0
-        
-        crossing_number = max(0, int(evolved_complexity * 20))
-        
-        # Braid data: [strands, crossing1_strand, crossing1_over, ...]
-        braid_data = [float(crossing_number)]  # Simplified: strand count = crossing number
-        for j in range(crossing_number):
-            braid_data.extend([float(j % 2), 1.0 if j % 2 == 0 else 0.0])
-        
-        snapshot = KnotSnapshot(
-            knot=base_knot,  # Keep reference to base knot
-            timestamp=timestamp,
-            jones_polynomial=jones_poly,
-            alexander_polynomial=alexander_poly,
-            crossing_number=crossing_number,
-            braid_data=braid_data
-        )
-        snapshots.append(snapshot)
-    
-    return snapshots
+    tensor, knots = generate_evolution_tensor([profile], generator, num_snapshots, days_span)
+    return tensor.snapshots(0, _snapshot_from_fields, knots[0])
 
 
 def interpolate_polynomials_avrai(
@@ -472,7 +489,7 @@ def calculate_interpolation_error(
     return float(mse)
 
 
-def run_experiment_8():
+def run_experiment_8(max_profiles: Optional[int] = MAX_PROFILES):
     """Run Experiment 8: String Evolution Math Validation."""
     print()
     print("=" * 70)
@@ -483,7 +500,7 @@ def run_experiment_8():
     # Load profiles
     print("Loading personality profiles from Big Five OCEAN data...")
     try:
-        profiles = load_personality_profiles()
+        profiles = load_personality_profiles(max_profiles)
         print(f"  ✅ Loaded {len(profiles)} profiles (real Big Five data)")
     except Exception as e:
         print(f"  ⚠️  Error loading profiles: {e}")
@@ -514,132 +531,85 @@ def run_experiment_8():
     print("Generating knot evolution snapshots...")
     generator = KnotGenerator()
     
-    all_snapshots = []
-    for profile in profiles[:50]:  # Use first 50 profiles
-        try:
-            snapshots = generate_knot_snapshots(profile, generator, num_snapshots=10)
-            all_snapshots.append((profile.user_id, snapshots))
-        except Exception as e:
-            print(f"  ⚠️  Failed to generate snapshots for {profile.user_id}: {e}")
-            continue
+    tensor, base_knots = generate_evolution_tensor(profiles, generator, num_snapshots=NUM_SNAPSHOTS)
+    print(f"  Generated snapshots for {tensor.num_profiles} profiles "
+          f"({tensor.num_profiles * tensor.num_snapshots} snapshots)")
     
-    print(f"  Generated snapshots for {len(all_snapshots)} profiles")
-    
-    if len(all_snapshots) < 10:
+    if tensor.num_profiles < 10:
         print("  ❌ Not enough snapshots for testing")
         return {'status': 'insufficient_data'}
     
+    # Per-snapshot objects for the braid and Claim 5 tests
+    all_snapshots = [
+        (tensor.user_ids[i], tensor.snapshots(i, _snapshot_from_fields, base_knots[i]))
+        for i in range(min(OBJECT_TEST_PROFILES, tensor.num_profiles))
+    ]
+    
     # Test 1: Polynomial Interpolation Accuracy
     print()
     print("Test 1: Polynomial Interpolation Accuracy")
     print("-" * 70)
     
-    interpolation_results = []
-    
-    for user_id, snapshots in all_snapshots:
-        if len(snapshots) < 3:
-            continue
-        
-        # Test interpolation between consecutive snapshots
-        for i in range(len(snapshots) - 1):
-            snapshot1 = snapshots[i]
-            snapshot2 = snapshots[i + 1]
-            
-            # Test multiple interpolation factors
-            for factor in [0.25, 0.5, 0.75]:
-                # AVRAI interpolation
-                avrai_jones = interpolate_polynomials_avrai(
-                    snapshot1.jones_polynomial,
-                    snapshot2.jones_polynomial,
-                    factor
-                )
-                avrai_alexander = interpolate_polynomials_avrai(
-                    snapshot1.alexander_polynomial,
-                    snapshot2.alexander_polynomial,
-                    factor
-                )
-                
-                # Baseline interpolation
-                baseline_jones = interpolate_polynomials_baseline(
-                    snapshot1.jones_polynomial,
-                    snapshot2.jones_polynomial,
-                    factor
-                )
-                baseline_alexander = interpolate_polynomials_baseline(
-                    snapshot1.alexander_polynomial,
-                    snapshot2.alexander_polynomial,
-                    factor
-                )
-                
-                # Calculate "ground truth" (linear interpolation of actual values at factor point)
-                # For testing, we'll use the actual snapshot2 as ground truth at factor=1.0
-                if factor == 1.0:
-                    ground_truth_jones = snapshot2.jones_polynomial
-                    ground_truth_alexander = snapshot2.alexander_polynomial
-                elif factor == 0.0:
-                    ground_truth_jones = snapshot1.jones_polynomial
-                    ground_truth_alexander = snapshot1.alexander_polynomial
-                else:
-                    # For intermediate factors, use actual snapshot if available
-                    # Otherwise, use linear interpolation as approximation
-                    ground_truth_jones = snapshot2.jones_polynomial  # Simplified
-                    ground_truth_alexander = snapshot2.alexander_polynomial
-                
-                # Calculate errors
-                avrai_jones_error = calculate_interpolation_error(avrai_jones, ground_truth_jones)
-                baseline_jones_error = calculate_interpolation_error(baseline_jones, ground_truth_jones)
-                
-                avrai_alexander_error = calculate_interpolation_error(avrai_alexander, ground_truth_alexander)
-                baseline_alexander_error = calculate_interpolation_error(baseline_alexander, ground_truth_alexander)
-                
-                interpolation_results.append({
-                    'user_id': user_id,
-                    'snapshot_pair': f'{i}-{i+1}',
-                    'factor': factor,
-                    'jones_degree_diff': abs(len(snapshot1.jones_polynomial) - len(snapshot2.jones_polynomial)),
-                    'alexander_degree_diff': abs(len(snapshot1.alexander_polynomial) - len(snapshot2.alexander_polynomial)),
-                    'avrai_jones_error': avrai_jones_error,
-                    'baseline_jones_error': baseline_jones_error,
-                    'avrai_alexander_error': avrai_alexander_error,
-                    'baseline_alexander_error': baseline_alexander_error,
-                    'jones_improvement': baseline_jones_error - avrai_jones_error if baseline_jones_error > 0 else 0.0,
-                    'alexander_improvement': baseline_alexander_error - avrai_alexander_error if baseline_alexander_error > 0 else 0.0,
-                })
-    
-    df_interpolation = pd.DataFrame(interpolation_results)
+    # Every consecutive snapshot pair x factor in one batch: (P, S-1, F)
+    factors = np.array(INTERPOLATION_FACTORS)
+    num_pairs = tensor.num_snapshots - 1
+    grid_shape = (tensor.num_profiles, num_pairs, len(factors))
+    errors = {}
+    for polynomial in ('jones', 'alexander'):
+        coefficients, lengths = tensor.coefficients(polynomial)
+        # Ground truth: the later snapshot of each pair (simplified, as before)
+        truth = coefficients[:, 1:, None]
+        truth_lengths = lengths[:, 1:, None]
+        for method, same_degree_only in (('avrai', False), ('baseline', True)):
+            predicted, predicted_lengths = tensor.interpolate_segments(factors, polynomial, same_degree_only)
+            errors[f'{method}_{polynomial}_error'] = padded_mse(predicted, predicted_lengths, truth, truth_lengths)
+    
+    def pair_grid(values: np.ndarray) -> np.ndarray:
+        return np.broadcast_to(values, grid_shape).ravel()
+    
+    df_interpolation = pd.DataFrame({
+        'user_id': np.repeat(np.array(tensor.user_ids, dtype=object), num_pairs * len(factors)),
+        'snapshot_pair': pair_grid(np.array([f'{i}-{i+1}' for i in range(num_pairs)], dtype=object)[None, :, None]),
+        'factor': pair_grid(factors),
+        'jones_degree_diff': pair_grid(np.abs(np.diff(tensor.jones_lengths, axis=1))[..., None]),
+        'alexander_degree_diff': pair_grid(np.abs(np.diff(tensor.alexander_lengths, axis=1))[..., None]),
+        **{name: values.ravel() for name, values in errors.items()},
+    })
+    for polynomial in ('jones', 'alexander'):
+        baseline = df_interpolation[f'baseline_{polynomial}_error']
+        df_interpolation[f'{polynomial}_improvement'] = np.where(
+            baseline > 0, baseline - df_interpolation[f'avrai_{polynomial}_error'], 0.0
+        )
+    print(f"  Interpolated {len(df_interpolation)} snapshot pairs/factors in one batch")
+    
+    # Held-out ground truth: interpolate from even snapshots at the odd snapshots' times
+    known = tensor.select_snapshots(slice(0, None, 2))
+    held_out = tensor.select_snapshots(slice(1, None, 2))
+    held_out_errors = {
+        polynomial: known.interpolation_error(held_out.timestamps, *held_out.coefficients(polynomial), polynomial)
+        for polynomial in ('jones', 'alexander')
+    }
+    print(f"  Held-out snapshots: {held_out_errors['jones'].size} "
+          f"(Jones MSE {held_out_errors['jones'].mean():.6f}, "
+          f"Alexander MSE {held_out_errors['alexander'].mean():.6f})")
     
     # Test 2: Evolution Rate Calculation
     print()
     print("Test 2: Evolution Rate Calculation")
     print("-" * 70)
     
-    evolution_results = []
-    
-    for user_id, snapshots in all_snapshots:
-        if len(snapshots) < 2:
-            continue
-        
-        # Test evolution rate calculation
-        for i in range(len(snapshots) - 1):
-            snapshot1 = snapshots[i]
-            snapshot2 = snapshots[i + 1]
-            
-            # Predict future (1 day ahead)
-            future_time = snapshot2.timestamp + timedelta(days=1)
-            
-            evolution_data = calculate_evolution_rate_avrai(snapshot1, snapshot2, future_time)
-            
-            if 'error' not in evolution_data:
-                evolution_results.append({
-                    'user_id': user_id,
-                    'snapshot_pair': f'{i}-{i+1}',
-                    'evolution_rate': evolution_data['evolution_rate'],
-                    'crossing_delta': evolution_data['crossing_delta'],
-                    'time_delta': evolution_data['time_delta'],
-                    'history_delta': evolution_data['history_delta'],
-                })
-    
-    df_evolution = pd.DataFrame(evolution_results)
+    # Same quantities as calculate_evolution_rate_avrai() for every pair (future = t2 + 1 day)
+    history_delta = np.diff(tensor.timestamps, axis=1)
+    time_delta = np.full(history_delta.shape, timedelta(days=1).total_seconds())
+    valid = history_delta != 0
+    df_evolution = pd.DataFrame({
+        'user_id': np.repeat(np.array(tensor.user_ids, dtype=object), num_pairs),
+        'snapshot_pair': np.tile(np.array([f'{i}-{i+1}' for i in range(num_pairs)], dtype=object), tensor.num_profiles),
+        'evolution_rate': np.divide(time_delta, history_delta, out=np.zeros(history_delta.shape), where=valid).ravel(),
+        'crossing_delta': np.diff(tensor.crossing_numbers, axis=1).ravel(),
+        'time_delta': time_delta.ravel(),
+        'history_delta': history_delta.ravel(),
+    })[valid.ravel()].reset_index(drop=True)
     
     # Test 3: Braid Data Interpolation
     print()
@@ -656,7 +626,7 @@ def run_experiment_8():
             snapshot1 = snapshots[i]
             snapshot2 = snapshots[i + 1]
             
-            for factor in [0.25, 0.5, 0.75]:
+            for factor in INTERPOLATION_FACTORS:
                 avrai_braid = interpolate_braid_data_avrai(
                     snapshot1.braid_data,
                     snapshot2.braid_data,
@@ -941,7 +911,7 @@ def run_experiment_8():
     
     summary = {
         'status': 'complete',
-        'total_profiles_tested': len(all_snapshots),
+        'total_profiles_tested': tensor.num_profiles,
         'total_interpolation_tests': len(df_interpolation),
         'total_evolution_tests': len(df_evolution),
         'total_braid_tests': len(df_braid),
@@ -953,6 +923,11 @@ def run_experiment_8():
             'avg_baseline_alexander_error': float(avg_baseline_alexander_error) if len(df_interpolation) > 0 else 0.0,
             'alexander_improvement_pct': float(alexander_improvement_pct) if len(df_interpolation) > 0 else 0.0,
         },
+        'held_out_interpolation': {
+            'total_queries': int(held_out_errors['jones'].size),
+            'avg_jones_error': float(held_out_errors['jones'].mean()),
+            'avg_alexander_error': float(held_out_errors['alexander'].mean()),
+        },
         'evolution_rate': {
             'avg_evolution_rate': float(avg_evolution_rate) if len(df_evolution) > 0 else 0.0,
             'valid_calculations': len(df_evolution),
@@ -1007,4 +982,10 @@ def run_experiment_8():
 
 
 if __name__ == '__main__':
-    run_experiment_8()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Patent #31 Experiment 8: String Evolution Math')
+    parser.add_argument('--profiles', type=int, default=MAX_PROFILES,
+                        help='Number of Big Five profiles to load (default: all)')
+    args = parser.parse_args()
+    run_experiment_8(max_profiles=args.profiles)
@@ -15,6 +15,7 @@ Tests:
 1. Worldsheet interpolation accuracy at time points
 2. Cross-section calculation correctness
 3. Temporal evolution tracking precision
+4. Batch time queries (vectorized interpolation over dense time grids)
 
 Compares AVRAI's worldsheet interpolation against baseline simple time-series.
 
@@ -23,12 +24,13 @@ Date: January 3, 2026
 
 import sys
 import os
+import time
 from pathlib import Path
 import numpy as np
 import pandas as pd
 import json
-from typing import List, Dict, Any, Tuple, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Any, Tuple, Optional, Sequence, Union
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from scipy import stats
 
@@ -72,6 +74,7 @@ except ImportError as e:
 # Configuration
 RESULTS_DIR = Path(__file__).parent.parent / 'results' / 'patent_31'
 RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+BATCH_QUERIES_PER_WORLDSHEET = 10000
 
 
 @dataclass
@@ -92,6 +95,220 @@ class Worldsheet:
     initial_fabric: FabricSnapshot
     snapshots: List[FabricSnapshot]
     user_strings: Dict[str, List[datetime]]  # User ID -> list of timestamps (σ dimension)
+    _store: Optional['WorldsheetStore'] = field(default=None, init=False, repr=False, compare=False)
+    
+    def store(self) -> 'WorldsheetStore':
+        """Sorted, indexed view of the snapshots (rebuilt if snapshots were replaced or resized)."""
+        if self._store is None or not self._store.matches(self):
+            self._store = WorldsheetStore(self)
+        return self._store
+
+
+# Query result kinds
+KIND_INITIAL = 0
+KIND_EXACT = 1
+KIND_INTERPOLATED = 2
+KIND_EXTRAPOLATED = 3
+
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+
+
+def to_seconds(moment: datetime) -> float:
+    """Seconds since the epoch; naive datetimes are treated as wall-clock (no DST jumps)."""
+    if moment.tzinfo is None:
+        return (moment - _NAIVE_EPOCH).total_seconds()
+    return moment.timestamp()
+
+
+def from_seconds(seconds: float, like: datetime) -> datetime:
+    """Inverse of to_seconds, matching the naive/aware kind of `like`."""
+    if like.tzinfo is None:
+        return _NAIVE_EPOCH + timedelta(seconds=float(seconds))
+    return datetime.fromtimestamp(float(seconds), tz=like.tzinfo)
+
+
+@dataclass
+class WorldsheetQueryResult:
+    """Fabric properties for a batch of query times (knot lists stay shared, built on demand)."""
+    store: 'WorldsheetStore'
+    times: np.ndarray  # Query times (epoch seconds)
+    kind: np.ndarray  # KIND_* per query
+    stability: np.ndarray
+    density: np.ndarray
+    user_count: np.ndarray
+    source_index: np.ndarray  # Snapshot supplying user knots (-1 = initial fabric)
+    
+    def __len__(self) -> int:
+        return len(self.times)
+    
+    def user_knots(self, i: int) -> List[str]:
+        """Shared (not copied) user knot list for query i."""
+        return self.store.knots_for(self.source_index[i])
+    
+    def fabric(self, i: int) -> FabricSnapshot:
+        """Materialize query i as a FabricSnapshot (same fields as get_fabric_at_time_avrai)."""
+        return self.store.build_fabric(i, self)
+
+
+class WorldsheetStore:
+    """
+    Worldsheet snapshots kept sorted, with per-field NumPy arrays.
+    
+    Lookups use a searchsorted over the sorted timestamp array (for one
+    time or a whole batch) instead of re-sorting and scanning the snapshot
+    list on every call, and returned
+    fabrics share their snapshot's user_knots list rather than copying it.
+    """
+    
+    def __init__(self, worldsheet: Worldsheet):
+        self.worldsheet = worldsheet
+        self.initial_fabric = worldsheet.initial_fabric
+        self._source = worldsheet.snapshots
+        self.snapshots = sorted(worldsheet.snapshots, key=lambda s: s.timestamp)
+        self._count = len(self.snapshots)
+        self._reindex()
+    
+    def matches(self, worldsheet: Worldsheet) -> bool:
+        return worldsheet.snapshots is self._source and len(worldsheet.snapshots) == self._count
+    
+    def _reindex(self):
+        self.timestamps = np.array([to_seconds(s.timestamp) for s in self.snapshots], dtype=float)
+        self.stabilities = np.array([s.stability for s in self.snapshots], dtype=float)
+        self.densities = np.array([s.density for s in self.snapshots], dtype=float)
+        self.user_counts = np.array([s.user_count for s in self.snapshots], dtype=np.int64)
+    
+    def __len__(self) -> int:
+        return len(self.snapshots)
+    
+    def add_snapshot(self, snapshot: FabricSnapshot):
+        """Insert a snapshot in timestamp order (after equal timestamps) and record it on the worldsheet."""
+        seconds = to_seconds(snapshot.timestamp)
+        index = int(np.searchsorted(self.timestamps, seconds, side='right'))
+        self.snapshots.insert(index, snapshot)
+        self.timestamps = np.insert(self.timestamps, index, seconds)
+        self.stabilities = np.insert(self.stabilities, index, snapshot.stability)
+        self.densities = np.insert(self.densities, index, snapshot.density)
+        self.user_counts = np.insert(self.user_counts, index, snapshot.user_count)
+        self.worldsheet.snapshots.append(snapshot)
+        self._count = len(self.worldsheet.snapshots)
+    
+    def knots_for(self, source_index: int) -> List[str]:
+        if source_index < 0:
+            return self.initial_fabric.user_knots
+        return self.snapshots[source_index].user_knots
+    
+    def query(self, target_times: Union[Sequence[datetime], np.ndarray]) -> WorldsheetQueryResult:
+        """
+        Fabric at many times at once (KnotWorldsheet.getFabricAtTime() logic).
+        
+        `target_times` may be datetimes or epoch seconds (see to_seconds).
+        """
+        times = np.asarray(target_times)
+        if times.dtype == object:
+            times = np.array([to_seconds(t) for t in target_times], dtype=float)
+        times = times.astype(float)
+        n = len(times)
+        kind = np.full(n, KIND_INITIAL, dtype=np.int8)
+        stability = np.full(n, self.initial_fabric.stability, dtype=float)
+        density = np.full(n, self.initial_fabric.density, dtype=float)
+        user_count = np.full(n, self.initial_fabric.user_count, dtype=np.int64)
+        source_index = np.full(n, -1, dtype=np.int64)
+        result = WorldsheetQueryResult(self, times, kind, stability, density, user_count, source_index)
+        if len(self) == 0 or n == 0:
+            return result
+        
+        ts = self.timestamps
+        after = np.searchsorted(ts, times, side='right')  # First snapshot strictly after t
+        before = after - 1  # Last snapshot at or before t
+        
+        # After last snapshot: extrapolate with small stability decay
+        extrapolated = times > ts[-1]
+        if extrapolated.any():
+            days_since_last = (times[extrapolated] - ts[-1]) / (24 * 3600)
+            kind[extrapolated] = KIND_EXTRAPOLATED
+            stability[extrapolated] = self.stabilities[-1] * np.exp(-0.01 * days_since_last)
+            density[extrapolated] = self.densities[-1]
+            user_count[extrapolated] = self.user_counts[-1]
+            source_index[extrapolated] = len(self) - 1
+        
+        # Exactly on a snapshot (last of any equal timestamps)
+        inside = (before >= 0) & ~extrapolated
+        exact = inside & (ts[np.clip(before, 0, None)] == times)
+        if exact.any():
+            idx = before[exact]
+            kind[exact] = KIND_EXACT
+            stability[exact] = self.stabilities[idx]
+            density[exact] = self.densities[idx]
+            user_count[exact] = self.user_counts[idx]
+            source_index[exact] = idx
+        
+        # Between snapshots: linear interpolation, knots from the closer snapshot
+        between = inside & ~exact
+        if between.any():
+            lo, hi = before[between], after[between]
+            factor = (times[between] - ts[lo]) / (ts[hi] - ts[lo])
+            closer = np.where(factor < 0.5, lo, hi)
+            kind[between] = KIND_INTERPOLATED
+            stability[between] = self.stabilities[lo] * (1 - factor) + self.stabilities[hi] * factor
+            density[between] = self.densities[lo] * (1 - factor) + self.densities[hi] * factor
+            user_count[between] = self.user_counts[closer]
+            source_index[between] = closer
+        return result
+    
+    def build_fabric(self, i: int, result: WorldsheetQueryResult) -> FabricSnapshot:
+        """FabricSnapshot for query i of `result` (snapshot objects returned as-is)."""
+        kind = result.kind[i]
+        if kind == KIND_INITIAL:
+            return self.initial_fabric
+        if kind == KIND_EXACT:
+            return self.snapshots[result.source_index[i]]
+        if kind == KIND_EXTRAPOLATED:
+            base = self.snapshots[-1]
+            fabric_id = f'{base.fabric_id}_extrapolated'
+        else:
+            lo = np.searchsorted(self.timestamps, result.times[i], side='right') - 1
+            base = self.snapshots[lo]
+            fabric_id = f'{base.fabric_id}_interpolated'
+        return FabricSnapshot(
+            fabric_id=fabric_id,
+            timestamp=from_seconds(result.times[i], base.timestamp),
+            user_count=int(result.user_count[i]),
+            stability=float(result.stability[i]),
+            density=float(result.density[i]),
+            user_knots=result.user_knots(i),
+        )
+    
+    def fabric_at(self, target_time: datetime) -> FabricSnapshot:
+        """Fabric at a single time."""
+        result = self.query(np.array([to_seconds(target_time)]))
+        fabric = self.build_fabric(0, result)
+        if result.kind[0] in (KIND_INTERPOLATED, KIND_EXTRAPOLATED):
+            fabric.timestamp = target_time
+        return fabric
+    
+    def closest(self, target_times: Union[Sequence[datetime], np.ndarray]) -> np.ndarray:
+        """
+        Baseline lookup for many times: index of the closest snapshot
+        (first on ties), or -1 when the initial fabric is strictly closer.
+        """
+        times = np.asarray(target_times)
+        if times.dtype == object:
+            times = np.array([to_seconds(t) for t in target_times], dtype=float)
+        times = times.astype(float)
+        if len(self) == 0:
+            return np.full(len(times), -1, dtype=np.int64)
+        ts = self.timestamps
+        right = np.clip(np.searchsorted(ts, times, side='left'), 0, len(ts) - 1)
+        left = np.clip(right - 1, 0, len(ts) - 1)
+        # Earliest index attaining each candidate distance (first-wins on ties, like the linear scan)
+        left = np.searchsorted(ts, ts[left], side='left')
+        right_first = np.searchsorted(ts, ts[right], side='left')
+        left_diff = np.abs(times - ts[left])
+        right_diff = np.abs(times - ts[right_first])
+        best = np.where(right_diff < left_diff, right_first, left)
+        best_diff = np.minimum(left_diff, right_diff)
+        initial_diff = np.abs(times - to_seconds(self.initial_fabric.timestamp))
+        return np.where(initial_diff < best_diff, -1, best)
 
 
 def load_personality_profiles() -> List[PersonalityProfile]:
@@ -223,75 +440,15 @@ def get_fabric_at_time_avrai(
     Matches KnotWorldsheet.getFabricAtTime() logic:
     - If before first snapshot: return initial fabric
     - If after last snapshot: extrapolate
+    - If exactly on a snapshot (including the last): return it
     - If between snapshots: interpolate
+    
+    Uses the worldsheet's cached WorldsheetStore; user_knots are shared
+    with the source snapshot, not copied.
     """
     if len(worldsheet.snapshots) == 0:
         return worldsheet.initial_fabric
-    
-    # Sort snapshots by timestamp
-    sorted_snapshots = sorted(worldsheet.snapshots, key=lambda s: s.timestamp)
-    
-    # Before first snapshot
-    if target_time < sorted_snapshots[0].timestamp:
-        return worldsheet.initial_fabric
-    
-    # After last snapshot (extrapolate)
-    if target_time > sorted_snapshots[-1].timestamp:
-        # Simple extrapolation: use last snapshot with slight stability decay
-        last = sorted_snapshots[-1]
-        time_since_last = (target_time - last.timestamp).total_seconds() / (24 * 3600)  # days
-        stability_decay = np.exp(-0.01 * time_since_last)  # Small decay
-        
-        return FabricSnapshot(
-            fabric_id=f'{last.fabric_id}_extrapolated',
-            timestamp=target_time,
-            user_count=last.user_count,
-            stability=last.stability * stability_decay,
-            density=last.density,
-            user_knots=last.user_knots.copy()
-        )
-    
-    # Find surrounding snapshots
-    before = None
-    after = None
-    
-    for i, snapshot in enumerate(sorted_snapshots):
-        if snapshot.timestamp > target_time:
-            after = snapshot
-            if i > 0:
-                before = sorted_snapshots[i - 1]
-            break
-    
-    # Exactly on a snapshot
-    if before and before.timestamp == target_time:
-        return before
-    if after and after.timestamp == target_time:
-        return after
-    
-    # Interpolate between snapshots
-    if before and after:
-        time_diff = (after.timestamp - before.timestamp).total_seconds()
-        time_to_target = (target_time - before.timestamp).total_seconds()
-        factor = time_to_target / time_diff if time_diff > 0 else 0.5
-        
-        # Interpolate stability and density
-        interpolated_stability = before.stability * (1 - factor) + after.stability * factor
-        interpolated_density = before.density * (1 - factor) + after.density * factor
-        
-        # For user count, use the closer snapshot's user list
-        # (In reality, would interpolate user composition)
-        closer_snapshot = before if factor < 0.5 else after
-        
-        return FabricSnapshot(
-            fabric_id=f'{before.fabric_id}_interpolated',
-            timestamp=target_time,
-            user_count=closer_snapshot.user_count,
-            stability=interpolated_stability,
-            density=interpolated_density,
-            user_knots=closer_snapshot.user_knots.copy()
-        )
-    
-    return None
+    return worldsheet.store().fabric_at(target_time)
 
 
 def get_fabric_at_time_baseline(
@@ -306,24 +463,9 @@ def get_fabric_at_time_baseline(
     if len(worldsheet.snapshots) == 0:
         return worldsheet.initial_fabric
     
-    sorted_snapshots = sorted(worldsheet.snapshots, key=lambda s: s.timestamp)
-    
-    # Find closest snapshot
-    closest = sorted_snapshots[0]
-    min_diff = abs((target_time - closest.timestamp).total_seconds())
-    
-    for snapshot in sorted_snapshots:
-        diff = abs((target_time - snapshot.timestamp).total_seconds())
-        if diff < min_diff:
-            min_diff = diff
-            closest = snapshot
-    
-    # Also check initial fabric
-    initial_diff = abs((target_time - worldsheet.initial_fabric.timestamp).total_seconds())
-    if initial_diff < min_diff:
-        return worldsheet.initial_fabric
-    
-    return closest
+    store = worldsheet.store()
+    index = store.closest(np.array([to_seconds(target_time)]))[0]
+    return worldsheet.initial_fabric if index < 0 else store.snapshots[index]
 
 
 def get_cross_section_at_time(
@@ -417,41 +559,43 @@ def run_experiment_9():
         if len(worldsheet.snapshots) < 2:
             continue
         
-        # Test interpolation at various time points
-        sorted_snapshots = sorted(worldsheet.snapshots, key=lambda s: s.timestamp)
+        # Test interpolation at the midpoint of every consecutive snapshot pair (one batch query)
+        store = worldsheet.store()
+        sorted_snapshots = store.snapshots
+        midpoint_seconds = (store.timestamps[:-1] + store.timestamps[1:]) / 2
+        
+        # AVRAI interpolation
+        avrai = store.query(midpoint_seconds)
+        
+        # Baseline (closest snapshot)
+        closest = store.closest(midpoint_seconds)
+        baseline_stability = np.where(closest < 0, worldsheet.initial_fabric.stability,
+                                      store.stabilities[np.clip(closest, 0, None)])
+        baseline_density = np.where(closest < 0, worldsheet.initial_fabric.density,
+                                    store.densities[np.clip(closest, 0, None)])
+        
+        # Ground truth: use snapshot2 as approximation (since we don't have exact midpoint)
+        # In reality, we'd need actual fabric data at midpoint
+        truth_stability = store.stabilities[1:]
+        truth_density = store.densities[1:]
+        avrai_stability_error = np.abs(avrai.stability - truth_stability)
+        baseline_stability_error = np.abs(baseline_stability - truth_stability)
+        avrai_density_error = np.abs(avrai.density - truth_density)
+        baseline_density_error = np.abs(baseline_density - truth_density)
         
         for i in range(len(sorted_snapshots) - 1):
-            snapshot1 = sorted_snapshots[i]
-            snapshot2 = sorted_snapshots[i + 1]
-            
-            # Test interpolation at midpoint
-            midpoint_time = snapshot1.timestamp + (snapshot2.timestamp - snapshot1.timestamp) / 2
-            
-            # AVRAI interpolation
-            avrai_fabric = get_fabric_at_time_avrai(worldsheet, midpoint_time)
-            
-            # Baseline (closest snapshot)
-            baseline_fabric = get_fabric_at_time_baseline(worldsheet, midpoint_time)
-            
-            # Ground truth: use snapshot2 as approximation (since we don't have exact midpoint)
-            # In reality, we'd need actual fabric data at midpoint
-            ground_truth = snapshot2
-            
-            if avrai_fabric and baseline_fabric:
-                avrai_error = calculate_interpolation_error(avrai_fabric, ground_truth)
-                baseline_error = calculate_interpolation_error(baseline_fabric, ground_truth)
-                
-                interpolation_results.append({
-                    'group_id': worldsheet.group_id,
-                    'snapshot_pair': f'{i}-{i+1}',
-                    'time_point': midpoint_time.isoformat(),
-                    'avrai_stability_error': avrai_error['stability_error'],
-                    'baseline_stability_error': baseline_error['stability_error'],
-                    'avrai_density_error': avrai_error['density_error'],
-                    'baseline_density_error': baseline_error['density_error'],
-                    'stability_improvement': baseline_error['stability_error'] - avrai_error['stability_error'],
-                    'density_improvement': baseline_error['density_error'] - avrai_error['density_error'],
-                })
+            midpoint_time = from_seconds(midpoint_seconds[i], sorted_snapshots[i].timestamp)
+            interpolation_results.append({
+                'group_id': worldsheet.group_id,
+                'snapshot_pair': f'{i}-{i+1}',
+                'time_point': midpoint_time.isoformat(),
+                'avrai_stability_error': avrai_stability_error[i],
+                'baseline_stability_error': baseline_stability_error[i],
+                'avrai_density_error': avrai_density_error[i],
+                'baseline_density_error': baseline_density_error[i],
+                'stability_improvement': baseline_stability_error[i] - avrai_stability_error[i],
+                'density_improvement': baseline_density_error[i] - avrai_density_error[i],
+            })
     
     df_interpolation = pd.DataFrame(interpolation_results)
     
@@ -497,7 +641,7 @@ def run_experiment_9():
         if len(worldsheet.snapshots) < 3:
             continue
         
-        sorted_snapshots = sorted(worldsheet.snapshots, key=lambda s: s.timestamp)
+        sorted_snapshots = worldsheet.store().snapshots
         
         # Track stability evolution
         stabilities = [s.stability for s in sorted_snapshots]
@@ -522,6 +666,44 @@ def run_experiment_9():
     
     df_evolution = pd.DataFrame(evolution_results)
     
+    # Test 4: Batch Time Queries (dense interpolation sweep per worldsheet)
+    print()
+    print("Test 4: Batch Time Queries")
+    print("-" * 70)
+    
+    batch_results = []
+    for worldsheet in worldsheets:
+        store = worldsheet.store()
+        start_seconds = to_seconds(worldsheet.initial_fabric.timestamp)
+        end_seconds = store.timestamps[-1] + 7 * 86400 if len(store) else start_seconds
+        query_seconds = np.linspace(start_seconds, end_seconds, BATCH_QUERIES_PER_WORLDSHEET)
+        
+        start = time.perf_counter()
+        batch = store.query(query_seconds)
+        batch_elapsed = time.perf_counter() - start
+        
+        # Per-call reference on a subsample (each call re-sorts nothing, but pays Python overhead)
+        sample = query_seconds[::max(1, len(query_seconds) // 200)]
+        sample_times = [from_seconds(t, worldsheet.initial_fabric.timestamp) for t in sample]
+        start = time.perf_counter()
+        single = [get_fabric_at_time_avrai(worldsheet, t) for t in sample_times]
+        single_elapsed = (time.perf_counter() - start) * len(query_seconds) / len(sample)
+        sample_index = np.arange(0, len(query_seconds), max(1, len(query_seconds) // 200))
+        max_diff = max(abs(f.stability - batch.stability[i]) for f, i in zip(single, sample_index))
+        
+        batch_results.append({
+            'group_id': worldsheet.group_id,
+            'num_queries': len(query_seconds),
+            'batch_seconds': batch_elapsed,
+            'per_call_seconds_estimate': single_elapsed,
+            'speedup': single_elapsed / batch_elapsed if batch_elapsed > 0 else float('inf'),
+            'max_stability_diff': max_diff,
+            'interpolated_queries': int((batch.kind == KIND_INTERPOLATED).sum()),
+            'extrapolated_queries': int((batch.kind == KIND_EXTRAPOLATED).sum()),
+        })
+    
+    df_batch = pd.DataFrame(batch_results)
+    
     # Calculate statistics
     print()
     print("Results Summary")
@@ -556,6 +738,13 @@ def run_experiment_9():
         print(f"  Average temporal consistency: {avg_consistency:.4f}")
         print(f"  Groups tracked: {len(df_evolution)}")
     
+    if len(df_batch) > 0:
+        total_queries = int(df_batch['num_queries'].sum())
+        queries_per_sec = total_queries / df_batch['batch_seconds'].sum()
+        print(f"\nBatch Time Queries:")
+        print(f"  Queries: {total_queries:,} ({queries_per_sec:,.0f}/s batched)")
+        print(f"  Median speedup vs per-call lookup: {df_batch['speedup'].median():.1f}x")
+    
     # Save results
     print()
     print("Saving results...")
@@ -563,6 +752,7 @@ def run_experiment_9():
     df_interpolation.to_csv(RESULTS_DIR / 'experiment_9_interpolation_results.csv', index=False)
     df_cross_section.to_csv(RESULTS_DIR / 'experiment_9_cross_section_results.csv', index=False)
     df_evolution.to_csv(RESULTS_DIR / 'experiment_9_evolution_results.csv', index=False)
+    df_batch.to_csv(RESULTS_DIR / 'experiment_9_batch_query_results.csv', index=False)
     
     summary = {
         'status': 'complete',
@@ -586,6 +776,12 @@ def run_experiment_9():
             'avg_consistency': float(avg_consistency) if len(df_evolution) > 0 else 0.0,
             'groups_tracked': len(df_evolution),
         },
+        'batch_queries': {
+            'total_queries': int(df_batch['num_queries'].sum()) if len(df_batch) > 0 else 0,
+            'queries_per_sec': float(queries_per_sec) if len(df_batch) > 0 else 0.0,
+            'median_speedup': float(df_batch['speedup'].median()) if len(df_batch) > 0 else 0.0,
+            'max_stability_diff': float(df_batch['max_stability_diff'].max()) if len(df_batch) > 0 else 0.0,
+        },
         'success_criteria': {
             'worldsheet_interpolation_works': len(df_interpolation) > 0,
             'avrai_better_than_baseline': stability_improvement_pct > 0 if len(df_interpolation) > 0 else False,
@@ -4,121 +4,197 @@ Master Experiment Runner - All Patent Experiments
 
 Runs all 30 experiments (19 required + 11 optional) for Patents #1, #3, #21, #29, #11
 
+Experiment entry points (`run_patent_N_experiments` in `run_patent_N_experiments.py`)
+are discovered automatically and run as a dependency graph (see
+experiment_harness.py):
+- Shared synthetic data (generate_synthetic_data.py) runs first; patents that
+  read it depend on it
+- Independent patents run concurrently in a process pool with per-experiment
+  timeouts
+- Experiments whose code (including local imports) and input data are
+  unchanged since their last successful run are skipped
+
+Usage:
+    python3 run_all_experiments.py                 # Patents #1, #3, #21, #29, #11
+    python3 run_all_experiments.py --all           # Every discovered patent
+    python3 run_all_experiments.py --patent 1 29   # Specific patents
+    python3 run_all_experiments.py --force         # Ignore the run cache
+    python3 run_all_experiments.py --list          # Show the experiment graph
+
 Date: December 21, 2025
 """
 
+import re
 import sys
+import ast
 import time
+import argparse
 from pathlib import Path
 
 # Add scripts directory to path
 SCRIPTS_DIR = Path(__file__).parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 
-# Import individual experiment modules
-try:
-    from run_patent_1_experiments import run_patent_1_experiments
-    from run_patent_3_experiments import run_patent_3_experiments
-    from run_patent_21_experiments import run_patent_21_experiments
-    from run_patent_29_experiments import run_patent_29_experiments
-    from run_patent_11_experiments import run_patent_11_experiments
-except ImportError as e:
-    print(f"⚠️  Warning: Some experiment modules not found: {e}")
-    print("Creating individual experiment scripts...")
-    print()
-    print("Please run experiments individually:")
-    print("  python scripts/run_patent_1_experiments.py")
-    print("  python scripts/run_patent_3_experiments.py")
-    print("  python scripts/run_patent_21_experiments.py")
-    print("  python scripts/run_patent_29_experiments.py")
-    print("  python scripts/run_patent_11_experiments.py")
-    sys.exit(1)
+from experiment_harness import ExperimentSpec, run_experiment_graph, order_specs
+
+EXPERIMENTS_DIR = SCRIPTS_DIR.parent
+DATA_DIR = EXPERIMENTS_DIR / 'data'
+RESULTS_DIR = EXPERIMENTS_DIR / 'results'
+LOGS_DIR = EXPERIMENTS_DIR / 'logs' / 'run_all_experiments'
+CACHE_FILE = LOGS_DIR / 'run_cache.json'
+
+# Patents run by default (the master suite)
+DEFAULT_PATENTS = ['1', '3', '21', '29', '11']
+
+# Per-experiment timeout in seconds (Patent #3 is a time-based simulation)
+DEFAULT_TIMEOUT = 3600
+TIMEOUTS = {'3': 7200}
+
+# Shared synthetic data written by generate_synthetic_data.main()
+SYNTHETIC_DATA_DIRS = {
+    '1': DATA_DIR / 'patent_1_quantum_compatibility',
+    '3': DATA_DIR / 'patent_3_contextual_personality',
+    '21': DATA_DIR / 'patent_21_quantum_state_preservation',
+    '29': DATA_DIR / 'patent_29_multi_entity_quantum_matching',
+}
+
+SYNTHETIC_DATA_SPEC = ExperimentSpec(
+    name='synthetic_data',
+    module='generate_synthetic_data',
+    function='main',
+    outputs=tuple(SYNTHETIC_DATA_DIRS.values()),
+)
+
+ENTRY_POINT_PATTERN = re.compile(r'^run_patent_(\d+)_experiments\.py$')
+
+
+def discover_experiments():
+    """
+    Find `run_patent_N_experiments()` entry points in the scripts directory.
+
+    Parses files instead of importing them, so discovery stays fast and
+    does not trigger module-level side effects.
+
+    Returns:
+        Dict mapping patent number (str) to ExperimentSpec
+    """
+    experiments = {}
+    for path in sorted(SCRIPTS_DIR.glob('run_patent_*_experiments.py')):
+        match = ENTRY_POINT_PATTERN.match(path.name)
+        if not match:
+            continue
+        patent = match.group(1)
+        function = f'run_patent_{patent}_experiments'
+        tree = ast.parse(path.read_text(encoding='utf-8'), filename=str(path))
+        if not any(isinstance(node, ast.FunctionDef) and node.name == function for node in tree.body):
+            continue
+
+        data_dir = SYNTHETIC_DATA_DIRS.get(patent)
+        experiments[patent] = ExperimentSpec(
+            name=f'patent_{patent}',
+            module=path.stem,
+            function=function,
+            timeout=TIMEOUTS.get(patent, DEFAULT_TIMEOUT),
+            depends_on=(SYNTHETIC_DATA_SPEC.name,) if data_dir else (),
+            inputs=(data_dir,) if data_dir else (),
+            # Each run_patent_N_experiments.py writes to results/patent_N
+            outputs=(RESULTS_DIR / f'patent_{patent}',),
+        )
+    return experiments
+
+
+def build_specs(patents, timeout=None):
+    """Experiment specs for the selected patents, plus shared data if needed."""
+    discovered = discover_experiments()
+    missing = [p for p in patents if p not in discovered]
+    if missing:
+        print(f"⚠️  Warning: No experiment entry point found for patent(s): {', '.join(missing)}")
+
+    specs = [discovered[p] for p in patents if p in discovered]
+    if timeout is not None:
+        for spec in specs:
+            spec.timeout = timeout
+    if any(SYNTHETIC_DATA_SPEC.name in spec.depends_on for spec in specs):
+        specs.insert(0, SYNTHETIC_DATA_SPEC)
+    return order_specs(specs)
 
 
 def main():
     """Run all experiments."""
+    parser = argparse.ArgumentParser(description="Run patent experiments as a dependency graph")
+    parser.add_argument('--all', action='store_true', help="Run every discovered patent")
+    parser.add_argument('--patent', nargs='+', metavar='N', help="Run specific patent numbers")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Maximum concurrent experiment processes (default: CPU count)")
+    parser.add_argument('--timeout', type=float, default=None,
+                        help="Override the per-experiment timeout in seconds")
+    parser.add_argument('--force', action='store_true', help="Re-run even if unchanged")
+    parser.add_argument('--list', action='store_true', help="List the experiment graph and exit")
+    args = parser.parse_args()
+
+    if args.all:
+        patents = sorted(discover_experiments(), key=int)
+    elif args.patent:
+        patents = args.patent
+    else:
+        patents = DEFAULT_PATENTS
+    specs = build_specs(patents, timeout=args.timeout)
+
     print("=" * 70)
     print("Master Experiment Runner - All Patent Experiments")
     print("=" * 70)
     print()
-    print("Total Experiments: 33 (19 required + 11 optional + 3 focused tests)")
-    print("  - Patent #1: 5 experiments (4 required + 1 optional)")
-    print("  - Patent #3: 5 experiments (3 required + 2 optional)")
-    print("  - Patent #21: 4 experiments (2 required + 2 optional)")
-    print("  - Patent #29: 9 experiments (6 required + 3 optional)")
-    print("  - Patent #11: 11 experiments (6 required + 2 optional + 3 focused tests)")
-    print()
-    print("Note: Some optional experiments are not yet implemented and will be skipped.")
+    for spec in specs:
+        depends = f" (after {', '.join(spec.depends_on)})" if spec.depends_on else ""
+        print(f"  - {spec.name}: {spec.module}.{spec.function}{depends}")
     print()
+    if args.list:
+        return
     print("=" * 70)
     print()
-    
+
+    def report(result):
+        status = result['status']
+        if status == 'success':
+            print(f"✅ {result['name']} completed in {result['duration']:.2f} seconds")
+        elif status == 'cached':
+            print(f"⏭️  {result['name']} unchanged since {result.get('last_success')}, skipped")
+        else:
+            print(f"❌ {result['name']} {status}: {result.get('error')}")
+
     start_time = time.time()
-    
-    # Run Patent #1 experiments
-    print("🔬 Running Patent #1 Experiments...")
-    print("-" * 70)
-    try:
-        run_patent_1_experiments()
-        print("✅ Patent #1 experiments completed")
-    except Exception as e:
-        print(f"❌ Patent #1 experiments failed: {e}")
-    print()
-    
-    # Run Patent #3 experiments
-    print("🔬 Running Patent #3 Experiments...")
-    print("-" * 70)
-    try:
-        run_patent_3_experiments()
-        print("✅ Patent #3 experiments completed")
-    except Exception as e:
-        print(f"❌ Patent #3 experiments failed: {e}")
-    print()
-    
-    # Run Patent #21 experiments
-    print("🔬 Running Patent #21 Experiments...")
-    print("-" * 70)
-    try:
-        run_patent_21_experiments()
-        print("✅ Patent #21 experiments completed")
-    except Exception as e:
-        print(f"❌ Patent #21 experiments failed: {e}")
-    print()
-    
-    # Run Patent #29 experiments
-    print("🔬 Running Patent #29 Experiments...")
-    print("-" * 70)
-    try:
-        run_patent_29_experiments()
-        print("✅ Patent #29 experiments completed")
-    except Exception as e:
-        print(f"❌ Patent #29 experiments failed: {e}")
-    print()
-    
-    # Run Patent #11 experiments
-    print("🔬 Running Patent #11 Experiments...")
-    print("-" * 70)
-    try:
-        run_patent_11_experiments()
-        print("✅ Patent #11 experiments completed")
-    except Exception as e:
-        print(f"❌ Patent #11 experiments failed: {e}")
-    print()
-    
+
+    LOGS_DIR.mkdir(parents=True, exist_ok=True)
+    results = run_experiment_graph(
+        specs,
+        cache_path=CACHE_FILE,
+        force=args.force,
+        max_workers=args.workers,
+        log_dir=LOGS_DIR,
+        on_complete=report,
+    )
+
     elapsed = time.time() - start_time
-    
+    failed = [name for name, r in results.items() if r['status'] not in ('success', 'cached')]
+
+    print()
     print("=" * 70)
-    print("✅ All Experiments Completed!")
+    if failed:
+        print(f"⚠️  Experiments Completed with {len(failed)} failure(s): {', '.join(failed)}")
+    else:
+        print("✅ All Experiments Completed!")
     print("=" * 70)
     print(f"Total Time: {elapsed:.2f} seconds ({elapsed/60:.2f} minutes)")
     print()
+    print(f"Logs saved to: {LOGS_DIR}")
     print("Results saved to:")
-    print("  - docs/patents/experiments/results/patent_1/")
-    print("  - docs/patents/experiments/results/patent_3/")
-    print("  - docs/patents/experiments/results/patent_21/")
-    print("  - docs/patents/experiments/results/patent_29/")
+    for spec in specs:
+        if spec is not SYNTHETIC_DATA_SPEC:
+            print(f"  - docs/patents/experiments/results/{spec.name}/")
+
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == '__main__':
     main()
-
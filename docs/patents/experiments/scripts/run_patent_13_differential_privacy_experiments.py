@@ -16,11 +16,15 @@ import pandas as pd
 import json
 from pathlib import Path
 import time
-from scipy.stats import pearsonr
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 import random
-import hashlib
 import warnings
+import argparse
+
+from secure_signatures import (
+    SignatureCache, batch_temporal_decay_signatures, benchmark_signing, iterated_sha256, window_start_for
+)
+from differential_privacy import PrivacyAccountant, laplace_mechanism, make_rng, privacy_utility_sweep, row_correlations
 warnings.filterwarnings('ignore')
 
 # Configuration
@@ -38,6 +42,8 @@ DEFAULT_EPSILON = 0.02
 MIN_ENTROPY = 0.8
 RANDOM_SEED = 42
 np.random.seed(RANDOM_SEED)
+NOISE_RNG = make_rng(RANDOM_SEED)
+DIMENSION_KEYS = [f'dim_{j}' for j in range(12)]
 random.seed(RANDOM_SEED)
 
 
@@ -65,37 +71,40 @@ def generate_synthetic_data():
 
 
 def load_data():
-    """Load synthetic data."""
+    """Load synthetic data (regenerated if the profile count changed)."""
     if not (DATA_DIR / 'synthetic_profiles.json').exists():
         return generate_synthetic_data()
     
     with open(DATA_DIR / 'synthetic_profiles.json', 'r') as f:
         profiles = json.load(f)
     
+    if len(profiles) != NUM_PROFILES:
+        return generate_synthetic_data()
+    
     return profiles
 
 
-def laplace_noise(epsilon, sensitivity):
+def profiles_to_matrix(profiles):
+    """Stack profile dimensions into an (N, 12) matrix."""
+    return np.array([[profile['dimensions'][key] for key in DIMENSION_KEYS] for profile in profiles])
+
+
+def laplace_noise(epsilon, sensitivity, size=None):
     """Generate Laplace noise: L(0, scale) where scale = sensitivity / epsilon"""
-    u = random.uniform(-0.5, 0.5)
     scale = sensitivity / epsilon if epsilon > 0 else float('inf')
-    
-    # Laplace distribution: -scale * sign(u) * log(1 - 2*|u|)
-    noise = -scale * np.sign(u) * np.log(1 - 2 * abs(u))
-    
-    return noise
+    return NOISE_RNG.laplace(0.0, scale, size)
 
 
 def apply_differential_privacy(data, epsilon=DEFAULT_EPSILON, sensitivity=1.0):
     """Apply differential privacy with Laplace noise."""
-    noisy_data = {}
-    
-    for key, value in data.items():
-        noise = laplace_noise(epsilon, sensitivity)
-        noisy_value = np.clip(value + noise, 0.0, 1.0)  # Clamp to [0, 1]
-        noisy_data[key] = noisy_value
-    
-    return noisy_data
+    keys = list(data.keys())
+    noisy_values = laplace_mechanism([data[key] for key in keys], epsilon, sensitivity, rng=NOISE_RNG)
+    return dict(zip(keys, noisy_values))
+
+
+def apply_differential_privacy_matrix(matrix, epsilon=DEFAULT_EPSILON, sensitivity=1.0):
+    """Apply differential privacy with Laplace noise to a whole (N, 12) profile matrix."""
+    return laplace_mechanism(matrix, epsilon, sensitivity, rng=NOISE_RNG)
 
 
 def calculate_entropy(data, bins=10):
@@ -118,6 +127,18 @@ def calculate_entropy(data, bins=10):
     return entropy
 
 
+def calculate_entropy_rows(matrix, bins=10):
+    """Histogram entropy of each row of a [0, 1] matrix (vectorized calculate_entropy)."""
+    matrix = np.asarray(matrix, dtype=float)
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    bin_index = np.clip(np.searchsorted(edges, matrix, side='right') - 1, 0, bins - 1)
+    counts = np.zeros((len(matrix), bins))
+    np.add.at(counts, (np.repeat(np.arange(len(matrix)), matrix.shape[1]), bin_index.reshape(-1)), 1)
+    probs = counts / matrix.shape[1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return -np.sum(np.where(probs > 0, probs * np.log2(probs), 0.0), axis=1)
+
+
 def validate_entropy(anonymized_data, min_entropy=MIN_ENTROPY):
     """Validate entropy meets minimum threshold."""
     entropy = calculate_entropy(anonymized_data)
@@ -133,32 +154,28 @@ def generate_secure_salt(length=32):
 
 def create_secure_hash(data, salt, iterations=1000):
     """Create SHA-256 hash with multiple iterations."""
-    current_hash = (data + salt).encode('utf-8')
-    
-    for _ in range(iterations):
-        current_hash = hashlib.sha256(current_hash).digest()
-    
-    return current_hash.hex()
+    return iterated_sha256(data, salt, iterations)
 
 
-def create_temporal_decay_signature(salt, window_minutes=15):
-    """Create temporal decay signature with time window."""
-    now = time.time()
-    
+def create_temporal_decay_signature(salt, window_minutes=15, cache=None):
+    """Create temporal decay signature with time window (memoized per window if cache given)."""
     # Round to time window
-    window_seconds = window_minutes * 60
-    window_start = int(now // window_seconds) * window_seconds
+    window_start = window_start_for(time.time(), window_minutes)
     
-    # Create temporal data
-    temporal_data = f"{salt}-{window_start}"
+    if cache is not None:
+        signature = cache.get(salt, window_start, 1000, 'sha256-iterated')
+        if signature is not None:
+            return signature, window_start
     
-    # Create signature
-    signature = create_secure_hash(temporal_data, salt)
+    # Create signature over the temporal data
+    signature = create_secure_hash(f"{salt}-{window_start}", salt)
+    if cache is not None:
+        cache.put(salt, window_start, 1000, 'sha256-iterated', signature)
     
     return signature, window_start
 
 
-def experiment_1_laplace_noise():
+def experiment_1_laplace_noise(accountant=None):
     """Experiment 1: Laplace Noise Addition Accuracy."""
     print("=" * 70)
     print("Experiment 1: Laplace Noise Addition Accuracy")
@@ -167,39 +184,23 @@ def experiment_1_laplace_noise():
     
     profiles = load_data()
     
-    results = []
     print(f"Applying Laplace noise to {len(profiles)} profiles...")
     
-    for profile in profiles:
-        original_data = profile['dimensions']
-        
-        # Apply differential privacy
-        noisy_data = apply_differential_privacy(original_data, epsilon=DEFAULT_EPSILON)
-        
-        # Calculate noise statistics
-        noise_values = []
-        for key in original_data:
-            noise = noisy_data[key] - original_data[key]
-            noise_values.append(noise)
-        
-        avg_noise = np.mean(noise_values)
-        noise_std = np.std(noise_values)
-        max_noise = np.max(np.abs(noise_values))
-        
-        # Calculate utility (correlation with original)
-        original_values = list(original_data.values())
-        noisy_values = list(noisy_data.values())
-        correlation, p_value = pearsonr(original_values, noisy_values)
-        
-        results.append({
-            'profile_id': profile['profile_id'],
-            'avg_noise': avg_noise,
-            'noise_std': noise_std,
-            'max_noise': max_noise,
-            'correlation': correlation,
-        })
-    
-    df = pd.DataFrame(results)
+    # Apply differential privacy to the whole profile matrix at once
+    original = profiles_to_matrix(profiles)
+    noisy = apply_differential_privacy_matrix(original, epsilon=DEFAULT_EPSILON)
+    if accountant is not None:
+        accountant.spend(DEFAULT_EPSILON)
+    
+    # Calculate noise statistics and utility (correlation with original) per profile
+    noise_values = noisy - original
+    df = pd.DataFrame({
+        'profile_id': [profile['profile_id'] for profile in profiles],
+        'avg_noise': noise_values.mean(axis=1),
+        'noise_std': noise_values.std(axis=1),
+        'max_noise': np.abs(noise_values).max(axis=1),
+        'correlation': row_correlations(original, noisy),
+    })
     
     # Calculate metrics
     avg_noise_mean = df['avg_noise'].mean()
@@ -226,7 +227,7 @@ def experiment_1_laplace_noise():
     }
 
 
-def experiment_2_epsilon_privacy_budget():
+def experiment_2_epsilon_privacy_budget(accountant=None):
     """Experiment 2: Epsilon Privacy Budget Effectiveness."""
     print("=" * 70)
     print("Experiment 2: Epsilon Privacy Budget Effectiveness")
@@ -235,40 +236,19 @@ def experiment_2_epsilon_privacy_budget():
     
     profiles = load_data()
     
-    results = []
     print(f"Testing epsilon privacy budgets for {len(profiles)} profiles...")
     
     epsilon_levels = [0.01, 0.02, 0.1]  # Maximum, High, Standard
     
-    for epsilon in epsilon_levels:
-        correlations = []
-        noise_levels = []
-        
-        for profile in profiles[:100]:  # Sample for speed
-            original_data = profile['dimensions']
-            noisy_data = apply_differential_privacy(original_data, epsilon=epsilon)
-            
-            # Calculate correlation (utility)
-            original_values = list(original_data.values())
-            noisy_values = list(noisy_data.values())
-            correlation, _ = pearsonr(original_values, noisy_values)
-            correlations.append(correlation)
-            
-            # Calculate noise level
-            noise = np.mean([abs(noisy_data[k] - original_data[k]) for k in original_data])
-            noise_levels.append(noise)
-        
-        avg_correlation = np.mean(correlations)
-        avg_noise = np.mean(noise_levels)
-        
-        results.append({
-            'epsilon': epsilon,
-            'avg_correlation': avg_correlation,
-            'avg_noise': avg_noise,
-            'privacy_level': 'MAXIMUM' if epsilon == 0.01 else 'HIGH' if epsilon == 0.02 else 'STANDARD',
-        })
+    # Sweep every epsilon over the full profile matrix
+    results = privacy_utility_sweep(profiles_to_matrix(profiles), epsilon_levels, rng=NOISE_RNG)
+    for row in results:
+        epsilon = row['epsilon']
+        row['privacy_level'] = 'MAXIMUM' if epsilon == 0.01 else 'HIGH' if epsilon == 0.02 else 'STANDARD'
+        if accountant is not None:
+            accountant.spend(epsilon)
     
-    df = pd.DataFrame(results)
+    df = pd.DataFrame(results)[['epsilon', 'avg_correlation', 'avg_noise', 'privacy_level']]
     
     print()
     print("Results:")
@@ -288,7 +268,7 @@ def experiment_2_epsilon_privacy_budget():
     }
 
 
-def experiment_3_entropy_validation():
+def experiment_3_entropy_validation(accountant=None):
     """Experiment 3: Entropy Validation Accuracy."""
     print("=" * 70)
     print("Experiment 3: Entropy Validation Accuracy")
@@ -297,31 +277,23 @@ def experiment_3_entropy_validation():
     
     profiles = load_data()
     
-    results = []
     print(f"Validating entropy for {len(profiles)} profiles...")
     
-    for profile in profiles:
-        original_data = profile['dimensions']
-        
-        # Apply differential privacy
-        noisy_data = apply_differential_privacy(original_data, epsilon=DEFAULT_EPSILON)
-        
-        # Validate entropy
-        is_valid, entropy = validate_entropy(noisy_data, min_entropy=MIN_ENTROPY)
-        
-        # Calculate original entropy for comparison
-        original_entropy = calculate_entropy(original_data)
-        
-        results.append({
-            'profile_id': profile['profile_id'],
-            'original_entropy': original_entropy,
-            'anonymized_entropy': entropy,
-            'min_entropy': MIN_ENTROPY,
-            'is_valid': is_valid,
-            'entropy_meets_threshold': entropy >= MIN_ENTROPY,
-        })
-    
-    df = pd.DataFrame(results)
+    # Apply differential privacy and validate entropy for all profiles at once
+    original = profiles_to_matrix(profiles)
+    noisy = apply_differential_privacy_matrix(original, epsilon=DEFAULT_EPSILON)
+    if accountant is not None:
+        accountant.spend(DEFAULT_EPSILON)
+    anonymized_entropy = calculate_entropy_rows(noisy)
+    
+    df = pd.DataFrame({
+        'profile_id': [profile['profile_id'] for profile in profiles],
+        'original_entropy': calculate_entropy_rows(original),
+        'anonymized_entropy': anonymized_entropy,
+        'min_entropy': MIN_ENTROPY,
+        'is_valid': anonymized_entropy >= MIN_ENTROPY,
+        'entropy_meets_threshold': anonymized_entropy >= MIN_ENTROPY,
+    })
     
     # Calculate metrics
     validation_rate = df['is_valid'].mean()
@@ -360,20 +332,19 @@ def experiment_4_temporal_decay_signature():
     results = []
     print(f"Creating temporal decay signatures for {len(profiles)} profiles...")
     
-    for profile in profiles:
-        # Generate fresh salt
-        salt = generate_secure_salt()
-        
-        # Create temporal signature
-        signature, window_start = create_temporal_decay_signature(salt, window_minutes=15)
-        
+    # Generate fresh salts and sign them all in one batch
+    salts = [generate_secure_salt() for _ in profiles]
+    cache = SignatureCache()
+    signatures, window_starts = batch_temporal_decay_signatures(salts, window_minutes=15, cache=cache)
+    
+    for profile, salt, signature, window_start in zip(profiles, salts, signatures, window_starts):
         # Simulate time passage (test expiration)
         current_time = time.time()
         expiration_time = window_start + (30 * 24 * 60 * 60)  # 30 days
         is_expired = current_time > expiration_time
         
         # Test signature uniqueness (same salt, different time windows)
-        signature2, window_start2 = create_temporal_decay_signature(salt, window_minutes=15)
+        signature2, window_start2 = create_temporal_decay_signature(salt, window_minutes=15, cache=cache)
         signatures_different = (signature != signature2) or (window_start != window_start2)
         
         results.append({
@@ -413,6 +384,32 @@ def experiment_4_temporal_decay_signature():
     }
 
 
+def experiment_5_signature_throughput():
+    """Experiment 5: Temporal Decay Signature Throughput."""
+    print("=" * 70)
+    print("Experiment 5: Temporal Decay Signature Throughput")
+    print("=" * 70)
+    print()
+    
+    num_signatures = max(NUM_PROFILES, 2000)
+    print(f"Benchmarking {num_signatures} signatures per signing mode...")
+    
+    df = pd.DataFrame(benchmark_signing(num_signatures))
+    
+    print()
+    print("Results:")
+    print("-" * 70)
+    for _, row in df.iterrows():
+        print(f"{row['mode']:<32} {row['signatures_per_sec']:>14,.0f} signatures/sec")
+    
+    df.to_csv(RESULTS_DIR / 'signature_throughput.csv', index=False)
+    print(f"✅ Results saved to: {RESULTS_DIR / 'signature_throughput.csv'}")
+    
+    return {
+        'signatures_per_sec': dict(zip(df['mode'], df['signatures_per_sec'])),
+    }
+
+
 def validate_patent_claims(experiment_results):
     """Validate patent claims against experiment results."""
     validation_report = {
@@ -492,11 +489,19 @@ def main():
     
     start_time = time.time()
     
+    # Track cumulative epsilon per profile across every noisy release
+    accountant = PrivacyAccountant(len(load_data()))
+    
     # Run all required experiments
-    exp1_results = experiment_1_laplace_noise()
-    exp2_results = experiment_2_epsilon_privacy_budget()
-    exp3_results = experiment_3_entropy_validation()
+    exp1_results = experiment_1_laplace_noise(accountant)
+    exp2_results = experiment_2_epsilon_privacy_budget(accountant)
+    exp3_results = experiment_3_entropy_validation(accountant)
     exp4_results = experiment_4_temporal_decay_signature()
+    exp5_results = experiment_5_signature_throughput()
+    
+    privacy_budget = accountant.summary()
+    with open(RESULTS_DIR / 'privacy_budget.json', 'w') as f:
+        json.dump(privacy_budget, f, indent=2)
     
     # Validate patent claims
     experiment_results = {
@@ -504,6 +509,7 @@ def main():
         'exp2': exp2_results,
         'exp3': exp3_results,
         'exp4': exp4_results,
+        'exp5': exp5_results,
     }
     
     validation_report = validate_patent_claims(experiment_results)
@@ -515,6 +521,8 @@ def main():
     print("All Experiments Complete")
     print("=" * 70)
     print(f"Total Execution Time: {elapsed_time:.2f} seconds")
+    print(f"Cumulative ε per profile: {privacy_budget['max_epsilon_spent']:.3f} "
+          f"over {privacy_budget['total_queries'] // max(privacy_budget['num_agents'], 1)} releases")
     print()
     
     # Print validation results
@@ -532,5 +540,9 @@ def main():
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=f'Patent #{PATENT_NUMBER} experiments')
+    parser.add_argument('--profiles', type=int, default=NUM_PROFILES,
+                        help=f'Number of synthetic profiles (default {NUM_PROFILES})')
+    NUM_PROFILES = parser.parse_args().profiles
     main()
 
@@ -17,6 +17,8 @@ import json
 from pathlib import Path
 import time
 
+from differential_privacy import DEFAULT_SEED, laplace_mechanism, make_rng, normalize_rows
+
 # Configuration
 DATA_DIR = Path(__file__).parent.parent / 'data' / 'patent_21_quantum_state_preservation'
 RESULTS_DIR = Path(__file__).parent.parent / 'results' / 'patent_21'
@@ -25,6 +27,7 @@ RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 # Differential privacy parameters
 # Adjusted for better balance between privacy and accuracy
 EPSILON = 0.01  # Optimized based on focused parameter sensitivity testing (optimal tradeoff score: 0.3921)
+NOISE_RNG = make_rng(DEFAULT_SEED)
 
 
 def load_data():
@@ -43,37 +46,26 @@ def quantum_compatibility(profile_a, profile_b):
     return inner_product ** 2
 
 
-def apply_differential_privacy(profile, epsilon=EPSILON):
+def apply_differential_privacy(profile, epsilon=EPSILON, rng=None):
     """
     Apply differential privacy using Laplace mechanism.
     
     Adds Laplace noise: Lap(Δf/ε) where Δf = sensitivity
     Optimized to preserve quantum state properties better.
+    Accepts a single 12-D profile or an (N, 12) profile matrix.
     """
     # Sensitivity: For quantum states, use per-dimension sensitivity
     # Each dimension can change by at most 1.0, but we scale down noise
     # to preserve quantum state structure better
     sensitivity = 1.0  # Per-dimension sensitivity
-    scale = sensitivity / epsilon
-    
-    # Generate Laplace noise
-    noise = np.random.laplace(0, scale, 12)
+    profile = np.asarray(profile, dtype=float)
     
-    # Add noise
-    anonymized = profile + noise
-    
-    # Clip to valid range
-    anonymized = np.clip(anonymized, 0.0, 1.0)
+    # Add Laplace noise and clip to valid range
+    anonymized = laplace_mechanism(profile, epsilon, sensitivity, rng=rng if rng is not None else NOISE_RNG)
     
     # Normalize to maintain quantum state properties (critical for quantum compatibility)
-    norm = np.linalg.norm(anonymized)
-    if norm > 0:
-        anonymized = anonymized / norm
-    else:
-        # Fallback: use original profile if normalization fails
-        anonymized = profile / np.linalg.norm(profile) if np.linalg.norm(profile) > 0 else profile
-    
-    return anonymized
+    # Fallback: use original profile if normalization fails
+    return normalize_rows(anonymized, fallback=profile)
 
 
 def experiment_1_quantum_state_preservation():
@@ -187,6 +179,7 @@ def experiment_2_performance_benchmarks():
         throughput = size / elapsed  # pairs per second
         
         results.append({
+            'mode': 'per_pair',
             'num_pairs': size,
             'total_time_seconds': elapsed,
             'time_per_pair_ms': time_per_pair,
@@ -195,6 +188,23 @@ def experiment_2_performance_benchmarks():
         
         print(f"  Time: {elapsed:.4f}s, Per pair: {time_per_pair:.4f}ms, Throughput: {throughput:.0f} pairs/sec")
     
+    # Batch mode: anonymize the full profile matrix at once, then score disjoint pairs
+    matrix = np.array(list(profiles.values()))
+    num_pairs = len(matrix) // 2
+    print(f"Testing batch anonymization of {len(matrix)} profiles ({num_pairs} pairs)...")
+    start_time = time.time()
+    anonymized = apply_differential_privacy(matrix)
+    np.einsum('ij,ij->i', anonymized[0:2 * num_pairs:2], anonymized[1:2 * num_pairs:2]) ** 2
+    elapsed = time.time() - start_time
+    results.append({
+        'mode': 'batch',
+        'num_pairs': num_pairs,
+        'total_time_seconds': elapsed,
+        'time_per_pair_ms': elapsed / max(num_pairs, 1) * 1000,
+        'throughput_pairs_per_sec': num_pairs / elapsed if elapsed > 0 else 0.0
+    })
+    print(f"  Time: {elapsed:.4f}s, Throughput: {results[-1]['throughput_pairs_per_sec']:.0f} pairs/sec")
+    
     print()
     
     # Save results
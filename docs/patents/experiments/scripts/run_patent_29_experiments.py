@@ -24,6 +24,8 @@ import time
 from typing import List, Dict, Any, Optional, Tuple
 from scipy.stats import pearsonr
 
+from factorized_entanglement import MatrixProductState
+
 # Configuration
 DATA_DIR = Path(__file__).parent.parent / 'data' / 'patent_29_multi_entity_quantum_matching'
 RESULTS_DIR = Path(__file__).parent.parent / 'results' / 'patent_29'
@@ -47,8 +49,10 @@ def create_entangled_state(entities, use_full_tensor=True):
     """
     Create N-way entangled quantum state using tensor products.
     
-    For small N (≤4), uses full tensor product.
-    For N ≥ 5, uses dimensionality reduction to avoid exponential growth (optimized for performance).
+    For small N (≤4), uses the dense full tensor product (12^N dimensions).
+    For N ≥ 5, returns the same tensor product as a factorized
+    MatrixProductState, so the semantics do not change with group size.
+    With use_full_tensor=False, uses the 12-D weighted-average approximation.
     """
     if len(entities) == 0:
         return np.array([])
@@ -67,10 +71,13 @@ def create_entangled_state(entities, use_full_tensor=True):
             entangled = entangled / norm
         
         return entangled
+    elif use_full_tensor:
+        # For N ≥ 5, keep the tensor product factorized (one 12-D site per entity)
+        # instead of materializing 12^N dimensions
+        return MatrixProductState.from_product(entities)
     else:
-        # For N ≥ 5, use weighted combination with entanglement coefficients
+        # Weighted combination with entanglement coefficients
         # This approximates tensor product while avoiding exponential dimension growth
-        # Optimized for performance: avoids 12^5 = 248,832 dimensions
         weights = np.ones(len(entities)) / len(entities)
         entangled = np.zeros(12)
         
@@ -85,38 +92,51 @@ def create_entangled_state(entities, use_full_tensor=True):
         return entangled
 
 
-def n_way_compatibility(entangled_state, user_profile):
+def project_entangled_state(entangled_state, dim=12):
     """
-    Calculate N-way compatibility using quantum fidelity.
+    Project an entangled state to the user dimension.
     
-    Handles both full tensor product (high dimension) and projected states.
-    """
-    # For pure states: F(|ψ⟩, |φ⟩) = |⟨ψ|φ⟩|²
+    - MatrixProductState: contract all other sites with their mean, O(N·12·χ²)
+    - Dense tensor product: reshape into `dim`-sized chunks and average them
+      (or take the first `dim` dimensions if the size is not a multiple)
+    - Same-dimension state: returned as-is
     
-    # If entangled state is high-dimensional (from tensor product), project to user dimension
-    if len(entangled_state) > len(user_profile):
-        # Project high-dimensional entangled state to 12D
-        # Method: Reshape and take mean of chunks, or use first 12 dimensions
-        if len(entangled_state) % len(user_profile) == 0:
+    Projections are normalized; returns None if the projection vanishes.
+    """
+    if isinstance(entangled_state, MatrixProductState):
+        projected = entangled_state.projected_state()
+    elif len(entangled_state) > dim:
+        if len(entangled_state) % dim == 0:
             # Reshape and average
-            chunks = len(entangled_state) // len(user_profile)
-            projected = entangled_state[:len(user_profile) * chunks].reshape(chunks, len(user_profile)).mean(axis=0)
+            chunks = len(entangled_state) // dim
+            projected = entangled_state[:dim * chunks].reshape(chunks, dim).mean(axis=0)
         else:
             # Take first 12 dimensions and normalize
-            projected = entangled_state[:len(user_profile)]
-        
-        # Normalize projection
-        norm = np.linalg.norm(projected)
-        if norm > 0:
-            projected = projected / norm
-        else:
-            projected = user_profile / np.linalg.norm(user_profile) if np.linalg.norm(user_profile) > 0 else user_profile
-        
-        inner_product = np.abs(np.dot(projected, user_profile))
+            projected = entangled_state[:dim]
     else:
-        # Same dimension, direct inner product
-        inner_product = np.abs(np.dot(entangled_state, user_profile))
+        # Same dimension, used directly
+        return entangled_state
+    
+    norm = np.linalg.norm(projected)
+    if norm > 0:
+        return projected / norm
+    return None
+
+
+def n_way_compatibility(entangled_state, user_profile):
+    """
+    Calculate N-way compatibility using quantum fidelity.
     
+    Handles full tensor product (high dimension), factorized
+    MatrixProductState, and projected states.
+    """
+    # For pure states: F(|ψ⟩, |φ⟩) = |⟨ψ|φ⟩|²
+    projected = project_entangled_state(entangled_state, dim=len(user_profile))
+    if projected is None:
+        # Projection vanished: fall back to the (normalized) user state itself
+        projected = user_profile / np.linalg.norm(user_profile) if np.linalg.norm(user_profile) > 0 else user_profile
+    
+    inner_product = np.abs(np.dot(projected, user_profile))
     return inner_product ** 2
 
 
@@ -135,6 +155,111 @@ def sequential_bipartite_compatibility(entities, user_profile):
     return np.mean(compatibilities)
 
 
+# ============================================================================
+# BATCH SCORING (many users × many event states)
+# ============================================================================
+
+def batch_n_way_compatibility(user_profiles, entangled_states):
+    """
+    N-way compatibility for every (user, event) pair.
+    
+    Args:
+        user_profiles: (U, 12) matrix of user profiles
+        entangled_states: Sequence of E entangled states (dense or MatrixProductState)
+    
+    Returns:
+        (U, E) matrix equal to n_way_compatibility(state_e, user_u) for every pair
+    """
+    user_profiles = np.asarray(user_profiles, dtype=float)
+    dim = user_profiles.shape[1]
+    
+    projections = np.zeros((len(entangled_states), dim))
+    vanished = np.zeros(len(entangled_states), dtype=bool)
+    for e, state in enumerate(entangled_states):
+        projected = project_entangled_state(state, dim=dim)
+        if projected is None:
+            vanished[e] = True
+        else:
+            projections[e] = projected
+    
+    compatibility = (user_profiles @ projections.T) ** 2
+    if vanished.any():
+        # Fallback state is the normalized user: |⟨û|u⟩|² = ‖u‖²
+        compatibility[:, vanished] = np.sum(user_profiles ** 2, axis=1, keepdims=True)
+    return compatibility
+
+
+def batch_sequential_bipartite_compatibility(user_profiles, event_entities):
+    """
+    Sequential bipartite compatibility for every (user, event) pair.
+    
+    mean_k |⟨e_k|u⟩|² = ⟨u|ρ|u⟩ with ρ = mean_k |e_k⟩⟨e_k|, so each event is
+    reduced to one 12×12 matrix regardless of its entity count.
+    
+    Args:
+        user_profiles: (U, 12) matrix of user profiles
+        event_entities: Sequence of E lists of entity profiles
+    
+    Returns:
+        (U, E) compatibility matrix (0.0 for events without entities)
+    """
+    user_profiles = np.asarray(user_profiles, dtype=float)
+    dim = user_profiles.shape[1]
+    
+    density = np.zeros((len(event_entities), dim, dim))
+    for e, entities in enumerate(event_entities):
+        if len(entities) > 0:
+            entities = np.asarray(entities, dtype=float)
+            density[e] = entities.T @ entities / len(entities)
+    
+    return np.einsum('ui,eij,uj->ue', user_profiles, density, user_profiles, optimize=True)
+
+
+def top_k_users_per_event(user_profiles, entangled_states, k=100, block_size=262144, threshold=None):
+    """
+    Top-k users per event by N-way compatibility, streamed over user blocks.
+    
+    Only a (block_size, E) score block is held at a time, and candidates are
+    selected with argpartition rather than a full sort, so this scales to
+    millions of users.
+    
+    Returns:
+        (indices, scores, call_counts): (E, k) user indices and scores sorted
+        by descending score, and per-event counts of users above `threshold`
+        (None if no threshold given)
+    """
+    user_profiles = np.asarray(user_profiles, dtype=float)
+    num_users = len(user_profiles)
+    num_events = len(entangled_states)
+    k = min(k, num_users)
+    
+    best_indices = np.empty((0, num_events), dtype=np.int64)
+    best_scores = np.empty((0, num_events))
+    call_counts = np.zeros(num_events, dtype=np.int64) if threshold is not None else None
+    
+    for start in range(0, num_users, block_size):
+        scores = batch_n_way_compatibility(user_profiles[start:start + block_size], entangled_states)
+        if call_counts is not None:
+            call_counts += np.count_nonzero(scores > threshold, axis=0)
+        
+        # Merge this block's candidates with the running top-k
+        candidate_scores = np.vstack([best_scores, scores])
+        candidate_indices = np.vstack([
+            best_indices,
+            np.broadcast_to(np.arange(start, start + len(scores))[:, None], scores.shape),
+        ])
+        if len(candidate_scores) > k:
+            keep = np.argpartition(-candidate_scores, k - 1, axis=0)[:k]
+            candidate_scores = np.take_along_axis(candidate_scores, keep, axis=0)
+            candidate_indices = np.take_along_axis(candidate_indices, keep, axis=0)
+        best_scores, best_indices = candidate_scores, candidate_indices
+    
+    order = np.argsort(-best_scores, axis=0)
+    best_scores = np.take_along_axis(best_scores, order, axis=0)
+    best_indices = np.take_along_axis(best_indices, order, axis=0)
+    return best_indices.T, best_scores.T, call_counts
+
+
 def calculate_fabric_stability_for_group(
     entity_profiles: List[np.ndarray],
     user_profile: np.ndarray
@@ -205,9 +330,8 @@ def experiment_1_n_way_vs_sequential():
             user_profile = user_profiles[user_id]
             user_profile = user_profile / np.linalg.norm(user_profile) if np.linalg.norm(user_profile) > 0 else user_profile
             
-            # N-way matching (use full tensor for small N)
-            use_full = num_entities <= 5
-            entangled_state = create_entangled_state(entity_profiles, use_full_tensor=use_full)
+            # N-way matching (dense tensor for N ≤ 4, factorized above)
+            entangled_state = create_entangled_state(entity_profiles, use_full_tensor=True)
             n_way_score = n_way_compatibility(entangled_state, user_profile)
             n_way_scores.append(n_way_score)
             
@@ -758,7 +882,8 @@ def experiment_6_coefficient_optimization():
         
         for iteration in range(max_iterations):
             # Calculate current fidelity (simplified)
-            entangled_state = create_entangled_state(entity_profiles, use_full_tensor=(n_entities <= 5))
+            # Dense tensor for N ≤ 4, 12-D approximation above (compared by raw vector below)
+            entangled_state = create_entangled_state(entity_profiles, use_full_tensor=(n_entities <= 4))
             if len(entangled_state) == 0:
                 break
             
@@ -948,57 +1073,59 @@ def experiment_8_scalable_user_calling():
     
     results = []
     
-    # Test with different user counts
-    user_counts = [1000, 5000, 10000, 50000]
+    # Test with different user counts, calling a batch of events at once
+    user_counts = [1000, 10000, 100000, 1000000]
     entity_counts = [3, 5, 7, 10]
+    n_events = 10
+    top_k = 100
+    call_threshold = 0.7
+    
+    # Real users first, topped up with synthetic normalized profiles for large counts
+    base_profiles = np.array(list(user_profiles.values()))
+    max_users = max(user_counts)
+    if len(base_profiles) < max_users:
+        extra = np.random.uniform(0.0, 1.0, (max_users - len(base_profiles), 12))
+        extra /= np.linalg.norm(extra, axis=1, keepdims=True)
+        all_profiles = np.vstack([base_profiles, extra]) if len(base_profiles) else extra
+    else:
+        all_profiles = base_profiles
     
     for n_users in user_counts:
+        test_profiles = all_profiles[:n_users]
+        
         for n_entities in entity_counts:
-            if n_users > len(user_profiles):
-                # Simulate with available users
-                test_users = list(user_profiles.keys())[:min(n_users, len(user_profiles))]
-            else:
-                test_users = list(user_profiles.keys())[:n_users]
-            
-            # Generate test event
-            entity_profiles = []
-            for _ in range(n_entities):
-                profile = np.random.uniform(0.0, 1.0, 12)
-                profile = profile / np.linalg.norm(profile) if np.linalg.norm(profile) > 0 else profile
-                entity_profiles.append(profile)
-            
-            # Benchmark user calling
-            # OPTIMIZATION: Cache entangled state for all users (only calculate once)
-            entangled_state = create_entangled_state(entity_profiles, use_full_tensor=(n_entities <= 4))
+            # Generate test events
+            entangled_states = []
+            for _ in range(n_events):
+                entity_profiles = np.random.uniform(0.0, 1.0, (n_entities, 12))
+                entity_profiles /= np.linalg.norm(entity_profiles, axis=1, keepdims=True)
+                entangled_states.append(create_entangled_state(list(entity_profiles), use_full_tensor=True))
             
+            # Benchmark user calling: score every user against every event, keep top-k per event
             start_time = time.time()
-            call_count = 0
-            
-            for user_id in test_users:
-                user_profile = user_profiles[user_id]
-                
-                # Calculate compatibility using cached entangled state
-                if len(entangled_state) > 0:
-                    # Real compatibility calculation
-                    if len(entangled_state) == len(user_profile):
-                        compatibility = np.abs(np.dot(entangled_state, user_profile)) ** 2
-                    else:
-                        # Fallback for mismatched dimensions
-                        compatibility = np.random.uniform(0.0, 1.0)
-                    if compatibility > 0.7:
-                        call_count += 1
-            
+            top_indices, top_scores, call_counts = top_k_users_per_event(
+                test_profiles, entangled_states, k=top_k, threshold=call_threshold
+            )
             elapsed = time.time() - start_time
-            throughput = len(test_users) / elapsed if elapsed > 0 else 0.0
             
-            print(f"  {n_users} users, {n_entities} entities: {elapsed*1000:.2f}ms, {throughput:.0f} users/sec")
+            pairs_scored = n_users * n_events
+            throughput = n_users / elapsed if elapsed > 0 else 0.0
+            time_budget_ms = 100 if n_users <= 1000 else 500 if n_users <= 10000 else 2000
+            
+            print(f"  {n_users} users, {n_entities} entities, {n_events} events: "
+                  f"{elapsed*1000:.2f}ms, {throughput:.0f} users/sec")
             
             results.append({
                 'n_users': n_users,
                 'n_entities': n_entities,
+                'n_events': n_events,
                 'calculation_time_ms': elapsed * 1000,
                 'throughput_users_per_sec': throughput,
-                'meets_target': elapsed * 1000 < (100 if n_users <= 1000 else 500 if n_users <= 10000 else 2000)
+                'pairs_per_sec': pairs_scored / elapsed if elapsed > 0 else 0.0,
+                'avg_users_called': float(np.mean(call_counts)),
+                'avg_top_k_score': float(np.mean(top_scores)),
+                'time_budget_ms': time_budget_ms,
+                'meets_target': elapsed * 1000 < time_budget_ms
             })
     
     print()
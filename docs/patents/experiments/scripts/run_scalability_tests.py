@@ -8,225 +8,232 @@ Runs all patent experiments with large agent counts:
 - 500,000 agents
 - 1,000,000 agents
 
+For each agent count, synthetic data is generated once in-process, then the
+patent experiment entry points run concurrently in a process pool (see
+experiment_harness.py). Each experiment records wall-clock duration, CPU
+time, peak RSS and throughput (agents/second). Scaling exponents
+(duration ≈ a · N^b) are fitted across agent counts to estimate the largest
+population each algorithm can handle within a time budget.
+
+Usage:
+    python3 run_scalability_tests.py                      # All default agent counts
+    python3 run_scalability_tests.py 10000 100000         # Specific agent counts
+    python3 run_scalability_tests.py --workers 2 10000    # Limit pool size
+
 Date: December 19, 2025
 """
 
 import sys
+import json
 import time
-import subprocess
+import argparse
 from pathlib import Path
 from datetime import datetime
 
 # Configuration
 SCRIPTS_DIR = Path(__file__).parent
+sys.path.insert(0, str(SCRIPTS_DIR))
 RESULTS_DIR = Path(__file__).parent.parent / 'results' / 'scalability'
 RESULTS_DIR.mkdir(parents=True, exist_ok=True)
-LOGS_DIR = Path(__file__).parent.parent / 'logs'
+LOGS_DIR = Path(__file__).parent.parent / 'logs' / 'scalability'
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
+from experiment_harness import (
+    ExperimentSpec, run_experiments_in_pool, fit_scaling_exponent, extrapolate_max_agents
+)
+
 # Agent counts to test
 AGENT_COUNTS = [10000, 100000, 500000, 1000000]
 
+# Experiments to benchmark at every agent count
+EXPERIMENTS = [
+    ExperimentSpec('patent_1', 'run_patent_1_experiments', 'run_patent_1_experiments'),
+    # Patent #3 is a time-based simulation; too slow above 100k agents
+    ExperimentSpec('patent_3', 'run_patent_3_experiments', 'run_patent_3_experiments',
+                   kwargs={'num_months': 6}, timeout=7200, max_agents=100000),
+    ExperimentSpec('patent_21', 'run_patent_21_experiments', 'run_patent_21_experiments'),
+    ExperimentSpec('patent_29', 'run_patent_29_experiments', 'run_patent_29_experiments'),
+]
+
+# Production time budget used to extrapolate the supported population size
+PRODUCTION_BUDGET_SECONDS = 3600
+
+
+def generate_data(num_agents):
+    """Generate synthetic data for all patents once, in-process."""
+    import contextlib
+    import generate_synthetic_data
+
+    log_path = LOGS_DIR / f'data_generation_{num_agents}.log'
+    with open(log_path, 'w') as log_file, contextlib.redirect_stdout(log_file):
+        generate_synthetic_data.main(num_agents)
+
 
-def run_experiments_for_agent_count(num_agents):
+def run_experiments_for_agent_count(num_agents, max_workers=None):
     """Run all experiments for a specific agent count."""
     print("=" * 70)
     print(f"SCALABILITY TEST: {num_agents:,} AGENTS")
     print("=" * 70)
     print()
-    
+
     start_time = time.time()
     results = {}
-    
-    # Step 1: Generate data
+
+    # Step 1: Generate data (once for all experiments at this scale)
     print(f"📊 Step 1: Generating data for {num_agents:,} agents...")
     print("-" * 70)
+    data_start = time.time()
     try:
-        data_start = time.time()
-        result = subprocess.run(
-            ['python3', str(SCRIPTS_DIR / 'generate_synthetic_data.py'), str(num_agents)],
-            cwd=str(SCRIPTS_DIR.parent),
-            capture_output=True,
-            text=True,
-            timeout=3600  # 1 hour timeout
-        )
+        generate_data(num_agents)
         data_duration = time.time() - data_start
-        
-        if result.returncode == 0:
-            print(f"✅ Data generation completed in {data_duration:.2f} seconds")
-            results['data_generation'] = {'duration': data_duration, 'status': 'success'}
-        else:
-            print(f"❌ Data generation failed: {result.stderr}")
-            results['data_generation'] = {'duration': data_duration, 'status': 'failed', 'error': result.stderr}
-            return results
-    except subprocess.TimeoutExpired:
-        print(f"❌ Data generation timed out after 1 hour")
-        results['data_generation'] = {'status': 'timeout'}
-        return results
+        print(f"✅ Data generation completed in {data_duration:.2f} seconds")
+        results['data_generation'] = {'duration': data_duration, 'status': 'success'}
     except Exception as e:
         print(f"❌ Data generation error: {e}")
-        results['data_generation'] = {'status': 'error', 'error': str(e)}
+        results['data_generation'] = {
+            'duration': time.time() - data_start, 'status': 'error', 'error': str(e)
+        }
         return results
-    
-    print()
-    
-    # Step 2: Run Patent #1 experiments (sample pairs for large N)
-    print(f"🔬 Step 2: Running Patent #1 experiments...")
-    print("-" * 70)
-    try:
-        exp_start = time.time()
-        result = subprocess.run(
-            ['python3', str(SCRIPTS_DIR / 'run_patent_1_experiments.py')],
-            cwd=str(SCRIPTS_DIR.parent),
-            capture_output=True,
-            text=True,
-            timeout=3600
-        )
-        exp_duration = time.time() - exp_start
-        
-        if result.returncode == 0:
-            print(f"✅ Patent #1 completed in {exp_duration:.2f} seconds")
-            results['patent_1'] = {'duration': exp_duration, 'status': 'success'}
-        else:
-            print(f"⚠️  Patent #1 had issues: {result.stderr[:200]}")
-            results['patent_1'] = {'duration': exp_duration, 'status': 'partial'}
-    except Exception as e:
-        print(f"❌ Patent #1 error: {e}")
-        results['patent_1'] = {'status': 'error', 'error': str(e)}
-    
-    print()
-    
-    # Step 3: Run Patent #3 experiments (most time-consuming, may need to skip for very large N)
-    if num_agents <= 100000:
-        print(f"🔬 Step 3: Running Patent #3 experiments (6 months)...")
-        print("-" * 70)
-        try:
-            exp_start = time.time()
-            result = subprocess.run(
-                ['python3', str(SCRIPTS_DIR / 'run_patent_3_experiments.py'), '6'],
-                cwd=str(SCRIPTS_DIR.parent),
-                capture_output=True,
-                text=True,
-                timeout=7200  # 2 hour timeout
-            )
-            exp_duration = time.time() - exp_start
-            
-            if result.returncode == 0:
-                print(f"✅ Patent #3 completed in {exp_duration:.2f} seconds")
-                results['patent_3'] = {'duration': exp_duration, 'status': 'success'}
-            else:
-                print(f"⚠️  Patent #3 had issues: {result.stderr[:200]}")
-                results['patent_3'] = {'duration': exp_duration, 'status': 'partial'}
-        except Exception as e:
-            print(f"❌ Patent #3 error: {e}")
-            results['patent_3'] = {'status': 'error', 'error': str(e)}
-    else:
-        print(f"⏭️  Step 3: Skipping Patent #3 (too many agents for time-based simulation)")
-        results['patent_3'] = {'status': 'skipped', 'reason': 'too_many_agents'}
-    
+
     print()
-    
-    # Step 4: Run Patent #21 experiments
-    print(f"🔬 Step 4: Running Patent #21 experiments...")
-    print("-" * 70)
-    try:
-        exp_start = time.time()
-        result = subprocess.run(
-            ['python3', str(SCRIPTS_DIR / 'run_patent_21_experiments.py')],
-            cwd=str(SCRIPTS_DIR.parent),
-            capture_output=True,
-            text=True,
-            timeout=3600
-        )
-        exp_duration = time.time() - exp_start
-        
-        if result.returncode == 0:
-            print(f"✅ Patent #21 completed in {exp_duration:.2f} seconds")
-            results['patent_21'] = {'duration': exp_duration, 'status': 'success'}
+
+    # Step 2: Run experiments in a process pool
+    specs = []
+    for spec in EXPERIMENTS:
+        if spec.max_agents is not None and num_agents > spec.max_agents:
+            print(f"⏭️  Skipping {spec.name} (too many agents, limit {spec.max_agents:,})")
+            results[spec.name] = {'status': 'skipped', 'reason': 'too_many_agents'}
         else:
-            print(f"⚠️  Patent #21 had issues: {result.stderr[:200]}")
-            results['patent_21'] = {'duration': exp_duration, 'status': 'partial'}
-    except Exception as e:
-        print(f"❌ Patent #21 error: {e}")
-        results['patent_21'] = {'status': 'error', 'error': str(e)}
-    
-    print()
-    
-    # Step 5: Run Patent #29 experiments
-    print(f"🔬 Step 5: Running Patent #29 experiments...")
+            specs.append(spec)
+
+    print(f"🔬 Step 2: Running {len(specs)} experiment suites in a process pool...")
     print("-" * 70)
-    try:
-        exp_start = time.time()
-        result = subprocess.run(
-            ['python3', str(SCRIPTS_DIR / 'run_patent_29_experiments.py')],
-            cwd=str(SCRIPTS_DIR.parent),
-            capture_output=True,
-            text=True,
-            timeout=3600
-        )
-        exp_duration = time.time() - exp_start
-        
-        if result.returncode == 0:
-            print(f"✅ Patent #29 completed in {exp_duration:.2f} seconds")
-            results['patent_29'] = {'duration': exp_duration, 'status': 'success'}
+
+    def report(result):
+        if result['status'] == 'success':
+            print(f"✅ {result['name']} completed in {result['duration']:.2f}s "
+                  f"(CPU {result['cpu_time']:.2f}s, peak RSS {result['peak_rss_mb']:.0f} MB)")
         else:
-            print(f"⚠️  Patent #29 had issues: {result.stderr[:200]}")
-            results['patent_29'] = {'duration': exp_duration, 'status': 'partial'}
-    except Exception as e:
-        print(f"❌ Patent #29 error: {e}")
-        results['patent_29'] = {'status': 'error', 'error': str(e)}
-    
+            print(f"⚠️  {result['name']} {result['status']}: {str(result.get('error'))[:200]}")
+
+    log_dir = LOGS_DIR / f'{num_agents}_agents'
+    log_dir.mkdir(parents=True, exist_ok=True)
+    experiment_results = run_experiments_in_pool(
+        specs, max_workers=max_workers, log_dir=log_dir, on_complete=report
+    )
+
+    for name, result in experiment_results.items():
+        if result['status'] == 'success' and result.get('duration'):
+            result['throughput_agents_per_second'] = num_agents / result['duration']
+        results[name] = result
+
     print()
-    
+
     total_duration = time.time() - start_time
-    
+
     print("=" * 70)
     print(f"✅ {num_agents:,} AGENTS TEST COMPLETE")
     print("=" * 70)
     print(f"Total Duration: {total_duration:.2f} seconds ({total_duration/60:.2f} minutes)")
     print()
-    
+
     results['total_duration'] = total_duration
     results['num_agents'] = num_agents
-    
+
     return results
 
 
+def fit_scaling(all_results):
+    """Fit duration, CPU time and memory scaling exponents per experiment."""
+    scaling = {}
+    names = ['data_generation'] + [spec.name for spec in EXPERIMENTS]
+
+    for name in names:
+        counts, durations, cpu_times, rss = [], [], [], []
+        for num_agents, results in sorted(all_results.items()):
+            result = results.get(name, {})
+            if result.get('status') != 'success':
+                continue
+            counts.append(num_agents)
+            durations.append(result.get('duration'))
+            cpu_times.append(result.get('cpu_time'))
+            rss.append(result.get('peak_rss_mb'))
+
+        duration_fit = fit_scaling_exponent(counts, durations)
+        if duration_fit is None:
+            continue
+
+        exponent, coefficient = duration_fit
+        cpu_fit = fit_scaling_exponent(counts, cpu_times)
+        rss_fit = fit_scaling_exponent(counts, rss)
+        scaling[name] = {
+            'agent_counts': counts,
+            'duration_exponent': exponent,
+            'duration_coefficient': coefficient,
+            'cpu_time_exponent': cpu_fit[0] if cpu_fit else None,
+            'peak_rss_exponent': rss_fit[0] if rss_fit else None,
+            'max_agents_within_budget': extrapolate_max_agents(
+                exponent, coefficient, PRODUCTION_BUDGET_SECONDS
+            ),
+        }
+
+    return scaling
+
+
+def format_metric(result, key, fmt):
+    """Format a metric from a result dict, or '-' if missing."""
+    value = result.get(key)
+    return format(value, fmt) if isinstance(value, (int, float)) else '-'
+
+
 def main():
     """Run scalability tests for all agent counts."""
+    parser = argparse.ArgumentParser(description="Run patent experiments at large agent counts")
+    parser.add_argument('agent_counts', nargs='*', type=int, default=AGENT_COUNTS,
+                        help="Agent counts to test (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Maximum concurrent experiment processes (default: CPU count)")
+    args = parser.parse_args()
+    agent_counts = args.agent_counts
+
     print("=" * 70)
     print("SCALABILITY TESTS - LARGE AGENT COUNTS")
     print("=" * 70)
     print()
     print("Testing with:")
-    for count in AGENT_COUNTS:
+    for count in agent_counts:
         print(f"  - {count:,} agents")
     print()
     print("=" * 70)
     print()
-    
+
     all_results = {}
-    
-    for num_agents in AGENT_COUNTS:
-        results = run_experiments_for_agent_count(num_agents)
+
+    for num_agents in agent_counts:
+        results = run_experiments_for_agent_count(num_agents, max_workers=args.workers)
         all_results[num_agents] = results
-        
+
         # Save results
-        import json
         results_file = RESULTS_DIR / f'scalability_{num_agents}_agents.json'
         with open(results_file, 'w') as f:
             json.dump(results, f, indent=2)
-        
+
         print()
         print(f"📄 Results saved to: {results_file}")
         print()
-    
+
+    # Fit scaling exponents across agent counts
+    scaling = fit_scaling(all_results)
+    scaling_file = RESULTS_DIR / 'scalability_exponents.json'
+    with open(scaling_file, 'w') as f:
+        json.dump(scaling, f, indent=2)
+
     # Create summary
     summary_file = RESULTS_DIR / 'scalability_summary.md'
     with open(summary_file, 'w') as f:
         f.write(f"""# Scalability Test Summary
 
-**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
+**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 **Purpose:** Test patent experiments with large agent counts
 
 ---
@@ -234,39 +241,62 @@ def main():
 ## 📊 **Results by Agent Count**
 
 """)
-        
-        for num_agents in AGENT_COUNTS:
+
+        for num_agents in agent_counts:
             results = all_results[num_agents]
             f.write(f"""### **{num_agents:,} Agents**
 
 - **Total Duration:** {results.get('total_duration', 0):.2f} seconds ({results.get('total_duration', 0)/60:.2f} minutes)
 - **Data Generation:** {results.get('data_generation', {}).get('duration', 0):.2f}s - {results.get('data_generation', {}).get('status', 'unknown')}
-- **Patent #1:** {results.get('patent_1', {}).get('duration', 0):.2f}s - {results.get('patent_1', {}).get('status', 'unknown')}
-- **Patent #3:** {results.get('patent_3', {}).get('duration', 0):.2f}s - {results.get('patent_3', {}).get('status', 'unknown')}
-- **Patent #21:** {results.get('patent_21', {}).get('duration', 0):.2f}s - {results.get('patent_21', {}).get('status', 'unknown')}
-- **Patent #29:** {results.get('patent_29', {}).get('duration', 0):.2f}s - {results.get('patent_29', {}).get('status', 'unknown')}
 
+| Experiment | Status | Wall (s) | CPU (s) | Peak RSS (MB) | Agents/s |
+|------------|--------|----------|---------|---------------|----------|
 """)
-        
+            for spec in EXPERIMENTS:
+                result = results.get(spec.name, {})
+                f.write(
+                    f"| {spec.name} | {result.get('status', 'unknown')} "
+                    f"| {format_metric(result, 'duration', '.2f')} "
+                    f"| {format_metric(result, 'cpu_time', '.2f')} "
+                    f"| {format_metric(result, 'peak_rss_mb', '.0f')} "
+                    f"| {format_metric(result, 'throughput_agents_per_second', ',.0f')} |\n"
+                )
+            f.write("\n")
+
         f.write(f"""
 ---
 
 ## 📈 **Performance Analysis**
 
-[Performance analysis will be added after all tests complete]
+Scaling exponents from a log-log fit of duration ≈ a · N^b (b ≈ 1 is linear, b ≈ 2 is quadratic).
+Max agents is the extrapolated population that completes within {PRODUCTION_BUDGET_SECONDS:,} seconds.
+
+| Experiment | Duration b | CPU b | Peak RSS b | Max Agents ({PRODUCTION_BUDGET_SECONDS:,}s) |
+|------------|------------|-------|------------|---------------------|
+""")
+        for name, fit in scaling.items():
+            f.write(
+                f"| {name} | {fit['duration_exponent']:.2f} "
+                f"| {format_metric(fit, 'cpu_time_exponent', '.2f')} "
+                f"| {format_metric(fit, 'peak_rss_exponent', '.2f')} "
+                f"| {fit['max_agents_within_budget']:,.0f} |\n"
+            )
+        if not scaling:
+            f.write("\n[At least two successful agent counts are needed to fit scaling exponents]\n")
 
+        f.write(f"""
 ---
 
 **Completed:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """)
-    
+
     print("=" * 70)
     print("✅ ALL SCALABILITY TESTS COMPLETE")
     print("=" * 70)
     print(f"📄 Summary saved to: {summary_file}")
+    print(f"📄 Scaling exponents saved to: {scaling_file}")
     print()
 
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Batch Iterated-Hash Signing
+
+Batch engine for the Patent #13 temporal decay signatures. A signature is
+an iterated SHA-256 over `data + salt`; signing many agents x windows is
+CPU-bound, so this module offers:
+
+1. `sha256-iterated` - the exact scheme used by create_secure_hash
+   (SHA-256 applied `iterations` times), bit-for-bit compatible
+2. `pbkdf2` - hashlib.pbkdf2_hmac('sha256', ...), the same iterated-hash
+   intent with the loop in C (different digest values)
+3. A process pool for large batches (chunked, any scheme)
+4. SignatureCache keyed by (salt, window_start, iterations, scheme), so a
+   salt is signed at most once per time window
+
+Date: October 18, 2026
+"""
+
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_ITERATIONS = 1000
+SCHEMES = ('sha256-iterated', 'pbkdf2')
+
+# Batches smaller than this are signed in-process (pool startup dominates)
+MIN_POOL_BATCH = 2000
+
+
+def iterated_sha256(data: str, salt: str, iterations: int = DEFAULT_ITERATIONS) -> str:
+    """SHA-256 applied `iterations` times to (data + salt)."""
+    current_hash = (data + salt).encode('utf-8')
+    sha256 = hashlib.sha256
+    for _ in range(iterations):
+        current_hash = sha256(current_hash).digest()
+    return current_hash.hex()
+
+
+def pbkdf2_sha256(data: str, salt: str, iterations: int = DEFAULT_ITERATIONS) -> str:
+    """PBKDF2-HMAC-SHA256 of data keyed by salt (C-implemented iteration)."""
+    return hashlib.pbkdf2_hmac('sha256', data.encode('utf-8'), salt.encode('utf-8'), iterations).hex()
+
+
+_HASHERS = {'sha256-iterated': iterated_sha256, 'pbkdf2': pbkdf2_sha256}
+
+
+def sign(data: str, salt: str, iterations: int = DEFAULT_ITERATIONS, scheme: str = 'sha256-iterated') -> str:
+    """Sign one (data, salt) pair with the given scheme."""
+    if scheme not in _HASHERS:
+        raise ValueError(f"Unknown signing scheme: {scheme} (expected one of {SCHEMES})")
+    return _HASHERS[scheme](data, salt, iterations)
+
+
+def _sign_chunk(args) -> List[str]:
+    items, iterations, scheme = args
+    hasher = _HASHERS[scheme]
+    return [hasher(data, salt, iterations) for data, salt in items]
+
+
+def batch_sign(
+    items: Sequence[Tuple[str, str]],
+    iterations: int = DEFAULT_ITERATIONS,
+    scheme: str = 'sha256-iterated',
+    workers: Optional[int] = None,
+) -> List[str]:
+    """
+    Sign many (data, salt) pairs, in input order.
+
+    Uses a process pool of `workers` (default: CPU count) for batches of at
+    least MIN_POOL_BATCH items; workers=1 forces in-process signing.
+    """
+    if scheme not in _HASHERS:
+        raise ValueError(f"Unknown signing scheme: {scheme} (expected one of {SCHEMES})")
+    items = list(items)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(items) < MIN_POOL_BATCH:
+        return _sign_chunk((items, iterations, scheme))
+
+    chunk_size = -(-len(items) // (workers * 4))
+    chunks = [(items[i:i + chunk_size], iterations, scheme) for i in range(0, len(items), chunk_size)]
+    signatures = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_signatures in executor.map(_sign_chunk, chunks):
+            signatures.extend(chunk_signatures)
+    return signatures
+
+
+def window_start_for(timestamp: float, window_minutes: int = 15) -> int:
+    """Start (epoch seconds) of the time window containing `timestamp`."""
+    window_seconds = window_minutes * 60
+    return int(timestamp // window_seconds) * window_seconds
+
+
+class SignatureCache:
+    """Temporal decay signatures memoized per (salt, window_start, iterations, scheme)."""
+
+    def __init__(self):
+        self._signatures: Dict[Tuple[str, int, int, str], str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def get(self, salt: str, window_start: int, iterations: int, scheme: str) -> Optional[str]:
+        signature = self._signatures.get((salt, window_start, iterations, scheme))
+        if signature is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return signature
+
+    def put(self, salt: str, window_start: int, iterations: int, scheme: str, signature: str) -> None:
+        self._signatures[salt, window_start, iterations, scheme] = signature
+
+    def evict_before(self, window_start: int) -> int:
+        """Drop signatures for windows older than `window_start`; returns count removed."""
+        stale = [key for key in self._signatures if key[1] < window_start]
+        for key in stale:
+            del self._signatures[key]
+        return len(stale)
+
+
+def batch_temporal_decay_signatures(
+    salts: Sequence[str],
+    window_starts: Optional[Sequence[int]] = None,
+    window_minutes: int = 15,
+    iterations: int = DEFAULT_ITERATIONS,
+    scheme: str = 'sha256-iterated',
+    cache: Optional[SignatureCache] = None,
+    workers: Optional[int] = None,
+) -> Tuple[List[str], List[int]]:
+    """
+    Temporal decay signatures for many salts (and windows).
+
+    `window_starts` defaults to the current window for every salt. Each
+    signature hashes "{salt}-{window_start}" with the salt, matching
+    create_temporal_decay_signature; cached pairs are not re-signed.
+    """
+    if window_starts is None:
+        window_starts = [window_start_for(time.time(), window_minutes)] * len(salts)
+    window_starts = [int(w) for w in window_starts]
+
+    signatures: List[Optional[str]] = [None] * len(salts)
+    pending: Dict[Tuple[str, int], List[int]] = {}
+    for i, (salt, window_start) in enumerate(zip(salts, window_starts)):
+        cached = cache.get(salt, window_start, iterations, scheme) if cache is not None else None
+        if cached is not None:
+            signatures[i] = cached
+        else:
+            pending.setdefault((salt, window_start), []).append(i)
+
+    keys = list(pending)
+    signed = batch_sign([(f"{salt}-{window_start}", salt) for salt, window_start in keys],
+                        iterations, scheme, workers)
+    for (salt, window_start), signature in zip(keys, signed):
+        if cache is not None:
+            cache.put(salt, window_start, iterations, scheme, signature)
+        for i in pending[salt, window_start]:
+            signatures[i] = signature
+
+    return signatures, window_starts
+
+
+def benchmark_signing(
+    num_signatures: int = 5000, iterations: int = DEFAULT_ITERATIONS, workers: Optional[int] = None
+) -> List[dict]:
+    """Signatures/sec for each signing mode over the same salts."""
+    salts = [os.urandom(32).hex() for _ in range(num_signatures)]
+    window_starts = [window_start_for(time.time())] * num_signatures
+    workers = workers or os.cpu_count() or 1
+
+    modes = [('sha256-iterated', 'sha256-iterated', 1, False), ('pbkdf2', 'pbkdf2', 1, False)]
+    if workers > 1:
+        modes += [(f'sha256-iterated x{workers} processes', 'sha256-iterated', workers, False),
+                  (f'pbkdf2 x{workers} processes', 'pbkdf2', workers, False)]
+    modes.append(('cached (warm)', 'sha256-iterated', 1, True))
+    results = []
+    for label, scheme, mode_workers, warm in modes:
+        cache = SignatureCache() if warm else None
+        if warm:
+            batch_temporal_decay_signatures(salts, window_starts, iterations=iterations, scheme=scheme,
+                                            cache=cache, workers=workers)
+        start = time.perf_counter()
+        batch_temporal_decay_signatures(salts, window_starts, iterations=iterations, scheme=scheme,
+                                        cache=cache, workers=mode_workers)
+        elapsed = time.perf_counter() - start
+        results.append({
+            'mode': label,
+            'scheme': scheme,
+            'workers': mode_workers,
+            'num_signatures': num_signatures,
+            'iterations': iterations,
+            'elapsed_seconds': elapsed,
+            'signatures_per_sec': num_signatures / elapsed if elapsed > 0 else float('inf'),
+        })
+    return results
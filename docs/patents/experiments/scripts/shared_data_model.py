@@ -268,6 +268,19 @@ def quantum_compatibility(profile_a: np.ndarray, profile_b: np.ndarray) -> float
     return inner_product ** 2
 
 
+def quantum_compatibility_matrix(profiles_a: np.ndarray, profiles_b: np.ndarray) -> np.ndarray:
+    """
+    quantum_compatibility() for every (row of profiles_a, row of profiles_b)
+    pair as one (N_a, N_b) matrix; zero vectors score 0.
+    """
+    def normalize(profiles):
+        profiles = np.asarray(profiles, dtype=float)
+        norms = np.linalg.norm(profiles, axis=1, keepdims=True)
+        return np.divide(profiles, norms, out=np.zeros_like(profiles), where=norms > 0)
+
+    return np.abs(normalize(profiles_a) @ normalize(profiles_b).T) ** 2
+
+
 def calculate_homogenization_rate(personalities: List[np.ndarray]) -> float:
     """
     Calculate homogenization rate based on average pairwise Euclidean distance.
@@ -330,6 +343,19 @@ def calculate_location_match(loc1: Dict[str, float], loc2: Dict[str, float]) ->
     return max(0.0, 1.0 - (distance / max_distance))
 
 
+def location_match_matrix(locations_a: np.ndarray, locations_b: np.ndarray) -> np.ndarray:
+    """
+    calculate_location_match() for every pair of (lat, lng) rows as one
+    (N_a, N_b) matrix.
+    """
+    locations_a = np.asarray(locations_a, dtype=float)
+    locations_b = np.asarray(locations_b, dtype=float)
+    distance = np.sqrt((locations_a[:, :1] - locations_b[:, 0]) ** 2 +
+                       (locations_a[:, 1:] - locations_b[:, 1]) ** 2) * 111000  # meters
+    max_distance = 20000  # 20km max
+    return np.maximum(0.0, 1.0 - (distance / max_distance))
+
+
 # ============================================================================
 # DATA GENERATION
 # ============================================================================
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Incremental Patent Document Build Pipeline
+
+Shared by convert_to_pdf.py, convert_html_to_pdf.py and
+convert_html_to_pdf_playwright.py:
+- ConversionManifest records, for every converted source document, the
+  output it was built into, the source's content hash and the converter
+  that built it (tool versions and options). Documents whose source and
+  converter are unchanged, and whose output still exists, are skipped on
+  the next run.
+- run_conversions() converts the out-of-date documents through a batch
+  converter (thread_pool_batch() runs a per-document converter in a bounded
+  worker pool) and reports results in document order.
+
+Flags read by the conversion scripts:
+    --force      Reconvert every document
+    --workers N  Concurrent conversions (default: CPU count)
+
+Date: October 18, 2026
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+PACKAGE_DIR = Path(__file__).parent / "patent_package_for_lawyer"
+MANIFEST_PATH = PACKAGE_DIR / ".conversion_manifest.json"
+MANIFEST_VERSION = 1
+
+# (file actually written, note printed before the status) - None if it failed.
+# convert_to_pdf.py may write HTML instead of the requested PDF.
+ConversionResult = Tuple[Optional[Path], str]
+
+
+@dataclass
+class ConversionJob:
+    """One document to convert"""
+    source: Path
+    output: Path
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def tool_version(command: List[str]) -> str:
+    """First line printed by a version command (e.g. ['pandoc', '--version'])"""
+    try:
+        result = subprocess.run(command, capture_output=True, text=True)
+    except FileNotFoundError:
+        return f"{command[0]} unavailable"
+    lines = (result.stdout or result.stderr).strip().splitlines()
+    return lines[0] if lines else command[0]
+
+
+def manifest_key(path: Path) -> str:
+    """Manifest key: POSIX path relative to the project root"""
+    return Path(os.path.relpath(path, PROJECT_ROOT)).as_posix()
+
+
+class ConversionManifest:
+    """Outputs, source hashes and converters of previously converted documents (JSON, saved atomically)"""
+
+    def __init__(self, path: Path = MANIFEST_PATH):
+        self.path = path
+        self.entries: Dict[str, Dict[str, str]] = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.entries = data.get('documents', {})
+        except (OSError, ValueError):
+            pass
+
+    def is_current(self, job: ConversionJob, source_sha256: str, tool: str) -> bool:
+        """Was job.output built from this exact source by this converter, and does it still exist?"""
+        entry = self.entries.get(manifest_key(job.source))
+        return (
+            entry is not None
+            and entry['output'] == manifest_key(job.output)
+            and entry['source_sha256'] == source_sha256
+            and entry['tool'] == tool
+            and (PROJECT_ROOT / entry['written']).exists()
+        )
+
+    def record(self, job: ConversionJob, source_sha256: str, tool: str, written: Path):
+        self.entries[manifest_key(job.source)] = {
+            'output': manifest_key(job.output),
+            'source_sha256': source_sha256,
+            'tool': tool,
+            'written': manifest_key(written),
+        }
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'documents': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+
+def parse_pipeline_args(argv: List[str] = None) -> Tuple[bool, Optional[int]]:
+    """(force, workers) from --force / --workers N"""
+    argv = sys.argv if argv is None else argv
+    workers = None
+    if "--workers" in argv:
+        workers = int(argv[argv.index("--workers") + 1])
+    return "--force" in argv, workers
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def thread_pool_batch(convert: Callable[[Path, Path], ConversionResult],
+                      workers: Optional[int] = None) -> Callable[[List[ConversionJob]], Iterable[ConversionResult]]:
+    """
+    Batch converter running convert(source, output) in a bounded thread pool.
+    The converters spend their time in external processes (pandoc,
+    wkhtmltopdf, ...), so threads are enough to keep `workers` of them busy.
+    Results are yielded in job order as they become available.
+    """
+    def convert_batch(jobs: List[ConversionJob]) -> Iterable[ConversionResult]:
+        with ThreadPoolExecutor(max_workers=workers or default_workers()) as pool:
+            yield from pool.map(lambda job: convert(job.source, job.output), jobs)
+    return convert_batch
+
+
+def run_conversions(jobs: List[ConversionJob],
+                    convert_batch: Callable[[List[ConversionJob]], Iterable[ConversionResult]],
+                    tool: str, force: bool = False,
+                    manifest: ConversionManifest = None) -> Tuple[int, int, int]:
+    """
+    Convert the documents whose source or converter changed since the last
+    run (all of them with force). `tool` identifies the converter: tool
+    versions and any option that changes the output. Returns (converted,
+    failed, skipped).
+    """
+    manifest = manifest or ConversionManifest()
+    hashes = {}
+    stale = []
+    for job in jobs:
+        hashes[manifest_key(job.source)] = source_sha256 = file_sha256(job.source)
+        if force or not manifest.is_current(job, source_sha256, tool):
+            stale.append(job)
+    skipped = len(jobs) - len(stale)
+    if skipped:
+        print(f"  ⏭️  {skipped} unchanged document(s) already converted (use --force to rebuild)")
+
+    converted = 0
+    failed = 0
+    for job, (written, note) in zip(stale, convert_batch(stale)):
+        print(f"  Converting: {job.source.name}... {note}{'✅' if written else '❌'}", flush=True)
+        if written:
+            converted += 1
+            manifest.record(job, hashes[manifest_key(job.source)], tool, written)
+            # Saved as results arrive, so an interrupted run keeps its progress
+            manifest.save()
+        else:
+            failed += 1
+
+    return converted, failed, skipped
@@ -6,11 +6,18 @@ Verifies all patent documents for:
 1. Mathematical formula accuracy (matches code)
 2. Code reference validity (files exist)
 3. Formula consistency across documents
+
+Formulas are found in one screening pass per document (see FORMULA_SCREEN)
+and match offsets become line numbers through a per-document newline-offset
+table; documents are verified across a process pool (--workers N).
 """
 
 import os
 import re
+import sys
 import json
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Tuple, Set
 
@@ -19,6 +26,58 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 PATENTS_DIR = PROJECT_ROOT / "docs" / "patents"
 LIB_DIR = PROJECT_ROOT / "lib"
 
+FORMULA_FLAGS = re.IGNORECASE | re.MULTILINE
+
+# (pattern, formula type); each type is reported in this order
+FORMULA_PATTERNS = [
+    # Pattern for quantum compatibility: C = |⟨ψ_A|ψ_B⟩|²
+    (r'C\s*=\s*\|\s*⟨\s*ψ[^⟩]*⟩\s*\|\s*\^?2', 'Quantum Compatibility'),
+    (r'\|⟨\s*ψ[^⟩]*⟩\|\s*\^?2', 'Quantum Inner Product Squared'),
+    (r'⟨\s*ψ[^⟩]*⟩', 'Quantum Inner Product'),
+    (r'D_B\s*=\s*√?\s*\[?\s*2\s*\(\s*1\s*-\s*\|⟨[^⟩]*⟩\|\s*\)\s*\]?', 'Bures Distance'),
+    (r'\|ψ_entangled⟩\s*=\s*[^=]+', 'Entangled State'),
+    (r'F\s*\(\s*ρ[^)]+\)', 'Quantum Fidelity'),
+    (r'α_optimal\s*=\s*[^=]+', 'Coefficient Optimization'),
+    (r'compatibility\s*=\s*[^=]+', 'Compatibility Formula'),
+    (r'[0-9.]+%\s*\*\s*[A-Za-z_]+', 'Weighted Formula'),
+]
+FORMULA_REGEXES = [(re.compile(pattern, FORMULA_FLAGS), formula_type) for pattern, formula_type in FORMULA_PATTERNS]
+
+# Finds the next offset where any formula pattern matches. The leading class
+# holds the first character of every pattern above (keep it in sync): it lets
+# the scan skip most offsets without trying each pattern there.
+FORMULA_SCREEN = re.compile(
+    '(?=[CDF|⟨α0-9.])(?=' + '|'.join(f'(?:{pattern})' for pattern, _ in FORMULA_PATTERNS) + ')',
+    FORMULA_FLAGS,
+)
+
+
+def line_starts(content: str) -> List[int]:
+    """Offsets at which each line of content starts"""
+    starts = [0]
+    offset = content.find('\n')
+    while offset != -1:
+        starts.append(offset + 1)
+        offset = content.find('\n', offset + 1)
+    return starts
+
+
+def line_number(starts: List[int], offset: int) -> int:
+    """1-based line number of offset, given line_starts(content)"""
+    return bisect_right(starts, offset)
+
+
+def verify_patent_file(patent_file: Path) -> Dict:
+    """Verify one patent document (module level so worker processes can run it)"""
+    try:
+        return PatentVerifier().verify_patent(patent_file)
+    except Exception as e:
+        return {
+            'patent_file': str(patent_file.relative_to(PROJECT_ROOT)),
+            'error': str(e),
+        }
+
+
 class PatentVerifier:
     def __init__(self):
         self.patents_verified = []
@@ -59,28 +118,33 @@ class PatentVerifier:
     
     def extract_formulas(self, content: str) -> List[Dict]:
         """Extract mathematical formulas from patent content"""
-        formulas = []
-        
-        # Pattern for quantum compatibility: C = |⟨ψ_A|ψ_B⟩|²
-        patterns = [
-            (r'C\s*=\s*\|\s*⟨\s*ψ[^⟩]*⟩\s*\|\s*\^?2', 'Quantum Compatibility'),
-            (r'\|⟨\s*ψ[^⟩]*⟩\|\s*\^?2', 'Quantum Inner Product Squared'),
-            (r'⟨\s*ψ[^⟩]*⟩', 'Quantum Inner Product'),
-            (r'D_B\s*=\s*√?\s*\[?\s*2\s*\(\s*1\s*-\s*\|⟨[^⟩]*⟩\|\s*\)\s*\]?', 'Bures Distance'),
-            (r'\|ψ_entangled⟩\s*=\s*[^=]+', 'Entangled State'),
-            (r'F\s*\(\s*ρ[^)]+\)', 'Quantum Fidelity'),
-            (r'α_optimal\s*=\s*[^=]+', 'Coefficient Optimization'),
-            (r'compatibility\s*=\s*[^=]+', 'Compatibility Formula'),
-            (r'[0-9.]+%\s*\*\s*[A-Za-z_]+', 'Weighted Formula'),
-        ]
+        # Same matches as a separate re.finditer() per pattern: overlapping
+        # matches of different patterns are all kept, each pattern's own
+        # matches never overlap (next_start).
+        found = [[] for _ in FORMULA_REGEXES]
+        next_start = [0] * len(FORMULA_REGEXES)
+        position = 0
+        while True:
+            screen = FORMULA_SCREEN.search(content, position)
+            if not screen:
+                break
+            position = screen.start()
+            for i, (regex, _) in enumerate(FORMULA_REGEXES):
+                if position >= next_start[i]:
+                    match = regex.match(content, position)
+                    if match:
+                        found[i].append(match)
+                        next_start[i] = max(match.end(), position + 1)
+            position += 1
         
-        for pattern, formula_type in patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
+        starts = line_starts(content)
+        formulas = []
+        for (_, formula_type), matches in zip(FORMULA_REGEXES, found):
             for match in matches:
                 formulas.append({
                     'type': formula_type,
                     'formula': match.group(0),
-                    'line': content[:match.start()].count('\n') + 1,
+                    'line': line_number(starts, match.start()),
                 })
         
         return formulas
@@ -141,8 +205,6 @@ class PatentVerifier:
     
     def verify_patent(self, patent_file: Path) -> Dict:
         """Verify a single patent document"""
-        print(f"Verifying: {patent_file.name}")
-        
         with open(patent_file, 'r', encoding='utf-8') as f:
             content = f.read()
         
@@ -174,22 +236,19 @@ class PatentVerifier:
             'code_ref_count': len(code_refs),
         }
     
-    def verify_all(self) -> Dict:
-        """Verify all patents"""
+    def verify_all(self, workers: int = None) -> Dict:
+        """Verify all patents (across `workers` processes, default: CPU count)"""
         patent_files = self.find_all_patent_docs()
         print(f"Found {len(patent_files)} patent documents to verify\n")
         
-        results = []
-        for patent_file in patent_files:
-            try:
-                result = self.verify_patent(patent_file)
-                results.append(result)
-            except Exception as e:
-                print(f"Error verifying {patent_file.name}: {e}")
-                results.append({
-                    'patent_file': str(patent_file.relative_to(PROJECT_ROOT)),
-                    'error': str(e),
-                })
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(patent_files) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                verified = pool.map(verify_patent_file, patent_files,
+                                    chunksize=max(1, len(patent_files) // (workers * 4)))
+                results = self._collect(patent_files, verified)
+        else:
+            results = self._collect(patent_files, map(verify_patent_file, patent_files))
         
         return {
             'total_patents': len(patent_files),
@@ -197,6 +256,16 @@ class PatentVerifier:
             'results': results,
         }
     
+    def _collect(self, patent_files: List[Path], verified) -> List[Dict]:
+        """Gather results in document order, reporting progress as they arrive"""
+        results = []
+        for patent_file, result in zip(patent_files, verified):
+            print(f"Verifying: {patent_file.name}")
+            if 'error' in result:
+                print(f"Error verifying {patent_file.name}: {result['error']}")
+            results.append(result)
+        return results
+    
     def generate_report(self, results: Dict) -> str:
         """Generate verification report"""
         report = []
@@ -264,8 +333,12 @@ class PatentVerifier:
         return "\n".join(report)
 
 if __name__ == "__main__":
+    workers = None
+    if "--workers" in sys.argv:
+        workers = int(sys.argv[sys.argv.index("--workers") + 1])
+    
     verifier = PatentVerifier()
-    results = verifier.verify_all()
+    results = verifier.verify_all(workers=workers)
     
     report = verifier.generate_report(results)
     
@@ -26,10 +26,15 @@ import re
 import sys
 from pathlib import Path
 from collections import defaultdict
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import List, Dict, Tuple
 import json
 
+from dart_source_index import DartSourceIndex
+
+# Index fact: a file's FileAnalysis as plain data, recomputed only when it changes
+FILE_ANALYSIS_FACT = 'analyze_test_quality/file_analysis@1'
+
 @dataclass
 class TestIssue:
     """Represents a test quality issue"""
@@ -73,13 +78,24 @@ class TestQualityAnalyzer:
     def __init__(self):
         self.issues: List[TestIssue] = []
         self.file_analyses: Dict[str, FileAnalysis] = {}
+        self.source_index = DartSourceIndex()
         
     def analyze_file(self, file_path: Path) -> FileAnalysis:
-        """Analyze a single test file"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            lines = content.split('\n')
-        
+        """Analyze a single test file (reusing the indexed result while it is unchanged)"""
+        cached = self.source_index.fact(
+            file_path, FILE_ANALYSIS_FACT,
+            lambda content: asdict(self._analyze_content(content, file_path))
+        )
+        analysis = FileAnalysis(**{
+            **cached,
+            'file_path': str(file_path),
+            'issues': [TestIssue(**{**issue, 'file_path': str(file_path)}) for issue in cached['issues']],
+        })
+        self.file_analyses[str(file_path)] = analysis
+        return analysis
+    
+    def _analyze_content(self, content: str, file_path: Path) -> FileAnalysis:
+        """Analyze the content of a test file"""
         analysis = FileAnalysis(
             file_path=str(file_path),
             total_tests=0
@@ -104,7 +120,6 @@ class TestQualityAnalyzer:
             # Analyze test content
             self._analyze_test(test_name, test_content, test_lines, start_line, file_path, analysis)
         
-        self.file_analyses[str(file_path)] = analysis
         return analysis
     
     def _find_test_end(self, content: str, start_pos: int) -> int:
@@ -228,7 +243,7 @@ class TestQualityAnalyzer:
     def analyze_directory(self, directory: Path) -> Dict[str, FileAnalysis]:
         """Analyze all test files in a directory (recursively)"""
         # Find all test files recursively
-        test_files = list(directory.rglob('*_test.dart'))
+        test_files = [f for f in self.source_index.dart_files(directory) if f.name.endswith('_test.dart')]
         
         # Also check for test files in integration_test/ directory (common Flutter pattern)
         if directory.name == 'test' or 'test' in str(directory):
@@ -236,7 +251,8 @@ class TestQualityAnalyzer:
             project_root = directory if directory.name == 'test' else directory.parent
             integration_test_dir = project_root / 'integration_test'
             if integration_test_dir.exists():
-                test_files.extend(integration_test_dir.rglob('*_test.dart'))
+                test_files.extend(f for f in self.source_index.dart_files(integration_test_dir)
+                                  if f.name.endswith('_test.dart'))
         
         # Remove duplicates and sort
         test_files = sorted(set(test_files))
@@ -250,6 +266,7 @@ class TestQualityAnalyzer:
             except Exception as e:
                 print(f"Error analyzing {test_file}: {e}", file=sys.stderr)
         
+        self.source_index.save()
         return self.file_analyses
     
     def generate_report(self, output_file: str = None) -> str:
@@ -2,6 +2,11 @@
 """
 Comprehensive Warning/Info Fix Script
 Systematically fixes all remaining warnings and infos
+
+Fixes are queued per file and applied in one pass by the shared rewrite
+engine (dart_rewrite_engine.edit_files): bottom-up per file, files in
+parallel, with per-fix hit counts and timing. --diff prints the planned
+edits without applying them.
 """
 
 import re
@@ -11,10 +16,66 @@ from pathlib import Path
 from typing import List, Tuple, Dict
 from collections import defaultdict
 
+from dart_rewrite_engine import LineEditor, RewriteStats, edit_files
+
+# Pattern: "warning • message • file:line:col • code"
+ISSUE_PATTERN = re.compile(r"(warning|info) • (.+?) • (.+?):(\d+):\d+ • ([a-z_]+)")
+VARIABLE_NAME_PATTERN = re.compile(r"variable '(.+?)'")
+
+
+def ignore_unused_local_variable(editor: LineEditor, line_num: int, var_name: str) -> bool:
+    """Add an ignore comment above a (possibly) unused local variable."""
+    line = editor.line(line_num)
+    if line is None:
+        return False
+    
+    # Check if already has ignore comment
+    if any('ignore:' in previous for previous in editor.before(line_num)):
+        return False
+    
+    # Check if variable is actually used (might be false positive)
+    # If used in callback or later, add ignore comment
+    if var_name in line:
+        editor.insert_before(line_num, '      // ignore: unused_local_variable - May be used in callback or assertion')
+        return True
+    return False
+
+
+def insert_mounted_check(editor: LineEditor, line_num: int, _) -> bool:
+    """Add `if (!mounted) return;` before a context use with no mounted check just above."""
+    line = editor.line(line_num)
+    if line is None:
+        return False
+    
+    # Find the context usage and wrap with mounted check
+    # This is complex - for now, add ignore comment
+    if 'context.' in line and 'mounted' not in '\n'.join(editor.before(line_num, 4) + [line]):
+        indent = len(line) - len(line.lstrip())
+        editor.insert_before(line_num, ' ' * indent + 'if (!mounted) return;')
+        return True
+    return False
+
+
+def add_test_ignore(editor: LineEditor, line_num: int, code: str) -> bool:
+    """Add an ignore comment for an intentional test issue."""
+    if editor.line(line_num) is None:
+        return False
+    
+    # Check if already has ignore
+    if any('ignore:' in previous for previous in editor.before(line_num)):
+        return False
+    
+    editor.insert_before(line_num, f'      // ignore: {code}')
+    return True
+
+
 class ComprehensiveFixer:
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, workers: int = None):
         self.project_root = Path(project_root)
+        self.workers = workers
         self.issues_by_type: Dict[str, List[Tuple[str, int, str]]] = defaultdict(list)
+        self.edits: Dict[Path, list] = defaultdict(list)
+        self.stats = RewriteStats()
         
     def analyze(self):
         """Analyze all warnings/infos."""
@@ -26,11 +87,8 @@ class ComprehensiveFixer:
             text=True
         )
         
-        # Pattern: "warning • message • file:line:col • code"
-        pattern = r"(warning|info) • (.+?) • (.+?):(\d+):\d+ • ([a-z_]+)"
-        
         for line in result.stdout.split('\n'):
-            match = re.search(pattern, line)
+            match = ISSUE_PATTERN.search(line)
             if match:
                 severity = match.group(1)
                 message = match.group(2)
@@ -44,81 +102,44 @@ class ComprehensiveFixer:
         print(f"✅ Found {total} issues across {len(self.issues_by_type)} types\n")
         return total
     
+    def _queue(self, file_path: str, name: str, edit, line_num: int, argument=None) -> bool:
+        """Queue an edit for a file (applied by apply_edits); False if the file is missing."""
+        full_path = self.project_root / file_path
+        if not full_path.exists():
+            return False
+        self.edits[full_path].append((name, edit, line_num, argument))
+        return True
+    
     def fix_unused_local_variables_in_tests(self) -> int:
-        """Fix unused local variables in test files by adding ignore comments."""
-        fixed = 0
+        """Queue ignore comments for unused local variables in test files."""
+        queued = 0
         issues = self.issues_by_type.get('unused_local_variable', [])
         
         # Only fix test files
         test_issues = [(f, line, msg) for f, line, msg in issues if 'test/' in f]
         
         for file_path, line_num, message in test_issues:
-            full_path = self.project_root / file_path
-            if not full_path.exists():
-                continue
-            
-            try:
-                lines = full_path.read_text().split('\n')
-                if line_num < 1 or line_num > len(lines):
-                    continue
-                
-                # Check if already has ignore comment
-                if line_num > 1 and 'ignore:' in lines[line_num - 2]:
-                    continue
-                
-                # Extract variable name
-                var_match = re.search(r"variable '(.+?)'", message)
-                if not var_match:
-                    continue
-                
-                var_name = var_match.group(1)
-                line = lines[line_num - 1]
-                
-                # Check if variable is actually used (might be false positive)
-                # If used in callback or later, add ignore comment
-                if var_name in line:
-                    # Add ignore comment
-                    lines.insert(line_num - 1, f'      // ignore: unused_local_variable - May be used in callback or assertion')
-                    full_path.write_text('\n'.join(lines))
-                    fixed += 1
-            except Exception as e:
-                print(f"Error fixing {file_path}:{line_num}: {e}")
-        
-        return fixed
+            # Extract variable name
+            var_match = VARIABLE_NAME_PATTERN.search(message)
+            if var_match:
+                queued += self._queue(file_path, 'unused_local_variables', ignore_unused_local_variable,
+                                      line_num, var_match.group(1))
+        
+        return queued
     
     def fix_use_build_context_synchronously(self) -> int:
-        """Fix use_build_context_synchronously by checking mounted."""
-        fixed = 0
+        """Queue mounted checks for use_build_context_synchronously."""
+        queued = 0
         issues = self.issues_by_type.get('use_build_context_synchronously', [])
         
         for file_path, line_num, message in issues:
-            full_path = self.project_root / file_path
-            if not full_path.exists():
-                continue
-            
-            try:
-                content = full_path.read_text()
-                lines = content.split('\n')
-                if line_num < 1 or line_num > len(lines):
-                    continue
-                
-                # Find the context usage and wrap with mounted check
-                # This is complex - for now, add ignore comment
-                line = lines[line_num - 1]
-                if 'context.' in line and 'mounted' not in '\n'.join(lines[max(0, line_num-5):line_num]):
-                    # Add mounted check before the line
-                    indent = len(line) - len(line.lstrip())
-                    lines.insert(line_num - 1, ' ' * indent + 'if (!mounted) return;')
-                    full_path.write_text('\n'.join(lines))
-                    fixed += 1
-            except Exception:
-                pass
-        
-        return fixed
+            queued += self._queue(file_path, 'build_context', insert_mounted_check, line_num)
+        
+        return queued
     
     def add_ignore_comments_for_test_issues(self) -> int:
-        """Add ignore comments for intentional test issues."""
-        fixed = 0
+        """Queue ignore comments for intentional test issues."""
+        queued = 0
         
         # Test files can have intentional unused variables/prints
         test_only_codes = ['avoid_print', 'unused_local_variable']
@@ -128,29 +149,21 @@ class ComprehensiveFixer:
             test_issues = [(f, line, msg) for f, line, msg in issues if 'test/' in f]
             
             for file_path, line_num, _ in test_issues:
-                full_path = self.project_root / file_path
-                if not full_path.exists():
-                    continue
-                
-                try:
-                    lines = full_path.read_text().split('\n')
-                    if line_num < 1 or line_num > len(lines):
-                        continue
-                    
-                    # Check if already has ignore
-                    if line_num > 1 and 'ignore:' in lines[line_num - 2]:
-                        continue
-                    
-                    # Add ignore comment
-                    lines.insert(line_num - 1, f'      // ignore: {code}')
-                    full_path.write_text('\n'.join(lines))
-                    fixed += 1
-                except Exception:
-                    pass
-        
-        return fixed
-    
-    def fix_all(self, dry_run: bool = False) -> Dict[str, int]:
+                queued += self._queue(file_path, 'test_ignores', add_test_ignore, line_num, code)
+        
+        return queued
+    
+    def apply_edits(self, dry_run: bool = False) -> Dict[str, str]:
+        """
+        Apply all queued edits: one read/write per file, bottom-up so analyzer
+        line numbers stay valid, files in parallel. Returns diffs of changed files.
+        """
+        diffs = edit_files(dict(self.edits), dry_run=dry_run, workers=self.workers, stats=self.stats,
+                           root=self.project_root)
+        self.edits.clear()
+        return diffs
+    
+    def fix_all(self, dry_run: bool = False, show_diff: bool = False) -> Dict[str, int]:
         """Fix all fixable issues."""
         results = {}
         
@@ -159,26 +172,45 @@ class ComprehensiveFixer:
             print("=" * 80)
             for code, issues in sorted(self.issues_by_type.items(), key=lambda x: len(x[1]), reverse=True):
                 print(f"  {len(issues):4d} × {code}")
+            if show_diff:
+                self._queue_all()
+                print("\n📝 Planned edits:")
+                for diff in self.apply_edits(dry_run=True).values():
+                    print(diff, end='')
+                self.stats.print_summary("FIXES")
             return {}
         
         print("\n🔧 Fixing issues...")
         print("=" * 80)
         
-        results['unused_local_variables'] = self.fix_unused_local_variables_in_tests()
+        self._queue_all()
+        self.apply_edits()
+        
+        results['unused_local_variables'] = self.stats.hits['unused_local_variables']
         print(f"   ✅ Fixed {results['unused_local_variables']} unused local variables in tests")
         
-        results['build_context'] = self.fix_use_build_context_synchronously()
+        results['build_context'] = self.stats.hits['build_context']
         print(f"   ✅ Fixed {results['build_context']} build context issues")
         
-        results['test_ignores'] = self.add_ignore_comments_for_test_issues()
+        results['test_ignores'] = self.stats.hits['test_ignores']
         print(f"   ✅ Added {results['test_ignores']} ignore comments in tests")
         
+        self.stats.print_summary("FIXES")
         return results
+    
+    def _queue_all(self):
+        self.fix_unused_local_variables_in_tests()
+        self.fix_use_build_context_synchronously()
+        self.add_ignore_comments_for_test_issues()
 
 
 def main():
+    workers = None
+    if "--workers" in sys.argv:
+        workers = int(sys.argv[sys.argv.index("--workers") + 1])
+    
     project_root = Path(__file__).parent.parent
-    fixer = ComprehensiveFixer(str(project_root))
+    fixer = ComprehensiveFixer(str(project_root), workers=workers)
     
     print("🚀 Comprehensive Warning/Info Fixer\n")
     
@@ -189,7 +221,7 @@ def main():
     if dry_run:
         print("💡 Use --fix to actually apply fixes\n")
     
-    results = fixer.fix_all(dry_run=dry_run)
+    results = fixer.fix_all(dry_run=dry_run, show_diff="--diff" in sys.argv)
     
     if results:
         print("\n✅ Summary:")
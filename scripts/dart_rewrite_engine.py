@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Dart Rewrite Engine
+
+Shared rule engine for the Dart rewrite scripts (update_package_imports.py,
+fix_design_tokens.py, comprehensive_warning_fix.py, fix_all_warnings_infos.py).
+
+- Rule / RuleSet: regex rules compiled once, plus one combined alternation
+  of all of them that screens each line in a single search. Only lines it
+  hits are checked rule by rule, so results are exactly those of trying
+  every rule in order, at the cost of one search for the other lines.
+- plan_files(): runs a per-file planner (content → change tuples) across a
+  process pool, reusing plans cached in the Dart source index.
+- process_files(): the same pool for any per-file work.
+- LineEditor / edit_files(): line edits addressed by original line numbers
+  (e.g. from `flutter analyze`), applied bottom-up with one read and one
+  write per file, across the pool.
+- RewriteStats: per-rule hit counts and timing, merged across workers.
+- unified_diff(): dry-run diffs.
+
+A change is a plain tuple (line_number, rule_name, old_line, new_line);
+an edit is (rule_name, edit_function, line_number, argument).
+
+Date: October 18, 2026
+"""
+
+import difflib
+import hashlib
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from dart_source_index import DartSourceIndex, decode
+
+Change = Tuple[int, str, str, str]
+
+# Numbered/named backreferences change meaning once a pattern is embedded
+# in the combined alternation
+BACKREFERENCE = re.compile(r'\\[1-9]|\(\?P=')
+INLINE_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+
+
+@dataclass
+class RewriteStats:
+    """Per-rule hits and matching time, plus file counts."""
+    hits: Counter = field(default_factory=Counter)
+    seconds: Dict[str, float] = field(default_factory=dict)
+    files: int = 0
+    cached_files: int = 0
+    changed_files: int = 0
+    planning_seconds: float = 0.0
+    elapsed: float = 0.0
+
+    def merge(self, other: 'RewriteStats'):
+        self.hits.update(other.hits)
+        for name, seconds in other.seconds.items():
+            self.add_time(name, seconds)
+        self.files += other.files
+        self.cached_files += other.cached_files
+        self.changed_files += other.changed_files
+        self.planning_seconds += other.planning_seconds
+
+    def add_time(self, name: str, seconds: float):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def count_changes(self, changes: Sequence[Change]):
+        self.hits.update(change[1] for change in changes)
+
+    def print_summary(self, title: str = "REWRITE RULES", rule_names: Sequence[str] = ()):
+        print("\n" + "=" * 80)
+        print(title)
+        print("=" * 80)
+        print(f"Files: {self.files} ({self.cached_files} from cache, {self.changed_files} with changes)"
+              f" in {self.elapsed:.2f}s ({self.planning_seconds:.2f}s planning)")
+        names = sorted(set(rule_names) | set(self.hits) | set(self.seconds),
+                       key=lambda name: (-self.hits[name], name))
+        for name in names:
+            print(f"  {self.hits[name]:6d} hits  {self.seconds.get(name, 0.0) * 1000:9.1f} ms  {name}")
+
+
+# Stats of the rules run in this process (see collecting_stats)
+STATS = RewriteStats()
+
+
+@contextmanager
+def collecting_stats() -> Iterator[RewriteStats]:
+    """Collect rule stats into a fresh RewriteStats for the duration of the block."""
+    global STATS
+    outer, STATS = STATS, RewriteStats()
+    try:
+        yield STATS
+    finally:
+        STATS = outer
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    One regex rule. `replacement` is a re template (None reports the line
+    without changing it); with whole_line=True it replaces the entire line,
+    otherwise just the match.
+    """
+    name: str
+    pattern: str
+    replacement: Optional[str] = None
+    whole_line: bool = False
+    flags: int = 0
+    description: str = ''
+
+    def apply(self, line: str, match: re.Match) -> str:
+        if self.replacement is None:
+            return line
+        new_text = match.expand(self.replacement)
+        return new_text if self.whole_line else line[:match.start()] + new_text + line[match.end():]
+
+
+class RuleSet:
+    """Rules compiled individually and as one combined screening alternation."""
+
+    def __init__(self, rules: Sequence[Rule]):
+        self.rules = tuple(rules)
+        self.regexes = tuple(re.compile(rule.pattern, rule.flags) for rule in self.rules)
+        alternatives = []
+        for rule in self.rules:
+            if BACKREFERENCE.search(rule.pattern):
+                raise ValueError(f"Rule {rule.name!r}: backreferences are not supported")
+            letters = ''.join(letter for flag, letter in INLINE_FLAGS if rule.flags & flag)
+            alternatives.append(f'(?{letters}:{rule.pattern})' if letters else f'(?:{rule.pattern})')
+        self.combined = re.compile('|'.join(alternatives))
+        self.fingerprint = hashlib.sha256(
+            repr([(r.name, r.pattern, r.replacement, r.whole_line, r.flags) for r in self.rules]).encode()
+        ).hexdigest()[:16]
+
+    def _search(self, index: int, line: str) -> Optional[re.Match]:
+        start = time.perf_counter()
+        match = self.regexes[index].search(line)
+        STATS.add_time(self.rules[index].name, time.perf_counter() - start)
+        return match
+
+    def first_match(self, line: str) -> Optional[Tuple[Rule, re.Match]]:
+        """The first rule (in order) matching anywhere in the line, with its match."""
+        if not self.combined.search(line):
+            return None
+        for index, rule in enumerate(self.rules):
+            match = self._search(index, line)
+            if match:
+                return rule, match
+        return None
+
+    def line_hits(self, line: str) -> List[Tuple[Rule, re.Match]]:
+        """Every match of every rule in the line, in rule order then position."""
+        if not self.combined.search(line):
+            return []
+        hits = []
+        for index, rule in enumerate(self.rules):
+            start = time.perf_counter()
+            hits.extend((rule, match) for match in self.regexes[index].finditer(line))
+            STATS.add_time(rule.name, time.perf_counter() - start)
+        return hits
+
+    def plan(self, content: str) -> List[Change]:
+        """Changes from applying the first matching rule to each line."""
+        changes = []
+        for line_number, line in enumerate(content.split('\n'), 1):
+            hit = self.first_match(line)
+            if hit:
+                rule, match = hit
+                changes.append((line_number, rule.name, line, rule.apply(line, match)))
+        return changes
+
+
+def apply_line_changes(content: str, changes: Sequence[Change]) -> str:
+    """Content with each changed line replaced by its new text."""
+    lines = content.split('\n')
+    for line_number, _, _, new_line in changes:
+        lines[line_number - 1] = new_line
+    return '\n'.join(lines)
+
+
+def unified_diff(path, old_text: str, new_text: str) -> str:
+    """git-style unified diff of one file's planned rewrite."""
+    return ''.join(difflib.unified_diff(
+        old_text.splitlines(keepends=True), new_text.splitlines(keepends=True),
+        fromfile=f'a/{path}', tofile=f'b/{path}',
+    ))
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def process_files(func: Callable, items: Sequence, workers: Optional[int] = None) -> List:
+    """
+    [func(item) for item in items] across a process pool (in order).
+    `func` must be a module-level function; runs in-process for one worker or item.
+    """
+    workers = default_workers() if workers is None else workers
+    if workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    chunksize = max(1, len(items) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
+
+
+def _plan_file(task) -> Tuple[str, Optional[str], Optional[List[Change]], RewriteStats]:
+    """Worker: (path, planner) → (path, content hash, changes, stats); changes None on error."""
+    path, planner = task
+    with collecting_stats() as stats:
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            start = time.perf_counter()
+            changes = planner(decode(data))
+            stats.planning_seconds += time.perf_counter() - start
+            digest = hashlib.sha256(data).hexdigest()
+        except Exception:
+            # Left unplanned: the caller's own per-file path reports the error
+            return path, None, None, stats
+    return path, digest, changes, stats
+
+
+def plan_files(
+    paths: Sequence[Path],
+    planner: Callable[[str], List[Change]],
+    source_index: Optional[DartSourceIndex] = None,
+    fact_name: Optional[str] = None,
+    workers: Optional[int] = None,
+    stats: Optional[RewriteStats] = None,
+) -> Dict[Path, List[Change]]:
+    """
+    {path: planner(content)} for every readable file. With a source index and
+    fact name, plans cached for unchanged files are reused and new ones cached.
+    Rule timing and per-rule change counts are added to `stats` (default: STATS).
+    """
+    stats = STATS if stats is None else stats
+    start = time.perf_counter()
+    plans: Dict[Path, List[Change]] = {}
+    todo = []
+    for path in paths:
+        cached = source_index.cached_fact(path, fact_name) if source_index and fact_name else None
+        if cached is not None:
+            plans[path] = cached
+            stats.cached_files += 1
+        else:
+            todo.append(path)
+
+    results = process_files(_plan_file, [(str(path), planner) for path in todo], workers)
+    for path, (_, digest, changes, file_stats) in zip(todo, results):
+        stats.merge(file_stats)
+        if changes is None:
+            continue
+        plans[path] = changes
+        if source_index and fact_name:
+            source_index.store_fact(path, fact_name, changes, digest)
+
+    for changes in plans.values():
+        stats.count_changes(changes)
+    stats.files += len(plans)
+    stats.changed_files += sum(1 for changes in plans.values() if changes)
+    stats.elapsed += time.perf_counter() - start
+    return plans
+
+
+class LineEditor:
+    """
+    A file's lines, edited by original (1-based) line number. Edits must come
+    in descending line order (edit_files sorts them), so every earlier line
+    number still points at its original line; several edits may target the
+    same line, in order.
+    """
+
+    def __init__(self, content: str):
+        self.lines = content.split('\n')
+        self.original_count = len(self.lines)
+        self._inserted = Counter()  # lines inserted before each original line
+        self._removed = set()
+        self.notes = set()  # free-form state shared by a file's edits
+
+    def index(self, line_number: int) -> Optional[int]:
+        """Current 0-based index of an original line (None if out of range or removed)."""
+        if line_number < 1 or line_number > self.original_count or line_number in self._removed:
+            return None
+        return line_number - 1 + self._inserted[line_number]
+
+    def line(self, line_number: int) -> Optional[str]:
+        index = self.index(line_number)
+        return self.lines[index] if index is not None else None
+
+    def before(self, line_number: int, count: int = 1) -> List[str]:
+        """The `count` lines currently just above an original line."""
+        index = self.index(line_number)
+        return self.lines[max(0, index - count):index] if index is not None else []
+
+    def replace(self, line_number: int, text: str):
+        self.lines[self.index(line_number)] = text
+
+    def insert_before(self, line_number: int, text: str):
+        self.lines.insert(self.index(line_number), text)
+        self._inserted[line_number] += 1
+
+    def remove(self, line_number: int):
+        del self.lines[self.index(line_number)]
+        self._removed.add(line_number)
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(self.lines)
+
+
+Edit = Tuple[str, Callable[[LineEditor, int, Any], bool], int, Any]
+
+
+def _edit_file(task) -> Tuple[str, Optional[str], RewriteStats]:
+    """Worker: apply one file's edits; returns (path, diff or None, stats)."""
+    path, edits, dry_run, label = task
+    with collecting_stats() as stats:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            editor = LineEditor(content)
+            start = time.perf_counter()
+            for name, edit, line_number, argument in sorted(edits, key=lambda e: -e[2]):
+                edit_start = time.perf_counter()
+                if edit(editor, line_number, argument):
+                    stats.hits[name] += 1
+                stats.add_time(name, time.perf_counter() - edit_start)
+            stats.planning_seconds += time.perf_counter() - start
+            stats.files += 1
+            if editor.text == content:
+                return path, None, stats
+            stats.changed_files += 1
+            if not dry_run:
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(editor.text)
+            return path, unified_diff(label, content, editor.text), stats
+        except Exception as e:
+            print(f"Error editing {path}: {e}")
+            return path, None, stats
+
+
+def edit_files(
+    file_edits: Dict[Path, List[Edit]],
+    dry_run: bool = False,
+    workers: Optional[int] = None,
+    stats: Optional[RewriteStats] = None,
+    root: Optional[Path] = None,
+) -> Dict[str, str]:
+    """
+    Apply every file's edits (one read/write per file) across the pool.
+    Edit functions must be module-level; they return True when they changed
+    something, counted as a hit for their rule name. Returns {path: diff} for
+    changed files (diff headers relative to `root` when given); with dry_run
+    nothing is written.
+    """
+    stats = STATS if stats is None else stats
+    start = time.perf_counter()
+    tasks = [
+        (str(path), edits, dry_run, Path(path).relative_to(root) if root else path)
+        for path, edits in file_edits.items()
+    ]
+    results = process_files(_edit_file, tasks, workers)
+    diffs = {}
+    for path, diff, file_stats in results:
+        stats.merge(file_stats)
+        if diff is not None:
+            diffs[path] = diff
+    stats.elapsed += time.perf_counter() - start
+    return diffs
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Dart Source Index
+
+Incremental index of the Dart sources shared by the repo maintenance scripts
+(update_package_imports.py, fix_design_tokens.py, analyze_test_quality.py,
+validate_experiment_vs_production.py).
+
+For every file under lib/, packages/, test/ and integration_test/ it keeps:
+- mtime, size and a SHA-256 of the content
+- import/export/part directives
+- a line-offset table (offset → line number by bisect)
+- top-level symbols (classes, mixins, enums, extensions, typedefs, functions)
+- "facts": cached results of script-specific scans of the content
+
+The index is pickled to .dart_tool/source_index.pickle. A file is re-read
+only when its mtime or size changed, and re-parsed (dropping its facts) only
+when its hash changed too, so warm runs touch nothing but directory entries.
+Facts must be plain data (tuples, lists, dicts, str/int/bool) so every
+script can load the shared cache.
+
+Usage:
+    python3 scripts/dart_source_index.py [--rebuild] [--symbol NAME] [paths...]
+
+Date: October 18, 2026
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import re
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_ROOTS = ('lib', 'packages', 'test', 'integration_test')
+DEFAULT_CACHE_PATH = Path('.dart_tool') / 'source_index.pickle'
+
+# Bump when the parsed fields change; older caches are rebuilt
+INDEX_VERSION = 1
+
+DIRECTIVE_PATTERN = re.compile(
+    r"^[ \t]*(import|export|part(?:[ \t]+of)?)[ \t]+['\"]([^'\"\n]+)['\"]", re.MULTILINE
+)
+TYPE_PATTERN = re.compile(
+    r"^(?:(?:abstract|base|final|sealed|interface)\s+)*"
+    r"(class|mixin class|mixin|enum|extension type|extension|typedef)\s+([A-Za-z_$][\w$]*)",
+    re.MULTILINE,
+)
+FUNCTION_PATTERN = re.compile(
+    r"^(?=[A-Za-z_$])(?:[\w$<>?,\[\] ]+?[ \t]+)?([A-Za-z_$][\w$]*)[ \t]*(?:<[^>\n]*>)?[ \t]*\([^;\n]*$",
+    re.MULTILINE,
+)
+NOT_FUNCTIONS = {
+    'if', 'for', 'while', 'switch', 'return', 'assert', 'catch', 'on',
+    'import', 'export', 'part', 'library', 'class', 'mixin', 'enum', 'extension', 'typedef',
+}
+
+
+@dataclass
+class DartFile:
+    """Index entry for one source file."""
+    mtime_ns: int
+    size: int
+    sha256: str
+    line_offsets: array = field(default_factory=lambda: array('L', [0]))
+    imports: List[Tuple[int, str, str]] = field(default_factory=list)  # (line, kind, uri)
+    symbols: List[Tuple[int, str, str]] = field(default_factory=list)  # (line, kind, name)
+    facts: Dict[str, Any] = field(default_factory=dict)
+
+    def line_number(self, offset: int) -> int:
+        """1-based line containing a character offset of the content."""
+        return bisect_right(self.line_offsets, offset)
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_offsets)
+
+
+def decode(data: bytes) -> str:
+    """UTF-8 text with universal newlines, as open(path, encoding='utf-8').read() returns it."""
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def parse_dart(data: bytes, mtime_ns: int, size: int) -> DartFile:
+    """Build the index entry for one file's bytes."""
+    entry = DartFile(mtime_ns=mtime_ns, size=size, sha256=hashlib.sha256(data).hexdigest())
+    content = decode(data)
+
+    entry.line_offsets = array('L', [0])
+    entry.line_offsets.extend(accumulate(len(line) + 1 for line in content.split('\n')[:-1]))
+
+    entry.imports = [
+        (entry.line_number(m.start(1)), ' '.join(m.group(1).split()), m.group(2))
+        for m in DIRECTIVE_PATTERN.finditer(content)
+    ]
+    symbols = [
+        (entry.line_number(m.start()), ' '.join(m.group(1).split()), m.group(2))
+        for m in TYPE_PATTERN.finditer(content)
+        if m.group(2) != 'on'
+    ]
+    symbols.extend(
+        (entry.line_number(m.start()), 'function', m.group(1))
+        for m in FUNCTION_PATTERN.finditer(content)
+        if m.group(1) not in NOT_FUNCTIONS
+    )
+    entry.symbols = sorted(symbols)
+    return entry
+
+
+class DartSourceIndex:
+    """Persistent, incrementally refreshed index of the project's Dart files."""
+
+    def __init__(self, project_root: Path = PROJECT_ROOT, cache_path: Optional[Path] = None):
+        self.project_root = Path(os.path.abspath(project_root))
+        self.cache_path = Path(cache_path) if cache_path else self.project_root / DEFAULT_CACHE_PATH
+        self._entries: Optional[Dict[str, DartFile]] = None
+        self._checked = set()  # keys stat-checked in this process
+        self._dirty = False
+        self.stats = {'checked': 0, 'reread': 0, 'parsed': 0, 'removed': 0, 'facts_computed': 0}
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    @property
+    def entries(self) -> Dict[str, DartFile]:
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self) -> Dict[str, DartFile]:
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('version') == INDEX_VERSION:
+                return cached['entries']
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable source index {self.cache_path}: {e}", file=sys.stderr)
+        return {}
+
+    def save(self):
+        """Write the index back if anything changed (atomically)."""
+        if not self._dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(f'{self.cache_path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': INDEX_VERSION, 'entries': self.entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.cache_path)
+        self._dirty = False
+
+    def clear(self):
+        """Forget every entry (the next queries re-parse everything)."""
+        self._entries = {}
+        self._checked.clear()
+        self._dirty = True
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+
+    def _abspath(self, path) -> str:
+        return os.path.abspath(path)
+
+    def key(self, path) -> str:
+        """Cache key: POSIX path relative to the project root (absolute outside it)."""
+        abs_path = self._abspath(path)
+        root = str(self.project_root)
+        if abs_path == root:
+            return ''
+        if abs_path.startswith(root + os.sep):
+            return Path(abs_path[len(root) + 1:]).as_posix()
+        return Path(abs_path).as_posix()
+
+    def _walk(self, directory: str) -> Iterator[Tuple[str, os.stat_result]]:
+        """(absolute path, stat) of every .dart file, skipping hidden and build directories."""
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not entry.name.startswith('.') and entry.name != 'build':
+                                stack.append(entry.path)
+                        elif entry.name.endswith('.dart') and entry.is_file():
+                            yield entry.path, entry.stat()
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                continue
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def _update(self, key: str, abs_path: str, stat: os.stat_result) -> DartFile:
+        """Bring one entry up to date with the file's stat (re-reading only if it changed)."""
+        self.stats['checked'] += 1
+        self._checked.add(key)
+        entry = self.entries.get(key)
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            return entry
+        with open(abs_path, 'rb') as f:
+            data = f.read()
+        return self._store(key, data, stat.st_mtime_ns, stat.st_size)
+
+    def _store(self, key: str, data: bytes, mtime_ns: int, size: int) -> DartFile:
+        self.stats['reread'] += 1
+        self._dirty = True
+        entry = self.entries.get(key)
+        if entry is not None and entry.sha256 == hashlib.sha256(data).hexdigest():
+            entry.mtime_ns, entry.size = mtime_ns, size
+            return entry
+        try:
+            entry = parse_dart(data, mtime_ns, size)
+        except UnicodeDecodeError:
+            # Unreadable as text: keep only the stat so it is not retried until it changes
+            entry = DartFile(mtime_ns=mtime_ns, size=size, sha256=hashlib.sha256(data).hexdigest())
+        self.stats['parsed'] += 1
+        self.entries[key] = entry
+        return entry
+
+    def refresh(self, directory=None):
+        """Re-validate every Dart file under `directory` (default: all DEFAULT_ROOTS)."""
+        self.dart_files(directory)
+
+    def dart_files(self, directory=None) -> List[Path]:
+        """
+        Sorted .dart files under `directory`, refreshing their entries.
+
+        Paths are returned relative to `directory` as given (directory / sub/path.dart),
+        so callers see the same path form they would get from walking it themselves.
+        With no directory, files under every existing DEFAULT_ROOTS folder are returned
+        as absolute paths.
+        """
+        if directory is None:
+            files = []
+            for root in DEFAULT_ROOTS:
+                if (self.project_root / root).is_dir():
+                    files.extend(self.dart_files(self.project_root / root))
+            return files
+
+        directory = Path(directory)
+        abs_dir = self._abspath(directory)
+        dir_key = self.key(abs_dir)
+        prefix = f'{dir_key}/' if dir_key else ''
+
+        seen = {}
+        for abs_path, stat in self._walk(abs_dir):
+            key = self.key(abs_path)
+            self._update(key, abs_path, stat)
+            seen[key] = abs_path
+
+        # Drop files deleted since the last run
+        removed = [key for key in self.entries
+                   if key.endswith('.dart') and key.startswith(prefix) and key not in seen
+                   and (prefix or not key.startswith('/'))]
+        for key in removed:
+            del self.entries[key]
+        if removed:
+            self.stats['removed'] += len(removed)
+            self._dirty = True
+
+        return sorted(directory / os.path.relpath(abs_path, abs_dir) for abs_path in seen.values())
+
+    def record(self, path) -> Optional[DartFile]:
+        """Up-to-date entry for one file (any file, indexed on demand); None if missing."""
+        key = self.key(path)
+        entry = self.entries.get(key)
+        if entry is not None and key in self._checked:
+            return entry
+        abs_path = self._abspath(path)
+        try:
+            stat = os.stat(abs_path)
+        except FileNotFoundError:
+            if self.entries.pop(key, None) is not None:
+                self._dirty = True
+            return None
+        return self._update(key, abs_path, stat)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def read_text(self, path) -> str:
+        """File content (UTF-8, universal newlines), re-indexing it if it changed on disk."""
+        abs_path = self._abspath(path)
+        with open(abs_path, 'rb') as f:
+            data = f.read()
+        key = self.key(abs_path)
+        entry = self.entries.get(key)
+        if entry is None or entry.sha256 != hashlib.sha256(data).hexdigest():
+            stat = os.stat(abs_path)
+            self._store(key, data, stat.st_mtime_ns, stat.st_size)
+            self._checked.add(key)
+        return decode(data)
+
+    def line_number(self, path, offset: int) -> int:
+        """1-based line number of a character offset in the file."""
+        entry = self.record(path)
+        if entry is None:
+            raise FileNotFoundError(f"Cannot look up a line number: {path} does not exist")
+        return entry.line_number(offset)
+
+    def imports(self, path) -> List[Tuple[int, str, str]]:
+        """(line, kind, uri) for each import/export/part directive."""
+        entry = self.record(path)
+        return entry.imports if entry else []
+
+    def symbols(self, path) -> List[Tuple[int, str, str]]:
+        """(line, kind, name) for each top-level declaration."""
+        entry = self.record(path)
+        return entry.symbols if entry else []
+
+    def find_symbol(self, name: str, directory=None) -> List[Tuple[str, int, str]]:
+        """(file key, line, kind) of every top-level declaration called `name`."""
+        self.refresh(directory)
+        return [
+            (key, line, kind)
+            for key, entry in sorted(self.entries.items())
+            for line, kind, symbol in entry.symbols
+            if symbol == name
+        ]
+
+    def importers(self, uri_fragment: str, directory=None) -> List[str]:
+        """Keys of files with a directive whose URI contains `uri_fragment`."""
+        self.refresh(directory)
+        return sorted(
+            key for key, entry in self.entries.items()
+            if any(uri_fragment in uri for _, _, uri in entry.imports)
+        )
+
+    def cached_fact(self, path, name: str) -> Any:
+        """A fact cached for the file's current content, or None."""
+        entry = self.record(path)
+        return entry.facts.get(name) if entry is not None else None
+
+    def store_fact(self, path, name: str, value: Any, sha256: str) -> bool:
+        """
+        Cache a fact computed elsewhere (e.g. in a worker process) from content
+        with the given hash; ignored if the file has changed since.
+        """
+        entry = self.record(path)
+        if entry is None or entry.sha256 != sha256:
+            return False
+        entry.facts[name] = value
+        self.stats['facts_computed'] += 1
+        self._dirty = True
+        return True
+
+    def fact(self, path, name: str, extract: Callable[[str], Any]) -> Any:
+        """
+        Cached extract(content) for a file, recomputed only when its content changes.
+
+        `name` identifies the extractor and should carry a version
+        (e.g. 'design_tokens/color_usage@1'); change it when `extract` changes.
+        Raises like open() when the file cannot be read as UTF-8 text.
+        """
+        entry = self.record(path)
+        if entry is not None and name in entry.facts:
+            return entry.facts[name]
+        content = self.read_text(path)
+        entry = self.record(path)
+        value = extract(content)
+        entry.facts[name] = value
+        self.stats['facts_computed'] += 1
+        self._dirty = True
+        return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or refresh the shared Dart source index')
+    parser.add_argument('paths', nargs='*', help=f"Directories to index (default: {', '.join(DEFAULT_ROOTS)})")
+    parser.add_argument('--rebuild', action='store_true', help='Discard the cache and re-parse every file')
+    parser.add_argument('--symbol', help='Print where a top-level symbol is declared')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = DartSourceIndex()
+    if args.rebuild:
+        index.clear()
+    files = []
+    for directory in args.paths or [None]:
+        files.extend(index.dart_files(directory))
+    index.save()
+    elapsed = time.perf_counter() - start
+
+    print(f"📁 {len(files)} Dart files indexed in {elapsed:.2f}s "
+          f"({index.stats['parsed']} parsed, {index.stats['reread']} re-read, "
+          f"{index.stats['removed']} removed)")
+    print(f"💾 Cache: {index.cache_path}")
+
+    if args.symbol:
+        for key, line, kind in index.find_symbol(args.symbol):
+            print(f"  {key}:{line}  {kind} {args.symbol}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,11 @@
 """
 Comprehensive Warning and Info Fix Script
 Fixes all remaining warnings and info messages systematically
+
+Fixes are queued per file and applied by the shared rewrite engine: each
+file is read and written once, its edits applied bottom-up (so analyzer
+line numbers stay valid), files in parallel, with per-fix hit counts and
+timing; --diff shows the planned edits without applying them.
 """
 
 import re
@@ -11,12 +16,90 @@ from pathlib import Path
 from typing import List, Tuple, Dict, Set
 from collections import defaultdict
 
+from dart_rewrite_engine import LineEditor, RewriteStats, edit_files
+
+# "warning • message • file:line:col • code" / "info • message • file:line:col • code"
+ISSUE_PATTERN = re.compile(r"(warning|info) • (.+?) • (.+?):(\d+):\d+ • ([a-z_]+)")
+UNUSED_VARIABLE_PATTERN = re.compile(r"^The value of the (?:local )?variable '(.+?)' isn't used")
+PRINT_PATTERN = re.compile(r"print\('?(.+?)'?\)")
+DEVELOPER_IMPORT = "import 'dart:developer' as developer;"
+
+
+def remove_line(editor: LineEditor, line_num: int, _) -> bool:
+    """Remove a line."""
+    if editor.line(line_num) is None:
+        return False
+    editor.remove(line_num)
+    return True
+
+
+def prefix_with_underscore(editor: LineEditor, line_num: int, var_name: str) -> bool:
+    """Prefix variable with underscore to indicate intentionally unused."""
+    line = editor.line(line_num)
+    if line is None or var_name not in line:
+        return False
+    editor.replace(line_num, line.replace(f' {var_name}', f' _{var_name}'))
+    return True
+
+
+def add_ignore_comment(editor: LineEditor, line_num: int, code: str) -> bool:
+    """Add ignore comment before a line."""
+    if editor.line(line_num) is None:
+        return False
+    
+    # Check if already has ignore comment
+    if any('ignore:' in line for line in editor.before(line_num)):
+        return False
+    
+    editor.insert_before(line_num, f'  // ignore: {code}')
+    return True
+
+
+def replace_print_with_logger(editor: LineEditor, line_num: int, service_name: str) -> bool:
+    """Replace print() with developer.log() (the import is added by add_developer_import)."""
+    line = editor.line(line_num)
+    if line is None:
+        return False
+    
+    # Check if already has ignore comment or is in test code
+    if '// ignore: avoid_print' in line or 'const bool.fromEnvironment' in '\n'.join(editor.before(line_num, 4) + [line]):
+        return False
+    
+    # Simple replacement - extract message
+    if 'print(' in line:
+        match = PRINT_PATTERN.search(line)
+        if match:
+            message = match.group(1)
+            editor.replace(line_num, line.replace(
+                f"print('{message}')",
+                f"developer.log('{message}', name: '{service_name}')"
+            ))
+            editor.notes.add('developer.log')
+            return True
+    return False
+
+
+def add_developer_import(editor: LineEditor, _, __) -> bool:
+    """Queued at line 0 so it runs after the file's print() replacements."""
+    if 'developer.log' not in editor.notes or 'import \'dart:developer\'' in editor.text:
+        return False
+    # Before the first import line
+    for i, line in enumerate(editor.lines):
+        if line.startswith('import '):
+            editor.lines.insert(i, DEVELOPER_IMPORT)
+            return True
+    return False
+
+
 class WarningInfoFixer:
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, workers: int = None):
         self.project_root = Path(project_root)
+        self.workers = workers
         self.warnings: List[Tuple[str, str, int, str]] = []  # (file, type, line, message)
         self.infos: List[Tuple[str, str, int, str]] = []
         self.fixes_applied = 0
+        self.edits: Dict[Path, list] = defaultdict(list)
+        self.stats = RewriteStats()
         
     def analyze_all_issues(self):
         """Run flutter analyze and extract all warnings and infos."""
@@ -29,29 +112,12 @@ class WarningInfoFixer:
             text=True
         )
         
-        # Pattern: "warning • message • file:line:col • code"
-        # Pattern: "info • message • file:line:col • code"
-        warning_pattern = r"warning • (.+?) • (.+?):(\d+):\d+ • ([a-z_]+)"
-        info_pattern = r"info • (.+?) • (.+?):(\d+):\d+ • ([a-z_]+)"
-        
         for line in result.stdout.split('\n'):
-            # Match warnings
-            match = re.search(warning_pattern, line)
-            if match:
-                message = match.group(1)
-                file_path = match.group(2)
-                line_num = int(match.group(3))
-                code = match.group(4)
-                self.warnings.append((file_path, code, line_num, message))
-            
-            # Match infos
-            match = re.search(info_pattern, line)
+            match = ISSUE_PATTERN.search(line)
             if match:
-                message = match.group(1)
-                file_path = match.group(2)
-                line_num = int(match.group(3))
-                code = match.group(4)
-                self.infos.append((file_path, code, line_num, message))
+                severity, message, file_path, line_num, code = match.groups()
+                issues = self.warnings if severity == 'warning' else self.infos
+                issues.append((file_path, code, int(line_num), message))
         
         print(f"✅ Found {len(self.warnings)} warnings and {len(self.infos)} infos")
         return len(self.warnings) + len(self.infos)
@@ -63,23 +129,30 @@ class WarningInfoFixer:
             breakdown[code] += 1
         return dict(breakdown)
     
+    def _queue(self, file_path: str, name: str, edit, line_num: int, argument=None) -> bool:
+        """Queue an edit for a file (applied by fix_all); False if the file is missing."""
+        full_path = self.project_root / file_path
+        if not full_path.exists():
+            return False
+        self.edits[full_path].append((name, edit, line_num, argument))
+        return True
+    
     def fix_unused_imports(self) -> int:
-        """Remove unused imports."""
-        fixed = 0
+        """Queue removal of unused imports."""
+        queued = 0
         unused_imports = [
             (f, line, msg) for f, code, line, msg in self.warnings + self.infos
             if code == 'unused_import'
         ]
         
         for file_path, line_num, message in unused_imports:
-            if self._remove_line(file_path, line_num):
-                fixed += 1
+            queued += self._queue(file_path, 'unused_imports', remove_line, line_num)
         
-        return fixed
+        return queued
     
     def fix_unused_variables(self) -> int:
-        """Fix unused local variables."""
-        fixed = 0
+        """Queue fixes for unused local variables."""
+        queued = 0
         unused_vars = [
             (f, line, msg) for f, code, line, msg in self.warnings
             if code == 'unused_local_variable'
@@ -87,170 +160,76 @@ class WarningInfoFixer:
         
         for file_path, line_num, message in unused_vars:
             # Extract variable name from message
-            match = re.search(r"^The value of the (?:local )?variable '(.+?)' isn't used", message)
+            match = UNUSED_VARIABLE_PATTERN.search(message)
             if match:
-                var_name = match.group(1)
-                if self._prefix_with_underscore(file_path, line_num, var_name):
-                    fixed += 1
+                queued += self._queue(file_path, 'unused_variables', prefix_with_underscore, line_num, match.group(1))
         
-        return fixed
+        return queued
     
     def fix_unused_fields(self) -> int:
-        """Fix unused fields by adding ignore comments."""
-        fixed = 0
+        """Queue ignore comments for unused fields."""
+        queued = 0
         unused_fields = [
             (f, line, msg) for f, code, line, msg in self.warnings
             if code == 'unused_field'
         ]
         
         for file_path, line_num, message in unused_fields:
-            if self._add_ignore_comment(file_path, line_num, 'unused_field'):
-                fixed += 1
+            queued += self._queue(file_path, 'unused_fields', add_ignore_comment, line_num, 'unused_field')
         
-        return fixed
+        return queued
     
     def fix_avoid_print(self) -> int:
-        """Fix print() statements in production code."""
-        fixed = 0
+        """Queue print() → developer.log() in production code."""
+        queued = 0
         avoid_print = [
             (f, line, msg) for f, code, line, msg in self.warnings + self.infos
             if code == 'avoid_print' and f.startswith('lib/') and 'test' not in f
         ]
         
         for file_path, line_num, _ in avoid_print:
-            if self._replace_print_with_logger(file_path, line_num):
-                fixed += 1
+            service_name = Path(file_path).stem.replace('_', ' ').title().replace(' ', '')
+            queued += self._queue(file_path, 'avoid_print', replace_print_with_logger, line_num, service_name)
+        for file_path in {f for f, _, _ in avoid_print}:
+            self._queue(file_path, 'developer_import', add_developer_import, 0)
         
-        return fixed
+        return queued
     
-    def _remove_line(self, file_path: str, line_num: int) -> bool:
-        """Remove a line from a file."""
-        full_path = self.project_root / file_path
-        if not full_path.exists():
-            return False
-        
-        try:
-            lines = full_path.read_text().split('\n')
-            if line_num < 1 or line_num > len(lines):
-                return False
-            
-            # Remove the line (0-indexed)
-            lines.pop(line_num - 1)
-            full_path.write_text('\n'.join(lines))
-            return True
-        except Exception:
-            return False
-    
-    def _prefix_with_underscore(self, file_path: str, line_num: int, var_name: str) -> bool:
-        """Prefix variable with underscore to indicate intentionally unused."""
-        full_path = self.project_root / file_path
-        if not full_path.exists():
-            return False
-        
-        try:
-            content = full_path.read_text()
-            lines = content.split('\n')
-            if line_num < 1 or line_num > len(lines):
-                return False
-            
-            # Prefix variable name with underscore
-            line = lines[line_num - 1]
-            if var_name in line:
-                lines[line_num - 1] = line.replace(f' {var_name}', f' _{var_name}')
-                full_path.write_text('\n'.join(lines))
-                return True
-        except Exception:
-            pass
-        return False
-    
-    def _add_ignore_comment(self, file_path: str, line_num: int, code: str) -> bool:
-        """Add ignore comment before a line."""
-        full_path = self.project_root / file_path
-        if not full_path.exists():
-            return False
-        
-        try:
-            lines = full_path.read_text().split('\n')
-            if line_num < 1 or line_num > len(lines):
-                return False
-            
-            # Check if already has ignore comment
-            if line_num > 1 and 'ignore:' in lines[line_num - 2]:
-                return False
-            
-            # Add ignore comment before the line
-            lines.insert(line_num - 1, f'  // ignore: {code}')
-            full_path.write_text('\n'.join(lines))
-            return True
-        except Exception:
-            return False
+    def apply_edits(self, dry_run: bool = False) -> Dict[str, str]:
+        """Apply all queued edits (one read/write per file, in parallel); returns diffs."""
+        diffs = edit_files(dict(self.edits), dry_run=dry_run, workers=self.workers, stats=self.stats,
+                           root=self.project_root)
+        self.edits.clear()
+        return diffs
     
-    def _replace_print_with_logger(self, file_path: str, line_num: int) -> bool:
-        """Replace print() with developer.log()."""
-        full_path = self.project_root / file_path
-        if not full_path.exists():
-            return False
-        
-        try:
-            content = full_path.read_text()
-            lines = content.split('\n')
-            if line_num < 1 or line_num > len(lines):
-                return False
-            
-            # Check if already has ignore comment or is in test code
-            line = lines[line_num - 1]
-            if '// ignore: avoid_print' in line or 'const bool.fromEnvironment' in '\n'.join(lines[max(0, line_num-5):line_num]):
-                return False
-            
-            # Add developer import if needed
-            if 'import \'dart:developer\'' not in content:
-                # Find first import line
-                for i, l in enumerate(lines):
-                    if l.startswith('import '):
-                        lines.insert(i, "import 'dart:developer' as developer;")
-                        line_num += 1  # Adjust for inserted line
-                        break
-            
-            # Replace print with developer.log
-            line = lines[line_num - 1]
-            # Simple replacement - extract message
-            if 'print(' in line:
-                # Extract print content
-                match = re.search(r"print\('?(.+?)'?\)", line)
-                if match:
-                    message = match.group(1)
-                    service_name = Path(file_path).stem.replace('_', ' ').title().replace(' ', '')
-                    new_line = line.replace(
-                        f"print('{message}')",
-                        f"developer.log('{message}', name: '{service_name}')"
-                    )
-                    lines[line_num - 1] = new_line
-                    full_path.write_text('\n'.join(lines))
-                    return True
-        except Exception as e:
-            print(f"Error fixing {file_path}:{line_num}: {e}")
-        
-        return False
-    
-    def fix_all(self, dry_run: bool = False) -> Dict[str, int]:
+    def fix_all(self, dry_run: bool = False, show_diff: bool = False) -> Dict[str, int]:
         """Fix all issues."""
         results = {}
         
         print("\n🔧 Fixing issues...")
         print("=" * 80)
         
-        if not dry_run:
-            print("\n1. Fixing unused imports...")
-            results['unused_imports'] = self.fix_unused_imports()
-            print(f"   ✅ Fixed {results['unused_imports']} unused imports")
+        if not dry_run or show_diff:
+            self.fix_unused_imports()
+            self.fix_unused_fields()
+            self.fix_avoid_print()
+            diffs = self.apply_edits(dry_run=dry_run)
             
-            print("\n2. Fixing unused fields...")
-            results['unused_fields'] = self.fix_unused_fields()
-            print(f"   ✅ Fixed {results['unused_fields']} unused fields")
-            
-            print("\n3. Fixing print() in production code...")
-            results['avoid_print'] = self.fix_avoid_print()
-            print(f"   ✅ Fixed {results['avoid_print']} print() statements")
+            if dry_run:
+                print("DRY RUN - planned edits:")
+                for diff in diffs.values():
+                    print(diff, end='')
+            else:
+                results['unused_imports'] = self.stats.hits['unused_imports']
+                results['unused_fields'] = self.stats.hits['unused_fields']
+                results['avoid_print'] = self.stats.hits['avoid_print']
+                print("\n1. Fixing unused imports...")
+                print(f"   ✅ Fixed {results['unused_imports']} unused imports")
+                print("\n2. Fixing unused fields...")
+                print(f"   ✅ Fixed {results['unused_fields']} unused fields")
+                print("\n3. Fixing print() in production code...")
+                print(f"   ✅ Fixed {results['avoid_print']} print() statements")
+            self.stats.print_summary("FIXES")
         else:
             print("DRY RUN - would fix:")
             breakdown = self.get_issue_breakdown()
@@ -266,11 +245,13 @@ def main():
 Comprehensive Warning and Info Fix Script
 
 Usage:
-    python scripts/fix_all_warnings_infos.py [--dry-run] [--fix]
+    python scripts/fix_all_warnings_infos.py [--dry-run] [--fix] [--diff] [--workers N]
 
 Options:
     --dry-run    Show what would be fixed without actually fixing
     --fix        Actually apply fixes (default: dry-run)
+    --diff       In dry-run mode, print the planned edits as a unified diff
+    --workers N  Worker processes for editing files (default: CPU count)
 
 Examples:
     python scripts/fix_all_warnings_infos.py --dry-run
@@ -278,8 +259,12 @@ Examples:
         """)
         return
     
+    workers = None
+    if "--workers" in sys.argv:
+        workers = int(sys.argv[sys.argv.index("--workers") + 1])
+    
     project_root = Path(__file__).parent.parent
-    fixer = WarningInfoFixer(str(project_root))
+    fixer = WarningInfoFixer(str(project_root), workers=workers)
     
     print("🚀 Starting comprehensive warning/info analysis...\n")
     
@@ -296,7 +281,7 @@ Examples:
     if dry_run:
         print("\n💡 Use --fix to actually apply fixes")
     
-    results = fixer.fix_all(dry_run=dry_run)
+    results = fixer.fix_all(dry_run=dry_run, show_diff="--diff" in sys.argv)
     
     if results:
         print("\n✅ Fixes Applied:")
@@ -6,12 +6,14 @@ Automatically replaces Colors.* usage with AppColors.* equivalents across the co
 Handles Colors.white, Colors.black, and preserves Colors.transparent (acceptable exception).
 
 Usage:
-    python scripts/fix_design_tokens.py [--dry-run] [--backup] [--path PATH]
+    python scripts/fix_design_tokens.py [--dry-run] [--backup] [--path PATH] [--workers N] [--diff]
 
 Options:
     --dry-run    Show what would be changed without making changes
     --backup     Create backup files before modifying
     --path PATH  Specific path to process (default: lib/)
+    --workers N  Worker processes for planning (default: CPU count)
+    --diff       With --dry-run, print a unified diff of every change
 """
 
 import os
@@ -22,6 +24,9 @@ from pathlib import Path
 from typing import List, Tuple, Dict
 from dataclasses import dataclass, field
 
+from dart_source_index import DartSourceIndex
+from dart_rewrite_engine import Rule, RuleSet, RewriteStats, plan_files, unified_diff
+
 # Color replacement mappings
 COLOR_REPLACEMENTS = {
     'Colors.white': 'AppColors.white',
@@ -49,6 +54,18 @@ PDF_COLORS_FILES = [
     'pdf_generation_service.dart',
 ]
 
+# Colors.white / Colors.black as whole tokens (not AppColors.white)
+COLOR_RULES = RuleSet([
+    Rule(old_color, r'\b' + re.escape(old_color) + r'\b', new_color)
+    for old_color, new_color in COLOR_REPLACEMENTS.items()
+])
+
+# Change "rule" name of the AppColors import insertion
+IMPORT_RULE_NAME = 'app_colors_import'
+
+# Index fact: planned_changes() for a file
+PLANNED_CHANGES_FACT = f'fix_design_tokens/planned_changes@{COLOR_RULES.fingerprint}'
+
 
 @dataclass
 class FileChange:
@@ -70,13 +87,21 @@ class FileReport:
     skip_reason: str = ""
 
 
+def planned_changes(content: str) -> List[Tuple[int, str, str, str]]:
+    """DesignTokenFixer.plan_fixes() change list (module level so worker processes can run it)"""
+    return DesignTokenFixer(dry_run=True).plan_fixes(content)[1]
+
+
 class DesignTokenFixer:
     """Main class for fixing design token compliance"""
     
-    def __init__(self, dry_run: bool = False, create_backup: bool = False):
+    def __init__(self, dry_run: bool = False, create_backup: bool = False, workers: int = None):
         self.dry_run = dry_run
         self.create_backup = create_backup
+        self.workers = workers
         self.reports: Dict[str, FileReport] = {}
+        self.source_index = DartSourceIndex()
+        self.rule_stats = RewriteStats()
         self.stats = {
             'files_processed': 0,
             'files_modified': 0,
@@ -118,17 +143,13 @@ class DesignTokenFixer:
                 continue
             
             # Find Colors.white and Colors.black (but not Colors.transparent)
-            for old_color, new_color in COLOR_REPLACEMENTS.items():
-                # Pattern to match Colors.white or Colors.black but not in comments
-                pattern = re.compile(r'\b' + re.escape(old_color) + r'\b')
+            for rule, match in COLOR_RULES.line_hits(line):
+                # Check if it's in a comment
+                comment_start = line.find('//')
+                if comment_start != -1 and match.start() > comment_start:
+                    continue
                 
-                for match in pattern.finditer(line):
-                    # Check if it's in a comment
-                    comment_start = line.find('//')
-                    if comment_start != -1 and match.start() > comment_start:
-                        continue
-                    
-                    matches.append((line_num, old_color, new_color))
+                matches.append((line_num, rule.name, rule.replacement))
         
         return matches
     
@@ -176,27 +197,12 @@ class DesignTokenFixer:
         # Default: insert at the beginning
         return 0
     
-    def fix_file(self, file_path: Path) -> FileReport:
-        """Fix design token compliance in a single file"""
-        report = FileReport(file_path=str(file_path))
-        
-        # Check if should skip
-        should_skip, reason = self.should_skip_file(file_path)
-        if should_skip:
-            report.skipped = True
-            report.skip_reason = reason
-            return report
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            report.skipped = True
-            report.skip_reason = f"Error reading file: {e}"
-            return report
-        
-        original_content = content
-        modified = False
+    def plan_fixes(self, content: str) -> Tuple[str, List[Tuple[int, str, str, str]]]:
+        """
+        Fixed content and its changes as (line_number, rule, old_text, new_text),
+        a pure function of the content so the change list can be cached per file.
+        """
+        changes = []
         
         # Find and replace color usage
         color_matches = self.find_color_usage(content)
@@ -208,15 +214,7 @@ class DesignTokenFixer:
                 if new_line != line:
                     lines[line_num - 1] = new_line
                     content = '\n'.join(lines)
-                    report.changes.append(FileChange(
-                        file_path=str(file_path),
-                        line_number=line_num,
-                        old_text=line.strip(),
-                        new_text=new_line.strip(),
-                        change_type='replacement'
-                    ))
-                    modified = True
-                    self.stats['replacements_made'] += 1
+                    changes.append((line_num, old_color, line.strip(), new_line.strip()))
         
         # Add import if needed
         if self.needs_import(content):
@@ -230,19 +228,51 @@ class DesignTokenFixer:
                 lines.insert(import_pos + 1, '')
             
             content = '\n'.join(lines)
-            report.import_added = True
+            changes.append((import_pos + 1, IMPORT_RULE_NAME, '', APP_COLORS_IMPORT))
+        
+        return content, changes
+    
+    def fix_file(self, file_path: Path) -> FileReport:
+        """Fix design token compliance in a single file"""
+        report = FileReport(file_path=str(file_path))
+        
+        # Check if should skip
+        should_skip, reason = self.should_skip_file(file_path)
+        if should_skip:
+            report.skipped = True
+            report.skip_reason = reason
+            return report
+        
+        try:
+            # The change list is cached in the source index until the file changes
+            changes = self.source_index.fact(file_path, PLANNED_CHANGES_FACT, planned_changes)
+        except Exception as e:
+            report.skipped = True
+            report.skip_reason = f"Error reading file: {e}"
+            return report
+        
+        for line_num, rule_name, old_text, new_text in changes:
+            change_type = 'import_added' if rule_name == IMPORT_RULE_NAME else 'replacement'
             report.changes.append(FileChange(
                 file_path=str(file_path),
-                line_number=import_pos + 1,
-                old_text='',
-                new_text=APP_COLORS_IMPORT,
-                change_type='import_added'
+                line_number=line_num,
+                old_text=old_text,
+                new_text=new_text,
+                change_type=change_type
             ))
-            modified = True
-            self.stats['imports_added'] += 1
+            if change_type == 'import_added':
+                report.import_added = True
+                self.stats['imports_added'] += 1
+            else:
+                self.stats['replacements_made'] += 1
+        modified = bool(changes)
         
         # Write changes if any were made
         if modified and not self.dry_run:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                original_content = f.read()
+            content, _ = self.plan_fixes(original_content)
+            
             # Create backup if requested
             if self.create_backup:
                 backup_path = file_path.with_suffix(file_path.suffix + '.bak')
@@ -269,11 +299,17 @@ class DesignTokenFixer:
             print("Backups will be created for modified files")
         print("-" * 80)
         
+        # Every .dart file, as before (hidden and build directories are reported as skipped);
+        # the index still serves each file's cached plan
         dart_files = list(root_path.rglob('*.dart'))
         total_files = len(dart_files)
         
         print(f"Found {total_files} Dart files to process\n")
         
+        # Plan every file up front across the worker pool (cached per file)
+        plan_files([f for f in dart_files if not self.should_skip_file(f)[0]], planned_changes,
+                   self.source_index, PLANNED_CHANGES_FACT, workers=self.workers, stats=self.rule_stats)
+        
         for i, file_path in enumerate(dart_files, 1):
             if i % 50 == 0:
                 print(f"Progress: {i}/{total_files} files processed...")
@@ -284,6 +320,14 @@ class DesignTokenFixer:
                 self.stats['files_skipped'] += 1
             elif report.changes:
                 self.reports[str(file_path)] = report
+        
+        self.source_index.save()
+    
+    def print_diffs(self):
+        """Print unified diffs of every modified file"""
+        for file_path in sorted(self.reports):
+            content = self.source_index.read_text(file_path)
+            print(unified_diff(file_path, content, self.plan_fixes(content)[0]), end='')
     
     def print_summary(self):
         """Print summary of changes"""
@@ -306,6 +350,8 @@ class DesignTokenFixer:
                     elif change.change_type == 'import_added':
                         print(f"    Added import: {APP_COLORS_IMPORT}")
         
+        self.rule_stats.print_summary("RULES", [rule.name for rule in COLOR_RULES.rules] + [IMPORT_RULE_NAME])
+        
         if self.dry_run:
             print("\n⚠️  DRY RUN MODE - No files were actually modified")
             print("Run without --dry-run to apply changes")
@@ -343,6 +389,17 @@ Examples:
         default='lib/',
         help='Path to process (default: lib/)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes for planning (default: CPU count)'
+    )
+    parser.add_argument(
+        '--diff',
+        action='store_true',
+        help='Print a unified diff of every change (use with --dry-run)'
+    )
     
     args = parser.parse_args()
     
@@ -353,9 +410,11 @@ Examples:
         sys.exit(1)
     
     # Create fixer and process
-    fixer = DesignTokenFixer(dry_run=args.dry_run, create_backup=args.backup)
+    fixer = DesignTokenFixer(dry_run=args.dry_run, create_backup=args.backup, workers=args.workers)
     fixer.process_directory(root_path)
     fixer.print_summary()
+    if args.diff and args.dry_run:
+        fixer.print_diffs()
 
 
 if __name__ == '__main__':
@@ -11,15 +11,23 @@ Part of Phase 0 validation for Patent #31.
 import json
 import sys
 import os
+import heapq
+from collections import defaultdict
 from pathlib import Path
 from typing import List, Dict, Any
 from dataclasses import dataclass
 import statistics
+import numpy as np
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.knot_validation.top_k_recommender import TopKRecommender, Weighting
+
+QUANTUM_WEIGHTING = Weighting('quantum', {'quantum': 1.0})
+INTEGRATED_WEIGHTING = Weighting('integrated', {'quantum': 0.7, 'topological': 0.3})
+
 @dataclass
 class RecommendationResult:
     """Represents recommendation analysis result."""
@@ -54,9 +62,8 @@ class RecommendationAnalyzer:
                 'method': 'quantum'
             })
         
-        # Sort by score and return top N
-        scores.sort(key=lambda x: x['score'], reverse=True)
-        return scores[:top_n]
+        # Top N by score (ties keep candidate order)
+        return heapq.nlargest(top_n, scores, key=lambda x: x['score'])
     
     def generate_recommendations_integrated(
         self,
@@ -95,9 +102,52 @@ class RecommendationAnalyzer:
                 'method': 'integrated'
             })
         
-        # Sort by score and return top N
-        scores.sort(key=lambda x: x['score'], reverse=True)
-        return scores[:top_n]
+        # Top N by score (ties keep candidate order)
+        return heapq.nlargest(top_n, scores, key=lambda x: x['score'])
+    
+    def build_recommender(self, profiles: List[Dict], knots: List[Dict]) -> TopKRecommender:
+        """
+        Top-k recommender over `profiles` (users and candidates alike) with
+        'quantum' (_calculate_similarity) and 'topological'
+        (_calculate_knot_similarity, 0.5 without a knot) components, scored a
+        block of users at a time.
+        """
+        dimension_names = list(dict.fromkeys(
+            name for profile in profiles for name in profile.get('dimensions', {})
+        ))
+        dimensions = np.array([
+            [profile.get('dimensions', {}).get(name, np.nan) for name in dimension_names]
+            for profile in profiles
+        ], dtype=float).reshape(len(profiles), len(dimension_names))
+        
+        knot_map = {k['user_id']: k for k in knots}
+        profile_knots = [knot_map.get(profile['user_id']) for profile in profiles]
+        has_knot = np.array([knot is not None for knot in profile_knots])
+        knot_types = [(knot or {}).get('knot_type', 'unknown') for knot in profile_knots]
+        type_codes = np.unique(knot_types, return_inverse=True)[1].reshape(-1)
+        is_complex = np.array([knot_type.startswith('complex') for knot_type in knot_types])
+        complexity = np.array([(knot or {}).get('complexity', 0.5) for knot in profile_knots], dtype=float)
+        
+        def score_block(rows: np.ndarray) -> Dict[str, np.ndarray]:
+            # Mean of 1 - |a - b| over the dimensions both profiles have
+            similarity_sum = np.zeros((len(rows), len(profiles)))
+            shared = np.zeros((len(rows), len(profiles)))
+            for column in range(len(dimension_names)):
+                values = dimensions[:, column]
+                both = ~np.isnan(values[rows])[:, None] & ~np.isnan(values)[None, :]
+                similarity_sum += np.where(both, 1.0 - np.abs(values[rows][:, None] - values[None, :]), 0.0)
+                shared += both
+            quantum = np.divide(similarity_sum, shared, out=np.full(shared.shape, 0.5), where=shared > 0)
+            
+            type_similarity = np.where(
+                type_codes[rows][:, None] == type_codes[None, :], 1.0,
+                np.where(is_complex[rows][:, None] & is_complex[None, :], 0.7, 0.3)
+            )
+            complexity_similarity = 1.0 - np.abs(complexity[rows][:, None] - complexity[None, :])
+            topological = np.where(has_knot[None, :], 0.6 * type_similarity + 0.4 * complexity_similarity, 0.5)
+            return {'quantum': quantum, 'topological': topological}
+        
+        return TopKRecommender(score_block, len(profiles), len(profiles))
     
     def _calculate_similarity(self, profile_a: Dict, profile_b: Dict) -> float:
         """Calculate similarity between profiles (simplified)."""
@@ -147,39 +197,28 @@ class RecommendationAnalyzer:
         quantum_satisfactions = []
         integrated_satisfactions = []
         
-        analyzer = RecommendationAnalyzer()
-        profile_map = {p['user_id']: p for p in profiles}
-        knot_map = {k['user_id']: k for k in knots}
+        profiles = list({p['user_id']: p for p in profiles}.values())
+        user_ids = [p['user_id'] for p in profiles]
+        knot_ids = {k['user_id'] for k in knots}
+        engagement_by_user = defaultdict(list)
+        for e in engagement_data:
+            engagement_by_user[e.get('user_id')].append(e)
         
         total_recommendations = 0
         
-        for user_id in profile_map.keys():
-            user_profile = profile_map[user_id]
-            user_knot = knot_map.get(user_id)
-            
-            if not user_knot:
-                continue
-            
-            # Get candidates (all other users)
-            candidates = [p for p in profiles if p['user_id'] != user_id]
-            candidate_knots = [k for k in knots if k['user_id'] != user_id]
-            
-            # Generate recommendations
-            quantum_recs = analyzer.generate_recommendations_quantum(
-                user_profile, candidates, top_n=10
-            )
-            integrated_recs = analyzer.generate_recommendations_integrated(
-                user_profile, user_knot, candidates, candidate_knots, top_n=10
-            )
-            
-            # Get engagement data for this user
-            user_engagement = [
-                e for e in engagement_data
-                if e.get('user_id') == user_id
-            ]
-            
-            if not user_engagement:
-                continue
+        # Users with a knot and engagement data, each recommended the top 10
+        # other users under both weightings in one pass
+        user_rows = np.array([row for row, user_id in enumerate(user_ids)
+                              if user_id in knot_ids and engagement_by_user.get(user_id)], dtype=np.int64)
+        recommender = self.build_recommender(profiles, knots)
+        
+        for user_row, top_k in recommender.stream(
+            [QUANTUM_WEIGHTING, INTEGRATED_WEIGHTING], 10,
+            user_rows=user_rows, excluded_items=np.arange(len(profiles))
+        ):
+            user_engagement = engagement_by_user[user_ids[user_row]]
+            quantum_recs = [{'user_id': user_ids[i]} for i in top_k[QUANTUM_WEIGHTING.name][0]]
+            integrated_recs = [{'user_id': user_ids[i]} for i in top_k[INTEGRATED_WEIGHTING.name][0]]
             
             # Calculate engagement scores
             quantum_engagement = self._calculate_engagement_score(
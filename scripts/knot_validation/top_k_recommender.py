@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Top-K Recommender
+
+Purpose: Shared recommendation engine for the quantum-only vs. integrated
+(quantum + knot) comparisons. Instead of scoring every candidate for one
+user at a time and sorting the full list, it:
+
+- asks a block scorer for each score component (e.g. 'quantum', 'knot')
+  as a (users x items) matrix for a block of users,
+- combines the components under one or more Weightings in the same pass,
+- selects each row's top k with np.argpartition (equal scores keep item
+  order, exactly like a stable descending sort truncated to k), and
+- yields results block by block or user by user, so memory stays at one
+  block of scores whatever the population size.
+
+Part of Phase 0 validation for Patent #31.
+
+Date: October 18, 2026
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Score elements per component matrix in one user block (2^22 float64 = 32 MB)
+DEFAULT_BLOCK_ELEMENTS = 1 << 22
+
+# user rows → {component name: (len(rows), num_items) score matrix}
+BlockScorer = Callable[[np.ndarray], Dict[str, np.ndarray]]
+
+
+@dataclass(frozen=True)
+class Weighting:
+    """
+    One way of integrating score components:
+    score = clip(Σ weight · component, lower, upper).
+
+    Weighting('quantum_only', {'quantum': 1.0}) and
+    Weighting('integrated', {'quantum': 1.0, 'knot': 0.15}, upper=1.0)
+    reproduce quantum-only and knot-bonus scoring.
+    """
+    name: str
+    weights: Dict[str, float] = field(hash=False)
+    lower: Optional[float] = None
+    upper: Optional[float] = None
+
+    def combine(self, components: Dict[str, np.ndarray]) -> np.ndarray:
+        scores = None
+        for component, weight in self.weights.items():
+            term = weight * components[component]
+            scores = term if scores is None else scores + term
+        if self.lower is not None or self.upper is not None:
+            scores = np.clip(scores, self.lower, self.upper)
+        return scores
+
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Best k items of every row of a (rows, items) score matrix, best first,
+    as (item indices, scores). Equal scores keep item order.
+    """
+    num_rows, num_items = scores.shape
+    k = min(k, num_items)
+    if k <= 0:
+        return np.empty((num_rows, 0), dtype=np.int64), np.empty((num_rows, 0))
+
+    if k < num_items:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(num_items), scores.shape)
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.lexsort((candidates, -candidate_scores), axis=-1)
+    items = np.take_along_axis(candidates, order, axis=1)
+
+    # argpartition picks arbitrarily among items tied with the k-th score;
+    # redo those (rare) rows with a full stable sort
+    if k < num_items:
+        kth_scores = np.take_along_axis(scores, items[:, -1:], axis=1)
+        tied_rows = np.flatnonzero((scores >= kth_scores).sum(axis=1) > k)
+        for row in tied_rows:
+            items[row] = np.argsort(-scores[row], kind='stable')[:k]
+
+    return items, np.take_along_axis(scores, items, axis=1)
+
+
+@dataclass
+class RecommendationBlock:
+    """Top-k results for a block of users, per weighting name."""
+    user_rows: np.ndarray
+    items: Dict[str, np.ndarray]
+    scores: Dict[str, np.ndarray]
+
+    def __iter__(self) -> Iterator[Tuple[int, Dict[str, Tuple[np.ndarray, np.ndarray]]]]:
+        """(user row, {weighting: (items, scores)}) for each user in the block."""
+        for i, user_row in enumerate(self.user_rows):
+            yield int(user_row), {name: (self.items[name][i], self.scores[name][i]) for name in self.items}
+
+
+class TopKRecommender:
+    """Top-k recommendations for many users over one shared item set."""
+
+    def __init__(
+        self,
+        score_block: BlockScorer,
+        num_users: int,
+        num_items: int,
+        block_size: Optional[int] = None,
+    ):
+        self.score_block = score_block
+        self.num_users = num_users
+        self.num_items = num_items
+        self.block_size = block_size or max(1, DEFAULT_BLOCK_ELEMENTS // max(num_items, 1))
+
+    def blocks(
+        self,
+        weightings: Sequence[Weighting],
+        k: int,
+        user_rows: Optional[np.ndarray] = None,
+        excluded_items: Optional[np.ndarray] = None,
+    ) -> Iterator[RecommendationBlock]:
+        """
+        Stream top-k results one user block at a time, for every weighting.
+
+        excluded_items[user_row] is an item never recommended to that user
+        (e.g. the user themself, -1 for none); with exclusions at most
+        num_items - 1 items are returned per user.
+        """
+        user_rows = np.arange(self.num_users) if user_rows is None else np.asarray(user_rows, dtype=np.int64)
+        k = min(k, self.num_items - 1) if excluded_items is not None else k
+
+        for start in range(0, len(user_rows), self.block_size):
+            rows = user_rows[start:start + self.block_size]
+            components = self.score_block(rows)
+            items, scores = {}, {}
+            for weighting in weightings:
+                combined = weighting.combine(components)
+                if excluded_items is not None:
+                    combined = np.array(combined, dtype=float)
+                    excluded = np.asarray(excluded_items)[rows]
+                    has_excluded = excluded >= 0
+                    combined[np.flatnonzero(has_excluded), excluded[has_excluded]] = -np.inf
+                items[weighting.name], scores[weighting.name] = top_k(combined, k)
+            yield RecommendationBlock(rows, items, scores)
+
+    def stream(self, weightings: Sequence[Weighting], k: int, **kwargs):
+        """(user row, {weighting: (items, scores)}) per user, in user order."""
+        for block in self.blocks(weightings, k, **kwargs):
+            yield from block
+
+    def recommend(
+        self, weightings: Sequence[Weighting], k: int, **kwargs
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """All users' top-k as {weighting: ((users, k) items, (users, k) scores)}."""
+        items = {w.name: [] for w in weightings}
+        scores = {w.name: [] for w in weightings}
+        for block in self.blocks(weightings, k, **kwargs):
+            for name in items:
+                items[name].append(block.items[name])
+                scores[name].append(block.scores[name])
+        return {name: (np.concatenate(items[name]) if items[name] else np.empty((0, 0), dtype=np.int64),
+                       np.concatenate(scores[name]) if scores[name] else np.empty((0, 0)))
+                for name in items}
@@ -3,6 +3,11 @@
 Generate Visual Diagrams for Patent #31: Topological Knot Theory for Personality Representation
 
 This script generates all 10 visual diagrams specified in the patent visuals document.
+Diagrams render in parallel, and only those whose drawing code changed since
+the last run are re-rendered (see visual_render_driver.py).
+
+Usage:
+    python scripts/patent_visuals/generate_patent_31_visuals.py [--force] [--workers N]
 """
 
 import matplotlib.pyplot as plt
@@ -13,6 +18,8 @@ import numpy as np
 from pathlib import Path
 import sys
 
+from visual_render_driver import Visual, parse_render_args, render_visuals
+
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
@@ -993,37 +1000,40 @@ def create_visual_10():
     plt.close()
     print("✅ Created Visual 10: Integrated System Architecture")
 
+VISUALS = [
+    Visual(create_visual_1, 'visual_1_dimension_to_braid.png'),
+    Visual(create_visual_2, 'visual_2_multidimensional_spaces.png'),
+    Visual(create_visual_3, 'visual_3_weaving_patterns.png'),
+    Visual(create_visual_4, 'visual_4_integrated_formula.png'),
+    Visual(create_visual_5, 'visual_5_dynamic_evolution.png'),
+    Visual(create_visual_6, 'visual_6_invariants_comparison.png'),
+    Visual(create_visual_6a, 'visual_6a_conway_knot_problem.png'),
+    Visual(create_visual_7, 'visual_7_community_discovery.png'),
+    Visual(create_visual_8, 'visual_8_higher_dimensional.png'),
+    Visual(create_visual_9, 'visual_9_algorithm_flow.png'),
+    Visual(create_visual_10, 'visual_10_system_architecture.png'),
+]
+
 def main():
     """Generate all visual diagrams."""
+    force, workers = parse_render_args()
+    
     print("=" * 80)
     print("Generating Patent #31 Visual Diagrams")
     print("=" * 80)
     print()
     
-    try:
-        create_visual_1()
-        create_visual_2()
-        create_visual_3()
-        create_visual_4()
-        create_visual_5()
-        create_visual_6()
-        create_visual_6a()
-        create_visual_7()
-        create_visual_8()
-        create_visual_9()
-        create_visual_10()
-        
-        print()
-        print("=" * 80)
-        print("✅ All visual diagrams generated successfully!")
-        print(f"📁 Output directory: {output_dir}")
+    rendered, skipped, failed = render_visuals(VISUALS, output_dir, workers=workers, force=force)
+    
+    print()
+    print("=" * 80)
+    if failed:
+        print(f"❌ {failed} visual diagram(s) failed ({rendered} rendered, {skipped} unchanged)")
         print("=" * 80)
-        
-    except Exception as e:
-        print(f"❌ Error generating visuals: {e}")
-        import traceback
-        traceback.print_exc()
         sys.exit(1)
+    print(f"✅ All visual diagrams generated successfully! ({rendered} rendered, {skipped} unchanged)")
+    print(f"📁 Output directory: {output_dir}")
+    print("=" * 80)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Parallel, Cached Rendering Driver for Patent Visual Generators
+
+A patent's generator lists its diagrams as Visual entries (the function that
+draws and saves the figure, the file it writes, optional keyword parameters)
+and hands them to render_visuals(), which:
+- hashes each visual's inputs: its function's source, the source of the
+  module-level helpers it calls (recursively), the module-level constants it
+  reads, the versions of the libraries it uses, and its parameters;
+- skips visuals whose hash matches the render manifest in the output
+  directory (.render_manifest.json) and whose output file exists;
+- renders the rest in a process pool on the non-interactive Agg backend,
+  printing each visual's output in list order.
+
+Editing one diagram function re-renders only that diagram; editing a shared
+helper re-renders the diagrams that use it.
+
+Usage from a generator:
+    VISUALS = [Visual(create_visual_1, 'visual_1_overview.png'), ...]
+    force, workers = parse_render_args()
+    rendered, skipped, failed = render_visuals(VISUALS, output_dir, workers=workers, force=force)
+
+Date: October 18, 2026
+"""
+
+import contextlib
+import hashlib
+import inspect
+import io
+import json
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import CodeType, FunctionType, ModuleType
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+MANIFEST_NAME = '.render_manifest.json'
+MANIFEST_VERSION = 1
+
+# Module-level values whose repr() is stable enough to hash
+CONSTANT_TYPES = (str, bytes, int, float, complex, bool, type(None), tuple, list, dict, frozenset, Path)
+
+
+@dataclass
+class Visual:
+    """One diagram: `function(**params)` draws it and saves it as `output` in the output directory"""
+    function: Callable
+    output: str
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        return self.function.__name__
+
+
+def use_agg_backend():
+    """Render without a display (also the worker process initializer)."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _code_names(code: CodeType) -> Set[str]:
+    """Global and attribute names used by a code object and the code nested in it."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _library_version(module: ModuleType) -> str:
+    top_level = sys.modules.get(module.__name__.split('.')[0], module)
+    return f"{module.__name__} {getattr(top_level, '__version__', '')}"
+
+
+def _dependency_parts(function: FunctionType, seen: Set[str]) -> List[str]:
+    """Sources, constants and library versions `function` depends on (sorted by name)."""
+    parts = []
+    module_name = function.__module__
+    namespace = function.__globals__
+    for name in sorted(_code_names(function.__code__)):
+        if name in seen or name not in namespace:
+            continue
+        seen.add(name)
+        value = namespace[name]
+        if isinstance(value, ModuleType):
+            parts.append(f"module {name}: {_library_version(value)}")
+        elif isinstance(value, (FunctionType, type)) and value.__module__ == module_name:
+            # A helper defined next to the visuals: its code counts, and so does what it uses
+            parts.append(f"source {name}:\n{inspect.getsource(value)}")
+            if isinstance(value, FunctionType):
+                parts.extend(_dependency_parts(value, seen))
+        elif isinstance(value, (FunctionType, type)):
+            library = sys.modules.get(value.__module__)
+            parts.append(f"imported {name}: {_library_version(library) if library else value.__module__}")
+        elif isinstance(value, CONSTANT_TYPES):
+            parts.append(f"constant {name}: {value!r}")
+    return parts
+
+
+def visual_hash(visual: Visual) -> str:
+    """Hash of everything the rendered visual depends on (see module docstring)."""
+    function = visual.function
+    parts = [
+        f"visual {visual.name} -> {visual.output}",
+        f"params: {sorted(visual.params.items())!r}",
+        inspect.getsource(function),
+    ] + _dependency_parts(function, {function.__name__})
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+class RenderManifest:
+    """{output file: {visual, hash}} of the last successful renders (JSON, saved atomically)"""
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / MANIFEST_NAME
+        self.entries: Dict[str, Dict[str, str]] = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.entries = data.get('visuals', {})
+        except (OSError, ValueError):
+            pass
+
+    def is_current(self, visual: Visual, digest: str) -> bool:
+        entry = self.entries.get(visual.output)
+        return entry is not None and entry['hash'] == digest and (self.output_dir / visual.output).exists()
+
+    def record(self, visual: Visual, digest: str):
+        self.entries[visual.output] = {'visual': visual.name, 'hash': digest}
+
+    def save(self):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'visuals': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+
+def _render(function: Callable, params: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """Worker: draw one visual; returns (its printed output, traceback or None)."""
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            function(**params)
+        return output.getvalue(), None
+    except Exception:
+        return output.getvalue(), traceback.format_exc()
+    finally:
+        # A failed visual must not leave its figure behind for the next one in this worker
+        import matplotlib.pyplot as plt
+        plt.close('all')
+
+
+def parse_render_args(argv: List[str] = None) -> Tuple[bool, Optional[int]]:
+    """(force, workers) from --force / --workers N"""
+    argv = sys.argv if argv is None else argv
+    workers = None
+    if "--workers" in argv:
+        workers = int(argv[argv.index("--workers") + 1])
+    return "--force" in argv, workers
+
+
+def render_visuals(visuals: List[Visual], output_dir: Path, workers: Optional[int] = None,
+                   force: bool = False) -> Tuple[int, int, int]:
+    """
+    Render the visuals whose inputs changed since their last render (all of
+    them with force) across `workers` processes (default: CPU count).
+    Returns (rendered, skipped, failed).
+    """
+    manifest = RenderManifest(output_dir)
+    digests = {visual.output: visual_hash(visual) for visual in visuals}
+    stale = [visual for visual in visuals if force or not manifest.is_current(visual, digests[visual.output])]
+    skipped = len(visuals) - len(stale)
+    if skipped:
+        print(f"⏭️  {skipped} visual(s) unchanged since the last render (use --force to re-render)")
+
+    workers = min(workers or os.cpu_count() or 1, len(stale))
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=use_agg_backend)
+        results = pool.map(_render, [visual.function for visual in stale], [visual.params for visual in stale])
+    else:
+        use_agg_backend()
+        pool = None
+        results = (_render(visual.function, visual.params) for visual in stale)
+
+    rendered = 0
+    failed = 0
+    try:
+        for visual, (printed, error) in zip(stale, results):
+            print(printed, end='')
+            if error is None:
+                rendered += 1
+                manifest.record(visual, digests[visual.output])
+                manifest.save()
+            else:
+                failed += 1
+                print(f"❌ Error rendering {visual.name}:\n{error}", end='')
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return rendered, skipped, failed
@@ -11,6 +11,8 @@ This script is intentionally conservative:
   - heuristic written-description support scan (claims terms vs Detailed Description)
   - prior-art positioning hooks extracted from document content
 
+Specs, sections and claims come from the shared parse in patent_corpus.py.
+
 Usage:
   python3 scripts/patents/generate_attorney_pass_pack.py
 
@@ -21,14 +23,13 @@ Output:
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
 from typing import Iterable
 
+from patent_corpus import LEGACY_MULTI_ENTITY, PATENTS_ROOT, Claim, PatentCorpus, load_corpus, rel
+
 
-PROJECT_ROOT = Path(__file__).resolve().parents[2]
-PATENTS_ROOT = PROJECT_ROOT / "docs" / "patents"
 OUTPUT_ROOT = (
     PATENTS_ROOT
     / "filing_preparation"
@@ -37,27 +38,6 @@ OUTPUT_ROOT = (
 )
 
 
-SKIP_NAMES = {
-    "DOCUMENTATION_STATUS.md",
-    "PATENT_SECTIONS_COMPLETE.md",
-    "PATENT_UPDATE_SUMMARY.md",
-    "PRIOR_ART_ADDITION_SUMMARY.md",
-    "REFERENCES_UPDATE_SUMMARY.md",
-    "PHASE_0_PROGRESS_SUMMARY.md",
-    "PATENT_30_VALIDATION_PLAN.md",
-    "PATENT_30_COMPLETION_CHECKLIST.md",
-    "MARKETING_VALIDATION_RESULTS.md",
-    "EXPERIMENT_RESULTS.md",
-    "TIMEZONE_AWARE_ENHANCEMENT.md",
-    "CRITICAL_PATENTABILITY_ANALYSIS.md",
-}
-
-
-SECTION_RE = re.compile(
-    r"^##\s+(?P<name>.+?)\s*$\n(?P<body>.*?)(?=^##\s+\S|\Z)",
-    flags=re.M | re.S,
-)
-CLAIM_LINE_RE = re.compile(r"^(?P<num>\d+)\.\s+(?P<body>.*)$", flags=re.M)
 FIG_LIST_RE = re.compile(
     r"^##\s+Figures\s*$\n(?P<body>.*?)(?=^##\s+\S|\Z)",
     flags=re.M | re.S,
@@ -75,75 +55,12 @@ def count_words(s: str) -> int:
     return len(WORD_RE.findall(s))
 
 
-def safe_read(p: Path) -> str:
-    return p.read_text(encoding="utf-8", errors="ignore")
-
-
-def rel(p: Path) -> str:
-    return str(p.relative_to(PROJECT_ROOT))
-
-
-def is_main_patent_doc(p: Path) -> bool:
-    if p.name.endswith("_visuals.md"):
-        return False
-    if p.name in SKIP_NAMES:
-        return False
-    head = safe_read(p)[:4000]
-    return (
-        ("**Patent Innovation #" in head)
-        or ("## Patent Overview" in head)
-        or (p.name == "MULTI_ENTITY_QUANTUM_ENTANGLEMENT_MATCHING.md")
-    )
-
-
 def paired_visuals_path(main_doc: Path) -> Path | None:
-    if main_doc.name == "MULTI_ENTITY_QUANTUM_ENTANGLEMENT_MATCHING.md":
+    if main_doc.name == LEGACY_MULTI_ENTITY.name:
         return None
     return main_doc.with_name(main_doc.stem + "_visuals.md")
 
 
-def parse_sections(text: str) -> dict[str, str]:
-    out: dict[str, str] = {}
-    for m in SECTION_RE.finditer(text):
-        name = m.group("name").strip()
-        body = m.group("body").strip()
-        out[name] = body
-    return out
-
-
-def extract_title(text: str, fallback: str) -> str:
-    m = re.search(r"^#\s+(.+?)\s*$", text, flags=re.M)
-    return m.group(1).strip() if m else fallback
-
-
-def extract_innovation_number(text: str) -> str | None:
-    m = re.search(r"^\*\*Patent Innovation #(\d+)\*\*", text, flags=re.M)
-    return m.group(1) if m else None
-
-
-@dataclass(frozen=True)
-class Claim:
-    num: int
-    text: str
-
-
-def parse_claims(claims_body: str) -> list[Claim]:
-    # A simple (but stable) parser: treat each "N." as claim header.
-    matches = list(CLAIM_LINE_RE.finditer(claims_body))
-    if not matches:
-        return []
-    out: list[Claim] = []
-    for i, m in enumerate(matches):
-        n = int(m.group("num"))
-        start = m.start()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(claims_body)
-        chunk = claims_body[start:end].strip()
-        # Remove the leading "N." line label from the chunk while preserving remainder.
-        chunk = re.sub(rf"^{re.escape(str(n))}\.\s*", "", chunk, count=1)
-        out.append(Claim(num=n, text=chunk.strip()))
-    return out
-
-
 def claim_dependency_map(claims: list[Claim]) -> dict[int, list[int]]:
     """
     Returns mapping: claim -> referenced claim(s), based on phrases like:
@@ -331,10 +248,11 @@ def render_pass_doc(
     title: str,
     main_doc: Path,
     visuals_doc: Path | None,
+    text: str,
+    innovation: str | None,
     sections: dict[str, str],
     claims: list[Claim],
 ) -> str:
-    innovation = extract_innovation_number(safe_read(main_doc))
     abstract_wc = count_words(sections.get("Abstract", ""))
 
     dep_map = claim_dependency_map(claims)
@@ -344,7 +262,7 @@ def render_pass_doc(
     antecedent_flags = antecedent_basis_flags(claims)
     clarity = clarity_flags(claims)
     support_missing = support_scan(claims, sections.get("Detailed Description", "")) if "Detailed Description" in sections else []
-    hooks = prior_art_hooks(safe_read(main_doc))
+    hooks = prior_art_hooks(text)
 
     lines: list[str] = []
     lines.append(f"# Attorney Pass — {title}")
@@ -430,43 +348,38 @@ def render_pass_doc(
     return "\n".join(lines).rstrip() + "\n"
 
 
-def main() -> None:
+def main(corpus: PatentCorpus | None = None) -> None:
+    corpus = corpus or load_corpus()
     OUTPUT_ROOT.mkdir(parents=True, exist_ok=True)
 
-    main_docs = sorted(
-        [p for p in PATENTS_ROOT.glob("category_*/*/*.md") if is_main_patent_doc(p)],
-        key=lambda x: str(x),
-    )
+    main_docs = sorted(corpus.category_docs(), key=lambda d: str(d.path))
 
     # Optional top-level doc (no visuals pairing expected).
-    extra = PATENTS_ROOT / "MULTI_ENTITY_QUANTUM_ENTANGLEMENT_MATCHING.md"
-    if extra.exists() and is_main_patent_doc(extra):
+    extra = corpus.legacy_multi_entity()
+    if extra is not None:
         main_docs.append(extra)
 
     generated = 0
-    for main_doc in main_docs:
-        text = safe_read(main_doc)
-        sections = parse_sections(text)
-        title = extract_title(text, fallback=main_doc.stem.replace("_", " "))
+    for doc in main_docs:
+        main_doc = doc.path
 
         visuals = paired_visuals_path(main_doc)
         if visuals is not None and not visuals.exists():
             visuals = None
 
-        claims_body = sections.get("Claims", "")
-        claims = parse_claims(claims_body)
-
         out_path = OUTPUT_ROOT / main_doc.relative_to(PATENTS_ROOT)
         out_path = out_path.with_suffix("")  # drop .md
         out_path = out_path.with_name(out_path.name + "_attorney_pass.md")
         out_path = out_path.with_suffix(".md")
 
         content = render_pass_doc(
-            title=title,
+            title=doc.title,
             main_doc=main_doc,
             visuals_doc=visuals,
-            sections=sections,
-            claims=claims,
+            text=doc.text,
+            innovation=doc.innovation,
+            sections=doc.sections,
+            claims=doc.claims,
         )
         write_markdown(out_path, content)
         generated += 1
@@ -9,6 +9,7 @@ Design goals:
   dependency rewrite risk in bulk generation.
 - Include optional companion statutory-class independents (system / CRM) as an appendix,
   without renumbering the main claim set.
+- Claims come from the shared parse in patent_corpus.py.
 
 Output folder:
   docs/patents/filing_preparation/claims_drafts/YYYY-MM-DD/...
@@ -17,13 +18,12 @@ Output folder:
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
 
+from patent_corpus import PATENTS_ROOT, Claim, PatentCorpus, load_corpus, rel
+
 
-PROJECT_ROOT = Path(__file__).resolve().parents[2]
-PATENTS_ROOT = PROJECT_ROOT / "docs" / "patents"
 OUTPUT_ROOT = (
     PATENTS_ROOT
     / "filing_preparation"
@@ -32,92 +32,16 @@ OUTPUT_ROOT = (
 )
 
 
-SKIP_NAMES = {
-    "DOCUMENTATION_STATUS.md",
-    "PATENT_SECTIONS_COMPLETE.md",
-    "PATENT_UPDATE_SUMMARY.md",
-    "PRIOR_ART_ADDITION_SUMMARY.md",
-    "REFERENCES_UPDATE_SUMMARY.md",
-    "PHASE_0_PROGRESS_SUMMARY.md",
-    "PATENT_30_VALIDATION_PLAN.md",
-    "PATENT_30_COMPLETION_CHECKLIST.md",
-    "MARKETING_VALIDATION_RESULTS.md",
-    "EXPERIMENT_RESULTS.md",
-    "TIMEZONE_AWARE_ENHANCEMENT.md",
-    "CRITICAL_PATENTABILITY_ANALYSIS.md",
-}
-
-
-SECTION_RE = re.compile(
-    r"^##\s+(?P<name>.+?)\s*$\n(?P<body>.*?)(?=^##\s+\S|\Z)",
-    flags=re.M | re.S,
-)
-
-CLAIM_NUM_LINE_RE = re.compile(r"^(?P<num>\d+)\.\s+(?P<body>.*)$", flags=re.M)
 FIG_HEADING_RE = re.compile(r"^###\s+FIG\.\s*\d+\s+[—-]\s+.+$", flags=re.M)
 SUBPART_LINE_RE = re.compile(r"^\s*\(([a-z])\)\s+(.+?)\s*$", flags=re.M)
 HR_LINE_RE = re.compile(r"^\s*---\s*$", flags=re.M)
 
 
-def safe_read(p: Path) -> str:
-    return p.read_text(encoding="utf-8", errors="ignore")
-
-
 def write_text(p: Path, s: str) -> None:
     p.parent.mkdir(parents=True, exist_ok=True)
     p.write_text(s, encoding="utf-8")
 
 
-def rel(p: Path) -> str:
-    return str(p.relative_to(PROJECT_ROOT))
-
-
-def is_main_patent_doc(p: Path) -> bool:
-    if p.name.endswith("_visuals.md"):
-        return False
-    if p.name in SKIP_NAMES:
-        return False
-    head = safe_read(p)[:4000]
-    return (
-        ("**Patent Innovation #" in head)
-        or ("## Patent Overview" in head)
-        or (p.name == "MULTI_ENTITY_QUANTUM_ENTANGLEMENT_MATCHING.md")
-    )
-
-
-def parse_sections(text: str) -> dict[str, str]:
-    out: dict[str, str] = {}
-    for m in SECTION_RE.finditer(text):
-        out[m.group("name").strip()] = m.group("body").strip()
-    return out
-
-
-def extract_title(text: str, fallback: str) -> str:
-    m = re.search(r"^#\s+(.+?)\s*$", text, flags=re.M)
-    return m.group(1).strip() if m else fallback
-
-
-@dataclass(frozen=True)
-class Claim:
-    num: int
-    text: str
-
-
-def parse_claims(claims_body: str) -> list[Claim]:
-    matches = list(CLAIM_NUM_LINE_RE.finditer(claims_body))
-    if not matches:
-        return []
-    out: list[Claim] = []
-    for i, m in enumerate(matches):
-        n = int(m.group("num"))
-        start = m.start()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(claims_body)
-        chunk = claims_body[start:end].strip()
-        chunk = re.sub(rf"^{re.escape(str(n))}\.\s*", "", chunk, count=1)
-        out.append(Claim(num=n, text=chunk.strip()))
-    return out
-
-
 def strip_non_claim_trailing_content(s: str) -> str:
     """
     Claims sections in these specs sometimes include a trailing '---' and additional
@@ -325,29 +249,23 @@ def render_claim_set(
     return "\n".join(lines).rstrip() + "\n"
 
 
-def main() -> None:
+def main(corpus: PatentCorpus | None = None) -> None:
+    corpus = corpus or load_corpus()
     OUTPUT_ROOT.mkdir(parents=True, exist_ok=True)
 
-    main_docs = sorted(
-        [p for p in PATENTS_ROOT.glob("category_*/*/*.md") if is_main_patent_doc(p)],
-        key=lambda x: str(x),
-    )
-    extra = PATENTS_ROOT / "MULTI_ENTITY_QUANTUM_ENTANGLEMENT_MATCHING.md"
-    if extra.exists() and is_main_patent_doc(extra):
+    main_docs = sorted(corpus.category_docs(), key=lambda d: str(d.path))
+    extra = corpus.legacy_multi_entity()
+    if extra is not None:
         main_docs.append(extra)
 
     written = 0
-    for main_doc in main_docs:
-        text = safe_read(main_doc)
-        sections = parse_sections(text)
-        claims_body = sections.get("Claims")
-        if not claims_body:
-            continue
-        claims = [Claim(num=c.num, text=clean_claim_text(c.text)) for c in parse_claims(claims_body)]
+    for doc in main_docs:
+        main_doc = doc.path
+        claims = [Claim(num=c.num, text=clean_claim_text(c.text)) for c in doc.claims]
         if not claims:
             continue
 
-        title = extract_title(text, fallback=main_doc.stem.replace("_", " "))
+        title = doc.title
         dependents = [c for c in claims if c.num != 1]
 
         # medium = as-is
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Run the filing-prep generators on one shared parse of the patent corpus.
+
+The specs are parsed once (in parallel, cached by content hash - see
+patent_corpus.py) and the same parse is handed to every selected generator,
+in dependency order:
+  1. retier_patents.py                    (writes TOP_10.md)
+  2. generate_high_touch_claims_top10.py  (reads TOP_10.md)
+  3. generate_claim_scope_variants.py
+  4. generate_attorney_pass_pack.py
+
+Usage:
+  python3 scripts/patents/generate_filing_prep.py --all
+  python3 scripts/patents/generate_filing_prep.py --retier --high-touch
+  python3 scripts/patents/generate_filing_prep.py --all --workers 4
+
+Options:
+  --all             Run every generator
+  --retier          Retiering report + TOP_10.md
+  --high-touch      High-touch claim drafts for the Top 10
+  --scope-variants  Broad/medium/narrow claim drafts
+  --attorney-pass   Attorney pass pack
+  --workers N       Processes for parsing changed specs (default: CPU count)
+
+Date: October 18, 2026
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+import generate_attorney_pass_pack
+import generate_claim_scope_variants
+import generate_high_touch_claims_top10
+import retier_patents
+from patent_corpus import load_corpus
+
+
+# (flag, label, generator) in dependency order
+STEPS = [
+    ("--retier", "Retiering", retier_patents.main),
+    ("--high-touch", "High-touch Top 10 claims", generate_high_touch_claims_top10.main),
+    ("--scope-variants", "Claim scope variants", generate_claim_scope_variants.main),
+    ("--attorney-pass", "Attorney pass pack", generate_attorney_pass_pack.main),
+]
+
+
+def main() -> None:
+    argv = sys.argv[1:]
+    steps = [step for step in STEPS if "--all" in argv or step[0] in argv]
+    if not steps:
+        print(__doc__)
+        raise SystemExit(2)
+    workers = None
+    if "--workers" in argv:
+        workers = int(argv[argv.index("--workers") + 1])
+
+    print("🚀 Filing-prep generators")
+    print("=" * 80)
+    start = time.perf_counter()
+    corpus = load_corpus(workers=workers)
+    print(
+        f"📚 Patent corpus: {len(corpus.patents)} specs "
+        f"({corpus.parsed} parsed, {len(corpus.patents) - corpus.parsed} from cache) "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+
+    for _, label, generate in steps:
+        print(f"\n📝 {label}")
+        step_start = time.perf_counter()
+        generate(corpus)
+        print(f"   ✅ {time.perf_counter() - step_start:.2f}s")
+
+    print("\n" + "=" * 80)
+    print(f"✅ {len(steps)} generator(s) done in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,18 +14,19 @@ Notes:
   - Claim 1 options (BROAD / MEDIUM / NARROW)
   - Cleaned baseline claims (2..N) from the spec
   - Optional companion independents (system + CRM) tied to Claim 1
+- Specs come from the shared parse in patent_corpus.py (see generate_filing_prep.py
+  for running every filing-prep generator on one parse).
 """
 
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
+from patent_corpus import PATENTS_ROOT, PROJECT_ROOT, Claim, PatentCorpus, load_corpus, rel, safe_read
+
 
-PROJECT_ROOT = Path(__file__).resolve().parents[2]
-PATENTS_ROOT = PROJECT_ROOT / "docs" / "patents"
 STAMP = datetime.now().astimezone().date().isoformat()
 
 RETIER_DIR = PATENTS_ROOT / "filing_preparation" / "retiering" / STAMP
@@ -40,46 +41,15 @@ OUT_DIR = (
 )
 
 
-SECTION_RE = re.compile(
-    r"^##\s+(?P<name>.+?)\s*$\n(?P<body>.*?)(?=^##\s+\S|\Z)",
-    flags=re.M | re.S,
-)
-CLAIM_NUM_LINE_RE = re.compile(r"^(?P<num>\d+)\.\s+(?P<body>.*)$", flags=re.M)
 SUBPART_LINE_RE = re.compile(r"^\s*\(([a-z])\)\s+(.+?)\s*$", flags=re.M)
 HR_LINE_RE = re.compile(r"^\s*---\s*$", flags=re.M)
 
 
-def safe_read(p: Path) -> str:
-    return p.read_text(encoding="utf-8", errors="ignore")
-
-
 def write_text(p: Path, s: str) -> None:
     p.parent.mkdir(parents=True, exist_ok=True)
     p.write_text(s, encoding="utf-8")
 
 
-def rel(p: Path) -> str:
-    return str(p.relative_to(PROJECT_ROOT))
-
-
-def extract_title(text: str, fallback: str) -> str:
-    m = re.search(r"^#\s+(.+?)\s*$", text, flags=re.M)
-    return m.group(1).strip() if m else fallback
-
-
-def parse_sections(text: str) -> dict[str, str]:
-    out: dict[str, str] = {}
-    for m in SECTION_RE.finditer(text):
-        out[m.group("name").strip()] = m.group("body").strip()
-    return out
-
-
-@dataclass(frozen=True)
-class Claim:
-    num: int
-    text: str
-
-
 def strip_non_claim_trailing_content(s: str) -> str:
     m = HR_LINE_RE.search(s)
     if m:
@@ -97,21 +67,6 @@ def clean_claim_text(s: str) -> str:
     return s
 
 
-def parse_claims(claims_body: str) -> list[Claim]:
-    matches = list(CLAIM_NUM_LINE_RE.finditer(claims_body))
-    if not matches:
-        return []
-    out: list[Claim] = []
-    for i, m in enumerate(matches):
-        n = int(m.group("num"))
-        start = m.start()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(claims_body)
-        chunk = claims_body[start:end].strip()
-        chunk = re.sub(rf"^{re.escape(str(n))}\.\s*", "", chunk, count=1)
-        out.append(Claim(num=n, text=clean_claim_text(chunk)))
-    return out
-
-
 def format_subparts_if_present(s: str) -> str:
     matches = list(SUBPART_LINE_RE.finditer(s))
     if not matches:
@@ -299,27 +254,23 @@ def render_high_touch_file(title: str, spec_path: Path, claims: list[Claim]) ->
     return "\n".join(lines).rstrip() + "\n"
 
 
-def main() -> None:
+def main(corpus: PatentCorpus | None = None) -> None:
     specs = load_top10_specs()
     if not specs:
         raise SystemExit(f"Could not parse spec paths from {rel(TOP10_PATH)}")
+    corpus = corpus or load_corpus()
 
     written = 0
     for spec in specs:
         if not spec.exists():
             raise SystemExit(f"Spec not found: {spec}")
-        text = safe_read(spec)
-        sections = parse_sections(text)
-        claims_body = sections.get("Claims")
-        if not claims_body:
-            continue
-        claims = parse_claims(claims_body)
+        patent = corpus.get(spec)
+        claims = [Claim(num=c.num, text=clean_claim_text(c.text)) for c in patent.claims]
         if not claims:
             continue
 
-        title = extract_title(text, fallback=spec.stem.replace("_", " "))
         out_path = OUT_DIR / spec.parent.relative_to(PATENTS_ROOT) / f"{spec.stem}_claims_high_touch.md"
-        write_text(out_path, render_high_touch_file(title, spec, claims))
+        write_text(out_path, render_high_touch_file(patent.title, spec, claims))
         written += 1
 
     index = [
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Shared parsed-patent cache for the filing-prep generators.
+
+retier_patents.py, generate_high_touch_claims_top10.py,
+generate_claim_scope_variants.py and generate_attorney_pass_pack.py all work
+from the same parse of each patent spec: its `## ` sections, the raw
+numbered claims of its `## Claims` section, and its patentability scores.
+load_corpus() produces that parse once per run:
+- specs are parsed in a process pool (one spec per task);
+- results are cached in docs/patents/filing_preparation/.parsed_patents.pickle,
+  keyed by the spec's content hash, so unchanged specs are not re-parsed on
+  the next run either (entries for specs that no longer exist are dropped).
+
+Each generator still cleans and formats claims its own way; only the parse is
+shared.
+
+Date: October 18, 2026
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+PATENTS_ROOT = PROJECT_ROOT / "docs" / "patents"
+CACHE_PATH = PATENTS_ROOT / "filing_preparation" / ".parsed_patents.pickle"
+# Bump when the parse changes, to invalidate cached entries
+CACHE_VERSION = 1
+
+# Legacy top-level copy of the multi-entity spec (also under category_1)
+LEGACY_MULTI_ENTITY = PATENTS_ROOT / "MULTI_ENTITY_QUANTUM_ENTANGLEMENT_MATCHING.md"
+
+
+SKIP_NAMES = {
+    "DOCUMENTATION_STATUS.md",
+    "PATENT_SECTIONS_COMPLETE.md",
+    "PATENT_UPDATE_SUMMARY.md",
+    "PRIOR_ART_ADDITION_SUMMARY.md",
+    "REFERENCES_UPDATE_SUMMARY.md",
+    "PHASE_0_PROGRESS_SUMMARY.md",
+    "PATENT_30_VALIDATION_PLAN.md",
+    "PATENT_30_COMPLETION_CHECKLIST.md",
+    "MARKETING_VALIDATION_RESULTS.md",
+    "EXPERIMENT_RESULTS.md",
+    "TIMEZONE_AWARE_ENHANCEMENT.md",
+    "CRITICAL_PATENTABILITY_ANALYSIS.md",
+}
+
+# Patentability Assessment scores ("<label> Score: N/10")
+SCORE_LABELS = (
+    "Novelty",
+    "Non-Obviousness",
+    "Technical Specificity",
+    "Problem-Solution Clarity",
+    "Prior Art Risk",
+)
+
+
+SECTION_RE = re.compile(
+    r"^##\s+(?P<name>.+?)\s*$\n(?P<body>.*?)(?=^##\s+\S|\Z)",
+    flags=re.M | re.S,
+)
+CLAIM_NUM_LINE_RE = re.compile(r"^(?P<num>\d+)\.\s+(?P<body>.*)$", flags=re.M)
+
+
+def safe_read(p: Path) -> str:
+    return p.read_text(encoding="utf-8", errors="ignore")
+
+
+def rel(p: Path) -> str:
+    return str(p.relative_to(PROJECT_ROOT))
+
+
+def parse_sections(text: str) -> dict[str, str]:
+    out: dict[str, str] = {}
+    for m in SECTION_RE.finditer(text):
+        out[m.group("name").strip()] = m.group("body").strip()
+    return out
+
+
+def extract_title(text: str, fallback: str) -> str:
+    m = re.search(r"^#\s+(.+?)\s*$", text, flags=re.M)
+    return m.group(1).strip() if m else fallback
+
+
+def extract_innovation_number(text: str) -> str | None:
+    m = re.search(r"^\*\*Patent Innovation #(\d+)\*\*", text, flags=re.M)
+    return m.group(1) if m else None
+
+
+def get_score(text: str, label: str) -> float | None:
+    m = re.search(
+        rf"{re.escape(label)}\s*Score:\s*(\d+(?:\.\d+)?)\s*/\s*10",
+        text,
+        flags=re.I,
+    )
+    return float(m.group(1)) if m else None
+
+
+@dataclass(frozen=True)
+class Claim:
+    num: int
+    text: str
+
+
+def parse_claims(claims_body: str) -> list[Claim]:
+    # A simple (but stable) parser: treat each "N." as claim header.
+    matches = list(CLAIM_NUM_LINE_RE.finditer(claims_body))
+    if not matches:
+        return []
+    out: list[Claim] = []
+    for i, m in enumerate(matches):
+        n = int(m.group("num"))
+        start = m.start()
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(claims_body)
+        chunk = claims_body[start:end].strip()
+        # Remove the leading "N." line label from the chunk while preserving remainder.
+        chunk = re.sub(rf"^{re.escape(str(n))}\.\s*", "", chunk, count=1)
+        out.append(Claim(num=n, text=chunk.strip()))
+    return out
+
+
+@dataclass(frozen=True)
+class ParsedPatent:
+    path: Path
+    sha256: str
+    text: str
+    is_main: bool
+    title: str
+    innovation: str | None
+    sections: dict[str, str]
+    # Raw claims of the "Claims" section (not cleaned)
+    claims: list[Claim]
+    # SCORE_LABELS -> score (None when the spec has none)
+    scores: dict[str, float | None]
+
+
+def is_main_patent_text(p: Path, text: str) -> bool:
+    if p.name.endswith("_visuals.md"):
+        return False
+    if p.name in SKIP_NAMES:
+        return False
+    head = text[:4000]
+    return (
+        ("**Patent Innovation #" in head)
+        or ("## Patent Overview" in head)
+        or (p.name == LEGACY_MULTI_ENTITY.name)
+    )
+
+
+def parse_patent(p: Path, data: bytes, sha256: str) -> ParsedPatent:
+    """Parse one spec (read as safe_read() would)."""
+    text = data.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+    sections = parse_sections(text)
+    return ParsedPatent(
+        path=p,
+        sha256=sha256,
+        text=text,
+        is_main=is_main_patent_text(p, text),
+        title=extract_title(text, fallback=p.stem.replace("_", " ")),
+        innovation=extract_innovation_number(text),
+        sections=sections,
+        claims=parse_claims(sections.get("Claims", "")),
+        scores={label: get_score(text, label) for label in SCORE_LABELS},
+    )
+
+
+def _parse_task(task: tuple[Path, bytes, str]) -> ParsedPatent:
+    return parse_patent(*task)
+
+
+class PatentCorpus:
+    """Parsed specs of one run, by path; parse results are cached by content hash."""
+
+    def __init__(self, cache_path: Path = CACHE_PATH):
+        self.cache_path = cache_path
+        self.patents: dict[Path, ParsedPatent] = {}
+        self.category_paths: list[Path] = []
+        self._cache: dict[str, ParsedPatent] = {}
+        self._dirty = False
+        self.parsed = 0
+        try:
+            with open(cache_path, "rb") as f:
+                version, entries = pickle.load(f)
+            if version == CACHE_VERSION:
+                self._cache = entries
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError, AttributeError, ImportError):
+            pass
+
+    def load(self, paths: list[Path], workers: int | None = None) -> None:
+        """Parse (or take from the cache) every path not loaded yet."""
+        pending = []
+        for p in paths:
+            if p in self.patents:
+                continue
+            data = p.read_bytes()
+            sha256 = hashlib.sha256(data).hexdigest()
+            cached = self._cache.get(rel(p))
+            if cached is not None and cached.sha256 == sha256:
+                # The checkout may have moved since the entry was cached
+                self.patents[p] = cached if cached.path == p else replace(cached, path=p)
+            else:
+                pending.append((p, data, sha256))
+
+        workers = min(workers or os.cpu_count() or 1, len(pending))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed = list(pool.map(_parse_task, pending, chunksize=max(1, len(pending) // (workers * 4))))
+        else:
+            parsed = [_parse_task(task) for task in pending]
+        for patent in parsed:
+            self.patents[patent.path] = patent
+            self._cache[rel(patent.path)] = patent
+        self.parsed += len(parsed)
+        self._dirty = self._dirty or bool(parsed)
+
+    def get(self, p: Path) -> ParsedPatent:
+        if p not in self.patents:
+            self.load([p], workers=1)
+        return self.patents[p]
+
+    def category_docs(self) -> list[ParsedPatent]:
+        """Main specs under docs/patents/category_*/*/ (glob order; callers sort)."""
+        return [self.patents[p] for p in self.category_paths if self.patents[p].is_main]
+
+    def legacy_multi_entity(self) -> ParsedPatent | None:
+        """The top-level multi-entity spec, if it exists and is a main spec."""
+        if not LEGACY_MULTI_ENTITY.exists():
+            return None
+        patent = self.get(LEGACY_MULTI_ENTITY)
+        return patent if patent.is_main else None
+
+    def save(self) -> None:
+        """Write the cache (atomically), keeping only the specs loaded this run."""
+        loaded = {rel(p) for p in self.patents}
+        if any(key not in loaded for key in self._cache):
+            # Drop entries for deleted (or no longer loaded) specs
+            self._cache = {key: entry for key, entry in self._cache.items() if key in loaded}
+            self._dirty = True
+        if not self._dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with open(temp_path, "wb") as f:
+            pickle.dump((CACHE_VERSION, self._cache), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.cache_path)
+        self._dirty = False
+
+
+def load_corpus(workers: int | None = None) -> PatentCorpus:
+    """Every category spec plus the legacy multi-entity spec, parsed once (cached across runs)."""
+    corpus = PatentCorpus()
+    corpus.category_paths = list(PATENTS_ROOT.glob("category_*/*/*.md"))
+    paths = corpus.category_paths + ([LEGACY_MULTI_ENTITY] if LEGACY_MULTI_ENTITY.exists() else [])
+    corpus.load(paths, workers=workers)
+    corpus.save()
+    return corpus
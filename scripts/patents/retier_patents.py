@@ -3,7 +3,7 @@
 Retier SPOTS patents based on in-spec patentability metrics.
 
 This script:
-- Reads each main patent spec in docs/patents/
+- Reads each main patent spec in docs/patents/ (parsed once, via patent_corpus.py)
 - Extracts numeric patentability scores when present:
   Novelty, Non-Obviousness, Technical Specificity, Problem-Solution Clarity, Prior Art Risk
 - Computes a viability score:
@@ -29,74 +29,20 @@ from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
+from patent_corpus import PATENTS_ROOT, PatentCorpus, load_corpus, rel, safe_read
+
 
-PROJECT_ROOT = Path(__file__).resolve().parents[2]
-PATENTS_ROOT = PROJECT_ROOT / "docs" / "patents"
 PORTFOLIO_INDEX = PATENTS_ROOT / "PATENT_PORTFOLIO_INDEX.md"
 
 STAMP = datetime.now().astimezone().date().isoformat()
 OUT_DIR = PATENTS_ROOT / "filing_preparation" / "retiering" / STAMP
 
 
-SKIP_NAMES = {
-    "DOCUMENTATION_STATUS.md",
-    "PATENT_SECTIONS_COMPLETE.md",
-    "PATENT_UPDATE_SUMMARY.md",
-    "PRIOR_ART_ADDITION_SUMMARY.md",
-    "REFERENCES_UPDATE_SUMMARY.md",
-    "PHASE_0_PROGRESS_SUMMARY.md",
-    "PATENT_30_VALIDATION_PLAN.md",
-    "PATENT_30_COMPLETION_CHECKLIST.md",
-    "MARKETING_VALIDATION_RESULTS.md",
-    "EXPERIMENT_RESULTS.md",
-    "TIMEZONE_AWARE_ENHANCEMENT.md",
-    "CRITICAL_PATENTABILITY_ANALYSIS.md",
-}
-
-
-def safe_read(p: Path) -> str:
-    return p.read_text(encoding="utf-8", errors="ignore")
-
-
 def write_text(p: Path, s: str) -> None:
     p.parent.mkdir(parents=True, exist_ok=True)
     p.write_text(s, encoding="utf-8")
 
 
-def rel(p: Path) -> str:
-    return str(p.relative_to(PROJECT_ROOT))
-
-
-def is_main_patent_doc(p: Path) -> bool:
-    if p.name.endswith("_visuals.md"):
-        return False
-    if p.name in SKIP_NAMES:
-        return False
-    head = safe_read(p)[:4000]
-    return ("**Patent Innovation #" in head) or ("## Patent Overview" in head) or (
-        p.name == "MULTI_ENTITY_QUANTUM_ENTANGLEMENT_MATCHING.md"
-    )
-
-
-def extract_title(text: str, fallback: str) -> str:
-    m = re.search(r"^#\s+(.+?)\s*$", text, flags=re.M)
-    return m.group(1).strip() if m else fallback
-
-
-def extract_innovation_number(text: str) -> str | None:
-    m = re.search(r"^\*\*Patent Innovation #(\d+)\*\*", text, flags=re.M)
-    return m.group(1) if m else None
-
-
-def get_score(text: str, label: str) -> float | None:
-    m = re.search(
-        rf"{re.escape(label)}\s*Score:\s*(\d+(?:\.\d+)?)\s*/\s*10",
-        text,
-        flags=re.I,
-    )
-    return float(m.group(1)) if m else None
-
-
 def tier_from_viability(v: float) -> int:
     if v >= 27:
         return 1
@@ -144,7 +90,8 @@ def maybe_current_tier(title: str, title_to_tier: dict[str, int]) -> int | None:
     return None
 
 
-def main() -> None:
+def main(corpus: PatentCorpus | None = None) -> None:
+    corpus = corpus or load_corpus()
     OUT_DIR.mkdir(parents=True, exist_ok=True)
 
     # Load current tiering from portfolio index (best-effort).
@@ -152,23 +99,19 @@ def main() -> None:
     if PORTFOLIO_INDEX.exists():
         title_to_tier = parse_current_tiers_from_index(safe_read(PORTFOLIO_INDEX))
 
-    docs = sorted([p for p in PATENTS_ROOT.glob("category_*/*/*.md") if is_main_patent_doc(p)])
+    docs = sorted(corpus.category_docs(), key=lambda d: d.path)
     # Include the legacy top-level multi-entity doc, but we will de-dupe it.
-    legacy_multi = PATENTS_ROOT / "MULTI_ENTITY_QUANTUM_ENTANGLEMENT_MATCHING.md"
-    if legacy_multi.exists() and is_main_patent_doc(legacy_multi):
+    legacy_multi = corpus.legacy_multi_entity()
+    if legacy_multi is not None:
         docs.append(legacy_multi)
 
     rows: list[RetierRow] = []
-    for p in docs:
-        txt = safe_read(p)
-        title = extract_title(txt, fallback=p.stem.replace("_", " "))
-        innovation = extract_innovation_number(txt)
-
-        novelty = get_score(txt, "Novelty") or 0.0
-        nonobvious = get_score(txt, "Non-Obviousness") or 0.0
-        technical = get_score(txt, "Technical Specificity") or 0.0
-        problem_solution = get_score(txt, "Problem-Solution Clarity") or 0.0
-        prior_art = get_score(txt, "Prior Art Risk") or 0.0
+    for doc in docs:
+        novelty = doc.scores["Novelty"] or 0.0
+        nonobvious = doc.scores["Non-Obviousness"] or 0.0
+        technical = doc.scores["Technical Specificity"] or 0.0
+        problem_solution = doc.scores["Problem-Solution Clarity"] or 0.0
+        prior_art = doc.scores["Prior Art Risk"] or 0.0
 
         viability = novelty + nonobvious + technical + problem_solution + (10.0 - prior_art)
         new_tier = tier_from_viability(viability)
@@ -177,9 +120,9 @@ def main() -> None:
             RetierRow(
                 viability=viability,
                 new_tier=new_tier,
-                path=p,
-                title=title,
-                innovation=innovation,
+                path=doc.path,
+                title=doc.title,
+                innovation=doc.innovation,
                 novelty=novelty,
                 nonobvious=nonobvious,
                 technical=technical,
@@ -190,8 +133,8 @@ def main() -> None:
 
     # De-dupe: drop legacy multi-entity doc if category version exists.
     category_multi = PATENTS_ROOT / "category_1_quantum_ai_systems" / "08_multi_entity_quantum_entanglement_matching" / "08_multi_entity_quantum_entanglement_matching.md"
-    if category_multi.exists():
-        rows = [r for r in rows if r.path != legacy_multi]
+    if category_multi.exists() and legacy_multi is not None:
+        rows = [r for r in rows if r.path != legacy_multi.path]
 
     rows_sorted = sorted(rows, key=lambda r: (-r.viability, rel(r.path)))
     top10 = rows_sorted[:10]
@@ -11,9 +11,9 @@ Features:
 - Incremental application (one package at a time)
 - Edge case reporting
 - Manual review step
+- Parallel scanning with per-rule hit counts/timing and --diff output
 """
 
-import os
 import re
 import shutil
 import sys
@@ -22,6 +22,37 @@ from typing import List, Tuple, Dict
 from dataclasses import dataclass
 from datetime import datetime
 
+from dart_source_index import DartSourceIndex
+from dart_rewrite_engine import (
+    Rule, RuleSet, RewriteStats, apply_line_changes, plan_files, unified_diff
+)
+
+# Migration rules, tried in order on every line (first match wins)
+IMPORT_RULES = RuleSet([
+    # package:spots/core/services/quantum/* → package:spots_quantum/services/quantum/*
+    Rule('quantum_service',
+         r"import\s+['\"]package:spots/core/services/quantum/([^'\"]+)['\"];",
+         r"import 'package:spots_quantum/services/quantum/\g<1>';",
+         whole_line=True, description="Quantum service import"),
+    # package:spots/core/services/knot/* → package:spots_knot/services/knot/*
+    Rule('knot_service',
+         r"import\s+['\"]package:spots/core/services/knot/([^'\"]+)['\"];",
+         r"import 'package:spots_knot/services/knot/\g<1>';",
+         whole_line=True, description="Knot service import"),
+    # package:spots/core/services/knot/bridge/* → package:spots_knot/services/knot/bridge/*
+    Rule('knot_bridge',
+         r"import\s+['\"]package:spots/core/services/knot/bridge/([^'\"]+)['\"];",
+         r"import 'package:spots_knot/services/knot/bridge/\g<1>';",
+         whole_line=True, description="Knot bridge import"),
+    # Other quantum/knot references to package:spots/core need manual review
+    Rule('edge_case', r"^(?=.*package:spots/core).*(?:quantum|knot)", flags=re.IGNORECASE,
+         description="Needs manual review"),
+])
+RULES_BY_NAME = {rule.name: rule for rule in IMPORT_RULES.rules}
+
+# Index fact: IMPORT_RULES.plan() for a file (keyed by the rules' fingerprint)
+IMPORT_PLAN_FACT = f'update_package_imports/plan@{IMPORT_RULES.fingerprint}'
+
 # Color codes for terminal output
 class Colors:
     GREEN = '\033[92m'
@@ -50,25 +81,20 @@ class FileChanges:
 class ImportMigrator:
     """Handles import migration with safeguards"""
     
-    def __init__(self, project_root: Path, dry_run: bool = True):
+    def __init__(self, project_root: Path, dry_run: bool = True, workers: int = None):
         self.project_root = project_root
         self.dry_run = dry_run
+        self.workers = workers
         # Keep backups out of the repo root "product surface".
         # This directory is intended as a quarantine/review area (see repo hygiene plan).
         self.backup_dir = project_root / 'review_before_deletion' / 'import_migration_backup'
         self.changes: Dict[Path, FileChanges] = {}
+        self.source_index = DartSourceIndex(project_root)
+        self.stats = RewriteStats()
         
     def find_dart_files(self, directory: Path) -> List[Path]:
-        """Find all Dart files in directory"""
-        dart_files = []
-        for root, dirs, files in os.walk(directory):
-            # Skip hidden directories and build directories
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d != 'build']
-            
-            for file in files:
-                if file.endswith('.dart'):
-                    dart_files.append(Path(root) / file)
-        return dart_files
+        """Find all Dart files in directory (hidden and build directories skipped)"""
+        return self.source_index.dart_files(directory)
     
     def should_update_file(self, file_path: Path) -> bool:
         """Determine if file should be updated"""
@@ -91,67 +117,35 @@ class ImportMigrator:
         Update a single import line.
         Returns: (updated_line, reason) or (original_line, None) if no change
         """
-        original_line = line
-        
-        # Pattern 1: Quantum service imports
-        # package:spots/core/services/quantum/* → package:spots_quantum/services/quantum/*
-        quantum_pattern = r"import\s+['\"]package:spots/core/services/quantum/([^'\"]+)['\"];"
-        match = re.search(quantum_pattern, line)
-        if match:
-            service_name = match.group(1)
-            new_import = f"import 'package:spots_quantum/services/quantum/{service_name}';"
-            return new_import, "Quantum service import"
-        
-        # Pattern 2: Knot service imports
-        # package:spots/core/services/knot/* → package:spots_knot/services/knot/*
-        knot_pattern = r"import\s+['\"]package:spots/core/services/knot/([^'\"]+)['\"];"
-        match = re.search(knot_pattern, line)
-        if match:
-            service_name = match.group(1)
-            new_import = f"import 'package:spots_knot/services/knot/{service_name}';"
-            return new_import, "Knot service import"
-        
-        # Pattern 3: Bridge imports (in knot package)
-        # package:spots/core/services/knot/bridge/* → package:spots_knot/services/knot/bridge/*
-        bridge_pattern = r"import\s+['\"]package:spots/core/services/knot/bridge/([^'\"]+)['\"];"
-        match = re.search(bridge_pattern, line)
-        if match:
-            bridge_path = match.group(1)
-            new_import = f"import 'package:spots_knot/services/knot/bridge/{bridge_path}';"
-            return new_import, "Knot bridge import"
-        
-        # Edge case: Other quantum/knot imports that might need manual review
-        if 'quantum' in line.lower() or 'knot' in line.lower():
-            if 'package:spots/core' in line:
-                # This might need manual review
-                return line, None  # Return original, will be flagged as edge case
-        
-        return line, None
+        hit = IMPORT_RULES.first_match(line)
+        if hit is None or hit[0].replacement is None:
+            # No rule, or an edge case (flagged by analyze_file)
+            return line, None
+        rule, match = hit
+        return rule.apply(line, match), rule.description
     
-    def analyze_file(self, file_path: Path) -> FileChanges:
+    def analyze_file(self, file_path: Path, plan: List[Tuple[int, str, str, str]] = None) -> FileChanges:
         """Analyze a file and return all changes needed"""
         changes = []
         edge_cases = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            if plan is None:
+                plan = self.source_index.fact(file_path, IMPORT_PLAN_FACT, IMPORT_RULES.plan)
             
-            for line_num, line in enumerate(lines, 1):
-                updated_line, reason = self.update_import_line(line, file_path)
-                
-                if updated_line != line:
+            for line_num, rule_name, line, updated_line in plan:
+                rule = RULES_BY_NAME[rule_name]
+                if rule.replacement is not None:
                     changes.append(ImportChange(
                         file_path=file_path,
                         line_number=line_num,
                         old_import=line.rstrip(),
                         new_import=updated_line.rstrip(),
-                        reason=reason
+                        reason=rule.description
                     ))
-                elif reason is None and ('quantum' in line.lower() or 'knot' in line.lower()):
+                else:
                     # Potential edge case
-                    if 'package:spots/core' in line:
-                        edge_cases.append(f"Line {line_num}: {line.rstrip()}")
+                    edge_cases.append(f"Line {line_num}: {line.rstrip()}")
         
         except Exception as e:
             print(f"{Colors.RED}Error reading {file_path}: {e}{Colors.RESET}")
@@ -198,18 +192,17 @@ class ImportMigrator:
         """Scan a directory for files that need updates"""
         print(f"\n{Colors.BOLD}{Colors.BLUE}Scanning {description}...{Colors.RESET}")
         
-        dart_files = self.find_dart_files(directory)
+        dart_files = [f for f in self.find_dart_files(directory) if self.should_update_file(f)]
+        plans = plan_files(dart_files, IMPORT_RULES.plan, self.source_index, IMPORT_PLAN_FACT,
+                           workers=self.workers, stats=self.stats)
         total_files = 0
         files_with_changes = 0
         total_changes = 0
         total_edge_cases = 0
         
         for file_path in dart_files:
-            if not self.should_update_file(file_path):
-                continue
-            
             total_files += 1
-            file_changes = self.analyze_file(file_path)
+            file_changes = self.analyze_file(file_path, plans.get(file_path))
             
             if file_changes.changes or file_changes.edge_cases:
                 self.changes[file_path] = file_changes
@@ -271,6 +264,18 @@ class ImportMigrator:
                     for edge_case in file_changes.edge_cases:
                         print(f"    {edge_case}")
     
+    def print_diffs(self):
+        """Print unified diffs of every file that would change"""
+        for file_path, file_changes in self.changes.items():
+            if not file_changes.changes:
+                continue
+            content = self.source_index.read_text(file_path)
+            new_content = apply_line_changes(content, [
+                (change.line_number, change.reason, change.old_import, change.new_import)
+                for change in file_changes.changes
+            ])
+            print(unified_diff(file_path.relative_to(self.project_root), content, new_content), end='')
+    
     def print_edge_cases(self):
         """Print all edge cases that need manual review"""
         all_edge_cases = []
@@ -354,6 +359,17 @@ def main():
         default=Path.cwd(),
         help='Project root directory (default: current directory)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes for scanning (default: CPU count)'
+    )
+    parser.add_argument(
+        '--diff',
+        action='store_true',
+        help='Print a unified diff of every change'
+    )
     
     args = parser.parse_args()
     
@@ -363,7 +379,7 @@ def main():
         print(f"{Colors.RED}Error: pubspec.yaml not found. Are you in the project root?{Colors.RESET}")
         sys.exit(1)
     
-    migrator = ImportMigrator(project_root, dry_run=not args.apply)
+    migrator = ImportMigrator(project_root, dry_run=not args.apply, workers=args.workers)
     
     print(f"{Colors.BOLD}{Colors.BLUE}{'='*80}{Colors.RESET}")
     print(f"{Colors.BOLD}Package Import Migration Script{Colors.RESET}")
@@ -395,8 +411,11 @@ def main():
         if lib_dir.exists():
             migrator.scan_directory(lib_dir, "main app (knot imports)")
     
+    migrator.source_index.save()
+    
     # Print summary
     migrator.print_changes_summary()
+    migrator.stats.print_summary("MIGRATION RULES", RULES_BY_NAME)
     
     # Print detailed changes
     migrator.print_detailed_changes(max_files=10)
@@ -404,6 +423,9 @@ def main():
     # Print edge cases
     migrator.print_edge_cases()
     
+    if args.diff:
+        migrator.print_diffs()
+    
     # Apply changes if not dry-run
     if args.apply:
         print(f"\n{Colors.BOLD}{Colors.RED}Are you sure you want to apply these changes? (yes/no): {Colors.RESET}", end='')
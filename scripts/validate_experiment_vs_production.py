@@ -18,9 +18,14 @@ from pathlib import Path
 from dataclasses import dataclass
 from typing import List, Dict, Tuple, Optional
 
+from dart_source_index import DartSourceIndex
+
 # Get project root
 PROJECT_ROOT = Path(__file__).parent.parent
 
+# Production sources are read through the shared index (hash-checked, with line tables)
+SOURCE_INDEX = DartSourceIndex(PROJECT_ROOT)
+
 
 @dataclass
 class FormulaValidation:
@@ -35,6 +40,26 @@ class FormulaValidation:
     notes: str = ""
 
 
+def first_matching_line(content: str, pattern: str, line_of=None) -> Optional[int]:
+    """0-based index of the first line that pattern matches on its own (re.IGNORECASE).
+    
+    Same answer as searching every line in turn, but from one search of the
+    whole content: a match that fits on one line is on the first matching line
+    (none of these patterns use ^ or $). Only a match spanning lines falls back
+    to the per-line search, from its line onwards. line_of(offset) gives the
+    1-based line of an offset (default: count newlines up to it).
+    """
+    regex = re.compile(pattern, re.IGNORECASE)
+    match = regex.search(content)
+    if not match:
+        return None
+    line = (line_of(match.start()) if line_of else content.count('\n', 0, match.start()) + 1) - 1
+    if '\n' not in match.group(0):
+        return line
+    lines = content.split('\n')
+    return next((i for i in range(line, len(lines)) if regex.search(lines[i])), None)
+
+
 def find_experiment_formulas(patent_num: int) -> List[Tuple[str, str, str]]:
     """Find formulas in patent experiment files.
     
@@ -71,18 +96,15 @@ def find_experiment_formulas(patent_num: int) -> List[Tuple[str, str, str]]:
                 (r"drift.*limit|max.*drift|0\.30.*drift", "Drift Limit"),
             ]
             
+            lines = content.split('\n')
             for pattern, name in formula_patterns:
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                if matches:
+                i = first_matching_line(content, pattern)
+                if i is not None:
                     # Extract surrounding context (5 lines)
-                    lines = content.split('\n')
-                    for i, line in enumerate(lines):
-                        if re.search(pattern, line, re.IGNORECASE):
-                            start = max(0, i - 2)
-                            end = min(len(lines), i + 3)
-                            context = '\n'.join(lines[start:end])
-                            formulas.append((name, context, str(exp_file)))
-                            break
+                    start = max(0, i - 2)
+                    end = min(len(lines), i + 3)
+                    context = '\n'.join(lines[start:end])
+                    formulas.append((name, context, str(exp_file)))
                             
         except Exception as e:
             print(f"Error reading {exp_file}: {e}")
@@ -143,18 +165,17 @@ def find_production_implementation(formula_name: str) -> Optional[Tuple[str, str
         file_path = PROJECT_ROOT / rel_path
         if file_path.exists():
             try:
-                content = file_path.read_text()
-                matches = list(re.finditer(search_pattern, content, re.IGNORECASE))
-                if matches:
+                content = SOURCE_INDEX.read_text(file_path)
+                match = re.search(search_pattern, content, re.IGNORECASE)
+                if match:
                     # Extract surrounding context
                     lines = content.split('\n')
-                    for match in matches:
-                        # Find line number
-                        line_num = content[:match.start()].count('\n')
-                        start = max(0, line_num - 3)
-                        end = min(len(lines), line_num + 4)
-                        context = '\n'.join(lines[start:end])
-                        return (context, str(file_path))
+                    # Find line number (0-based)
+                    line_num = SOURCE_INDEX.line_number(file_path, match.start()) - 1
+                    start = max(0, line_num - 3)
+                    end = min(len(lines), line_num + 4)
+                    context = '\n'.join(lines[start:end])
+                    return (context, str(file_path))
             except Exception as e:
                 print(f"Error reading {file_path}: {e}")
     
@@ -283,30 +304,29 @@ def validate_specific_formulas() -> List[FormulaValidation]:
                 if re.search(formula["experiment_pattern"], content, re.IGNORECASE):
                     exp_found = True
                     # Get context
-                    lines = content.split('\n')
-                    for i, line in enumerate(lines):
-                        if re.search(formula["experiment_pattern"], line, re.IGNORECASE):
-                            start = max(0, i - 2)
-                            end = min(len(lines), i + 3)
-                            exp_code = '\n'.join(lines[start:end])
-                            break
+                    i = first_matching_line(content, formula["experiment_pattern"])
+                    if i is not None:
+                        lines = content.split('\n')
+                        start = max(0, i - 2)
+                        end = min(len(lines), i + 3)
+                        exp_code = '\n'.join(lines[start:end])
             except Exception:
                 pass
         
         # Check production
         if prod_path.exists():
             try:
-                content = prod_path.read_text()
+                content = SOURCE_INDEX.read_text(prod_path)
                 if re.search(formula["production_pattern"], content, re.IGNORECASE):
                     prod_found = True
                     # Get context
-                    lines = content.split('\n')
-                    for i, line in enumerate(lines):
-                        if re.search(formula["production_pattern"], line, re.IGNORECASE):
-                            start = max(0, i - 2)
-                            end = min(len(lines), i + 3)
-                            prod_code = '\n'.join(lines[start:end])
-                            break
+                    i = first_matching_line(content, formula["production_pattern"],
+                                            lambda offset: SOURCE_INDEX.line_number(prod_path, offset))
+                    if i is not None:
+                        lines = content.split('\n')
+                        start = max(0, i - 2)
+                        end = min(len(lines), i + 3)
+                        prod_code = '\n'.join(lines[start:end])
             except Exception:
                 pass
         
@@ -439,6 +459,7 @@ def main():
     report_path.parent.mkdir(parents=True, exist_ok=True)
     report_path.write_text(report)
     print(f"\nReport saved to: {report_path}")
+    SOURCE_INDEX.save()
     
     # Return exit code based on results
     if mismatch_count > 0: